@@ -1,10 +1,13 @@
 import os
 import re
+import copy
 import logging
 import datetime
 import json
 import csv
 import asyncio
+import threading
+from contextlib import asynccontextmanager
 from typing import List, Dict, Any, Tuple
 
 from fastapi import FastAPI, HTTPException
@@ -17,13 +20,67 @@ from codellamas_backend.crews.crew_single import (
     ImplementationSpec,
 )
 from codellamas_backend.crews.crew_multi import CodellamasBackendMulti
-from codellamas_backend.runtime.verifier import MavenVerifier
+from codellamas_backend.crews.async_kickoff import kickoff_async
+from codellamas_backend.crews.backend_pool import api_key_hash, get_backend_pool
+from codellamas_backend.crews.llm_cache import get_llm_cache, llm_cache_scope
+from codellamas_backend.runtime.verifier import MavenVerifier, compile_preflight_enabled
+from codellamas_backend.runtime.bundles import get_bundle_store
+from codellamas_backend.runtime.cache import get_verification_cache
+from codellamas_backend.runtime.reactor import get_reactor_batcher
+from codellamas_backend.runtime.scheduler import get_verification_scheduler
+from codellamas_backend.runtime.timeouts import get_adaptive_timeouts
+from codellamas_backend.tools.cds_archive import get_cds_manager
+from codellamas_backend.tools.class_cache import get_class_cache
+from codellamas_backend.tools.gradle_tool import get_gradle_tool, start_gradle_warmup
+from codellamas_backend.tools.verification_profile import verification_profile_from_env
+from codellamas_backend.tools.workspace_cleanup import (
+    get_workspace_deleter,
+    get_workspace_janitor,
+    start_workspace_janitor,
+)
+from codellamas_backend.tools.workspace_root import get_workspace_roots
+from codellamas_backend.tools.maven_repo import (
+    repository_status,
+    warm_up_maven_repository,
+    warm_up_pom_files,
+)
 from codellamas_backend.schemas.files import ProjectFile
 
 
 logging.getLogger("LiteLLM").setLevel(logging.CRITICAL)
 
-app = FastAPI()
+
+def start_maven_warmup() -> threading.Thread | None:
+    """
+    Resolves the default pom (plus MAVEN_WARMUP_POMS) into the local Maven
+    repository in the background, so later verifications can run offline.
+    Disabled with MAVEN_WARMUP=0.
+    """
+    if os.getenv("MAVEN_WARMUP", "1") == "0":
+        return None
+    thread = threading.Thread(
+        target=warm_up_maven_repository,
+        kwargs={
+            "pom_files": warm_up_pom_files(),
+            "default_pom": default_base_project_files()[0].content,
+            "mvn_cmd": os.getenv("MAVEN_CMD", ""),
+        },
+        name="maven-warmup",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_maven_warmup()
+    start_workspace_janitor()
+    start_gradle_warmup()
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 CSV_FILE_PATH = "output/exercises_evaluation.csv"
 csv_write_lock = asyncio.Lock()
 
@@ -37,16 +94,30 @@ def get_backend(
     api_endpoint: str | None = None,
     api_key: str | None = None,
 ):
+    """
+    Checks out a backend for (mode, model_name, api_endpoint, api_key) from
+    the backend pool, constructing one only when none is idle. Hand it back
+    with release_backend once the request is done with it.
+    """
     if mode not in {"single", "multi"}:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid mode '{mode}'. Use 'single' or 'multi'.",
         )
-    return (
-        CodellamasBackendMulti(model_name, api_endpoint, api_key)
-        if mode == "multi"
-        else CodellamasBackend(model_name, api_endpoint, api_key)
-    )
+    backend_cls = CodellamasBackendMulti if mode == "multi" else CodellamasBackend
+    pool = get_backend_pool()
+    if pool is None:
+        return backend_cls(model_name, api_endpoint, api_key)
+    # the class is part of the key, so a replaced class never hands out old instances
+    key = (mode, backend_cls, model_name, api_endpoint, api_key_hash(api_key))
+    return pool.checkout(key, lambda: backend_cls(model_name, api_endpoint, api_key))
+
+
+def release_backend(backend) -> None:
+    """Returns a backend from get_backend to the pool (a no-op without one)."""
+    pool = get_backend_pool()
+    if pool is not None and backend is not None:
+        pool.release(backend)
 
 
 class GenerateRequest(BaseModel):
@@ -60,6 +131,8 @@ class GenerateRequest(BaseModel):
     model_name: str | None = None
     api_endpoint: str | None = None
     api_key: str | None = None
+    llm_cache: bool = False  # opt in: a cached answer makes a repeated request return the same exercise
+    fan_out: bool = False  # count > 1 in single mode: one contract, `count` implementations
 
 
 class EvaluateRequest(BaseModel):
@@ -73,6 +146,7 @@ class EvaluateRequest(BaseModel):
     model_name: str | None = None
     api_endpoint: str | None = None
     api_key: str | None = None
+    llm_cache: bool = True
 
 
 def ingest_code_smells(code_smells: List[str]) -> str:
@@ -178,6 +252,7 @@ def run_maven_verification(
     injected_tests: List[Any],
     timeout_sec: int = 180,
     skipped_reason: str = "verify_maven=true but no project_files provided",
+    use_bundle: bool = False,
 ) -> Dict[str, Any]:
     maven_verification: Dict[str, Any] = {"enabled": False}
 
@@ -197,17 +272,148 @@ def run_maven_verification(
         injected_tests={
             f.path: f.content for f in normalize_project_files(injected_tests or [])
         },
+        use_bundle=use_bundle,
     )
 
-    maven_verification.update(
-        {
-            "status": verification.status,
-            "failed_tests": verification.failed_tests,
-            "errors": verification.errors,
-            "raw_log_head": verification.summary(),
+    maven_verification.update(verification_payload(verification))
+    return maven_verification
+
+
+async def run_maven_verification_async(
+    *,
+    verify_maven: bool,
+    project_files: List[ProjectFile],
+    override_files: List[Any],
+    injected_tests: List[Any],
+    timeout_sec: int = 180,
+    skipped_reason: str = "verify_maven=true but no project_files provided",
+    use_bundle: bool = False,
+) -> Dict[str, Any]:
+    """
+    Awaitable run_maven_verification: Maven runs as an asyncio subprocess, so
+    handlers can await it without holding a worker thread for the whole build.
+    """
+    if not verify_maven:
+        return {"enabled": False}
+
+    if not project_files:
+        return {"enabled": True, "status": "SKIPPED", "reason": skipped_reason}
+
+    verifier = MavenVerifier(timeout_sec=timeout_sec, quiet=True)
+    verification = await verifier.verify_async(
+        base_project=normalize_project_files(project_files),
+        override_files=normalize_project_files(override_files or []),
+        injected_tests={
+            f.path: f.content for f in normalize_project_files(injected_tests or [])
+        },
+        use_bundle=use_bundle,
+    )
+    return {"enabled": True, **verification_payload(verification)}
+
+
+def prepare_review_bundle(exercise: SpringBootExercise) -> None:
+    """
+    Builds the exercise's verification bundle in the background, keyed the
+    same way /review will look it up (question_json project_files and test_files).
+    """
+    store = get_bundle_store()
+    if store is None:
+        return
+    store.prepare_async(
+        normalize_project_files(exercise.project_files),
+        {f.path: f.content for f in normalize_project_files(exercise.test_files)},
+    )
+
+
+def verification_payload(verification: Any) -> Dict[str, Any]:
+    return {
+        "status": verification.status,
+        "failed_tests": verification.failed_tests,
+        "errors": verification.errors,
+        "raw_log_head": verification.summary(),
+        "from_cache": verification.from_cache,
+        "test_summary": verification.test_summary,
+        "test_cases": verification.test_cases,
+        "queue_wait_sec": verification.queue_wait_sec,
+        "exec_sec": verification.exec_sec,
+        "estimated_startup_saving_sec": verification.estimated_startup_saving_sec,
+        "phase": verification.phase,
+        "diagnostics": verification.diagnostics,
+        "timed_out": verification.timed_out,
+        "timeout": verification.timeout,
+    }
+
+
+def run_maven_verification_variants(
+    *,
+    verify_maven: bool,
+    project_files: List[ProjectFile],
+    variants: Dict[str, List[Any]],
+    injected_tests: List[Any],
+    timeout_sec: int = 180,
+    skipped_reason: str = "verify_maven=true but no project_files provided",
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Like run_maven_verification, but checks several override variants (e.g.
+    smelly and solution) against the same base project and tests in one
+    verifier call, so they share workspace preparation and run concurrently.
+    """
+    if not verify_maven:
+        return {name: {"enabled": False} for name in variants}
+
+    if not project_files:
+        return {
+            name: {"enabled": True, "status": "SKIPPED", "reason": skipped_reason}
+            for name in variants
         }
+
+    verifier = MavenVerifier(timeout_sec=timeout_sec, quiet=True)
+    verifications = verifier.verify_variants(
+        base_project=normalize_project_files(project_files),
+        variants={
+            name: normalize_project_files(files or []) for name, files in variants.items()
+        },
+        injected_tests={
+            f.path: f.content for f in normalize_project_files(injected_tests or [])
+        },
     )
-    return maven_verification
+
+    return {
+        name: {"enabled": True, **verification_payload(verifications[name])}
+        for name in variants
+    }
+
+
+def run_compile_preflight_variants(
+    *,
+    verify_maven: bool,
+    project_files: List[ProjectFile],
+    variants: Dict[str, List[Any]],
+    injected_tests: List[Any],
+    timeout_sec: int = 180,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Compile-only check of each variant (MavenVerifier.verify_compile). A
+    variant with status FAIL does not compile and needs no test run; its
+    payload lists the compiler errors under "diagnostics".
+    """
+    if not verify_maven or not project_files or not compile_preflight_enabled():
+        return {name: {"enabled": False} for name in variants}
+
+    verifier = MavenVerifier(timeout_sec=timeout_sec, quiet=True)
+    verifications = verifier.verify_compile_variants(
+        base_project=normalize_project_files(project_files),
+        variants={
+            name: normalize_project_files(files or []) for name, files in variants.items()
+        },
+        injected_tests={
+            f.path: f.content for f in normalize_project_files(injected_tests or [])
+        },
+    )
+    return {
+        name: {"enabled": True, **verification_payload(verifications[name])}
+        for name in variants
+    }
 
 
 def default_base_project_files() -> List[ProjectFile]:
@@ -341,13 +547,23 @@ def build_maven_failure_context(label: str, verification: Dict[str, Any]) -> str
         f"Errors: {errors[:5]}",
     ]
 
-    if important_lines:
+    diagnostics = verification.get("diagnostics") or []
+    if diagnostics:
+        summary_lines.append("Compiler errors:")
+        summary_lines.extend(f"- {render_diagnostic(d)}" for d in diagnostics[:10])
+    elif important_lines:
         summary_lines.append("Important verifier lines:")
         summary_lines.extend(important_lines)
 
     return "\n".join(summary_lines)
 
 
+def render_diagnostic(diagnostic: Dict[str, Any]) -> str:
+    text = f"{diagnostic.get('path')}:{diagnostic.get('line')}: {diagnostic.get('message')}"
+    details = diagnostic.get("details")
+    return f"{text} ({details})" if details else text
+
+
 def extract_package_decl(content: str) -> str | None:
     match = re.search(r"^\s*package\s+([a-zA-Z_][\w.]*)\s*;", content, re.MULTILINE)
     return match.group(1) if match else None
@@ -462,19 +678,20 @@ def compose_exercise(contract: ContractSpec, implementation: ImplementationSpec)
     )
 
 
-def generate_single_contract(
+async def generate_single_contract_async(
     backend: CodellamasBackend,
     *,
     topic: str,
     code_smells: str,
     existing_codebase: str,
 ) -> ContractSpec:
-    raw = backend.contract_crew().kickoff(
-        inputs={
+    raw = await kickoff_async(
+        backend.contract_crew(),
+        {
             "topic": topic,
             "code_smells": code_smells,
             "existing_codebase": existing_codebase,
-        }
+        },
     )
     contract = ContractSpec(**raw.json_dict)
     contract_errors = validate_contract(contract)
@@ -486,7 +703,7 @@ def generate_single_contract(
     return contract
 
 
-def generate_single_implementation_with_retries(
+async def generate_single_implementation_with_retries_async(
     backend: CodellamasBackend,
     *,
     topic: str,
@@ -495,6 +712,7 @@ def generate_single_implementation_with_retries(
     base_project_files: List[ProjectFile],
     verify_maven: bool,
 ) -> Tuple[SpringBootExercise, Dict[str, Any]]:
+    """LLM calls are awaited; the compile and test verifications run on worker threads."""
     max_single_retries = 1
     implementation_attempts: List[Dict[str, Any]] = []
     failure_context = ""
@@ -504,14 +722,15 @@ def generate_single_implementation_with_retries(
     contract_json = contract.model_dump()
 
     for attempt in range(1, max_single_retries + 2):
-        raw = backend.implementation_crew().kickoff(
-            inputs={
+        raw = await kickoff_async(
+            backend.implementation_crew(),
+            {
                 "topic": topic,
                 "code_smells": code_smells,
                 "contract_json": contract_json,
                 "maven_failure_context": failure_context,
                 "previous_exercise_json": previous_exercise_json,
-            }
+            },
         )
 
         implementation = ImplementationSpec(**raw.json_dict)
@@ -538,33 +757,50 @@ def generate_single_implementation_with_retries(
             previous_exercise_json = exercise_data.model_dump()
             continue
 
-        smelly_verification = run_maven_verification(
-            verify_maven=verify_maven,
-            project_files=base_project_files,
-            override_files=exercise_data.project_files,
-            injected_tests=exercise_data.test_files,
-            timeout_sec=180,
-        )
-
         solution_override_files = build_solution_override_files(
             project_files=exercise_data.project_files,
             answers_list=exercise_data.answers_list,
             paths_to_ex=exercise_data.paths_to_ex,
         )
 
-        solution_verification = run_maven_verification(
+        variants = {
+            "smelly": exercise_data.project_files,
+            "solution": solution_override_files,
+        }
+        # code that does not compile is sent back without running the tests
+        compile_verifications = await asyncio.to_thread(
+            run_compile_preflight_variants,
             verify_maven=verify_maven,
             project_files=base_project_files,
-            override_files=solution_override_files,
+            variants=variants,
             injected_tests=exercise_data.test_files,
             timeout_sec=180,
-            skipped_reason="verify_maven=true but no base project_files provided for solution verification",
         )
+        variant_verifications = {
+            name: verification
+            for name, verification in compile_verifications.items()
+            if verification.get("status") == "FAIL"
+        }
+        to_test = {name: files for name, files in variants.items() if name not in variant_verifications}
+        if to_test:
+            variant_verifications.update(
+                await asyncio.to_thread(
+                    run_maven_verification_variants,
+                    verify_maven=verify_maven,
+                    project_files=base_project_files,
+                    variants=to_test,
+                    injected_tests=exercise_data.test_files,
+                    timeout_sec=180,
+                )
+            )
+        smelly_verification = variant_verifications["smelly"]
+        solution_verification = variant_verifications["solution"]
 
         implementation_attempts.append(
             {
                 "attempt": attempt,
                 "preflight": {"status": "PASS", "errors": []},
+                "compile": compile_verifications,
                 "smelly": smelly_verification,
                 "solution": solution_verification,
             }
@@ -641,9 +877,88 @@ async def capabilities():
     }
 
 
-def _execute_single_generation(body: GenerateRequest, max_retries: int = 3):
+@app.get("/verification/stats")
+async def verification_stats():
+    cache = get_verification_cache()
+    class_cache = get_class_cache()
+    bundles = get_bundle_store()
+    scheduler = get_verification_scheduler()
+    cds = get_cds_manager()
+    profile = verification_profile_from_env()
+    timeouts = get_adaptive_timeouts()
+    reactor = get_reactor_batcher()
+    deleter = get_workspace_deleter()
+    janitor = get_workspace_janitor()
+    return {
+        "cache": cache.stats() if cache is not None else {"enabled": False},
+        "class_cache": class_cache.stats() if class_cache is not None else {"enabled": False},
+        "bundles": bundles.stats() if bundles is not None else {"enabled": False},
+        "maven_repository": repository_status(),
+        "scheduler": scheduler.stats() if scheduler is not None else {"enabled": False},
+        "workspaces": get_workspace_roots().stats(),
+        "cds": cds.stats() if cds is not None else {"enabled": False},
+        "profile": profile.describe() if profile is not None else {"enabled": False},
+        "timeouts": timeouts.stats() if timeouts is not None else {"enabled": False},
+        "reactor": reactor.stats() if reactor is not None else {"enabled": False},
+        "cleanup": {
+            "deleter": deleter.stats() if deleter is not None else {"enabled": False},
+            "janitor": janitor.stats() if janitor is not None else {"enabled": False},
+        },
+        "gradle": get_gradle_tool().stats(),
+    }
+
+
+@app.get("/backends/stats")
+async def backend_stats():
+    pool = get_backend_pool()
+    llm_cache = get_llm_cache()
+    return {
+        "pool": pool.stats() if pool is not None else {"enabled": False},
+        "llm_cache": llm_cache.stats() if llm_cache is not None else {"enabled": False},
+    }
+
+
+@app.get("/verification/timeouts/{fingerprint}")
+async def verification_timeouts(fingerprint: str):
+    """Duration histogram and recent cut-offs of one project (the `timeout.fingerprint` of a result)."""
+    timeouts = get_adaptive_timeouts()
+    if timeouts is None:
+        raise HTTPException(status_code=404, detail="Adaptive timeouts are disabled")
+    histogram = timeouts.histogram(fingerprint)
+    if histogram is None:
+        raise HTTPException(status_code=404, detail=f"No timing history for {fingerprint}")
+    return {"fingerprint": fingerprint, **histogram}
+
+
+async def _execute_single_generation_async(
+    body: GenerateRequest,
+    max_retries: int = 3,
+    sample: int = 0,
+    contract: ContractSpec | None = None,
+):
+    """
+    One /generate exercise on the event loop. Crew kickoffs, file writes
+    and Maven verifications go to worker threads (with CREW_ASYNC=1,
+    waiting for the LLM holds no thread).
+
+    `sample` tells the exercises of a count>1 request apart in the LLM
+    response cache, so they are not all the same cached answer. A given
+    (single mode) `contract` is used as is; only the implementation is
+    generated.
+    """
+    with llm_cache_scope(enabled=body.llm_cache is not False, variant=f"sample-{sample}" if sample else "") as cache_scope:
+        return await _generate_with_retries(body, max_retries, cache_scope, contract)
+
+
+async def _generate_with_retries(
+    body: GenerateRequest,
+    max_retries: int,
+    cache_scope,
+    shared_contract: ContractSpec | None = None,
+):
     last_error = None
     for attempt in range(max_retries):
+        backend = None
         try:
             formatted_code_smells = ingest_code_smells(body.code_smells)
             backend = get_backend(
@@ -662,21 +977,21 @@ def _execute_single_generation(body: GenerateRequest, max_retries: int = 3):
             loop_meta = None
 
             if body.mode == "multi" and body.verify_maven:
-                exercise_data, loop_meta = backend.generate_with_fix_loop(
+                exercise_data, loop_meta = await backend.generate_with_fix_loop_async(
                     topic=body.topic,
                     code_smells=body.code_smells,
                     existing_codebase=body.existing_codebase,
                     project_files=base_project_files,
                 )
             else:
-                contract = generate_single_contract(
+                contract = shared_contract or await generate_single_contract_async(
                     backend=backend,
                     topic=body.topic,
                     code_smells=formatted_code_smells,
                     existing_codebase=body.existing_codebase,
                 )
 
-                exercise_data, loop_meta = generate_single_implementation_with_retries(
+                exercise_data, loop_meta = await generate_single_implementation_with_retries_async(
                     backend=backend,
                     topic=body.topic,
                     code_smells=formatted_code_smells,
@@ -685,17 +1000,11 @@ def _execute_single_generation(body: GenerateRequest, max_retries: int = 3):
                     verify_maven=body.verify_maven,
                 )
 
-            saved_path = save_exercise_to_repo(exercise_data, body.topic)
-
-            smelly_verification = run_maven_verification(
-                verify_maven=body.verify_maven,
-                project_files=base_project_files,
-                override_files=exercise_data.project_files,
-                injected_tests=exercise_data.test_files,
-                timeout_sec=180,
-            )
+            saved_path = await asyncio.to_thread(save_exercise_to_repo, exercise_data, body.topic)
+            if body.verify_maven:
+                prepare_review_bundle(exercise_data)
 
-            maven_verification: Dict[str, Any] = smelly_verification
+            maven_verification: Dict[str, Any]
 
             if body.mode == "single":
                 solution_override_files = build_solution_override_files(
@@ -704,20 +1013,27 @@ def _execute_single_generation(body: GenerateRequest, max_retries: int = 3):
                     paths_to_ex=exercise_data.paths_to_ex,
                 )
 
-                solution_verification = run_maven_verification(
+                maven_verification = await asyncio.to_thread(
+                    run_maven_verification_variants,
+                    verify_maven=body.verify_maven,
+                    project_files=base_project_files,
+                    variants={
+                        "smelly": exercise_data.project_files,
+                        "solution": solution_override_files,
+                    },
+                    injected_tests=exercise_data.test_files,
+                    timeout_sec=180,
+                )
+            else:
+                maven_verification = await asyncio.to_thread(
+                    run_maven_verification,
                     verify_maven=body.verify_maven,
                     project_files=base_project_files,
-                    override_files=solution_override_files,
+                    override_files=exercise_data.project_files,
                     injected_tests=exercise_data.test_files,
                     timeout_sec=180,
-                    skipped_reason="verify_maven=true but no base project_files provided for solution verification",
                 )
 
-                maven_verification = {
-                    "smelly": smelly_verification,
-                    "solution": solution_verification,
-                }
-
             response_data: Dict[str, Any] = {
                 "status": "success",
                 "message": f"Exercise generated and saved to {saved_path}",
@@ -725,8 +1041,7 @@ def _execute_single_generation(body: GenerateRequest, max_retries: int = 3):
                 "maven_verification": maven_verification,
             }
 
-            if loop_meta is not None:
-                response_data["meta"] = loop_meta
+            response_data["meta"] = {**(loop_meta or {}), "llm_cache": cache_scope.stats()}
 
             csv_row_args = {
                 "exercise": exercise_data,
@@ -740,20 +1055,79 @@ def _execute_single_generation(body: GenerateRequest, max_retries: int = 3):
         except Exception as e:
             logging.warning(f"Generation attempt {attempt+1} failed: {e}")
             last_error = e
+            # the next attempt must not replay an answer that may be why this one failed
+            cache_scope.forget()
+        finally:
+            release_backend(backend)
 
     return {"status": "error", "message": f"Generation failed after {max_retries} attempts: {last_error}"}, None
 
 
+async def _generate_shared_contract_async(body: GenerateRequest, max_retries: int = 3) -> ContractSpec:
+    """The one contract of a fan-out batch, generated and validated with up to max_retries attempts."""
+    last_error = None
+    with llm_cache_scope(enabled=body.llm_cache is not False) as cache_scope:
+        for attempt in range(max_retries):
+            backend = None
+            try:
+                backend = get_backend(
+                    "single",
+                    model_name=body.model_name,
+                    api_endpoint=body.api_endpoint,
+                    api_key=body.api_key,
+                )
+                return await generate_single_contract_async(
+                    backend=backend,
+                    topic=body.topic,
+                    code_smells=ingest_code_smells(body.code_smells),
+                    existing_codebase=body.existing_codebase,
+                )
+            except Exception as e:
+                logging.warning(f"Contract attempt {attempt+1} failed: {e}")
+                last_error = e
+                cache_scope.forget()
+            finally:
+                release_backend(backend)
+    raise RuntimeError(f"Contract generation failed after {max_retries} attempts: {last_error}")
+
+
+async def _execute_fan_out_generation_async(body: GenerateRequest, max_retries: int = 3):
+    """
+    count>1 with fan_out: one contract for the whole batch, then `count`
+    implementations generated against it concurrently. Every candidate is
+    verified with the same contract tests, so their verifications can be
+    batched, and the batch makes one contract LLM call instead of `count`.
+    """
+    try:
+        async with task_semaphore:
+            contract = await _generate_shared_contract_async(body, max_retries)
+    except Exception as e:
+        error = {"status": "error", "message": str(e)}
+        return [(copy.deepcopy(error), None) for _ in range(body.count)]
+
+    async def _candidate(sample: int):
+        async with task_semaphore:
+            response, csv_args = await _execute_single_generation_async(body, max_retries, sample, contract)
+        if response.get("status") == "success":
+            response.setdefault("meta", {})["fan_out"] = {"candidate": sample, "candidates": body.count}
+        return response, csv_args
+
+    return await asyncio.gather(*(_candidate(sample) for sample in range(body.count)))
+
+
 @app.post("/generate")
 async def generate_exercise(body: GenerateRequest):
-    async def _run_with_semaphore():
+    async def _run_with_semaphore(sample: int):
         async with task_semaphore:
-            return await asyncio.to_thread(_execute_single_generation, body, 3)
+            return await _execute_single_generation_async(body, 3, sample)
 
     try:
-        # Run generations in parallel, limited by semaphore
-        tasks = [_run_with_semaphore() for _ in range(body.count)]
-        results = await asyncio.gather(*tasks)
+        if body.fan_out and body.mode == "single" and body.count > 1:
+            results = await _execute_fan_out_generation_async(body, 3)
+        else:
+            # Run generations in parallel, limited by semaphore
+            tasks = [_run_with_semaphore(sample) for sample in range(body.count)]
+            results = await asyncio.gather(*tasks)
     except Exception as e:
         logging.error(f"Generation failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -777,7 +1151,7 @@ async def generate_exercise(body: GenerateRequest):
     }
 
 
-def _execute_single_review(body: EvaluateRequest) -> Dict[str, Any]:
+async def _execute_single_review(body: EvaluateRequest) -> Dict[str, Any]:
     parsed_q: Dict[str, Any] = body.question_json or {}
 
     project_files_q = parsed_q.get("project_files", [])
@@ -790,13 +1164,14 @@ def _execute_single_review(body: EvaluateRequest) -> Dict[str, Any]:
     formatted_code_smells = ingest_code_smells(getattr(body, "code_smells", []))
 
     try:
-        maven_verification = run_maven_verification(
+        maven_verification = await run_maven_verification_async(
             verify_maven=body.verify_maven,
             project_files=project_files,
             override_files=student_code or [],
             injected_tests=injected_tests or [],
             timeout_sec=180,
             skipped_reason="verify_maven=true but no project_files provided",
+            use_bundle=True,
         )
 
         test_results = body.test_results or ""
@@ -821,14 +1196,23 @@ def _execute_single_review(body: EvaluateRequest) -> Dict[str, Any]:
 
         # Use the single-agent review backend for both single and multi modes.
         # The multi-agent backend currently has no review_crew implementation.
-        review_backend = CodellamasBackend(
+        review_backend = get_backend(
+            "single",
             model_name=body.model_name,
             api_endpoint=body.api_endpoint,
             api_key=body.api_key,
         )
-        raw = review_backend.review_crew().kickoff(inputs=inputs)
-
-        return {"feedback": str(raw), "maven_verification": maven_verification}
+        try:
+            with llm_cache_scope(enabled=body.llm_cache is not False) as cache_scope:
+                raw = await kickoff_async(review_backend.review_crew(), inputs)
+        finally:
+            release_backend(review_backend)
+
+        return {
+            "feedback": str(raw),
+            "maven_verification": maven_verification,
+            "meta": {"llm_cache": cache_scope.stats()},
+        }
 
     except Exception as e:
         raise Exception(f"Review crew failed: {e}")
@@ -838,6 +1222,6 @@ def _execute_single_review(body: EvaluateRequest) -> Dict[str, Any]:
 async def review_solution(body: EvaluateRequest):
     async with task_semaphore:
         try:
-            return await asyncio.to_thread(_execute_single_review, body)
+            return await _execute_single_review(body)
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
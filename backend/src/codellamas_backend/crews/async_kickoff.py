@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import litellm
+from crewai import Crew, Process
+from crewai.utilities.i18n import I18N
+from crewai.utilities.string_utils import interpolate_only
+
+from codellamas_backend.crews.cassette import cassette_for
+from codellamas_backend.crews.llm_cache import cached_response, remember_response
+
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+@dataclass
+class AsyncCrewOutput:
+    """What callers read from a CrewOutput: raw text, json_dict, per-task raw outputs."""
+
+    raw: str
+    json_dict: Optional[Dict[str, Any]] = None
+    tasks_output: List[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return self.raw
+
+
+def native_async_enabled() -> bool:
+    return os.getenv("CREW_ASYNC", "0") == "1"
+
+
+async def kickoff_async(crew: Any, inputs: Dict[str, Any]) -> Any:
+    """
+    Runs a crew from a coroutine. By default crew.kickoff runs on a worker
+    thread.
+
+    With CREW_ASYNC=1 the crew does not hold a thread while the LLM answers:
+    crewAI's own async kickoff is used where the installed version has one
+    (`akickoff`). Otherwise sequential crews whose agents have no tools are
+    run here: each task becomes one chat completion awaited through
+    litellm.acompletion, with crewAI's prompt slices, the previous tasks'
+    output as context, and output_json parsed into json_dict. This rebuilds
+    crewAI's prompts from its internals, so it is opt-in. Anything else
+    (tools, hierarchical process) still falls back to crew.kickoff on a
+    worker thread.
+    """
+    if native_async_enabled():
+        akickoff = getattr(crew, "akickoff", None)
+        if inspect.iscoroutinefunction(akickoff):
+            return await akickoff(inputs=inputs)
+        if _runs_natively(crew):
+            return await _run_sequential(crew, inputs)
+    return await asyncio.to_thread(crew.kickoff, inputs=inputs)
+
+
+def _runs_natively(crew: Any) -> bool:
+    if not isinstance(crew, Crew) or crew.process != Process.sequential or not crew.tasks:
+        return False
+    for task in crew.tasks:
+        agent = _agent_for(crew, task)
+        if agent is None or agent.tools or task.tools or getattr(agent, "llm", None) is None:
+            return False
+        if isinstance(task.context, list) and task.context:
+            # explicit context (the default is a NOT_SPECIFIED sentinel)
+            return False
+    return True
+
+
+def _agent_for(crew: Crew, task: Any) -> Any:
+    if task.agent is not None:
+        return task.agent
+    return crew.agents[0] if len(crew.agents) == 1 else None
+
+
+async def _run_sequential(crew: Crew, inputs: Dict[str, Any]) -> AsyncCrewOutput:
+    i18n = I18N()
+    outputs: List[str] = []
+    json_dict: Optional[Dict[str, Any]] = None
+    for task in crew.tasks:
+        agent = _agent_for(crew, task)
+        messages = _messages(i18n, agent, task, inputs, outputs)
+        text = await _complete(agent.llm, messages)
+        json_dict = _parse_json(text, task.output_json) if task.output_json else None
+        outputs.append(json.dumps(json_dict) if json_dict is not None else text)
+    return AsyncCrewOutput(raw=outputs[-1], json_dict=json_dict, tasks_output=outputs)
+
+
+def _original(obj: Any, name: str) -> str:
+    # crewAI interpolates in place on kickoff and keeps the template aside
+    return getattr(obj, f"_original_{name}", None) or getattr(obj, name) or ""
+
+
+def _interpolate(template: str, inputs: Dict[str, Any]) -> str:
+    # like Crew.kickoff, which only interpolates when there are inputs
+    return interpolate_only(template, inputs) if inputs else template
+
+
+def _messages(i18n: I18N, agent: Any, task: Any, inputs: Dict[str, Any], previous: List[str]) -> List[Dict[str, str]]:
+    system = i18n.slice("role_playing").format(
+        role=_interpolate(_original(agent, "role"), inputs),
+        backstory=_interpolate(_original(agent, "backstory"), inputs),
+        goal=_interpolate(_original(agent, "goal"), inputs),
+    )
+    prompt = _interpolate(_original(task, "description"), inputs)
+    expected = _interpolate(_original(task, "expected_output"), inputs)
+    prompt += i18n.slice("expected_output").format(expected_output=expected)
+    if task.output_json:
+        schema = json.dumps(task.output_json.model_json_schema(), indent=2)
+        prompt += "\n\n" + i18n.slice("formatted_task_instructions").format(output_format=schema)
+    if previous:
+        # a sequential crew hands every earlier task's output to the next one
+        prompt = i18n.slice("task_with_context").format(task=prompt, context="\n\n----------\n\n".join(previous))
+    return [{"role": "system", "content": system}, {"role": "user", "content": prompt}]
+
+
+async def _complete(llm: Any, messages: List[Dict[str, str]]) -> str:
+    key, cached = cached_response(llm, messages)
+    if cached is not None:
+        return cached
+    cassette = cassette_for(llm)
+    if cassette is not None:
+        content = await cassette.acomplete(llm, messages, lambda: _acompletion(llm, messages))
+    else:
+        content = await _acompletion(llm, messages)
+    remember_response(key, content, model=llm.model)
+    return content
+
+
+async def _acompletion(llm: Any, messages: List[Dict[str, str]]) -> str:
+    params: Dict[str, Any] = {
+        "model": llm.model,
+        "messages": messages,
+        "base_url": llm.base_url,
+        "api_key": llm.api_key,
+        "max_tokens": llm.max_tokens,
+        "temperature": llm.temperature,
+        "timeout": (llm.additional_params or {}).get("request_timeout") or llm.timeout,
+    }
+    response = await litellm.acompletion(**{k: v for k, v in params.items() if v is not None})
+    return response.choices[0].message.content or ""
+
+
+def _parse_json(text: str, model: Any) -> Dict[str, Any]:
+    """The model's JSON answer validated against output_json; ValueError if there is none."""
+    candidate = text.split("Final Answer:", 1)[-1].strip()
+    candidate = _FENCE_RE.sub("", candidate).strip()
+    if not candidate.startswith("{"):
+        start, end = candidate.find("{"), candidate.rfind("}")
+        if start < 0 or end < start:
+            raise ValueError(f"{model.__name__}: the LLM did not answer with a JSON object")
+        candidate = candidate[start:end + 1]
+    try:
+        return model.model_validate_json(candidate).model_dump()
+    except Exception as e:
+        raise ValueError(f"{model.__name__}: the LLM answer does not match the schema: {e}") from e
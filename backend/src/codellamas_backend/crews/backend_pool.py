@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+def api_key_hash(api_key: Optional[str]) -> str:
+    """Pool keys carry a digest of the key, never the key itself."""
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+class BackendPool:
+    """
+    Keeps constructed crew backends for reuse. Building one parses the agent
+    and task YAML through @CrewBase and creates an LLM client, which costs far
+    more than the request setup it is part of.
+
+    checkout() hands an instance to one caller at a time: an idle one for the
+    key if there is one, a new one from `factory` otherwise (never blocking).
+    release() puts it back. At most max_idle_per_key instances per key and
+    max_idle in total are kept; the least recently released go first, and
+    instances idle for longer than idle_ttl_sec are dropped.
+    """
+
+    def __init__(self, max_idle: int = 32, max_idle_per_key: int = 8, idle_ttl_sec: float = 600.0):
+        self.max_idle = max_idle
+        self.max_idle_per_key = max_idle_per_key
+        self.idle_ttl_sec = idle_ttl_sec
+        self._lock = threading.Lock()
+        # key -> [(backend, released_at)], most recently released last
+        self._idle: "OrderedDict[Hashable, List[Tuple[Any, float]]]" = OrderedDict()
+        self._leased: Dict[int, Tuple[Hashable, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.construct_sec = 0.0
+
+    def checkout(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            entries = self._idle.get(key)
+            if entries:
+                backend, _ = entries.pop()
+                if not entries:
+                    del self._idle[key]
+                self._leased[id(backend)] = (key, backend)
+                self.hits += 1
+                return backend
+            self.misses += 1
+
+        started = time.monotonic()
+        backend = factory()  # outside the lock: construction is the slow part
+        with self._lock:
+            self.construct_sec += time.monotonic() - started
+            self._leased[id(backend)] = (key, backend)
+        return backend
+
+    def release(self, backend: Any) -> bool:
+        """Returns a checked-out instance; False (and nothing kept) for anything else."""
+        now = time.monotonic()
+        with self._lock:
+            leased = self._leased.pop(id(backend), None)
+            if leased is None or leased[1] is not backend:
+                return False
+            key = leased[0]
+            entries = self._idle.setdefault(key, [])
+            entries.append((backend, now))
+            self._idle.move_to_end(key)
+            if len(entries) > self.max_idle_per_key:
+                del entries[0]
+                self.evicted += 1
+            while self._idle_count() > self.max_idle:
+                self._evict_oldest()
+            self._evict_expired(now)
+            return True
+
+    def discard(self, backend: Any) -> None:
+        """Forgets a checked-out instance instead of returning it."""
+        with self._lock:
+            self._leased.pop(id(backend), None)
+
+    def evict_idle(self) -> int:
+        with self._lock:
+            return self._evict_expired(time.monotonic())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": True,
+                "idle": self._idle_count(),
+                "leased": len(self._leased),
+                "keys": len(self._idle),
+                "max_idle": self.max_idle,
+                "max_idle_per_key": self.max_idle_per_key,
+                "idle_ttl_sec": self.idle_ttl_sec,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evicted": self.evicted,
+                "avg_construct_ms": round(1000 * self.construct_sec / self.misses, 1) if self.misses else 0.0,
+            }
+
+    def _idle_count(self) -> int:
+        return sum(len(entries) for entries in self._idle.values())
+
+    def _evict_oldest(self) -> None:
+        # caller holds self._lock
+        oldest_key = min(self._idle, key=lambda k: self._idle[k][0][1])
+        entries = self._idle[oldest_key]
+        del entries[0]
+        if not entries:
+            del self._idle[oldest_key]
+        self.evicted += 1
+
+    def _evict_expired(self, now: float) -> int:
+        # caller holds self._lock
+        removed = 0
+        for key in list(self._idle):
+            entries = self._idle[key]
+            kept = [(backend, at) for backend, at in entries if now - at <= self.idle_ttl_sec]
+            removed += len(entries) - len(kept)
+            if kept:
+                self._idle[key] = kept
+            else:
+                del self._idle[key]
+        self.evicted += removed
+        return removed
+
+
+_pool: Optional[BackendPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_backend_pool() -> Optional[BackendPool]:
+    """
+    Process-wide backend pool. Disabled with BACKEND_POOL=0;
+    BACKEND_POOL_MAX_IDLE (default 32), BACKEND_POOL_MAX_IDLE_PER_KEY
+    (default 8) and BACKEND_POOL_IDLE_SEC (default 600) size it.
+    """
+    global _pool
+    if os.getenv("BACKEND_POOL", "1") == "0":
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = BackendPool(
+                max_idle=int(os.getenv("BACKEND_POOL_MAX_IDLE", "32")),
+                max_idle_per_key=int(os.getenv("BACKEND_POOL_MAX_IDLE_PER_KEY", "8")),
+                idle_ttl_sec=float(os.getenv("BACKEND_POOL_IDLE_SEC", "600")),
+            )
+        return _pool
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from codellamas_backend.crews.llm_cache import llm_cache_key, sampling_params
+
+
+CASSETTE_MODES = ("record", "replay", "strict")
+
+
+class UnrecordedPrompt(RuntimeError):
+    """A strict cassette was asked for a completion it has no recording of."""
+
+
+class LLMCassette:
+    """
+    Record/replay transport for LLM completions, so the pipeline can run
+    without the model (offline benchmarks, regression runs).
+
+    Interactions are keyed like the LLM response cache (model, endpoint,
+    rendered messages, sampling parameters) and stored in one JSON file.
+    A key can hold several recordings: replay hands them out in recorded
+    order and starts over when they run out, so repeated and count>1 runs
+    see the same sequence of answers.
+
+    - record: every call goes to the model; answers are written to the
+      cassette, which starts empty.
+    - replay: recorded answers are served; unrecorded prompts go to the
+      model and are added to the cassette.
+    - strict: recorded answers are served; unrecorded prompts raise
+      UnrecordedPrompt.
+
+    Replayed answers are delayed by the recorded duration times
+    latency_scale, or by latency_sec when that is set.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "replay",
+        latency_sec: Optional[float] = None,
+        latency_scale: float = 1.0,
+    ):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}; expected one of {', '.join(CASSETTE_MODES)}")
+        self.path = path
+        self.mode = mode
+        self.latency_sec = latency_sec
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, List[Dict[str, Any]]] = {} if mode == "record" else self._load()
+        self._cursor: Dict[str, int] = {}
+        self.replayed = 0
+        self.recorded = 0
+        self.unrecorded = 0
+
+    def key(self, llm: Any, messages: List[Dict[str, Any]]) -> str:
+        return llm_cache_key(
+            model=llm.model,
+            base_url=getattr(llm, "base_url", None) or getattr(llm, "api_base", None),
+            messages=messages,
+            params=sampling_params(llm),
+        )
+
+    def complete(self, llm: Any, messages: List[Dict[str, Any]], send: Callable[[], Any]) -> Any:
+        """The answer for `messages`: replayed (after the simulated latency) or from send()."""
+        key = self.key(llm, messages)
+        entry = self._next(key)
+        if entry is not None:
+            time.sleep(self.delay_for(entry))
+            return entry["content"]
+        started = time.monotonic()
+        content = send()
+        self._record(key, llm, content, time.monotonic() - started)
+        return content
+
+    async def acomplete(self, llm: Any, messages: List[Dict[str, Any]], send: Callable[[], Awaitable[Any]]) -> Any:
+        key = self.key(llm, messages)
+        entry = self._next(key)
+        if entry is not None:
+            await asyncio.sleep(self.delay_for(entry))
+            return entry["content"]
+        started = time.monotonic()
+        content = await send()
+        self._record(key, llm, content, time.monotonic() - started)
+        return content
+
+    def delay_for(self, entry: Dict[str, Any]) -> float:
+        if self.latency_sec is not None:
+            return max(0.0, self.latency_sec)
+        return max(0.0, float(entry.get("elapsed_sec", 0.0)) * self.latency_scale)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "path": self.path,
+                "mode": self.mode,
+                "prompts": len(self._interactions),
+                "recordings": sum(len(v) for v in self._interactions.values()),
+                "replayed": self.replayed,
+                "recorded": self.recorded,
+                "unrecorded": self.unrecorded,
+            }
+
+    def _next(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.mode == "record":
+            return None
+        with self._lock:
+            entries = self._interactions.get(key)
+            if entries:
+                index = self._cursor.get(key, 0)
+                self._cursor[key] = index + 1
+                self.replayed += 1
+                return entries[index % len(entries)]
+            self.unrecorded += 1
+        if self.mode == "strict":
+            raise UnrecordedPrompt(f"No recording in {self.path} for LLM prompt {key[:12]}")
+        return None
+
+    def _record(self, key: str, llm: Any, content: Any, elapsed_sec: float) -> None:
+        if not isinstance(content, str):
+            return
+        with self._lock:
+            self._interactions.setdefault(key, []).append({
+                "model": llm.model,
+                "content": content,
+                "elapsed_sec": round(elapsed_sec, 3),
+            })
+            self.recorded += 1
+            self._save()
+
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        return dict(data.get("interactions") or {})
+
+    def _save(self) -> None:
+        # caller holds self._lock
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "interactions": self._interactions}, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+
+_cassette: Optional[LLMCassette] = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[LLMCassette]:
+    """
+    Process-wide cassette for backends that were not given one, when
+    LLM_CASSETTE names a cassette file. LLM_CASSETTE_MODE (record, replay
+    or strict; default replay), LLM_CASSETTE_LATENCY_SEC (fixed replay delay)
+    and LLM_CASSETTE_LATENCY_SCALE (factor on recorded durations, default 1)
+    configure it.
+    """
+    global _cassette
+    path = os.getenv("LLM_CASSETTE")
+    if not path:
+        return None
+    with _cassette_lock:
+        if _cassette is None or _cassette.path != path:
+            latency = os.getenv("LLM_CASSETTE_LATENCY_SEC")
+            _cassette = LLMCassette(
+                path,
+                mode=os.getenv("LLM_CASSETTE_MODE", "replay"),
+                latency_sec=float(latency) if latency else None,
+                latency_scale=float(os.getenv("LLM_CASSETTE_LATENCY_SCALE", "1")),
+            )
+        return _cassette
+
+
+def cassette_for(llm: Any) -> Optional[LLMCassette]:
+    """The LLM's own cassette, else the process-wide one."""
+    cassette = getattr(llm, "cassette", None)
+    return cassette if isinstance(cassette, LLMCassette) else get_cassette()
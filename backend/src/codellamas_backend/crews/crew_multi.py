@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import os
 from typing import Any, Dict, List, Optional, Type
 
 from pydantic import BaseModel, Field
-from crewai import Agent, Crew, Process, Task, LLM
+from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, task, crew
 from crewai.tools import BaseTool
 
-from codellamas_backend.runtime.verifier import MavenVerifier
+from codellamas_backend.crews.async_kickoff import kickoff_async
+from codellamas_backend.crews.cassette import LLMCassette
+from codellamas_backend.crews.llm_cache import CachedLLM
+from codellamas_backend.runtime.verifier import MavenVerifier, compile_preflight_enabled
 from codellamas_backend.schemas.files import ProjectFile
 
 
@@ -38,6 +42,8 @@ class VerifyToolOutput(BaseModel):
     failed_tests: List[str] = Field(default_factory=list)
     errors: List[str] = Field(default_factory=list)
     raw_log_head: str = ""
+    phase: str = "test"
+    diagnostics: List[Dict[str, Any]] = Field(default_factory=list)
 
 
 class MavenVerifyTool(BaseTool):
@@ -102,17 +108,25 @@ class CodellamasBackendMulti:
     maven_timeout_sec: int = 180
     max_patch_iters: int = 2
 
-    def __init__(self, model_name: str = None, api_endpoint: str = None, api_key: str = None):
+    def __init__(
+        self,
+        model_name: str = None,
+        api_endpoint: str = None,
+        api_key: str = None,
+        cassette: LLMCassette | str | None = None,
+    ):
         self.model_name = model_name or MODEL
         self.api_endpoint = api_endpoint or BASE_URL
         self.api_key = api_key or OPENROUTER_API_KEY
-        self.llm = LLM(
+        self.llm = CachedLLM(
             model=self.model_name,
             base_url=self.api_endpoint,
             api_key=self.api_key,
             request_timeout=self.request_timeout_sec,
             max_tokens=30000,
         )
+        # record/replay instead of (or on top of) the model; a path replays that cassette
+        self.llm.cassette = LLMCassette(cassette) if isinstance(cassette, str) else cassette
         self.verify_tool = MavenVerifyTool()
 
     def _to_project_files(self, items: Optional[List[Any]]) -> List[ProjectFile]:
@@ -136,16 +150,27 @@ class CodellamasBackendMulti:
         override_project_files: List[ProjectFile],
         injected_tests: List[ProjectFile],
     ) -> VerifyToolOutput:
-        verification = MavenVerifier(timeout_sec=self.maven_timeout_sec, quiet=True).verify(
-            base_project=base_project_files,
-            override_files=override_project_files,
-            injected_tests={t.path: t.content for t in injected_tests},
-        )
+        verifier = MavenVerifier(timeout_sec=self.maven_timeout_sec, quiet=True)
+        tests = {t.path: t.content for t in injected_tests}
+        verification = None
+        if compile_preflight_enabled():
+            # a compile failure needs no test run to be sent back for patching
+            compiled = verifier.verify_compile(base_project_files, override_project_files, tests)
+            if compiled.status == "FAIL":
+                verification = compiled
+        if verification is None:
+            verification = verifier.verify(
+                base_project=base_project_files,
+                override_files=override_project_files,
+                injected_tests=tests,
+            )
         return VerifyToolOutput(
             status=verification.status,
             failed_tests=verification.failed_tests,
             errors=verification.errors,
             raw_log_head=verification.summary()[:2000],
+            phase=verification.phase,
+            diagnostics=verification.diagnostics,
         )
 
     def _merge_exercise(
@@ -177,6 +202,15 @@ class CodellamasBackendMulti:
             verbose=True,
         ).kickoff(inputs=inputs)
 
+    async def _run_single_task_crew_async(self, task_obj: Task, agent_obj: Agent, inputs: Dict[str, Any]) -> Any:
+        crew = Crew(
+            agents=[agent_obj],
+            tasks=[task_obj],
+            process=Process.sequential,
+            verbose=True,
+        )
+        return await kickoff_async(crew, inputs)
+
     def _build_reference_override_files(
         self,
         *,
@@ -322,7 +356,7 @@ class CodellamasBackendMulti:
             verbose=True,
         )
 
-    def generate_with_fix_loop(
+    async def generate_with_fix_loop_async(
         self,
         *,
         topic: str,
@@ -330,6 +364,11 @@ class CodellamasBackendMulti:
         existing_codebase: str,
         project_files: List[Any],
     ) -> tuple[SpringBootExercise, Dict[str, Any]]:
+        """
+        Generates an exercise and fixes it until it verifies. Crews go
+        through kickoff_async (awaited LLM calls with CREW_ASYNC=1) and the
+        Maven verifications run on worker threads.
+        """
         base_project_files = self._to_project_files(project_files)
 
         meta: Dict[str, Any] = {
@@ -341,17 +380,19 @@ class CodellamasBackendMulti:
             "reference_maven": None,
         }
 
-        initial_result = Crew(
+        initial_crew = Crew(
             agents=[self.problem_architect(), self.test_engineer(), self.smelly_developer()],
             tasks=[self.define_problem(), self.define_tests(), self.implement_smelly_code()],
             process=Process.sequential,
             verbose=True,
-        ).kickoff(
-            inputs={
+        )
+        initial_result = await kickoff_async(
+            initial_crew,
+            {
                 "topic": topic,
                 "code_smells": code_smells,
                 "existing_codebase": existing_codebase,
-            }
+            },
         )
 
         exercise = self._exercise_from_result(initial_result)
@@ -359,7 +400,8 @@ class CodellamasBackendMulti:
         for i in range(1, self.max_patch_iters + 1):
             meta["smelly_iterations"] = i
 
-            verification = self._verify(
+            verification = await asyncio.to_thread(
+                self._verify,
                 base_project_files=base_project_files,
                 override_project_files=exercise.project_files,
                 injected_tests=exercise.test_files,
@@ -369,7 +411,7 @@ class CodellamasBackendMulti:
             if verification.status == "PASS":
                 break
 
-            patched_result = self._run_single_task_crew(
+            patched_result = await self._run_single_task_crew_async(
                 self.patch_smelly_code(),
                 self.debug_specialist(),
                 inputs={
@@ -383,7 +425,7 @@ class CodellamasBackendMulti:
             patched_exercise = self._exercise_from_result(patched_result)
             exercise = self._merge_exercise(exercise, patched_exercise, prefer_updated_answers=False)
 
-        ref_result = self._run_single_task_crew(
+        ref_result = await self._run_single_task_crew_async(
             self.generate_answers_list(),
             self.answers_list_developer(),
             inputs={
@@ -404,7 +446,8 @@ class CodellamasBackendMulti:
                 paths_to_ex=exercise.paths_to_ex,
             )
 
-            verification = self._verify(
+            verification = await asyncio.to_thread(
+                self._verify,
                 base_project_files=base_project_files,
                 override_project_files=reference_override_files,
                 injected_tests=exercise.test_files,
@@ -414,7 +457,7 @@ class CodellamasBackendMulti:
             if verification.status == "PASS":
                 break
 
-            patched_result = self._run_single_task_crew(
+            patched_result = await self._run_single_task_crew_async(
                 self.patch_answers_list(),
                 self.debug_specialist(),
                 inputs={
@@ -428,7 +471,7 @@ class CodellamasBackendMulti:
             patched_exercise = self._exercise_from_result(patched_result)
             exercise = self._merge_exercise(exercise, patched_exercise)
 
-        audited_result = self._run_single_task_crew(
+        audited_result = await self._run_single_task_crew_async(
             self.audit_exercise(),
             self.quality_assurance(),
             inputs={
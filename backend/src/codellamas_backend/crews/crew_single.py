@@ -1,10 +1,12 @@
 import os
 from typing import List
 
-from crewai import Agent, Crew, Process, Task, LLM
+from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from pydantic import BaseModel
 
+from codellamas_backend.crews.cassette import LLMCassette
+from codellamas_backend.crews.llm_cache import CachedLLM
 from codellamas_backend.schemas.files import ProjectFile
 
 
@@ -44,17 +46,20 @@ class CodellamasBackend:
         model_name: str | None = None,
         api_endpoint: str | None = None,
         api_key: str | None = None,
+        cassette: LLMCassette | str | None = None,
     ):
         self.model_name = model_name or MODEL
         self.api_endpoint = api_endpoint or BASE_URL
         self.api_key = api_key or OPENROUTER_API_KEY
-        self.llm = LLM(
+        self.llm = CachedLLM(
             model=self.model_name,
             base_url=self.api_endpoint,
             api_key=self.api_key,
             request_timeout=1800,
             max_tokens=24000,
         )
+        # record/replay instead of (or on top of) the model; a path replays that cassette
+        self.llm.cassette = LLMCassette(cassette) if isinstance(cassette, str) else cassette
 
     @agent
     def general_agent(self) -> Agent:
@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from crewai import LLM
+
+from codellamas_backend.runtime.cache import JsonFileStore
+
+
+# Request parameters that change what the model may answer; part of every key.
+SAMPLING_PARAMS = (
+    "temperature",
+    "top_p",
+    "n",
+    "stop",
+    "max_tokens",
+    "max_completion_tokens",
+    "presence_penalty",
+    "frequency_penalty",
+    "seed",
+    "response_format",
+    "reasoning_effort",
+)
+
+
+def llm_cache_key(
+    model: str,
+    base_url: Optional[str],
+    messages: List[Dict[str, Any]],
+    params: Optional[Dict[str, Any]] = None,
+    variant: str = "",
+) -> str:
+    """
+    Exact-match key of one completion: model, endpoint, a hash of the fully
+    rendered messages, the sampling parameters, and the scope's variant (so
+    the samples of a count>1 request stay distinct).
+    """
+    messages_hash = hashlib.sha256(
+        json.dumps(messages, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    payload = {
+        "model": model,
+        "base_url": (base_url or "").rstrip("/"),
+        "messages": messages_hash,
+        "params": {k: v for k, v in sorted((params or {}).items()) if v is not None},
+        "variant": variant,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def sampling_params(llm: Any) -> Dict[str, Any]:
+    params = {name: getattr(llm, name, None) for name in SAMPLING_PARAMS}
+    params.update({k: v for k, v in (getattr(llm, "additional_params", None) or {}).items() if k in SAMPLING_PARAMS})
+    return {k: v for k, v in params.items() if v is not None and v != []}
+
+
+class LLMResponseCache:
+    """
+    Completed LLM answers keyed by llm_cache_key: an in-memory LRU in front of
+    a JsonFileStore that survives restarts. Entries older than ttl_sec are
+    dropped when read.
+    """
+
+    def __init__(
+        self,
+        disk_dir: Optional[str] = None,
+        max_memory_entries: int = 256,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        ttl_sec: float = 7 * 24 * 3600,
+    ):
+        self.disk_dir = disk_dir
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_sec = ttl_sec
+
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = JsonFileStore(disk_dir, max_disk_bytes) if disk_dir else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and not self._is_expired(entry, now):
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry["content"]
+
+        entry = self._read_disk(key)
+        if entry is not None and self._is_expired(entry, now):
+            self.delete(key)
+            with self._lock:
+                self.expired += 1
+            entry = None
+        with self._lock:
+            if entry is None:
+                self._memory.pop(key, None)
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, entry)
+        return entry["content"]
+
+    def put(self, key: str, content: str, model: str = "") -> None:
+        entry = {"content": content, "model": model, "created_at": time.time()}
+        with self._lock:
+            self._remember(key, entry)
+        if self._disk is not None:
+            self._disk.write(key, entry)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+        if self._disk is not None:
+            self._disk.delete(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self.memory_hits = self.disk_hits = self.misses = self.expired = self.evictions = 0
+        if self._disk is not None:
+            self._disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        disk_bytes = self._disk.bytes if self._disk is not None else 0
+        disk_evictions = self._disk.evictions if self._disk is not None else 0
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "enabled": True,
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "hits": hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "expired": self.expired,
+                "evictions": self.evictions + disk_evictions,
+                "ttl_sec": self.ttl_sec,
+                "disk_bytes": disk_bytes,
+            }
+
+    def _is_expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return bool(self.ttl_sec) and now - entry.get("created_at", 0) > self.ttl_sec
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        # reading bumps the file's recency for trimming; created_at keeps the age
+        entry = self._disk.read(key) if self._disk is not None else None
+        return entry if isinstance(entry, dict) and isinstance(entry.get("content"), str) else None
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Process-wide LLM response cache. Disabled with LLM_CACHE=0; LLM_CACHE_DIR
+    (default: codellamas_llm_cache in the temp dir), LLM_CACHE_DISK_MB
+    (default 256), LLM_CACHE_MEMORY_ENTRIES (default 256) and
+    LLM_CACHE_TTL_SEC (default 7 days) configure it.
+    """
+    global _cache
+    if os.getenv("LLM_CACHE", "1") == "0":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache(
+                disk_dir=os.getenv("LLM_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "codellamas_llm_cache"),
+                max_memory_entries=int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256")),
+                max_disk_bytes=int(os.getenv("LLM_CACHE_DISK_MB", "256")) * 1024 * 1024,
+                ttl_sec=float(os.getenv("LLM_CACHE_TTL_SEC", str(7 * 24 * 3600))),
+            )
+        return _cache
+
+
+@dataclass
+class LLMCacheScope:
+    """
+    Per-request view of the cache: whether the request uses it, the variant
+    mixed into its keys, its own hit counts for the response meta, and the
+    keys it wrote, so a failed attempt can take its answers back out.
+    """
+
+    enabled: bool = True
+    variant: str = ""
+    hits: int = 0
+    misses: int = 0
+    written: List[str] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def wrote(self, key: str) -> None:
+        with self._lock:
+            self.written.append(key)
+
+    def forget(self) -> None:
+        """Drops what this scope stored, so a retry does not replay an answer that failed."""
+        cache = get_llm_cache()
+        with self._lock:
+            keys, self.written = self.written, []
+        if cache is not None:
+            for key in keys:
+                cache.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled and get_llm_cache() is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_scope: "contextvars.ContextVar[Optional[LLMCacheScope]]" = contextvars.ContextVar("llm_cache_scope", default=None)
+
+
+@contextmanager
+def llm_cache_scope(enabled: bool = True, variant: str = "") -> Iterator[LLMCacheScope]:
+    """
+    Scopes the LLM calls of one request. Context variables follow the work
+    into asyncio tasks and asyncio.to_thread, so calls made by crewAI on a
+    worker thread are counted too.
+    """
+    scope = LLMCacheScope(enabled=enabled, variant=variant)
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+
+def current_llm_cache_scope() -> Optional[LLMCacheScope]:
+    return _scope.get()
+
+
+def cached_response(llm: Any, messages: List[Dict[str, Any]]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    (key, cached answer) for a completion about to be sent. The key is None
+    when caching is off for this call, the answer None on a miss.
+    """
+    cache = get_llm_cache()
+    scope = current_llm_cache_scope()
+    if cache is None or (scope is not None and not scope.enabled):
+        return None, None
+    key = llm_cache_key(
+        model=llm.model,
+        base_url=getattr(llm, "base_url", None) or getattr(llm, "api_base", None),
+        messages=messages,
+        params=sampling_params(llm),
+        variant=scope.variant if scope is not None else "",
+    )
+    content = cache.get(key)
+    if scope is not None:
+        scope.record(content is not None)
+    return key, content
+
+
+def remember_response(key: Optional[str], content: Any, model: str = "") -> None:
+    cache = get_llm_cache()
+    if key is None or cache is None or not isinstance(content, str) or not content.strip():
+        return
+    cache.put(key, content, model=model)
+    scope = current_llm_cache_scope()
+    if scope is not None:
+        scope.wrote(key)
+
+
+class CachedLLM(LLM):
+    """
+    crewAI LLM whose plain chat completions go through the LLM response
+    cache, and on a miss through its cassette (`cassette` attribute, else
+    LLM_CASSETTE) when there is one. Calls that offer tools for native
+    function calling bypass both: their answer may execute a tool.
+    """
+
+    cassette = None
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        if tools or available_functions:
+            return super().call(
+                messages, tools=tools, callbacks=callbacks, available_functions=available_functions, **kwargs
+            )
+        from codellamas_backend.crews.cassette import cassette_for  # the cassette keys through this module
+
+        rendered = [{"role": "user", "content": messages}] if isinstance(messages, str) else messages
+        key, content = cached_response(self, rendered)
+        if content is not None:
+            return content
+
+        def send():
+            return super(CachedLLM, self).call(messages, callbacks=callbacks, **kwargs)
+
+        cassette = cassette_for(self)
+        content = cassette.complete(self, rendered, send) if cassette is not None else send()
+        remember_response(key, content, model=self.model)
+        return content
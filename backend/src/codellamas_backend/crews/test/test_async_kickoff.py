@@ -0,0 +1,168 @@
+import asyncio
+import json
+import os
+import threading
+import time
+
+import pytest
+from crewai import LLM, Agent, Crew, Process, Task
+from crewai.tools import tool
+from pydantic import BaseModel
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from codellamas_backend.crews.async_kickoff import AsyncCrewOutput, _parse_json, kickoff_async
+
+
+@pytest.fixture(autouse=True)
+def native_async():
+    # every test here must reach the (mocked) completion
+    with patch.dict(os.environ, {"LLM_CACHE": "0", "CREW_ASYNC": "1"}):
+        yield
+
+
+class Answer(BaseModel):
+    title: str
+    score: int
+
+
+def completion(content: str) -> MagicMock:
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    return response
+
+
+def make_agent(role="Reviewer for {topic}", tools=None) -> Agent:
+    llm = LLM(model="openrouter/test/model", base_url="http://llm.local", api_key="k", max_tokens=100)
+    return Agent(role=role, goal="Grade {topic}", backstory="You grade.", llm=llm, tools=tools or [])
+
+
+def make_crew(*tasks: Task, agents=None) -> Crew:
+    return Crew(agents=agents or [tasks[0].agent], tasks=list(tasks), process=Process.sequential)
+
+
+# ─────────────────────────────────────────────
+# Native sequential path
+# ─────────────────────────────────────────────
+
+class TestNativeKickoff:
+    def test_single_task_with_output_json(self):
+        agent = make_agent()
+        task = Task(description="Grade the {topic} exercise", expected_output="JSON", agent=agent, output_json=Answer)
+        acompletion = AsyncMock(return_value=completion('```json\n{"title": "ok", "score": 4}\n```'))
+
+        with patch("codellamas_backend.crews.async_kickoff.litellm.acompletion", acompletion):
+            result = asyncio.run(kickoff_async(make_crew(task), {"topic": "refactoring"}))
+
+        assert isinstance(result, AsyncCrewOutput)
+        assert result.json_dict == {"title": "ok", "score": 4}
+        kwargs = acompletion.call_args[1]
+        assert kwargs["model"] == "openrouter/test/model"
+        assert kwargs["base_url"] == "http://llm.local"
+        assert kwargs["max_tokens"] == 100
+        system, user = kwargs["messages"]
+        assert "Reviewer for refactoring" in system["content"]
+        assert "Grade the refactoring exercise" in user["content"]
+        assert '"score"' in user["content"]  # the output schema
+
+    def test_later_tasks_get_earlier_output_as_context(self):
+        agent = make_agent()
+        first = Task(description="Outline {topic}", expected_output="text", agent=agent)
+        second = Task(description="Write {topic}", expected_output="text", agent=agent)
+        acompletion = AsyncMock(side_effect=[completion("OUTLINE"), completion("FINAL")])
+
+        with patch("codellamas_backend.crews.async_kickoff.litellm.acompletion", acompletion):
+            result = asyncio.run(kickoff_async(make_crew(first, second), {"topic": "x"}))
+
+        assert str(result) == "FINAL"
+        assert result.tasks_output == ["OUTLINE", "FINAL"]
+        assert "OUTLINE" in acompletion.call_args_list[1][1]["messages"][1]["content"]
+
+    def test_concurrent_kickoffs_do_not_need_threads(self):
+        async def slow(**kwargs):
+            await asyncio.sleep(0.2)
+            return completion("done")
+
+        async def many():
+            crews = [
+                make_crew(Task(description="d", expected_output="e", agent=make_agent()))
+                for _ in range(40)
+            ]
+            before = threading.active_count()
+            started = time.monotonic()
+            results = await asyncio.gather(*(kickoff_async(crew, {"topic": "t"}) for crew in crews))
+            return results, time.monotonic() - started, threading.active_count() - before
+
+        with patch("codellamas_backend.crews.async_kickoff.litellm.acompletion", side_effect=slow):
+            results, elapsed, extra_threads = asyncio.run(many())
+
+        assert [str(r) for r in results] == ["done"] * 40
+        assert elapsed < 2.0
+        assert extra_threads == 0
+
+
+# ─────────────────────────────────────────────
+# Fallbacks
+# ─────────────────────────────────────────────
+
+class TestKickoffFallbacks:
+    def test_non_crew_runs_kickoff_on_a_thread(self):
+        crew = MagicMock()
+        crew.kickoff.return_value = "result"
+        assert asyncio.run(kickoff_async(crew, {"a": 1})) == "result"
+        crew.kickoff.assert_called_once_with(inputs={"a": 1})
+
+    def test_native_async_kickoff_preferred(self):
+        crew = MagicMock()
+        crew.akickoff = AsyncMock(return_value="async result")
+        assert asyncio.run(kickoff_async(crew, {"a": 1})) == "async result"
+        crew.kickoff.assert_not_called()
+
+    def test_agents_with_tools_use_crewai(self):
+        @tool("lookup")
+        def lookup(query: str) -> str:
+            """Looks something up."""
+            return query
+
+        task = Task(description="d", expected_output="e", agent=make_agent(tools=[lookup]))
+        crew = make_crew(task)
+        with patch.object(Crew, "kickoff", return_value="threaded") as mock_kickoff, \
+             patch("codellamas_backend.crews.async_kickoff.litellm.acompletion") as acompletion:
+            assert asyncio.run(kickoff_async(crew, {})) == "threaded"
+        mock_kickoff.assert_called_once()
+        acompletion.assert_not_called()
+
+    def test_disabled_by_env(self):
+        crew = make_crew(Task(description="d", expected_output="e", agent=make_agent()))
+        with patch.dict(os.environ, {"CREW_ASYNC": "0"}), \
+             patch.object(Crew, "kickoff", return_value="threaded"), \
+             patch("codellamas_backend.crews.async_kickoff.litellm.acompletion") as acompletion:
+            assert asyncio.run(kickoff_async(crew, {})) == "threaded"
+        acompletion.assert_not_called()
+
+    def test_off_by_default(self):
+        crew = make_crew(Task(description="d", expected_output="e", agent=make_agent()))
+        with patch.dict(os.environ), \
+             patch.object(Crew, "kickoff", return_value="threaded"), \
+             patch("codellamas_backend.crews.async_kickoff.litellm.acompletion") as acompletion:
+            os.environ.pop("CREW_ASYNC")
+            assert asyncio.run(kickoff_async(crew, {})) == "threaded"
+        acompletion.assert_not_called()
+
+
+# ─────────────────────────────────────────────
+# JSON answers
+# ─────────────────────────────────────────────
+
+class TestParseJson:
+    def test_final_answer_prefix_and_surrounding_text(self):
+        text = 'Thought: done\nFinal Answer: Here it is {"title": "t", "score": 1} hope it helps'
+        assert _parse_json(text, Answer) == {"title": "t", "score": 1}
+
+    def test_no_json_raises(self):
+        with pytest.raises(ValueError, match="JSON object"):
+            _parse_json("no json here", Answer)
+
+    def test_schema_mismatch_raises(self):
+        with pytest.raises(ValueError, match="schema"):
+            _parse_json(json.dumps({"title": "t"}), Answer)
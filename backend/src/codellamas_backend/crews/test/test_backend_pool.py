@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+
+from unittest.mock import MagicMock, patch
+
+import codellamas_backend.crews.backend_pool as pool_module
+from codellamas_backend.crews.backend_pool import BackendPool, api_key_hash, get_backend_pool
+
+
+class Backend:
+    pass
+
+
+# ─────────────────────────────────────────────
+# Checkout and release
+# ─────────────────────────────────────────────
+
+class TestBackendPool:
+    def test_released_backend_is_reused(self):
+        pool = BackendPool()
+        factory = MagicMock(side_effect=Backend)
+        first = pool.checkout("k", factory)
+        assert pool.release(first) is True
+        assert pool.checkout("k", factory) is first
+        factory.assert_called_once()
+        stats = pool.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["leased"] == 1
+
+    def test_checked_out_backend_is_exclusive(self):
+        pool = BackendPool()
+        first = pool.checkout("k", Backend)
+        second = pool.checkout("k", Backend)
+        assert first is not second
+
+    def test_keys_do_not_share(self):
+        pool = BackendPool()
+        backend = pool.checkout("a", Backend)
+        pool.release(backend)
+        assert pool.checkout("b", Backend) is not backend
+
+    def test_release_of_unknown_backend_is_ignored(self):
+        pool = BackendPool()
+        assert pool.release(Backend()) is False
+        assert pool.stats()["idle"] == 0
+
+    def test_discarded_backend_is_not_kept(self):
+        pool = BackendPool()
+        backend = pool.checkout("k", Backend)
+        pool.discard(backend)
+        assert pool.release(backend) is False
+
+    def test_idle_bounds(self):
+        pool = BackendPool(max_idle=3, max_idle_per_key=2)
+        per_key = [pool.checkout("a", Backend) for _ in range(3)]
+        for backend in per_key:
+            pool.release(backend)
+        assert pool.stats()["idle"] == 2
+
+        others = [pool.checkout(key, Backend) for key in ("b", "c")]
+        for backend in others:
+            pool.release(backend)
+        stats = pool.stats()
+        assert stats["idle"] == 3
+        assert stats["evicted"] == 2
+
+    def test_idle_ttl_evicts(self):
+        pool = BackendPool(idle_ttl_sec=0.01)
+        pool.release(pool.checkout("k", Backend))
+        time.sleep(0.02)
+        assert pool.evict_idle() == 1
+        assert pool.stats()["idle"] == 0
+
+    def test_concurrent_checkouts_never_share(self):
+        pool = BackendPool()
+        seen = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(50):
+                backend = pool.checkout("k", Backend)
+                with lock:
+                    assert backend not in seen
+                    seen.append(backend)
+                with lock:
+                    seen.remove(backend)
+                pool.release(backend)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        assert pool.stats()["leased"] == 0
+        assert pool.stats()["idle"] <= 8
+
+    def test_api_key_hash_hides_key(self):
+        assert "secret" not in api_key_hash("secret")
+        assert api_key_hash("a") != api_key_hash("b")
+        assert api_key_hash(None) == api_key_hash("")
+
+
+# ─────────────────────────────────────────────
+# Process-wide instance
+# ─────────────────────────────────────────────
+
+class TestGetBackendPool:
+    def test_disabled(self):
+        with patch.dict(os.environ, {"BACKEND_POOL": "0"}):
+            assert get_backend_pool() is None
+
+    def test_singleton_reads_env(self):
+        env = {"BACKEND_POOL": "1", "BACKEND_POOL_MAX_IDLE": "4", "BACKEND_POOL_IDLE_SEC": "30"}
+        with patch.dict(os.environ, env), patch.object(pool_module, "_pool", None):
+            pool = get_backend_pool()
+            assert pool is get_backend_pool()
+            assert pool.max_idle == 4
+            assert pool.idle_ttl_sec == 30
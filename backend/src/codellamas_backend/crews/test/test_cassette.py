@@ -0,0 +1,176 @@
+import asyncio
+import json
+import os
+import tempfile
+
+import pytest
+from crewai import LLM
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import codellamas_backend.crews.cassette as cassette_module
+from codellamas_backend.crews.cassette import LLMCassette, UnrecordedPrompt, cassette_for, get_cassette
+from codellamas_backend.crews.crew_multi import CodellamasBackendMulti
+from codellamas_backend.crews.crew_single import CodellamasBackend
+from codellamas_backend.crews.llm_cache import CachedLLM
+
+
+MESSAGES = [{"role": "user", "content": "Write a contract."}]
+
+CONTRACT = {
+    "problem_description": "Refactor the order service",
+    "test_files": [{
+        "path": "src/test/java/com/example/OrderTest.java",
+        "content": "package com.example;\nclass OrderTest {}",
+    }],
+    "paths_to_ex": ["src/main/java/com/example/Order.java"],
+}
+
+
+@pytest.fixture(autouse=True)
+def no_llm_cache():
+    with patch.dict(os.environ, {"LLM_CACHE": "0", "CREW_ASYNC": "1"}):
+        yield
+
+
+@pytest.fixture
+def path():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield os.path.join(tmpdir, "cassettes", "run.json")
+
+
+def make_llm() -> CachedLLM:
+    return CachedLLM(model="openrouter/test/model", base_url="http://llm.local", api_key="k")
+
+
+def completion(content: str) -> MagicMock:
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    return response
+
+
+# ─────────────────────────────────────────────
+# LLMCassette
+# ─────────────────────────────────────────────
+
+class TestLLMCassette:
+    def test_record_then_replay(self, path):
+        recorder = LLMCassette(path, mode="record")
+        assert recorder.complete(make_llm(), MESSAGES, lambda: "answer") == "answer"
+
+        player = LLMCassette(path, mode="strict", latency_sec=0)
+        assert player.complete(make_llm(), MESSAGES, MagicMock(side_effect=AssertionError)) == "answer"
+        assert player.stats()["replayed"] == 1
+
+    def test_recordings_replayed_in_order_then_cycled(self, path):
+        recorder = LLMCassette(path, mode="record")
+        for answer in ("first", "second"):
+            recorder.complete(make_llm(), MESSAGES, lambda answer=answer: answer)
+
+        player = LLMCassette(path, mode="strict", latency_sec=0)
+        answers = [player.complete(make_llm(), MESSAGES, MagicMock()) for _ in range(3)]
+        assert answers == ["first", "second", "first"]
+
+    def test_record_mode_starts_empty(self, path):
+        LLMCassette(path, mode="record").complete(make_llm(), MESSAGES, lambda: "old")
+        LLMCassette(path, mode="record").complete(make_llm(), MESSAGES, lambda: "new")
+        with open(path, encoding="utf-8") as f:
+            interactions = json.load(f)["interactions"]
+        assert [e["content"] for entries in interactions.values() for e in entries] == ["new"]
+
+    def test_strict_raises_on_unrecorded_prompt(self, path):
+        player = LLMCassette(path, mode="strict")
+        with pytest.raises(UnrecordedPrompt):
+            player.complete(make_llm(), MESSAGES, lambda: "live")
+        assert player.stats()["unrecorded"] == 1
+
+    def test_replay_records_unrecorded_prompts(self, path):
+        player = LLMCassette(path, mode="replay", latency_sec=0)
+        assert player.complete(make_llm(), MESSAGES, lambda: "live") == "live"
+        assert LLMCassette(path, mode="strict", latency_sec=0).complete(make_llm(), MESSAGES, MagicMock()) == "live"
+
+    def test_prompt_and_model_are_part_of_the_key(self, path):
+        LLMCassette(path, mode="record").complete(make_llm(), MESSAGES, lambda: "answer")
+        player = LLMCassette(path, mode="strict")
+        other_model = CachedLLM(model="openrouter/other", base_url="http://llm.local", api_key="k")
+        with pytest.raises(UnrecordedPrompt):
+            player.complete(other_model, MESSAGES, MagicMock())
+        with pytest.raises(UnrecordedPrompt):
+            player.complete(make_llm(), [{"role": "user", "content": "other"}], MagicMock())
+
+    @pytest.mark.parametrize("latency_sec, latency_scale, expected", [
+        (None, 1.0, 2.0),
+        (None, 0.5, 1.0),
+        (0.25, 1.0, 0.25),
+    ])
+    def test_simulated_latency(self, path, latency_sec, latency_scale, expected):
+        player = LLMCassette(path, latency_sec=latency_sec, latency_scale=latency_scale)
+        assert player.delay_for({"elapsed_sec": 2.0}) == expected
+
+    def test_replay_sleeps_for_the_delay(self, path):
+        LLMCassette(path, mode="record").complete(make_llm(), MESSAGES, lambda: "answer")
+        player = LLMCassette(path, mode="strict", latency_sec=0.5)
+        with patch("codellamas_backend.crews.cassette.time.sleep") as mock_sleep:
+            player.complete(make_llm(), MESSAGES, MagicMock())
+        mock_sleep.assert_called_once_with(0.5)
+
+    def test_unknown_mode_rejected(self, path):
+        with pytest.raises(ValueError):
+            LLMCassette(path, mode="rewind")
+
+    def test_env_cassette(self, path):
+        with patch.object(cassette_module, "_cassette", None), \
+             patch.dict(os.environ, {"LLM_CASSETTE": path, "LLM_CASSETTE_MODE": "strict", "LLM_CASSETTE_LATENCY_SEC": "0"}):
+            cassette = get_cassette()
+            assert cassette is get_cassette()
+            assert cassette.mode == "strict"
+            assert cassette.latency_sec == 0.0
+            assert cassette_for(make_llm()) is cassette
+
+    def test_no_env_no_cassette(self):
+        with patch.dict(os.environ, {"LLM_CASSETTE": ""}):
+            assert get_cassette() is None
+
+
+# ─────────────────────────────────────────────
+# Transports
+# ─────────────────────────────────────────────
+
+class TestCassetteTransports:
+    def test_cached_llm_replays_without_calling_the_model(self, path):
+        llm = make_llm()
+        llm.cassette = LLMCassette(path, mode="record")
+        with patch.object(LLM, "call", return_value="answer"):
+            llm.call(MESSAGES)
+
+        llm.cassette = LLMCassette(path, mode="strict", latency_sec=0)
+        with patch.object(LLM, "call", side_effect=AssertionError("offline")):
+            assert llm.call(MESSAGES) == "answer"
+
+    def test_backends_take_a_cassette(self, path):
+        single = CodellamasBackend(cassette=path)
+        assert isinstance(single.llm.cassette, LLMCassette)
+        assert single.llm.cassette.path == path
+
+        cassette = LLMCassette(path, mode="strict")
+        multi = CodellamasBackendMulti(cassette=cassette)
+        assert multi.llm.cassette is cassette
+
+    def test_contract_generation_runs_offline_from_a_recording(self, path):
+        from codellamas_backend.api import generate_single_contract_async
+
+        inputs = dict(topic="orders", code_smells="Long Method", existing_codebase="NONE")
+        acompletion = AsyncMock(return_value=completion(json.dumps(CONTRACT)))
+        with patch("codellamas_backend.crews.async_kickoff.litellm.acompletion", acompletion):
+            recorded = asyncio.run(generate_single_contract_async(
+                CodellamasBackend(cassette=LLMCassette(path, mode="record")), **inputs
+            ))
+
+        offline = AsyncMock(side_effect=AssertionError("offline"))
+        with patch("codellamas_backend.crews.async_kickoff.litellm.acompletion", offline):
+            replayed = asyncio.run(generate_single_contract_async(
+                CodellamasBackend(cassette=LLMCassette(path, mode="strict", latency_sec=0)), **inputs
+            ))
+
+        assert replayed == recorded
+        offline.assert_not_awaited()
@@ -0,0 +1,229 @@
+import asyncio
+import os
+import tempfile
+import time
+
+import pytest
+from crewai import LLM
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import codellamas_backend.crews.llm_cache as llm_cache_module
+from codellamas_backend.crews.async_kickoff import _complete
+from codellamas_backend.crews.llm_cache import (
+    CachedLLM,
+    LLMResponseCache,
+    cached_response,
+    current_llm_cache_scope,
+    get_llm_cache,
+    llm_cache_key,
+    llm_cache_scope,
+    remember_response,
+    sampling_params,
+)
+
+
+MESSAGES = [{"role": "system", "content": "You grade."}, {"role": "user", "content": "Grade this."}]
+
+
+def make_llm(**kwargs) -> CachedLLM:
+    return CachedLLM(model="openrouter/test/model", base_url="http://llm.local", api_key="k", **kwargs)
+
+
+@pytest.fixture
+def cache():
+    """A fresh process-wide cache in a temp dir for the duration of the test."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fresh = LLMResponseCache(disk_dir=tmpdir)
+        with patch.dict(os.environ, {"LLM_CACHE": "1"}), patch.object(llm_cache_module, "_cache", fresh):
+            yield fresh
+
+
+# ─────────────────────────────────────────────
+# llm_cache_key
+# ─────────────────────────────────────────────
+
+class TestLLMCacheKey:
+    def test_same_inputs_same_key(self):
+        assert llm_cache_key("m", "http://x", MESSAGES, {"temperature": 0}) == llm_cache_key(
+            "m", "http://x/", MESSAGES, {"temperature": 0}
+        )
+
+    @pytest.mark.parametrize("change", [
+        {"model": "other"},
+        {"base_url": "http://y"},
+        {"messages": MESSAGES + [{"role": "user", "content": "more"}]},
+        {"params": {"temperature": 0.7}},
+        {"variant": "sample-1"},
+    ])
+    def test_each_part_changes_key(self, change):
+        base = {"model": "m", "base_url": "http://x", "messages": MESSAGES, "params": {"temperature": 0}}
+        assert llm_cache_key(**base) != llm_cache_key(**{**base, **change})
+
+    def test_unset_params_ignored(self):
+        assert llm_cache_key("m", None, MESSAGES, {"seed": None}) == llm_cache_key("m", None, MESSAGES, {})
+
+    def test_sampling_params_from_llm(self):
+        params = sampling_params(make_llm(max_tokens=100, temperature=0.2, request_timeout=30))
+        assert params == {"max_tokens": 100, "temperature": 0.2}
+
+
+# ─────────────────────────────────────────────
+# LLMResponseCache
+# ─────────────────────────────────────────────
+
+class TestLLMResponseCache:
+    def test_miss_then_hit(self):
+        c = LLMResponseCache()
+        assert c.get("k") is None
+        c.put("k", "answer")
+        assert c.get("k") == "answer"
+        assert c.stats()["hits"] == 1
+        assert c.stats()["misses"] == 1
+
+    def test_memory_lru_eviction(self):
+        c = LLMResponseCache(max_memory_entries=2)
+        c.put("a", "1")
+        c.put("b", "2")
+        c.get("a")
+        c.put("c", "3")
+        assert c.get("b") is None
+        assert c.get("a") == "1"
+
+    def test_survives_new_instance(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            LLMResponseCache(disk_dir=tmpdir).put("k", "answer")
+            reopened = LLMResponseCache(disk_dir=tmpdir)
+            assert reopened.get("k") == "answer"
+            assert reopened.stats()["disk_hits"] == 1
+
+    def test_expired_entries_dropped(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            c = LLMResponseCache(disk_dir=tmpdir, ttl_sec=60)
+            c.put("k", "answer")
+            with patch("codellamas_backend.crews.llm_cache.time.time", return_value=time.time() + 120):
+                assert c.get("k") is None
+            assert c.stats()["expired"] == 1
+            assert c.stats()["disk_bytes"] == 0
+
+    def test_disk_trimmed_least_recently_used_first(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            c = LLMResponseCache(disk_dir=tmpdir, max_disk_bytes=250)
+            c.put("aa1", "x" * 100)
+            old = os.path.join(tmpdir, "aa", "aa1.json")
+            os.utime(old, (time.time() - 100, time.time() - 100))
+            c.put("bb2", "y" * 100)
+            assert not os.path.exists(old)
+            assert LLMResponseCache(disk_dir=tmpdir).get("bb2") == "y" * 100
+
+    def test_delete(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            c = LLMResponseCache(disk_dir=tmpdir)
+            c.put("k", "answer")
+            c.delete("k")
+            assert c.get("k") is None
+
+    def test_disk_bytes_is_a_running_total(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            c = LLMResponseCache(disk_dir=tmpdir)
+            c.put("aa1", "x" * 100)
+            c.put("bb2", "y" * 100)
+            c.delete("aa1")
+            with patch.object(c._disk, "_entries", side_effect=AssertionError("walked")):
+                c.put("bb2", "y" * 100)
+                assert c.stats()["disk_bytes"] == os.path.getsize(os.path.join(tmpdir, "bb", "bb2.json"))
+
+    def test_disabled_by_env(self):
+        with patch.dict(os.environ, {"LLM_CACHE": "0"}):
+            assert get_llm_cache() is None
+
+    def test_singleton(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(llm_cache_module, "_cache", None), \
+                 patch.dict(os.environ, {"LLM_CACHE_DIR": tmpdir, "LLM_CACHE_TTL_SEC": "30"}):
+                assert get_llm_cache() is get_llm_cache()
+                assert get_llm_cache().ttl_sec == 30
+                assert get_llm_cache().disk_dir == tmpdir
+
+
+# ─────────────────────────────────────────────
+# Request scopes
+# ─────────────────────────────────────────────
+
+class TestLLMCacheScope:
+    def test_counts_hits_and_misses(self, cache):
+        llm = make_llm()
+        with llm_cache_scope() as scope:
+            key, content = cached_response(llm, MESSAGES)
+            assert content is None
+            remember_response(key, "answer")
+            assert cached_response(llm, MESSAGES) == (key, "answer")
+        assert scope.stats() == {"enabled": True, "hits": 1, "misses": 1, "hit_rate": 0.5}
+        assert current_llm_cache_scope() is None
+
+    def test_opt_out_neither_reads_nor_writes(self, cache):
+        llm = make_llm()
+        key, _ = cached_response(llm, MESSAGES)
+        remember_response(key, "answer")
+        with llm_cache_scope(enabled=False) as scope:
+            assert cached_response(llm, MESSAGES) == (None, None)
+        assert scope.stats()["enabled"] is False
+        assert scope.stats()["hits"] == 0
+
+    def test_variants_do_not_share_answers(self, cache):
+        llm = make_llm()
+        with llm_cache_scope(variant="sample-1"):
+            key, _ = cached_response(llm, MESSAGES)
+            remember_response(key, "first sample")
+        with llm_cache_scope():
+            assert cached_response(llm, MESSAGES)[1] is None
+
+    def test_forget_removes_what_the_scope_wrote(self, cache):
+        llm = make_llm()
+        with llm_cache_scope() as scope:
+            key, _ = cached_response(llm, MESSAGES)
+            remember_response(key, "bad answer")
+            scope.forget()
+            assert cached_response(llm, MESSAGES)[1] is None
+
+    def test_blank_answers_not_stored(self, cache):
+        key, _ = cached_response(make_llm(), MESSAGES)
+        remember_response(key, "  ")
+        assert cache.get(key) is None
+
+    def test_scope_follows_to_thread(self, cache):
+        async def run():
+            with llm_cache_scope() as scope:
+                await asyncio.to_thread(cached_response, make_llm(), MESSAGES)
+            return scope
+
+        assert asyncio.run(run()).misses == 1
+
+
+# ─────────────────────────────────────────────
+# Cached calls
+# ─────────────────────────────────────────────
+
+class TestCachedCalls:
+    def test_cached_llm_skips_second_call(self, cache):
+        llm = make_llm()
+        with patch.object(LLM, "call", return_value="answer") as mock_call:
+            assert llm.call(MESSAGES) == "answer"
+            assert llm.call(MESSAGES) == "answer"
+        mock_call.assert_called_once()
+
+    def test_cached_llm_does_not_cache_tool_calls(self, cache):
+        llm = make_llm()
+        with patch.object(LLM, "call", return_value="answer") as mock_call:
+            llm.call(MESSAGES, tools=[{"name": "verify"}], available_functions={"verify": MagicMock()})
+            llm.call(MESSAGES, tools=[{"name": "verify"}], available_functions={"verify": MagicMock()})
+        assert mock_call.call_count == 2
+
+    def test_async_completion_uses_cache(self, cache):
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = "answer"
+        acompletion = AsyncMock(return_value=response)
+        with patch("codellamas_backend.crews.async_kickoff.litellm.acompletion", acompletion):
+            assert asyncio.run(_complete(make_llm(), MESSAGES)) == "answer"
+            assert asyncio.run(_complete(make_llm(), MESSAGES)) == "answer"
+        acompletion.assert_awaited_once()
@@ -1,6 +1,7 @@
+import asyncio
 import pytest
 import json
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from pydantic import ValidationError
 from crewai import Process, Agent
 
@@ -52,7 +53,7 @@ def patch_test_runner():
 
 
 def make_backend(**kwargs) -> CodellamasBackendMulti:
-    with patch("codellamas_backend.crews.crew_multi.LLM"):
+    with patch("codellamas_backend.crews.crew_multi.CachedLLM"):
         with patch("codellamas_backend.crews.crew_multi.MavenVerifyTool"):
             with patch_test_runner():
                 return CodellamasBackendMulti(**kwargs)
@@ -286,21 +287,21 @@ class TestMavenVerifyToolRun:
 
 class TestCodellamasBackendMultiInit:
     def test_custom_model_stored(self):
-        with patch("codellamas_backend.crews.crew_multi.LLM"):
+        with patch("codellamas_backend.crews.crew_multi.CachedLLM"):
             with patch("codellamas_backend.crews.crew_multi.MavenVerifyTool"):
                 with patch_test_runner():
                     backend = CodellamasBackendMulti(model_name="gpt-4")
                     assert backend.model_name == "gpt-4"
 
     def test_custom_endpoint_stored(self):
-        with patch("codellamas_backend.crews.crew_multi.LLM"):
+        with patch("codellamas_backend.crews.crew_multi.CachedLLM"):
             with patch("codellamas_backend.crews.crew_multi.MavenVerifyTool"):
                 with patch_test_runner():
                     backend = CodellamasBackendMulti(api_endpoint="https://custom.com")
                     assert backend.api_endpoint == "https://custom.com"
 
     def test_custom_api_key_stored(self):
-        with patch("codellamas_backend.crews.crew_multi.LLM"):
+        with patch("codellamas_backend.crews.crew_multi.CachedLLM"):
             with patch("codellamas_backend.crews.crew_multi.MavenVerifyTool"):
                 with patch_test_runner():
                     backend = CodellamasBackendMulti(api_key="my-key")
@@ -308,7 +309,7 @@ class TestCodellamasBackendMultiInit:
 
     def test_none_model_falls_back_to_constant(self):
         with patch("codellamas_backend.crews.crew_multi.MODEL", "test-model"):
-            with patch("codellamas_backend.crews.crew_multi.LLM"):
+            with patch("codellamas_backend.crews.crew_multi.CachedLLM"):
                 with patch("codellamas_backend.crews.crew_multi.MavenVerifyTool"):
                     with patch_test_runner():
                         backend = CodellamasBackendMulti(model_name=None)
@@ -316,14 +317,14 @@ class TestCodellamasBackendMultiInit:
 
     def test_none_key_falls_back_to_constant(self):
         with patch("codellamas_backend.crews.crew_multi.OPENROUTER_API_KEY", "env-key"):
-            with patch("codellamas_backend.crews.crew_multi.LLM"):
+            with patch("codellamas_backend.crews.crew_multi.CachedLLM"):
                 with patch("codellamas_backend.crews.crew_multi.MavenVerifyTool"):
                     with patch_test_runner():
                         backend = CodellamasBackendMulti(api_key=None)
                         assert backend.api_key == "env-key"
 
     def test_llm_created_with_correct_params(self):
-        with patch("codellamas_backend.crews.crew_multi.LLM") as mock_llm:
+        with patch("codellamas_backend.crews.crew_multi.CachedLLM") as mock_llm:
             with patch("codellamas_backend.crews.crew_multi.MavenVerifyTool"):
                 with patch_test_runner():
                     CodellamasBackendMulti(
@@ -340,7 +341,7 @@ class TestCodellamasBackendMultiInit:
                     )
 
     def test_verify_tool_created_on_init(self):
-        with patch("codellamas_backend.crews.crew_multi.LLM"):
+        with patch("codellamas_backend.crews.crew_multi.CachedLLM"):
             with patch("codellamas_backend.crews.crew_multi.MavenVerifyTool") as mock_tool:
                 with patch_test_runner():
                     backend = CodellamasBackendMulti()
@@ -348,7 +349,7 @@ class TestCodellamasBackendMultiInit:
                     assert backend.verify_tool == mock_tool.return_value
 
     def test_default_constants(self):
-        with patch("codellamas_backend.crews.crew_multi.LLM"):
+        with patch("codellamas_backend.crews.crew_multi.CachedLLM"):
             with patch("codellamas_backend.crews.crew_multi.MavenVerifyTool"):
                 with patch_test_runner():
                     backend = make_backend()
@@ -460,6 +461,13 @@ class TestHelperMethods:
 class TestVerify:
     def setup_method(self):
         self.backend = make_backend()
+        # the compile preflight is covered in TestVerifyCompilePreflight
+        preflight = patch("codellamas_backend.crews.crew_multi.compile_preflight_enabled", return_value=False)
+        preflight.start()
+        self.preflight = preflight
+
+    def teardown_method(self):
+        self.preflight.stop()
 
     @patch("codellamas_backend.crews.crew_multi.MavenVerifier")
     def test_returns_verify_tool_output(self, mock_verifier):
@@ -468,6 +476,8 @@ class TestVerify:
         mock_verification.failed_tests = []
         mock_verification.errors = []
         mock_verification.summary.return_value = ""
+        mock_verification.phase = "test"
+        mock_verification.diagnostics = []
         mock_verifier.return_value.verify.return_value = mock_verification
 
         result = self.backend._verify(
@@ -485,6 +495,8 @@ class TestVerify:
         mock_verification.failed_tests = ["AppTest"]
         mock_verification.errors = ["err"]
         mock_verification.summary.return_value = "BUILD FAILURE"
+        mock_verification.phase = "test"
+        mock_verification.diagnostics = []
         mock_verifier.return_value.verify.return_value = mock_verification
 
         result = self.backend._verify(
@@ -502,6 +514,8 @@ class TestVerify:
         mock_verification.failed_tests = []
         mock_verification.errors = []
         mock_verification.summary.return_value = ""
+        mock_verification.phase = "test"
+        mock_verification.diagnostics = []
         mock_verifier.return_value.verify.return_value = mock_verification
 
         injected = [pf("src/Test.java", "test content")]
@@ -520,6 +534,8 @@ class TestVerify:
         mock_verification.failed_tests = []
         mock_verification.errors = []
         mock_verification.summary.return_value = "x" * 5000
+        mock_verification.phase = "test"
+        mock_verification.diagnostics = []
         mock_verifier.return_value.verify.return_value = mock_verification
 
         result = self.backend._verify(
@@ -536,6 +552,8 @@ class TestVerify:
         mock_verification.failed_tests = []
         mock_verification.errors = []
         mock_verification.summary.return_value = ""
+        mock_verification.phase = "test"
+        mock_verification.diagnostics = []
         mock_verifier.return_value.verify.return_value = mock_verification
 
         self.backend._verify(
@@ -546,6 +564,53 @@ class TestVerify:
         mock_verifier.assert_called_once_with(timeout_sec=180, quiet=True)
 
 
+class TestVerifyCompilePreflight:
+    def setup_method(self):
+        self.backend = make_backend()
+
+    def make_verification(self, status, phase="test", diagnostics=None):
+        verification = MagicMock()
+        verification.status = status
+        verification.failed_tests = []
+        verification.errors = ["Compilation error"] if phase == "compile" and status == "FAIL" else []
+        verification.summary.return_value = ""
+        verification.phase = phase
+        verification.diagnostics = diagnostics or []
+        return verification
+
+    @patch("codellamas_backend.crews.crew_multi.MavenVerifier")
+    def test_compile_failure_skips_test_run(self, mock_verifier):
+        diagnostic = {"path": "src/main/java/App.java", "line": 3, "column": None,
+                      "severity": "error", "message": "cannot find symbol", "details": "symbol: x"}
+        mock_verifier.return_value.verify_compile.return_value = self.make_verification(
+            "FAIL", phase="compile", diagnostics=[diagnostic]
+        )
+
+        result = self.backend._verify(base_project_files=[pf()], override_project_files=[], injected_tests=[])
+
+        assert result.status == "FAIL"
+        assert result.phase == "compile"
+        assert result.diagnostics == [diagnostic]
+        mock_verifier.return_value.verify.assert_not_called()
+
+    @patch("codellamas_backend.crews.crew_multi.MavenVerifier")
+    def test_compiling_code_gets_full_run(self, mock_verifier):
+        mock_verifier.return_value.verify_compile.return_value = self.make_verification("PASS", phase="compile")
+        mock_verifier.return_value.verify.return_value = self.make_verification("PASS")
+
+        result = self.backend._verify(base_project_files=[pf()], override_project_files=[], injected_tests=[])
+
+        assert result.phase == "test"
+        mock_verifier.return_value.verify.assert_called_once()
+
+    @patch.dict("os.environ", {"VERIFY_COMPILE_PREFLIGHT": "0"})
+    @patch("codellamas_backend.crews.crew_multi.MavenVerifier")
+    def test_disabled(self, mock_verifier):
+        mock_verifier.return_value.verify.return_value = self.make_verification("PASS")
+        self.backend._verify(base_project_files=[pf()], override_project_files=[], injected_tests=[])
+        mock_verifier.return_value.verify_compile.assert_not_called()
+
+
 # ─────────────────────────────────────────────
 # CodellamasBackendMulti._merge_exercise
 # ─────────────────────────────────────────────
@@ -911,7 +976,7 @@ class TestGenerateWithFixLoop:
 
         self.backend._exercise_from_result = MagicMock(return_value=self.mock_exercise)
         self.backend._verify = MagicMock(return_value=make_verify_output("PASS"))
-        self.backend._run_single_task_crew = MagicMock(return_value=MagicMock())
+        self.backend._run_single_task_crew_async = AsyncMock(return_value=MagicMock())
         self.backend._merge_exercise = MagicMock(return_value=self.mock_exercise)
         self.backend._build_reference_override_files = MagicMock(return_value=self.base_files)
         self.backend._to_project_files = MagicMock(return_value=self.base_files)
@@ -924,24 +989,24 @@ class TestGenerateWithFixLoop:
         patch.stopall()
 
     def test_returns_tuple_of_exercise_and_meta(self):
-        result = self.backend.generate_with_fix_loop(
+        result = asyncio.run(self.backend.generate_with_fix_loop_async(
             topic="refactoring",
             code_smells=["god class"],
             existing_codebase="code",
             project_files=self.base_files,
-        )
+        ))
         assert isinstance(result, tuple)
         exercise, meta = result
         assert isinstance(exercise, SpringBootExercise)
         assert isinstance(meta, dict)
 
     def test_meta_has_correct_keys(self):
-        _, meta = self.backend.generate_with_fix_loop(
+        _, meta = asyncio.run(self.backend.generate_with_fix_loop_async(
             topic="refactoring",
             code_smells=["god class"],
             existing_codebase="code",
             project_files=self.base_files,
-        )
+        ))
         assert meta["mode"] == "multi"
         assert meta["fix_loop"] is True
         assert "smelly_iterations" in meta
@@ -951,12 +1016,12 @@ class TestGenerateWithFixLoop:
 
     def test_smelly_pass_breaks_loop_after_one_iteration(self):
         self.backend._verify.return_value = make_verify_output("PASS")
-        _, meta = self.backend.generate_with_fix_loop(
+        _, meta = asyncio.run(self.backend.generate_with_fix_loop_async(
             topic="refactoring",
             code_smells=["god class"],
             existing_codebase="code",
             project_files=self.base_files,
-        )
+        ))
         assert meta["smelly_iterations"] == 1
 
     def test_smelly_fail_runs_patch_and_iterates(self):
@@ -966,15 +1031,15 @@ class TestGenerateWithFixLoop:
             make_verify_output("PASS"),  # smelly loop iter 2
             make_verify_output("PASS"),  # reference loop iter 1
         ]
-        _, meta = self.backend.generate_with_fix_loop(
+        _, meta = asyncio.run(self.backend.generate_with_fix_loop_async(
             topic="refactoring",
             code_smells=["god class"],
             existing_codebase="code",
             project_files=self.base_files,
-        )
+        ))
         assert meta["smelly_iterations"] == 2
         # patch task crew called at least once for smelly patch
-        self.backend._run_single_task_crew.assert_called()
+        self.backend._run_single_task_crew_async.assert_called()
 
     def test_smelly_fail_calls_merge_with_prefer_updated_false(self):
         self.backend._verify.side_effect = [
@@ -982,24 +1047,24 @@ class TestGenerateWithFixLoop:
             make_verify_output("PASS"),
             make_verify_output("PASS"),
         ]
-        self.backend.generate_with_fix_loop(
+        asyncio.run(self.backend.generate_with_fix_loop_async(
             topic="refactoring",
             code_smells=["god class"],
             existing_codebase="code",
             project_files=self.base_files,
-        )
+        ))
         # first merge call should have prefer_updated_answers=False
         first_merge_call = self.backend._merge_exercise.call_args_list[0]
         assert first_merge_call[1].get("prefer_updated_answers") is False
 
     def test_reference_pass_breaks_loop_after_one_iteration(self):
         self.backend._verify.return_value = make_verify_output("PASS")
-        _, meta = self.backend.generate_with_fix_loop(
+        _, meta = asyncio.run(self.backend.generate_with_fix_loop_async(
             topic="refactoring",
             code_smells=["god class"],
             existing_codebase="code",
             project_files=self.base_files,
-        )
+        ))
         assert meta["reference_iterations"] == 1
 
     def test_reference_fail_runs_patch_answers_list(self):
@@ -1008,32 +1073,32 @@ class TestGenerateWithFixLoop:
             make_verify_output("FAIL"),  # reference fail iter 1
             make_verify_output("PASS"),  # reference pass iter 2
         ]
-        _, meta = self.backend.generate_with_fix_loop(
+        _, meta = asyncio.run(self.backend.generate_with_fix_loop_async(
             topic="refactoring",
             code_smells=["god class"],
             existing_codebase="code",
             project_files=self.base_files,
-        )
+        ))
         assert meta["reference_iterations"] == 2
 
     def test_smelly_maven_set_in_meta(self):
         self.backend._verify.return_value = make_verify_output("PASS")
-        _, meta = self.backend.generate_with_fix_loop(
+        _, meta = asyncio.run(self.backend.generate_with_fix_loop_async(
             topic="refactoring",
             code_smells=["god class"],
             existing_codebase="code",
             project_files=self.base_files,
-        )
+        ))
         assert meta["smelly_maven"] is not None
 
     def test_reference_maven_set_in_meta(self):
         self.backend._verify.return_value = make_verify_output("PASS")
-        _, meta = self.backend.generate_with_fix_loop(
+        _, meta = asyncio.run(self.backend.generate_with_fix_loop_async(
             topic="refactoring",
             code_smells=["god class"],
             existing_codebase="code",
             project_files=self.base_files,
-        )
+        ))
         assert meta["reference_maven"] is not None
 
     def test_max_patch_iters_respected_for_smelly(self):
@@ -1043,12 +1108,12 @@ class TestGenerateWithFixLoop:
             make_verify_output("FAIL"),  # smelly iter 2
             make_verify_output("PASS"),  # reference iter 1
         ]
-        _, meta = self.backend.generate_with_fix_loop(
+        _, meta = asyncio.run(self.backend.generate_with_fix_loop_async(
             topic="refactoring",
             code_smells=["god class"],
             existing_codebase="code",
             project_files=self.base_files,
-        )
+        ))
         assert meta["smelly_iterations"] == self.backend.max_patch_iters
 
     def test_max_patch_iters_respected_for_reference(self):
@@ -1057,21 +1122,21 @@ class TestGenerateWithFixLoop:
             make_verify_output("FAIL"),  # reference iter 1
             make_verify_output("FAIL"),  # reference iter 2
         ]
-        _, meta = self.backend.generate_with_fix_loop(
+        _, meta = asyncio.run(self.backend.generate_with_fix_loop_async(
             topic="refactoring",
             code_smells=["god class"],
             existing_codebase="code",
             project_files=self.base_files,
-        )
+        ))
         assert meta["reference_iterations"] == self.backend.max_patch_iters
 
     def test_initial_crew_kickoff_called_with_inputs(self):
-        self.backend.generate_with_fix_loop(
+        asyncio.run(self.backend.generate_with_fix_loop_async(
             topic="refactoring",
             code_smells=["god class"],
             existing_codebase="my code",
             project_files=self.base_files,
-        )
+        ))
         kickoff_kwargs = self.patch_crew.return_value.kickoff.call_args[1]
         assert kickoff_kwargs["inputs"]["topic"] == "refactoring"
         assert kickoff_kwargs["inputs"]["code_smells"] == ["god class"]
@@ -23,7 +23,7 @@ def make_project_file(path="src/App.java", content="class App {}") -> ProjectFil
 
 
 def make_crew_backend(**kwargs) -> CodellamasBackend:
-    with patch("codellamas_backend.crews.crew_single.LLM"):
+    with patch("codellamas_backend.crews.crew_single.CachedLLM"):
         return CodellamasBackend(**kwargs)
 
 
@@ -135,27 +135,27 @@ class TestCodellamasBackendInit:
     def test_defaults_to_env_and_constants(self):
         with patch("codellamas_backend.crews.crew_single.OPENROUTER_API_KEY", "test-key"):
             with patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"}):
-                with patch("codellamas_backend.crews.crew_single.LLM"):
+                with patch("codellamas_backend.crews.crew_single.CachedLLM"):
                     crew = CodellamasBackend()
                     assert crew.api_key == "test-key"
 
     def test_custom_model_name(self):
-        with patch("codellamas_backend.crews.crew_single.LLM"):
+        with patch("codellamas_backend.crews.crew_single.CachedLLM"):
             crew = CodellamasBackend(model_name="gpt-4")
             assert crew.model_name == "gpt-4"
 
     def test_custom_api_endpoint(self):
-        with patch("codellamas_backend.crews.crew_single.LLM"):
+        with patch("codellamas_backend.crews.crew_single.CachedLLM"):
             crew = CodellamasBackend(api_endpoint="https://custom.api.com")
             assert crew.api_endpoint == "https://custom.api.com"
 
     def test_custom_api_key(self):
-        with patch("codellamas_backend.crews.crew_single.LLM"):
+        with patch("codellamas_backend.crews.crew_single.CachedLLM"):
             crew = CodellamasBackend(api_key="my-secret-key")
             assert crew.api_key == "my-secret-key"
 
     def test_llm_created_with_correct_params(self):
-        with patch("codellamas_backend.crews.crew_single.LLM") as mock_llm:
+        with patch("codellamas_backend.crews.crew_single.CachedLLM") as mock_llm:
             CodellamasBackend(model_name="claude-3", api_key="key", api_endpoint="https://ep.com")
             mock_llm.assert_called_once_with(
                 model="claude-3",
@@ -167,7 +167,7 @@ class TestCodellamasBackendInit:
 
     def test_none_model_falls_back_to_constant(self):
         with patch("codellamas_backend.crews.crew_single.MODEL", "test-model"):
-            with patch("codellamas_backend.crews.crew_single.LLM"):
+            with patch("codellamas_backend.crews.crew_single.CachedLLM"):
                 crew = CodellamasBackend(model_name=None)
                 assert crew.model_name == "test-model"  # MODEL constant default
 
@@ -0,0 +1,127 @@
+"""
+Throughput of the /generate pipeline against an LLM cassette, offline:
+
+    python -m codellamas_backend.pipeline_benchmark --cassette FILE [--record]
+        [--mode single|multi] [--requests 8] [--concurrency 4] [--verify-maven]
+
+With --record the generations go to the configured model and every answer
+is written to the cassette. Without it the cassette is replayed strictly
+(an unrecorded prompt fails that generation), delayed by the recorded
+durations times --latency-scale, so a run needs no network. The LLM
+response cache is off for the run, and generated exercises are written
+to a temporary directory.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+
+def benchmark_pipeline(
+    requests: int = 8,
+    concurrency: int = 4,
+    mode: str = "single",
+    topic: str = "Online Shopping",
+    code_smells: Optional[List[str]] = None,
+    verify_maven: bool = False,
+) -> Dict[str, Any]:
+    """
+    Runs `requests` generations, `concurrency` at a time, with one attempt
+    each, through the cassette and LLM settings already in the environment.
+    """
+    from codellamas_backend.api import GenerateRequest, _execute_single_generation_async
+    from codellamas_backend.crews.cassette import get_cassette
+
+    body = GenerateRequest(
+        topic=topic,
+        code_smells=code_smells if code_smells is not None else ["Feature Envy"],
+        mode=mode,
+        verify_maven=verify_maven,
+    )
+
+    async def run_all() -> List[Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(sample: int) -> Dict[str, Any]:
+            async with semaphore:
+                started = time.monotonic()
+                response, _ = await _execute_single_generation_async(body, 1, sample)
+                return {"seconds": time.monotonic() - started, "response": response}
+
+        return await asyncio.gather(*(one(sample) for sample in range(requests)))
+
+    started = time.monotonic()
+    results = asyncio.run(run_all())
+    wall_sec = time.monotonic() - started
+
+    succeeded = [r for r in results if r["response"].get("status") == "success"]
+    errors = [r["response"].get("message", "") for r in results if r["response"].get("status") != "success"]
+    cassette = get_cassette()
+    return {
+        "mode": mode,
+        "requests": requests,
+        "concurrency": concurrency,
+        "succeeded": len(succeeded),
+        "failed": len(errors),
+        "errors": errors[:5],
+        "wall_sec": round(wall_sec, 3),
+        "exercises_per_min": round(60 * len(succeeded) / wall_sec, 2) if wall_sec else 0.0,
+        "latency_sec": _latency([r["seconds"] for r in succeeded]),
+        "cassette": cassette.stats() if cassette is not None else None,
+    }
+
+
+def _latency(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"median": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(values)
+    return {
+        "median": round(statistics.median(ordered), 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark /generate against an LLM cassette.")
+    parser.add_argument("--cassette", required=True, help="cassette file to replay (or write, with --record)")
+    parser.add_argument("--record", action="store_true", help="call the model and record its answers")
+    parser.add_argument("--mode", choices=("single", "multi"), default="single")
+    parser.add_argument("--requests", type=int, default=8, help="generations to run (default: 8)")
+    parser.add_argument("--concurrency", type=int, default=4, help="generations at a time (default: 4)")
+    parser.add_argument("--topic", default="Online Shopping")
+    parser.add_argument("--smell", action="append", dest="code_smells", help="code smell (repeatable)")
+    parser.add_argument("--verify-maven", action="store_true", help="include Maven verification")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="factor on recorded LLM durations (default: 1)")
+    args = parser.parse_args(argv)
+
+    os.environ["LLM_CASSETTE"] = os.path.abspath(args.cassette)
+    os.environ["LLM_CASSETTE_MODE"] = "record" if args.record else "strict"
+    os.environ["LLM_CASSETTE_LATENCY_SCALE"] = str(args.latency_scale)
+    os.environ["LLM_CACHE"] = "0"
+
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="codellamas_benchmark_") as workdir:
+        os.chdir(workdir)  # save_exercise_to_repo writes under the working directory
+        try:
+            result = benchmark_pipeline(
+                requests=args.requests,
+                concurrency=args.concurrency,
+                mode=args.mode,
+                topic=args.topic,
+                code_smells=args.code_smells,
+                verify_maven=args.verify_maven,
+            )
+        finally:
+            os.chdir(previous_cwd)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from codellamas_backend.runtime.cache import verification_cache_key
+from codellamas_backend.schemas.files import ProjectFile
+from codellamas_backend.tools.compiler_diagnostics import errors_only, parse_diagnostics
+from codellamas_backend.tools.class_abi import ClassAbi, tree_abi
+from codellamas_backend.tools.javac_runner import JavacJUnitRunner, RunOutcome, compilation_failed, timed_out
+from codellamas_backend.tools.maven_tool import MavenTestResult
+from codellamas_backend.tools.pom_profile import is_simple_junit_pom, java_release
+from codellamas_backend.tools.surefire_report import parse_reports
+from codellamas_backend.tools.workspace import Workspace
+from codellamas_backend.tools.workspace_template import link_tree
+
+
+# Prebuilt test classes no longer link against the student's classes; the
+# normal path recompiles the tests and reports a proper compilation error.
+LINKAGE_ERRORS = (
+    "NoSuchMethodError",
+    "NoSuchFieldError",
+    "NoClassDefFoundError",
+    "IncompatibleClassChangeError",
+    "AbstractMethodError",
+    "IllegalAccessError",
+    "VerifyError",
+)
+
+
+@dataclass
+class VerificationBundle:
+    key: str
+    root: str  # materialized project + injected tests, with target/classes and target/test-classes
+    release: Optional[str]
+    classpath: List[str]  # test runtime classpath besides target/classes
+    injected_tests: Dict[str, str]
+    abi: Dict[str, ClassAbi]  # of the exercise's main classes the tests were compiled against
+
+
+def bundle_key(project_files: List[ProjectFile], injected_tests: Dict[str, str]) -> str:
+    return verification_cache_key(project_files, None, injected_tests, options={"bundle": 1})
+
+
+class BundleStore:
+    """
+    Per-exercise verification bundles: the exercise project with its injected
+    tests materialized and compiled once, so a review only overlays and
+    compiles the student's files (see JavacJUnitRunner.compile) before
+    running the prebuilt test classes.
+
+    Only exercises on the javac fast path qualify (plain JUnit 5 pom, no
+    resources). Bundles are built in the background and the store keeps the
+    max_bundles most recently used.
+
+    The prebuilt tests stay valid only while the student's classes keep the
+    exercise's API: javac resolves overloads and inlines constants when it
+    compiles the tests. A submission whose non-private signatures or constant
+    values differ from the exercise's goes the normal path and has its tests
+    recompiled.
+    """
+
+    def __init__(
+        self,
+        root_dir: Optional[str] = None,
+        max_bundles: int = 64,
+        runner: Optional[JavacJUnitRunner] = None,
+    ):
+        self.root_dir = root_dir or os.path.join(tempfile.gettempdir(), "codellamas_bundles")
+        self.max_bundles = max_bundles
+        self.runner = runner or JavacJUnitRunner()
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._remove_stale_bundles()
+
+        self._lock = threading.Lock()
+        self._bundles: "OrderedDict[str, VerificationBundle]" = OrderedDict()
+        self._pending: Dict[str, bool] = {}
+        self._unusable: Dict[str, str] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bundle-build")
+        self.hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+        self.builds = 0
+
+    def eligible(self, project_files: List[ProjectFile], injected_tests: Dict[str, str]) -> bool:
+        if not self.runner.available():
+            return False
+        pom = None
+        for f in project_files:
+            path = Workspace.normalize(f.path)
+            if path == "pom.xml":
+                pom = f.content
+            elif path.startswith(("src/main/resources/", "src/test/resources/")):
+                return False
+        return bool(injected_tests) and is_simple_junit_pom(pom)
+
+    def get(self, project_files: List[ProjectFile], injected_tests: Dict[str, str]) -> Optional[VerificationBundle]:
+        key = bundle_key(project_files, injected_tests)
+        with self._lock:
+            bundle = self._bundles.get(key)
+            if bundle is not None:
+                self._bundles.move_to_end(key)
+            return bundle
+
+    def prepare_async(self, project_files: List[ProjectFile], injected_tests: Dict[str, str]) -> None:
+        """Schedules a build unless the bundle exists, is building, or cannot be built."""
+        key = bundle_key(project_files, injected_tests)
+        with self._lock:
+            if key in self._bundles or key in self._pending or key in self._unusable:
+                return
+            self._pending[key] = True
+        self._executor.submit(self._build_logged, key, list(project_files), dict(injected_tests))
+
+    def build(self, project_files: List[ProjectFile], injected_tests: Dict[str, str]) -> Optional[VerificationBundle]:
+        key = bundle_key(project_files, injected_tests)
+        with self._lock:
+            self._pending[key] = True
+        return self._build(key, project_files, injected_tests)
+
+    def run(
+        self,
+        project_files: List[ProjectFile],
+        override_files: List[ProjectFile],
+        injected_tests: Dict[str, str],
+        timeout_sec: Optional[float] = None,
+    ) -> Optional[MavenTestResult]:
+        """
+        Verifies override_files against the exercise's bundle. Returns None
+        when the caller should use the normal path instead; in that case a
+        bundle build is scheduled if the exercise qualifies.
+        """
+        if not self._overrides_supported(project_files, override_files, injected_tests):
+            return None
+
+        bundle = self.get(project_files, injected_tests)
+        if bundle is None:
+            with self._lock:
+                self.misses += 1
+            if self.eligible(project_files, injected_tests):
+                self.prepare_async(project_files, injected_tests)
+            return None
+
+        with Workspace(prefix="codellamas_") as ws:
+            try:
+                link_tree(bundle.root, ws.root)
+            except OSError:
+                return None  # evicted while cloning
+            # main classes are rebuilt from the class cache; linked copies
+            # must not be overwritten by javac
+            shutil.rmtree(os.path.join(ws.root, "target", "classes"), ignore_errors=True)
+            ws.write_files(override_files)
+            outcome = self._run_prebuilt(ws, bundle, timeout_sec)
+            if outcome is not None:
+                status, returncode, failed_tests, errors, raw = outcome
+                test_cases = parse_reports(os.path.join(ws.root, "target", "junit-reports"))
+                diagnostics = errors_only(parse_diagnostics(raw, ws.root)) if status != "PASS" else []
+
+        if outcome is None or (status != "PASS" and any(marker in raw for marker in LINKAGE_ERRORS)):
+            with self._lock:
+                self.fallbacks += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return MavenTestResult(
+            status=status,
+            returncode=returncode,
+            failed_tests=failed_tests,
+            errors=errors,
+            raw_log=raw,
+            test_cases=test_cases,
+            diagnostics=diagnostics,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "bundles": len(self._bundles),
+                "building": len(self._pending),
+                "unusable": len(self._unusable),
+                "builds": self.builds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "fallbacks": self.fallbacks,
+            }
+
+    def _run_prebuilt(
+        self, ws: Workspace, bundle: VerificationBundle, timeout_sec: Optional[float]
+    ) -> Optional[RunOutcome]:
+        """Compiles the student's classes and runs the prebuilt tests; None if they changed the API."""
+        timeout_sec = timeout_sec or self.runner.timeout_sec
+        deadline = time.monotonic() + timeout_sec
+        try:
+            ok, log = self.runner.compile(ws.root, release=bundle.release, compile_tests=False, deadline=deadline)
+        except subprocess.TimeoutExpired:
+            return timed_out(timeout_sec)
+        if not ok:
+            return compilation_failed(log)
+        try:
+            if tree_abi(os.path.join(ws.root, "target", "classes")) != bundle.abi:
+                return None
+        except (OSError, ValueError):
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return timed_out(timeout_sec)
+        return self.runner.run(
+            ws.root, release=bundle.release, compile_tests=False, timeout_sec=remaining, precompiled=True
+        )
+
+    def _overrides_supported(
+        self,
+        project_files: List[ProjectFile],
+        override_files: List[ProjectFile],
+        injected_tests: Dict[str, str],
+    ) -> bool:
+        current = {Workspace.normalize(f.path): f.content for f in project_files}
+        current.update({Workspace.normalize(p): c for p, c in injected_tests.items()})
+        for f in override_files:
+            path = Workspace.normalize(f.path)
+            if current.get(path) == f.content:
+                continue
+            # anything that changes the build or the (prebuilt) tests needs a full run
+            if path == "pom.xml" or not path.startswith("src/main/java/") or path in injected_tests:
+                return False
+        return True
+
+    def _build_logged(self, key: str, project_files: List[ProjectFile], injected_tests: Dict[str, str]) -> None:
+        try:
+            self._build(key, project_files, injected_tests)
+        except Exception as e:  # background thread: never let a build failure escape
+            logging.warning(f"Verification bundle build failed: {e}")
+            self._mark_unusable(key, str(e))
+
+    def _build(
+        self, key: str, project_files: List[ProjectFile], injected_tests: Dict[str, str]
+    ) -> Optional[VerificationBundle]:
+        if not self.eligible(project_files, injected_tests):
+            self._mark_unusable(key, "not eligible for the javac fast path")
+            return None
+
+        root = os.path.join(self.root_dir, key)
+        ws = Workspace(prefix="codellamas_bundle_")
+        try:
+            ws.write_files(project_files)
+            ws.write_file_map(injected_tests)
+            release = java_release(ws.read("pom.xml"))
+            try:
+                ok, log = self.runner.compile(ws.root, release=release)
+            except subprocess.TimeoutExpired:
+                ok, log = False, "compilation timed out"
+            if not ok:
+                self._mark_unusable(key, log[:2000])
+                return None
+            abi = tree_abi(os.path.join(ws.root, "target", "classes"))
+            shutil.rmtree(root, ignore_errors=True)
+            shutil.move(ws.root, root)
+        finally:
+            ws.cleanup()
+
+        bundle = VerificationBundle(
+            key=key,
+            root=root,
+            release=release,
+            classpath=[self.runner.console_jar],
+            injected_tests=dict(injected_tests),
+            abi=abi,
+        )
+        with self._lock:
+            self._pending.pop(key, None)
+            self._bundles[key] = bundle
+            self._bundles.move_to_end(key)
+            self.builds += 1
+            while len(self._bundles) > self.max_bundles:
+                _, evicted = self._bundles.popitem(last=False)
+                shutil.rmtree(evicted.root, ignore_errors=True)
+        return bundle
+
+    def _mark_unusable(self, key: str, reason: str) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+            self._unusable[key] = reason
+            while len(self._unusable) > 1024:
+                self._unusable.pop(next(iter(self._unusable)))
+
+    def _remove_stale_bundles(self) -> None:
+        # bundles are indexed in memory only; leftovers from a previous process are unreachable
+        for name in os.listdir(self.root_dir):
+            if len(name) == 64 and all(c in "0123456789abcdef" for c in name):
+                shutil.rmtree(os.path.join(self.root_dir, name), ignore_errors=True)
+
+
+_store: Optional[BundleStore] = None
+_store_lock = threading.Lock()
+
+
+def get_bundle_store() -> Optional[BundleStore]:
+    """
+    Process-wide bundle store used for /review verification.
+    Disabled with VERIFY_BUNDLES=0; VERIFY_BUNDLES_MAX bounds how many are kept.
+    """
+    global _store
+    if os.getenv("VERIFY_BUNDLES", "1") == "0":
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = BundleStore(
+                root_dir=os.getenv("VERIFY_BUNDLES_DIR") or None,
+                max_bundles=int(os.getenv("VERIFY_BUNDLES_MAX", "64")),
+            )
+        return _store
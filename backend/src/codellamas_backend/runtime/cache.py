@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from codellamas_backend.schemas.files import ProjectFile
+
+
+def verification_cache_key(
+    base_project: List[ProjectFile],
+    override_files: Optional[List[ProjectFile]] = None,
+    injected_tests: Optional[Dict[str, str]] = None,
+    options: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Stable hash of the file set Maven would actually see (base, then overrides,
+    then injected tests, last write wins) plus the command/options used to run it.
+    """
+    merged: Dict[str, str] = {}
+    for f in base_project:
+        merged[_normalize_path(f.path)] = f.content
+    for f in override_files or []:
+        merged[_normalize_path(f.path)] = f.content
+    for path, content in (injected_tests or {}).items():
+        merged[_normalize_path(path)] = content
+
+    h = hashlib.sha256()
+    for path in sorted(merged):
+        h.update(path.encode("utf-8"))
+        h.update(b"\0")
+        h.update(merged[path].encode("utf-8"))
+        h.update(b"\0")
+    h.update(json.dumps(options or {}, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _normalize_path(path: str) -> str:
+    # mirrors Workspace._write_one so equivalent spellings share a key
+    return str(path).lstrip("/").replace("\\", "/")
+
+
+class JsonFileStore:
+    """
+    On-disk store of JSON entries, one file per key, trimmed back under
+    max_bytes, least recently used first (reads bump a file's mtime).
+
+    The store's size is counted once at startup and then kept as a running
+    total, so writes only walk the directory when they push it over the
+    limit; trimming then goes down to 90% of it. Files that vanish meanwhile,
+    e.g. trimmed by another process sharing the directory, are skipped.
+    """
+
+    def __init__(self, root_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._trim_lock = threading.Lock()
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._bytes = self._usage()
+
+    @property
+    def bytes(self) -> int:
+        with self._lock:
+            return self._bytes
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root_dir, key[:2], f"{key}.json")
+
+    def read(self, key: str) -> Optional[Any]:
+        path = self.path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)  # bump recency for LRU trimming
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def write(self, key: str, entry: Any) -> None:
+        path = self.path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            replaced = _size(path)
+            written = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError:
+            _silent_remove(tmp_path)
+            return
+        with self._lock:
+            self._bytes += written - replaced
+            over = self._bytes > self.max_bytes
+        if over:
+            self._trim()
+
+    def delete(self, key: str) -> None:
+        path = self.path(key)
+        size = _size(path)
+        try:
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._bytes = max(0, self._bytes - size)
+
+    def clear(self) -> None:
+        for path in self._entries():
+            _silent_remove(path)
+        with self._lock:
+            self._bytes = 0
+            self.evictions = 0
+
+    def _entries(self) -> List[str]:
+        if not os.path.isdir(self.root_dir):
+            return []
+        out: List[str] = []
+        for dirpath, _, filenames in os.walk(self.root_dir):
+            out.extend(os.path.join(dirpath, n) for n in filenames if n.endswith(".json"))
+        return out
+
+    def _usage(self) -> int:
+        return sum(_size(p) for p in self._entries())
+
+    def _trim(self) -> None:
+        if not self._trim_lock.acquire(blocking=False):
+            return  # another writer is already trimming
+        try:
+            entries = []
+            for path in self._entries():
+                try:
+                    entries.append((path, os.stat(path)))
+                except OSError:
+                    continue
+            total = sum(st.st_size for _, st in entries)
+            target = int(self.max_bytes * 0.9)
+            evicted = 0
+            for path, st in sorted(entries, key=lambda e: e[1].st_mtime):
+                if total <= target:
+                    break
+                _silent_remove(path)
+                total -= st.st_size
+                evicted += 1
+            with self._lock:
+                self._bytes = total
+                self.evictions += evicted
+        finally:
+            self._trim_lock.release()
+
+
+class VerificationCache:
+    """
+    Two-tier cache of verification results keyed by verification_cache_key:
+    an in-memory LRU in front of an optional JsonFileStore.
+    """
+
+    def __init__(
+        self,
+        max_memory_entries: int = 256,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.max_memory_entries = max_memory_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = JsonFileStore(disk_dir, max_disk_bytes) if disk_dir else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return dict(entry)
+
+        entry = self._disk.read(key) if self._disk is not None else None
+        with self._lock:
+            if not isinstance(entry, dict):
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, entry)
+        return dict(entry)
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._remember(key, dict(entry))
+        if self._disk is not None:
+            self._disk.write(key, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self.memory_hits = self.disk_hits = self.misses = self.evictions = 0
+        if self._disk is not None:
+            self._disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        disk_bytes = self._disk.bytes if self._disk is not None else 0
+        disk_evictions = self._disk.evictions if self._disk is not None else 0
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "hits": hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions + disk_evictions,
+                "disk_bytes": disk_bytes,
+            }
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _silent_remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+_cache: Optional[VerificationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_verification_cache() -> Optional[VerificationCache]:
+    """
+    Process-wide cache shared by every MavenVerifier instance.
+    Disabled with VERIFY_CACHE=0; the disk tier is enabled by VERIFY_CACHE_DIR.
+    """
+    global _cache
+    if os.getenv("VERIFY_CACHE", "1") == "0":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = VerificationCache(
+                max_memory_entries=int(os.getenv("VERIFY_CACHE_MEMORY_ENTRIES", "256")),
+                disk_dir=os.getenv("VERIFY_CACHE_DIR") or None,
+                max_disk_bytes=int(os.getenv("VERIFY_CACHE_DISK_MB", "256")) * 1024 * 1024,
+            )
+        return _cache
@@ -0,0 +1,224 @@
+import java.io.BufferedReader;
+import java.io.ByteArrayOutputStream;
+import java.io.File;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.io.PrintWriter;
+import java.io.StringWriter;
+import java.net.URL;
+import java.net.URLClassLoader;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.Paths;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.Collections;
+import java.util.List;
+import java.util.Locale;
+import java.util.stream.Collectors;
+import java.util.stream.Stream;
+
+import javax.tools.Diagnostic;
+import javax.tools.DiagnosticCollector;
+import javax.tools.JavaCompiler;
+import javax.tools.JavaFileObject;
+import javax.tools.StandardJavaFileManager;
+import javax.tools.ToolProvider;
+
+import org.junit.platform.engine.TestSource;
+import org.junit.platform.engine.discovery.DiscoverySelectors;
+import org.junit.platform.engine.support.descriptor.MethodSource;
+import org.junit.platform.launcher.Launcher;
+import org.junit.platform.launcher.LauncherDiscoveryRequest;
+import org.junit.platform.launcher.TestIdentifier;
+import org.junit.platform.launcher.core.LauncherDiscoveryRequestBuilder;
+import org.junit.platform.launcher.core.LauncherFactory;
+import org.junit.platform.launcher.listeners.SummaryGeneratingListener;
+import org.junit.platform.launcher.listeners.TestExecutionSummary;
+
+/**
+ * Long-lived verification worker driven by codellamas_backend.runtime.jvm_pool.
+ *
+ * Protocol (one job at a time, UTF-8, tab separated):
+ *   stdin:  JOB\t<workspace root>   |   SHUTDOWN
+ *   stdout: READY once on start-up, then per job any number of
+ *           STATUS\t<PASS|FAIL|ERROR>, FAILED\t<test>, ERROR\t<message>,
+ *           LOG\t<line> records terminated by END.
+ *
+ * Every job compiles src/main/java and src/test/java with the in-process
+ * javac and runs the JUnit Platform inside a fresh URLClassLoader, so no
+ * exercise classes leak from one job into the next.
+ */
+public class VerificationWorker {
+
+    public static void main(String[] args) throws Exception {
+        PrintStream protocol = new PrintStream(new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+
+        protocol.println("READY");
+        String line;
+        while ((line = in.readLine()) != null) {
+            if (line.isEmpty()) {
+                continue;
+            }
+            if (line.equals("SHUTDOWN")) {
+                break;
+            }
+            String[] parts = line.split("\t", 2);
+            if (parts.length != 2 || !parts[0].equals("JOB")) {
+                protocol.println("STATUS\tERROR");
+                emit(protocol, "ERROR", "Malformed worker request: " + line);
+            } else {
+                runJob(Paths.get(parts[1]), protocol);
+            }
+            protocol.println("END");
+        }
+    }
+
+    private static void runJob(Path root, PrintStream protocol) {
+        ByteArrayOutputStream captured = new ByteArrayOutputStream();
+        PrintStream capture = new PrintStream(captured, true, StandardCharsets.UTF_8);
+        PrintStream previousOut = System.out;
+        PrintStream previousErr = System.err;
+        System.setOut(capture);
+        System.setErr(capture);
+
+        try {
+            Path classes = root.resolve("target/classes");
+            Path testClasses = root.resolve("target/test-classes");
+            String baseClasspath = System.getProperty("java.class.path");
+            List<String> diagnostics = new ArrayList<>();
+
+            boolean compiled = compile(root.resolve("src/main/java"), classes, baseClasspath, diagnostics)
+                    && compile(
+                            root.resolve("src/test/java"),
+                            testClasses,
+                            classes + File.pathSeparator + baseClasspath,
+                            diagnostics);
+
+            if (!compiled) {
+                protocol.println("STATUS\tFAIL");
+                emit(protocol, "ERROR", "Compilation error");
+                capture.println("COMPILATION ERROR");
+                for (String diagnostic : diagnostics) {
+                    capture.println("[ERROR] " + diagnostic);
+                }
+                return;
+            }
+
+            runTests(classes, testClasses, protocol, capture);
+        } catch (Throwable t) {
+            protocol.println("STATUS\tERROR");
+            emit(protocol, "ERROR", "Worker error: " + t);
+            t.printStackTrace(capture);
+        } finally {
+            System.setOut(previousOut);
+            System.setErr(previousErr);
+            emit(protocol, "LOG", captured.toString(StandardCharsets.UTF_8));
+        }
+    }
+
+    private static boolean compile(Path sourceDir, Path outputDir, String classpath, List<String> diagnostics)
+            throws IOException {
+        if (!Files.isDirectory(sourceDir)) {
+            return true;
+        }
+
+        List<File> sources;
+        try (Stream<Path> walk = Files.walk(sourceDir)) {
+            sources = walk.filter(p -> p.toString().endsWith(".java"))
+                    .map(Path::toFile)
+                    .collect(Collectors.toList());
+        }
+        if (sources.isEmpty()) {
+            return true;
+        }
+
+        Files.createDirectories(outputDir);
+        JavaCompiler compiler = ToolProvider.getSystemJavaCompiler();
+        DiagnosticCollector<JavaFileObject> collector = new DiagnosticCollector<>();
+
+        try (StandardJavaFileManager fileManager =
+                compiler.getStandardFileManager(collector, Locale.ROOT, StandardCharsets.UTF_8)) {
+            List<String> options = Arrays.asList(
+                    "-d", outputDir.toString(),
+                    "-cp", classpath,
+                    "-encoding", "UTF-8",
+                    "-proc:none");
+            boolean ok = compiler.getTask(
+                    null, fileManager, collector, options, null,
+                    fileManager.getJavaFileObjectsFromFiles(sources)).call();
+
+            for (Diagnostic<? extends JavaFileObject> d : collector.getDiagnostics()) {
+                if (d.getKind() == Diagnostic.Kind.ERROR) {
+                    String source = d.getSource() == null ? "<unknown>" : d.getSource().getName();
+                    diagnostics.add(source + ":[" + d.getLineNumber() + "] " + d.getMessage(Locale.ROOT));
+                }
+            }
+            return ok;
+        }
+    }
+
+    private static void runTests(Path classes, Path testClasses, PrintStream protocol, PrintStream capture)
+            throws IOException {
+        if (!Files.isDirectory(testClasses)) {
+            protocol.println("STATUS\tPASS");
+            return;
+        }
+
+        URL[] urls = {classes.toUri().toURL(), testClasses.toUri().toURL()};
+        Thread current = Thread.currentThread();
+        ClassLoader previous = current.getContextClassLoader();
+
+        try (URLClassLoader loader = new URLClassLoader(urls, ClassLoader.getSystemClassLoader())) {
+            current.setContextClassLoader(loader);
+
+            LauncherDiscoveryRequest request = LauncherDiscoveryRequestBuilder.request()
+                    .selectors(DiscoverySelectors.selectClasspathRoots(Collections.singleton(testClasses)))
+                    .build();
+            SummaryGeneratingListener listener = new SummaryGeneratingListener();
+            Launcher launcher = LauncherFactory.create();
+            launcher.execute(request, listener);
+
+            TestExecutionSummary summary = listener.getSummary();
+            StringWriter report = new StringWriter();
+            summary.printTo(new PrintWriter(report));
+            summary.printFailuresTo(new PrintWriter(report), 25);
+            capture.print(report);
+
+            if (summary.getTotalFailureCount() == 0) {
+                protocol.println("STATUS\tPASS");
+                return;
+            }
+
+            protocol.println("STATUS\tFAIL");
+            emit(protocol, "ERROR", "Test failures");
+            for (TestExecutionSummary.Failure failure : summary.getFailures()) {
+                emit(protocol, "FAILED", describe(failure.getTestIdentifier()));
+            }
+        } finally {
+            current.setContextClassLoader(previous);
+        }
+    }
+
+    private static String describe(TestIdentifier identifier) {
+        TestSource source = identifier.getSource().orElse(null);
+        if (source instanceof MethodSource) {
+            MethodSource method = (MethodSource) source;
+            return method.getClassName() + "." + method.getMethodName();
+        }
+        return identifier.getDisplayName();
+    }
+
+    private static void emit(PrintStream protocol, String tag, String text) {
+        for (String line : text.split("\\R")) {
+            if (!line.isEmpty()) {
+                protocol.println(tag + "\t" + line);
+            }
+        }
+    }
+}
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import atexit
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Tuple
+
+from codellamas_backend.schemas.files import ProjectFile
+from codellamas_backend.tools.javac_runner import default_junit_standalone_jar
+from codellamas_backend.tools.maven_tool import MavenTestResult
+from codellamas_backend.tools.workspace import Workspace
+
+
+WORKER_SOURCE = os.path.join(os.path.dirname(__file__), "java", "VerificationWorker.java")
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def pom_is_pool_compatible(pom_xml: str) -> bool:
+    """
+    Workers only have JUnit 5 on their classpath, so projects that declare any
+    other dependency (or a parent pom that could add some) must go through Maven.
+    """
+    try:
+        root = ET.fromstring(pom_xml)
+    except ET.ParseError:
+        return False
+
+    for el in root.iter():
+        name = _local_name(el.tag)
+        if name == "parent":
+            return False
+        if name == "dependency":
+            group = next(
+                (c.text or "" for c in el if _local_name(c.tag) == "groupId"), ""
+            ).strip()
+            if not group.startswith("org.junit"):
+                return False
+    return True
+
+
+class JvmWorker:
+    """
+    One long-lived `java VerificationWorker.java` process. Not thread safe;
+    the pool hands each worker to a single caller at a time.
+    """
+
+    def __init__(self, java_cmd: str, classpath: str, startup_timeout_sec: int = 60):
+        self.proc = subprocess.Popen(
+            [java_cmd, "-cp", classpath, WORKER_SOURCE],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self.jobs_run = 0
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._reader = threading.Thread(target=self._pump, daemon=True)
+        self._reader.start()
+
+        ready = self._next_line(startup_timeout_sec)
+        if ready != "READY":
+            self.kill()
+            raise RuntimeError(f"JVM worker failed to start (got {ready!r})")
+
+    def _pump(self) -> None:
+        for line in self.proc.stdout:
+            self._lines.put(line.rstrip("\n"))
+        self._lines.put(None)
+
+    def _next_line(self, timeout_sec: float) -> Optional[str]:
+        try:
+            return self._lines.get(timeout=max(timeout_sec, 0.01))
+        except queue.Empty:
+            raise TimeoutError
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def run_job(self, root: str, timeout_sec: int) -> Tuple[str, List[str], List[str], str]:
+        """
+        Returns (status, failed_tests, errors, raw_log).
+        Raises TimeoutError / RuntimeError when the worker is no longer usable.
+        """
+        self.proc.stdin.write(f"JOB\t{root}\n")
+        self.proc.stdin.flush()
+        self.jobs_run += 1
+
+        status = "ERROR"
+        failed_tests: List[str] = []
+        errors: List[str] = []
+        log_lines: List[str] = []
+
+        deadline = time.monotonic() + timeout_sec
+        while True:
+            line = self._next_line(deadline - time.monotonic())
+            if line is None:
+                raise RuntimeError("JVM worker exited mid-job")
+            if line == "END":
+                break
+            tag, _, value = line.partition("\t")
+            if tag == "STATUS":
+                status = value
+            elif tag == "FAILED":
+                failed_tests.append(value)
+            elif tag == "ERROR":
+                errors.append(value)
+            elif tag == "LOG":
+                log_lines.append(value)
+
+        return status, failed_tests, errors, "\n".join(log_lines)
+
+    def shutdown(self) -> None:
+        if self.alive():
+            try:
+                self.proc.stdin.write("SHUTDOWN\n")
+                self.proc.stdin.flush()
+                self.proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        self.kill()
+
+    def kill(self) -> None:
+        if self.alive():
+            self.proc.kill()
+            self.proc.wait()
+
+
+class JvmWorkerPool:
+    """
+    Pool of warm JVMs that compile a workspace and run the JUnit 5 platform
+    in-process, avoiding Maven bootstrap and the surefire fork on every run.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        java_cmd: Optional[str] = None,
+        classpath: Optional[str] = None,
+        max_jobs_per_worker: int = 200,
+    ):
+        self.size = max(1, size)
+        self.java_cmd = java_cmd or shutil.which("java") or ""
+        self.classpath = classpath or default_junit_standalone_jar()
+        self.max_jobs_per_worker = max_jobs_per_worker
+
+        self._idle: "queue.LifoQueue[JvmWorker]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._closed = False
+
+    def available(self) -> bool:
+        return bool(self.java_cmd) and os.path.isfile(self.classpath)
+
+    def supports(
+        self,
+        project_files: List[ProjectFile],
+        override_files: Optional[List[ProjectFile]] = None,
+    ) -> bool:
+        if not self.available():
+            return False
+        merged: Dict[str, str] = {f.path: f.content for f in project_files}
+        merged.update({f.path: f.content for f in override_files or []})
+        pom = merged.get("pom.xml")
+        return pom is not None and pom_is_pool_compatible(pom)
+
+    def run_tests(
+        self,
+        project_files: List[ProjectFile],
+        override_files: Optional[List[ProjectFile]] = None,
+        inject_tests: Optional[Dict[str, str]] = None,
+        timeout_sec: int = 300,
+    ) -> Optional[MavenTestResult]:
+        """
+        Runs the tests on a pooled worker. Returns None when no worker could
+        start or the worker died mid-job, so the caller can fall back to Maven.
+        """
+        with Workspace(prefix="codellamas_") as ws:
+            ws.write_base(project_files)
+            if override_files:
+                ws.write_files(override_files)
+            if inject_tests:
+                ws.write_file_map(inject_tests)
+
+            with self._slots:
+                try:
+                    worker = self._checkout()
+                except (OSError, RuntimeError, TimeoutError):
+                    return None
+                try:
+                    status, failed_tests, errors, raw = worker.run_job(ws.root, timeout_sec)
+                except TimeoutError:
+                    worker.kill()
+                    return MavenTestResult(
+                        status="FAIL",
+                        returncode=124,
+                        failed_tests=[],
+                        errors=[f"JVM worker timed out after {timeout_sec}s"],
+                        raw_log="",
+                    )
+                except (OSError, RuntimeError):
+                    worker.kill()
+                    return None
+                except Exception:
+                    worker.kill()
+                    raise
+                self._checkin(worker)
+
+        return MavenTestResult(
+            status=status,
+            returncode=0 if status == "PASS" else 1,
+            failed_tests=list(dict.fromkeys(failed_tests))[:30],
+            errors=list(dict.fromkeys(errors))[:20],
+            raw_log=raw,
+        )
+
+    def _checkout(self) -> JvmWorker:
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return JvmWorker(self.java_cmd, self.classpath)
+            if worker.alive():
+                return worker
+
+    def _checkin(self, worker: JvmWorker) -> None:
+        if self._closed or worker.jobs_run >= self.max_jobs_per_worker or not worker.alive():
+            worker.shutdown()
+            return
+        self._idle.put(worker)
+
+    def shutdown(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().shutdown()
+            except queue.Empty:
+                return
+
+
+_pool: Optional[JvmWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_jvm_pool() -> JvmWorkerPool:
+    """Process-wide pool shared by every MavenVerifier instance."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = JvmWorkerPool(size=int(os.getenv("JVM_POOL_SIZE", "2")))
+            atexit.register(_pool.shutdown)
+        return _pool
@@ -0,0 +1,199 @@
+"""
+Benchmark of the verification profile against the untouched pom:
+
+    python -m codellamas_backend.runtime.profile_benchmark [--project DIR] [--runs 5]
+
+Both variants run `mvn test` (the javac fast path is off) on the same
+project, alternating so that disk cache and CPU frequency drift hit both
+equally; the first run of each is a discarded warm-up. The profile is the
+one MavenVerifier would use (VERIFY_PROFILE_* variables), or the defaults
+when VERIFY_PROFILE=0.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from codellamas_backend.schemas.files import ProjectFile
+from codellamas_backend.tools.maven_tool import MavenTestResult, MavenTool
+from codellamas_backend.tools.verification_profile import VerificationProfile, verification_profile_from_env
+
+
+SAMPLE_POM = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <modelVersion>4.0.0</modelVersion>
+  <groupId>com.example</groupId>
+  <artifactId>exercise</artifactId>
+  <version>1.0-SNAPSHOT</version>
+  <properties>
+    <maven.compiler.source>17</maven.compiler.source>
+    <maven.compiler.target>17</maven.compiler.target>
+    <project.build.sourceEncoding>UTF-8</project.build.sourceEncoding>
+  </properties>
+  <dependencies>
+    <dependency>
+      <groupId>org.junit.jupiter</groupId>
+      <artifactId>junit-jupiter</artifactId>
+      <version>5.10.2</version>
+      <scope>test</scope>
+    </dependency>
+  </dependencies>
+  <build>
+    <plugins>
+      <plugin>
+        <groupId>org.apache.maven.plugins</groupId>
+        <artifactId>maven-surefire-plugin</artifactId>
+        <version>3.2.5</version>
+        <configuration>
+          <useModulePath>false</useModulePath>
+        </configuration>
+      </plugin>
+    </plugins>
+  </build>
+</project>
+"""
+
+SAMPLE_MAIN = """package com.example;
+
+public class Pricing {
+    public static long total(int items, long unitCents, int discountPct) {
+        long gross = items * unitCents;
+        return gross - gross * discountPct / 100;
+    }
+}
+"""
+
+SAMPLE_TEST = """package com.example;
+
+import org.junit.jupiter.api.Test;
+import static org.junit.jupiter.api.Assertions.*;
+
+class Pricing{n}Test {{
+    @Test
+    void noDiscount() {{
+        assertEquals({n} * 250L, Pricing.total({n}, 250, 0));
+    }}
+
+    @Test
+    void halfPrice() {{
+        assertEquals({n} * 125L, Pricing.total({n}, 250, 50));
+    }}
+
+    @Test
+    void manyItems() {{
+        long sum = 0;
+        for (int i = 0; i < 200_000; i++) {{
+            sum += Pricing.total(i % 7 + {n}, 99, i % 30);
+        }}
+        assertTrue(sum > 0);
+    }}
+}}
+"""
+
+
+def sample_project(test_classes: int = 6) -> List[ProjectFile]:
+    """A default_base_project_files()-style exercise with a few test classes."""
+    files = [
+        ProjectFile(path="pom.xml", content=SAMPLE_POM),
+        ProjectFile(path="src/main/java/com/example/Pricing.java", content=SAMPLE_MAIN),
+    ]
+    for n in range(1, test_classes + 1):
+        files.append(ProjectFile(
+            path=f"src/test/java/com/example/Pricing{n}Test.java",
+            content=SAMPLE_TEST.format(n=n),
+        ))
+    return files
+
+
+def load_project(root: str) -> List[ProjectFile]:
+    """Project files under root, without build output and VCS metadata."""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in ("target", ".git", ".idea", "node_modules"))
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError):
+                continue  # binaries are not part of a generated exercise
+            files.append(ProjectFile(path=os.path.relpath(path, root).replace(os.sep, "/"), content=content))
+    return files
+
+
+def benchmark_profile(
+    project_files: List[ProjectFile],
+    inject_tests: Optional[Dict[str, str]] = None,
+    profile: Optional[VerificationProfile] = None,
+    runs: int = 3,
+    mvn_cmd: str = "",
+    timeout_sec: int = 600,
+) -> Dict[str, Any]:
+    """
+    Times `runs` verifications of the project with and without the profile.
+    same_outcome is False when the profile changed a status or test count,
+    e.g. because a test depends on running alone.
+    """
+    profile = profile or verification_profile_from_env() or VerificationProfile()
+    tools = {
+        "untouched": MavenTool(mvn_cmd=mvn_cmd, timeout_sec=timeout_sec, fast_path=False),
+        "profile": MavenTool(mvn_cmd=mvn_cmd, timeout_sec=timeout_sec, fast_path=False, profile=profile),
+    }
+    seconds: Dict[str, List[float]] = {name: [] for name in tools}
+    outcomes: Dict[str, List[tuple]] = {name: [] for name in tools}
+
+    for i in range(runs + 1):
+        order = list(tools) if i % 2 == 0 else list(reversed(list(tools)))
+        for name in order:
+            started = time.monotonic()
+            result = tools[name].run_tests(project_files, inject_tests=inject_tests)
+            elapsed = time.monotonic() - started
+            if i == 0:
+                continue  # warm-up: local repository, page cache, CDS archive creation
+            seconds[name].append(round(elapsed, 3))
+            outcomes[name].append(_outcome(result))
+
+    untouched = _timings(seconds["untouched"])
+    profiled = _timings(seconds["profile"])
+    return {
+        "profile": profile.describe(),
+        "runs": runs,
+        "untouched": {**untouched, "outcome": outcomes["untouched"][-1] if runs else None},
+        "with_profile": {**profiled, "outcome": outcomes["profile"][-1] if runs else None},
+        "speedup": round(untouched["median"] / profiled["median"], 3) if profiled["median"] else None,
+        "same_outcome": outcomes["untouched"] == outcomes["profile"],
+    }
+
+
+def _outcome(result: MavenTestResult) -> tuple:
+    summary = result.test_summary()
+    return result.status, summary.get("total", 0), summary.get("failed", 0) + summary.get("errors", 0)
+
+
+def _timings(values: List[float]) -> Dict[str, Any]:
+    if not values:
+        return {"seconds": [], "median": 0.0, "min": 0.0, "mean": 0.0}
+    return {
+        "seconds": values,
+        "median": round(statistics.median(values), 3),
+        "min": min(values),
+        "mean": round(statistics.mean(values), 3),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the verification profile against the untouched pom.")
+    parser.add_argument("--project", help="Maven project directory (default: a built-in sample exercise)")
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per variant (default: 5)")
+    args = parser.parse_args(argv)
+
+    files = load_project(args.project) if args.project else sample_project()
+    result = benchmark_profile(files, runs=args.runs, mvn_cmd=os.getenv("MAVEN_CMD", ""))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Future
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from codellamas_backend.runtime.scheduler import SlotTiming, get_verification_scheduler, verification_slot
+from codellamas_backend.tools.maven_reactor import ReactorJob
+from codellamas_backend.tools.maven_tool import MavenTestResult, MavenTool
+
+
+BatchOutcome = Optional[Tuple[MavenTestResult, SlotTiming]]
+
+
+class _Batch:
+    def __init__(self, tool: MavenTool):
+        self.tool = tool
+        self.jobs: List[ReactorJob] = []
+        self.timeouts: List[float] = []
+        self.futures: List[Future] = []
+        self.full = threading.Event()
+
+
+class ReactorBatcher:
+    """
+    Collects Maven verifications that arrive within window_sec of each other
+    and runs them as one reactor build (MavenTool.run_reactor): one Maven
+    JVM resolves the plugins once and builds up to max_modules projects in
+    parallel. The first caller of a batch waits out the window and runs it;
+    the others block until their module's result is split back to them.
+    A caller with nothing else in flight does not wait at all.
+
+    A batch takes one scheduler slot per module (up to the scheduler's
+    limit), which is also the reactor's thread count. Each module's test
+    fork is capped by its own caller's timeout; the build as a whole by the
+    longest one. submit() returns None for a job that ended up alone in its
+    batch or whose module result the reactor could not determine; the
+    caller verifies it on its own then.
+    """
+
+    def __init__(self, window_sec: float = 0.2, max_modules: int = 16):
+        self.window_sec = window_sec
+        self.max_modules = max(2, max_modules)
+        self._lock = threading.Lock()
+        self._open: Dict[Tuple[Any, ...], _Batch] = {}
+        self._active = 0
+        self.batches = 0
+        self.modules = 0
+        self.solo = 0
+        self.fallbacks = 0
+
+    def submit(
+        self, tool: MavenTool, job: ReactorJob, timeout_sec: float, wait: Optional[bool] = None
+    ) -> BatchOutcome:
+        """
+        wait=True waits out the window even when nothing else is in flight,
+        for callers that are about to submit sibling jobs.
+        """
+        key = _tool_key(tool)
+        future: Future = Future()
+        with self._lock:
+            self._active += 1
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._open[key] = _Batch(tool)
+                wait = wait or self._busy()
+            batch.jobs.append(replace(job, timeout_sec=timeout_sec))
+            batch.timeouts.append(timeout_sec)
+            batch.futures.append(future)
+            if len(batch.jobs) >= self.max_modules:
+                del self._open[key]
+                batch.full.set()
+
+        try:
+            if leader:
+                if wait:
+                    batch.full.wait(self.window_sec)
+                with self._lock:
+                    if self._open.get(key) is batch:
+                        del self._open[key]
+                try:
+                    self._run(batch)
+                finally:
+                    for pending in batch.futures:
+                        if not pending.done():
+                            pending.set_result(None)
+            return future.result()
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _busy(self) -> bool:
+        # caller holds self._lock
+        if self._active > 1:
+            return True
+        scheduler = get_verification_scheduler()
+        return scheduler is not None and scheduler.in_flight() > 0
+
+    def _run(self, batch: _Batch) -> None:
+        if len(batch.jobs) == 1:
+            with self._lock:
+                self.solo += 1
+            batch.futures[0].set_result(None)
+            return
+
+        modules = {f"m{i:03d}": job for i, job in enumerate(batch.jobs)}
+        scheduler = get_verification_scheduler()
+        threads = min(len(modules), scheduler.max_concurrent if scheduler is not None else (os.cpu_count() or 2))
+        results: Dict[str, Optional[MavenTestResult]] = {}
+        try:
+            with verification_slot(weight=len(modules)) as timing:
+                results = batch.tool.run_reactor(modules, timeout_sec=max(batch.timeouts), threads=threads)
+        except Exception:  # the queue is full or Maven could not start: everyone retries alone
+            results = {}
+            timing = SlotTiming()
+
+        outcomes = [results.get(module) for module in modules]
+        with self._lock:
+            self.batches += 1
+            self.modules += len(modules)
+            self.fallbacks += sum(1 for result in outcomes if result is None)
+        for future, result in zip(batch.futures, outcomes):
+            future.set_result((result, timing) if result is not None else None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": True,
+                "window_sec": self.window_sec,
+                "max_modules": self.max_modules,
+                "batches": self.batches,
+                "modules": self.modules,
+                "avg_modules": round(self.modules / self.batches, 2) if self.batches else 0.0,
+                "solo": self.solo,
+                "fallbacks": self.fallbacks,
+            }
+
+
+def _tool_key(tool: MavenTool) -> Tuple[Any, ...]:
+    # only builds that would run with the same command line can share a reactor
+    profile = tool.profile.describe() if tool.profile else None
+    return tool.mvn_cmd, repr(profile), tool.offline
+
+
+_batcher: Optional[ReactorBatcher] = None
+_batcher_lock = threading.Lock()
+
+
+def get_reactor_batcher() -> Optional[ReactorBatcher]:
+    """
+    Process-wide batcher shared by every MavenVerifier instance.
+    Disabled with VERIFY_REACTOR=0; VERIFY_REACTOR_WINDOW_MS (default 200)
+    and VERIFY_REACTOR_MAX_MODULES (default 16) size the batches.
+    """
+    global _batcher
+    if os.getenv("VERIFY_REACTOR", "1") == "0":
+        return None
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = ReactorBatcher(
+                window_sec=int(os.getenv("VERIFY_REACTOR_WINDOW_MS", "200")) / 1000,
+                max_modules=int(os.getenv("VERIFY_REACTOR_MAX_MODULES", "16")),
+            )
+        return _batcher
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Dict, Iterator, List, Optional
+
+
+# A Maven verification keeps the Maven JVM and the surefire fork alive at
+# the same time; budget roughly this much memory for one of them.
+DEFAULT_MEMORY_PER_VERIFICATION_MB = 1024
+
+
+class VerificationQueueFull(RuntimeError):
+    pass
+
+
+@dataclass
+class SlotTiming:
+    queue_wait_sec: float = 0.0
+    exec_sec: float = 0.0
+
+
+def total_memory_bytes() -> Optional[int]:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def default_concurrency(memory_per_verification_mb: int = DEFAULT_MEMORY_PER_VERIFICATION_MB) -> int:
+    """
+    Concurrent verifications the machine can take: half the cores (the JIT
+    and GC threads of each JVM want the rest), further capped by memory.
+    """
+    limit = max(1, (os.cpu_count() or 2) // 2)
+    memory = total_memory_bytes()
+    if memory:
+        limit = min(limit, max(1, memory // (memory_per_verification_mb * 1024 * 1024)))
+    return limit
+
+
+class VerificationScheduler:
+    """
+    Admission control for verifications, separate from the API's task
+    semaphore: at most max_concurrent slots are in use, later callers wait in
+    a FIFO queue of at most max_queue entries, and anything beyond that is
+    rejected with VerificationQueueFull.
+
+    A caller that runs several builds at once (MavenVerifier.verify_variants)
+    takes one slot per build. Queue wait and execution time are measured
+    separately (see SlotTiming and stats()).
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None, max_queue: int = 256, history: int = 512):
+        self.max_concurrent = max(1, max_concurrent or default_concurrency())
+        self.max_queue = max_queue
+        self._cond = threading.Condition()
+        self._queue: Deque[object] = deque()
+        self._running = 0
+        self._waits: Deque[float] = deque(maxlen=history)
+        self._execs: Deque[float] = deque(maxlen=history)
+        self.admitted = 0
+        self.rejected = 0
+
+    @contextmanager
+    def slot(self, weight: int = 1) -> Iterator[SlotTiming]:
+        """Blocks until `weight` slots are free; yields the timing, filled in on exit."""
+        weight = max(1, min(weight, self.max_concurrent))
+        timing = SlotTiming(queue_wait_sec=self._acquire(weight))
+        started = time.monotonic()
+        try:
+            yield timing
+        finally:
+            timing.exec_sec = round(time.monotonic() - started, 3)
+            self._release(weight, timing.exec_sec)
+
+    @asynccontextmanager
+    async def async_slot(self, weight: int = 1, poll_sec: float = 0.05) -> AsyncIterator[SlotTiming]:
+        """slot() for coroutines: waits without blocking a thread; cancelling the wait leaves the queue."""
+        weight = max(1, min(weight, self.max_concurrent))
+        timing = SlotTiming(queue_wait_sec=await self._acquire_async(weight, poll_sec))
+        started = time.monotonic()
+        try:
+            yield timing
+        finally:
+            timing.exec_sec = round(time.monotonic() - started, 3)
+            self._release(weight, timing.exec_sec)
+
+    def in_flight(self) -> int:
+        """Slots in use plus callers waiting for one."""
+        with self._cond:
+            return self._running + len(self._queue)
+
+    def stats(self) -> Dict[str, object]:
+        with self._cond:
+            waits = list(self._waits)
+            execs = list(self._execs)
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": len(self._queue),
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "queue_wait_sec": _distribution(waits),
+                "exec_sec": _distribution(execs),
+            }
+
+    def _acquire(self, weight: int) -> float:
+        started = time.monotonic()
+        with self._cond:
+            if self._queue or self._running + weight > self.max_concurrent:
+                ticket = self._enqueue()
+                try:
+                    while self._queue[0] is not ticket or self._running + weight > self.max_concurrent:
+                        self._cond.wait()
+                finally:
+                    self._queue.remove(ticket)
+                    self._cond.notify_all()
+            return self._admit(weight, started)
+
+    async def _acquire_async(self, weight: int, poll_sec: float) -> float:
+        started = time.monotonic()
+        with self._cond:
+            if not self._queue and self._running + weight <= self.max_concurrent:
+                return self._admit(weight, started)
+            ticket = self._enqueue()
+        try:
+            while True:
+                with self._cond:
+                    if self._queue[0] is ticket and self._running + weight <= self.max_concurrent:
+                        self._queue.popleft()
+                        self._cond.notify_all()
+                        return self._admit(weight, started)
+                await asyncio.sleep(poll_sec)
+        except BaseException:
+            with self._cond:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    self._cond.notify_all()
+            raise
+
+    def _enqueue(self) -> object:
+        # caller holds self._cond
+        if len(self._queue) >= self.max_queue:
+            self.rejected += 1
+            raise VerificationQueueFull(
+                f"Verification queue is full ({self.max_queue} waiting); try again later"
+            )
+        ticket = object()
+        self._queue.append(ticket)
+        return ticket
+
+    def _admit(self, weight: int, started: float) -> float:
+        # caller holds self._cond
+        self._running += weight
+        self.admitted += 1
+        waited = round(time.monotonic() - started, 3)
+        self._waits.append(waited)
+        return waited
+
+    def _release(self, weight: int, exec_sec: float) -> None:
+        with self._cond:
+            self._running -= weight
+            self._execs.append(exec_sec)
+            self._cond.notify_all()
+
+
+def _distribution(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0, "avg": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "avg": round(sum(ordered) / len(ordered), 3),
+        "p50": ordered[int(0.5 * (len(ordered) - 1))],
+        "p95": ordered[int(0.95 * (len(ordered) - 1))],
+        "max": ordered[-1],
+    }
+
+
+@contextmanager
+def verification_slot(weight: int = 1) -> Iterator[SlotTiming]:
+    """scheduler.slot() of the process-wide scheduler; only measures time when it is disabled."""
+    scheduler = get_verification_scheduler()
+    if scheduler is not None:
+        with scheduler.slot(weight) as timing:
+            yield timing
+        return
+    timing = SlotTiming()
+    started = time.monotonic()
+    try:
+        yield timing
+    finally:
+        timing.exec_sec = round(time.monotonic() - started, 3)
+
+
+@asynccontextmanager
+async def async_verification_slot(weight: int = 1) -> AsyncIterator[SlotTiming]:
+    """verification_slot() for coroutines."""
+    scheduler = get_verification_scheduler()
+    if scheduler is not None:
+        async with scheduler.async_slot(weight) as timing:
+            yield timing
+        return
+    timing = SlotTiming()
+    started = time.monotonic()
+    try:
+        yield timing
+    finally:
+        timing.exec_sec = round(time.monotonic() - started, 3)
+
+
+_scheduler: Optional[VerificationScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_verification_scheduler() -> Optional[VerificationScheduler]:
+    """
+    Process-wide scheduler shared by every MavenVerifier instance.
+    Disabled with VERIFY_SCHEDULER=0. VERIFY_CONCURRENCY overrides the limit
+    derived from cores and memory (VERIFY_MEMORY_MB per verification);
+    VERIFY_QUEUE_MAX bounds the wait queue.
+    """
+    global _scheduler
+    if os.getenv("VERIFY_SCHEDULER", "1") == "0":
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            concurrency = int(os.getenv("VERIFY_CONCURRENCY", "0")) or default_concurrency(
+                int(os.getenv("VERIFY_MEMORY_MB", str(DEFAULT_MEMORY_PER_VERIFICATION_MB)))
+            )
+            _scheduler = VerificationScheduler(
+                max_concurrent=concurrency,
+                max_queue=int(os.getenv("VERIFY_QUEUE_MAX", "256")),
+            )
+        return _scheduler
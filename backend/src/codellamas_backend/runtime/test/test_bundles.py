@@ -0,0 +1,210 @@
+import os
+import tempfile
+
+from unittest.mock import patch, MagicMock
+
+import codellamas_backend.runtime.bundles as bundles_module
+from codellamas_backend.api import default_base_project_files
+from codellamas_backend.runtime.bundles import BundleStore, bundle_key, get_bundle_store
+from codellamas_backend.schemas.files import ProjectFile
+
+
+POM = default_base_project_files()[0].content
+APP = ProjectFile(path="src/main/java/com/example/App.java", content="package com.example;\nclass App {}")
+PROJECT = [ProjectFile(path="pom.xml", content=POM), APP]
+TESTS = {"src/test/java/com/example/AppTest.java": "package com.example;\nclass AppTest {}"}
+
+
+def make_runner() -> MagicMock:
+    runner = MagicMock()
+    runner.available.return_value = True
+    runner.console_jar = "/opt/junit.jar"
+    runner.timeout_sec = 300
+    runner.api = "v1"  # what the compiled main classes expose, see fake_tree_abi
+
+    def compile_(root, release=None, compile_tests=True, deadline=None):
+        for sub in ("classes", "test-classes") if compile_tests else ("classes",):
+            os.makedirs(os.path.join(root, "target", sub), exist_ok=True)
+            with open(os.path.join(root, "target", sub, "X.class"), "w") as f:
+                f.write(runner.api if sub == "classes" else sub)
+        return True, ""
+
+    runner.compile.side_effect = compile_
+    runner.run.return_value = ("PASS", 0, [], [], "ok")
+    return runner
+
+
+def fake_tree_abi(classes_dir):
+    with open(os.path.join(classes_dir, "X.class")) as f:
+        return {"X.class": f.read()}
+
+
+class TestBundleStore:
+    def setup_method(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.runner = make_runner()
+        self.store = BundleStore(root_dir=self.tmp.name, runner=self.runner)
+        self.abi = patch.object(bundles_module, "tree_abi", side_effect=fake_tree_abi)
+        self.abi.start()
+
+    def teardown_method(self):
+        self.abi.stop()
+        self.tmp.cleanup()
+
+    # ─────────────────────────────────────────────
+    # eligibility / build
+    # ─────────────────────────────────────────────
+
+    def test_eligible_for_simple_junit_project(self):
+        assert self.store.eligible(PROJECT, TESTS) is True
+
+    def test_not_eligible_without_tests_or_runner(self):
+        assert self.store.eligible(PROJECT, {}) is False
+        self.runner.available.return_value = False
+        assert self.store.eligible(PROJECT, TESTS) is False
+
+    def test_not_eligible_with_resources_or_other_pom(self):
+        resources = PROJECT + [ProjectFile(path="src/main/resources/app.properties", content="a=b")]
+        assert self.store.eligible(resources, TESTS) is False
+        spring = [ProjectFile(path="pom.xml", content="<project><parent/></project>"), APP]
+        assert self.store.eligible(spring, TESTS) is False
+
+    def test_build_materializes_and_compiles(self):
+        bundle = self.store.build(PROJECT, TESTS)
+
+        assert bundle.key == bundle_key(PROJECT, TESTS)
+        assert bundle.release == "17"
+        assert os.path.exists(os.path.join(bundle.root, "target", "test-classes", "X.class"))
+        assert os.path.exists(os.path.join(bundle.root, "src/test/java/com/example/AppTest.java"))
+        assert self.store.get(PROJECT, TESTS) is bundle
+        assert self.store.stats()["builds"] == 1
+
+    def test_compile_failure_marks_unusable(self):
+        self.runner.compile.side_effect = None
+        self.runner.compile.return_value = (False, "error: boom")
+
+        assert self.store.build(PROJECT, TESTS) is None
+        assert self.store.stats()["unusable"] == 1
+        with patch.object(self.store, "_executor") as executor:
+            self.store.prepare_async(PROJECT, TESTS)
+        executor.submit.assert_not_called()
+
+    def test_prepare_async_schedules_once(self):
+        with patch.object(self.store, "_executor") as executor:
+            self.store.prepare_async(PROJECT, TESTS)
+            self.store.prepare_async(PROJECT, TESTS)
+        executor.submit.assert_called_once()
+
+    def test_lru_limit(self):
+        self.store.max_bundles = 1
+        first = self.store.build(PROJECT, TESTS)
+        self.store.build(PROJECT, {"src/test/java/OtherTest.java": "class OtherTest {}"})
+
+        assert self.store.get(PROJECT, TESTS) is None
+        assert not os.path.exists(first.root)
+
+    def test_stale_bundles_removed_on_start(self):
+        stale = os.path.join(self.tmp.name, "a" * 64)
+        keep = os.path.join(self.tmp.name, "notes")
+        os.makedirs(stale)
+        os.makedirs(keep)
+
+        BundleStore(root_dir=self.tmp.name, runner=self.runner)
+
+        assert not os.path.exists(stale)
+        assert os.path.exists(keep)
+
+    # ─────────────────────────────────────────────
+    # run
+    # ─────────────────────────────────────────────
+
+    def test_run_miss_schedules_build(self):
+        with patch.object(self.store, "prepare_async") as prepare:
+            assert self.store.run(PROJECT, [], TESTS) is None
+        prepare.assert_called_once()
+        assert self.store.stats()["misses"] == 1
+
+    def test_run_overlays_student_files_on_prebuilt_tests(self):
+        self.store.build(PROJECT, TESTS)
+        seen = {}
+
+        def fake_run(root, release=None, compile_tests=True, timeout_sec=None, precompiled=False):
+            seen["compile_tests"] = compile_tests
+            seen["precompiled"] = precompiled
+            seen["test_classes"] = os.path.exists(os.path.join(root, "target", "test-classes", "X.class"))
+            with open(os.path.join(root, APP.path)) as f:
+                seen["app"] = f.read()
+            return "FAIL", 1, ["com.example.AppTest.testX"], ["Test failures"], "log"
+
+        self.runner.run.side_effect = fake_run
+        student = [ProjectFile(path=APP.path, content="package com.example;\nclass App { void x() {} }")]
+        result = self.store.run(PROJECT, student, TESTS)
+
+        assert result.status == "FAIL"
+        assert result.failed_tests == ["com.example.AppTest.testX"]
+        assert seen == {
+            "compile_tests": False,
+            "precompiled": True,
+            "test_classes": True,
+            "app": student[0].content,
+        }
+        assert self.runner.compile.call_args[1]["compile_tests"] is False
+        assert self.store.stats()["hits"] == 1
+
+    def test_changed_api_falls_back(self):
+        self.store.build(PROJECT, TESTS)
+        self.runner.api = "v2"  # e.g. a new overload or another constant value
+
+        student = [ProjectFile(path=APP.path, content="package com.example;\nclass App { static final int X = 2; }")]
+        assert self.store.run(PROJECT, student, TESTS) is None
+        self.runner.run.assert_not_called()
+        assert self.store.stats()["fallbacks"] == 1
+
+    def test_compile_error_reported_without_running_tests(self):
+        self.store.build(PROJECT, TESTS)
+        self.runner.compile.side_effect = None
+        self.runner.compile.return_value = (False, "App.java:2: error: ';' expected")
+
+        result = self.store.run(PROJECT, [ProjectFile(path=APP.path, content="class App {")], TESTS)
+        assert result.status == "FAIL"
+        assert result.errors == ["Compilation error"]
+        self.runner.run.assert_not_called()
+
+    def test_run_does_not_touch_bundle_sources(self):
+        bundle = self.store.build(PROJECT, TESTS)
+        self.store.run(PROJECT, [ProjectFile(path=APP.path, content="changed")], TESTS)
+        with open(os.path.join(bundle.root, APP.path)) as f:
+            assert f.read() == APP.content
+
+    def test_linkage_error_falls_back(self):
+        self.store.build(PROJECT, TESTS)
+        self.runner.run.return_value = ("FAIL", 1, [], ["Test failures"], "java.lang.NoSuchMethodError: App.x()")
+
+        assert self.store.run(PROJECT, [], TESTS) is None
+        assert self.store.stats()["fallbacks"] == 1
+
+    def test_changed_tests_or_pom_not_supported(self):
+        self.store.build(PROJECT, TESTS)
+        changed_test = [ProjectFile(path="src/test/java/com/example/AppTest.java", content="changed")]
+        changed_pom = [ProjectFile(path="pom.xml", content="<project/>")]
+
+        assert self.store.run(PROJECT, changed_test, TESTS) is None
+        assert self.store.run(PROJECT, changed_pom, TESTS) is None
+        self.runner.run.assert_not_called()
+
+    def test_unchanged_pom_override_supported(self):
+        self.store.build(PROJECT, TESTS)
+        result = self.store.run(PROJECT, [ProjectFile(path="pom.xml", content=POM)], TESTS)
+        assert result.status == "PASS"
+
+
+class TestGetBundleStore:
+    def test_disabled_by_env(self):
+        with patch.dict("os.environ", {"VERIFY_BUNDLES": "0"}):
+            assert get_bundle_store() is None
+
+    def test_singleton(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(bundles_module, "_store", None):
+                with patch.dict("os.environ", {"VERIFY_BUNDLES_DIR": tmpdir}):
+                    assert get_bundle_store() is get_bundle_store()
@@ -0,0 +1,182 @@
+import os
+import tempfile
+
+from unittest.mock import patch
+
+import codellamas_backend.runtime.cache as cache_module
+from codellamas_backend.runtime.cache import (
+    VerificationCache,
+    get_verification_cache,
+    verification_cache_key,
+)
+from codellamas_backend.schemas.files import ProjectFile
+
+
+def pf(path="src/main/java/App.java", content="class App {}") -> ProjectFile:
+    return ProjectFile(path=path, content=content)
+
+
+ENTRY = {"status": "PASS", "failed_tests": [], "errors": [], "raw_log": "ok"}
+
+
+# ─────────────────────────────────────────────
+# verification_cache_key
+# ─────────────────────────────────────────────
+
+class TestVerificationCacheKey:
+    def test_same_inputs_same_key(self):
+        a = verification_cache_key([pf()], [], {"T.java": "t"}, {"mvn_cmd": "mvn"})
+        b = verification_cache_key([pf()], [], {"T.java": "t"}, {"mvn_cmd": "mvn"})
+        assert a == b
+
+    def test_file_order_does_not_matter(self):
+        a = verification_cache_key([pf("a.java", "1"), pf("b.java", "2")])
+        b = verification_cache_key([pf("b.java", "2"), pf("a.java", "1")])
+        assert a == b
+
+    def test_override_replaces_base_content(self):
+        overridden = verification_cache_key([pf(content="old")], [pf(content="new")])
+        direct = verification_cache_key([pf(content="new")])
+        assert overridden == direct
+
+    def test_path_spelling_normalized(self):
+        a = verification_cache_key([pf("/src\\App.java")])
+        b = verification_cache_key([pf("src/App.java")])
+        assert a == b
+
+    def test_options_change_key(self):
+        a = verification_cache_key([pf()], options={"quiet": True})
+        b = verification_cache_key([pf()], options={"quiet": False})
+        assert a != b
+
+    def test_content_change_changes_key(self):
+        assert verification_cache_key([pf(content="x")]) != verification_cache_key([pf(content="y")])
+
+
+# ─────────────────────────────────────────────
+# VerificationCache (memory tier)
+# ─────────────────────────────────────────────
+
+class TestMemoryTier:
+    def test_miss_then_hit(self):
+        cache = VerificationCache()
+        assert cache.get("k") is None
+        cache.put("k", ENTRY)
+        assert cache.get("k") == ENTRY
+
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_lru_eviction(self):
+        cache = VerificationCache(max_memory_entries=2)
+        cache.put("a", ENTRY)
+        cache.put("b", ENTRY)
+        cache.get("a")  # a is now most recent
+        cache.put("c", ENTRY)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_returned_entry_is_a_copy(self):
+        cache = VerificationCache()
+        cache.put("k", ENTRY)
+        cache.get("k")["status"] = "FAIL"
+        assert cache.get("k")["status"] == "PASS"
+
+    def test_clear_resets_entries_and_counters(self):
+        cache = VerificationCache()
+        cache.put("k", ENTRY)
+        cache.get("k")
+        cache.clear()
+        assert cache.stats()["memory_entries"] == 0
+        assert cache.stats()["hits"] == 0
+
+
+# ─────────────────────────────────────────────
+# VerificationCache (disk tier)
+# ─────────────────────────────────────────────
+
+class TestDiskTier:
+    def test_survives_new_instance(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            VerificationCache(disk_dir=tmpdir).put("abcd", ENTRY)
+
+            fresh = VerificationCache(disk_dir=tmpdir)
+            assert fresh.get("abcd") == ENTRY
+            assert fresh.stats()["disk_hits"] == 1
+
+    def test_disk_hit_promoted_to_memory(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            VerificationCache(disk_dir=tmpdir).put("abcd", ENTRY)
+            fresh = VerificationCache(disk_dir=tmpdir)
+            fresh.get("abcd")
+            fresh.get("abcd")
+            assert fresh.stats()["memory_hits"] == 1
+
+    def test_size_based_eviction_drops_oldest(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = VerificationCache(disk_dir=tmpdir, max_disk_bytes=150)
+            big = {**ENTRY, "raw_log": "x" * 60}
+            cache.put("aa01", big)
+            os.utime(cache._disk.path("aa01"), (1, 1))
+            cache.put("bb02", big)
+
+            assert not os.path.exists(cache._disk.path("aa01"))
+            assert os.path.exists(cache._disk.path("bb02"))
+            assert cache.stats()["disk_bytes"] <= 150
+
+    def test_disk_bytes_is_a_running_total(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = VerificationCache(disk_dir=tmpdir)
+            cache.put("aa01", ENTRY)
+            cache.put("aa01", {**ENTRY, "raw_log": "x" * 40})
+            cache.put("bb02", ENTRY)
+            on_disk = sum(os.path.getsize(cache._disk.path(k)) for k in ("aa01", "bb02"))
+
+            with patch.object(cache._disk, "_entries", side_effect=AssertionError("walked")):
+                assert cache.stats()["disk_bytes"] == on_disk
+            assert VerificationCache(disk_dir=tmpdir).stats()["disk_bytes"] == on_disk
+
+    def test_writes_under_the_limit_do_not_walk(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = VerificationCache(disk_dir=tmpdir)
+            with patch.object(cache._disk, "_entries", side_effect=AssertionError("walked")):
+                cache.put("aa01", ENTRY)
+
+    def test_entry_removed_during_trim_is_skipped(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = VerificationCache(disk_dir=tmpdir, max_disk_bytes=150)
+            big = {**ENTRY, "raw_log": "x" * 60}
+            cache.put("aa01", big)
+            gone = os.path.join(tmpdir, "cc", "cc03.json")
+            real_entries = cache._disk._entries
+            with patch.object(cache._disk, "_entries", side_effect=lambda: real_entries() + [gone]):
+                cache.put("bb02", big)
+            assert cache.stats()["evictions"] == 1
+
+    def test_corrupt_file_is_a_miss(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = VerificationCache(disk_dir=tmpdir)
+            path = cache._disk.path("ffff")
+            os.makedirs(os.path.dirname(path))
+            with open(path, "w") as f:
+                f.write("{not json")
+            assert cache.get("ffff") is None
+
+
+# ─────────────────────────────────────────────
+# get_verification_cache
+# ─────────────────────────────────────────────
+
+class TestGetVerificationCache:
+    def test_disabled_by_env(self):
+        with patch.dict("os.environ", {"VERIFY_CACHE": "0"}):
+            assert get_verification_cache() is None
+
+    def test_singleton(self):
+        with patch.object(cache_module, "_cache", None):
+            with patch.dict("os.environ", {}, clear=True):
+                assert get_verification_cache() is get_verification_cache()
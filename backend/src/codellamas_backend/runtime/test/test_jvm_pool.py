@@ -0,0 +1,186 @@
+import pytest
+from unittest.mock import patch, MagicMock
+
+from codellamas_backend.runtime.jvm_pool import (
+    JvmWorker,
+    JvmWorkerPool,
+    pom_is_pool_compatible,
+)
+from codellamas_backend.schemas.files import ProjectFile
+
+
+JUNIT_POM = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <modelVersion>4.0.0</modelVersion>
+  <dependencies>
+    <dependency>
+      <groupId>org.junit.jupiter</groupId>
+      <artifactId>junit-jupiter</artifactId>
+      <version>5.10.2</version>
+      <scope>test</scope>
+    </dependency>
+  </dependencies>
+</project>"""
+
+SPRING_POM = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <dependencies>
+    <dependency>
+      <groupId>org.springframework.boot</groupId>
+      <artifactId>spring-boot-starter</artifactId>
+    </dependency>
+  </dependencies>
+</project>"""
+
+PARENT_POM = """<project>
+  <parent>
+    <groupId>org.springframework.boot</groupId>
+    <artifactId>spring-boot-starter-parent</artifactId>
+  </parent>
+</project>"""
+
+
+def make_fake_proc(lines):
+    proc = MagicMock()
+    proc.stdout = iter(lines)
+    proc.poll.return_value = None
+    return proc
+
+
+# ─────────────────────────────────────────────
+# pom_is_pool_compatible
+# ─────────────────────────────────────────────
+
+class TestPomIsPoolCompatible:
+    def test_junit_only_pom_is_compatible(self):
+        assert pom_is_pool_compatible(JUNIT_POM) is True
+
+    def test_other_dependency_is_not_compatible(self):
+        assert pom_is_pool_compatible(SPRING_POM) is False
+
+    def test_parent_pom_is_not_compatible(self):
+        assert pom_is_pool_compatible(PARENT_POM) is False
+
+    def test_invalid_xml_is_not_compatible(self):
+        assert pom_is_pool_compatible("<project>") is False
+
+
+# ─────────────────────────────────────────────
+# JvmWorker
+# ─────────────────────────────────────────────
+
+class TestJvmWorker:
+    @patch("subprocess.Popen")
+    def test_parses_job_records(self, mock_popen):
+        mock_popen.return_value = make_fake_proc([
+            "READY\n",
+            "STATUS\tFAIL\n",
+            "ERROR\tTest failures\n",
+            "FAILED\tcom.example.AppTest.testFail\n",
+            "LOG\tTests failed: 1\n",
+            "END\n",
+        ])
+        worker = JvmWorker("java", "junit.jar")
+
+        status, failed, errors, raw = worker.run_job("/tmp/ws", timeout_sec=5)
+
+        assert status == "FAIL"
+        assert failed == ["com.example.AppTest.testFail"]
+        assert errors == ["Test failures"]
+        assert raw == "Tests failed: 1"
+        assert worker.jobs_run == 1
+        mock_popen.return_value.stdin.write.assert_called_with("JOB\t/tmp/ws\n")
+
+    @patch("subprocess.Popen")
+    def test_start_failure_raises(self, mock_popen):
+        mock_popen.return_value = make_fake_proc(["Error: could not find javac\n"])
+        with pytest.raises(RuntimeError, match="failed to start"):
+            JvmWorker("java", "junit.jar")
+
+    @patch("subprocess.Popen")
+    def test_worker_exit_mid_job_raises(self, mock_popen):
+        mock_popen.return_value = make_fake_proc(["READY\n", "STATUS\tPASS\n"])
+        worker = JvmWorker("java", "junit.jar")
+        with pytest.raises(RuntimeError, match="exited mid-job"):
+            worker.run_job("/tmp/ws", timeout_sec=5)
+
+
+# ─────────────────────────────────────────────
+# JvmWorkerPool
+# ─────────────────────────────────────────────
+
+class TestJvmWorkerPool:
+    def setup_method(self):
+        self.pool = JvmWorkerPool(size=1, java_cmd="java", classpath="/opt/junit.jar")
+        self.files = [ProjectFile(path="pom.xml", content=JUNIT_POM)]
+
+    def test_unavailable_without_classpath_jar(self):
+        assert self.pool.available() is False
+        assert self.pool.supports(self.files) is False
+
+    def test_supports_uses_override_pom(self):
+        with patch("os.path.isfile", return_value=True):
+            assert self.pool.supports(self.files) is True
+            overrides = [ProjectFile(path="pom.xml", content=SPRING_POM)]
+            assert self.pool.supports(self.files, overrides) is False
+
+    @patch("codellamas_backend.runtime.jvm_pool.JvmWorker")
+    def test_run_tests_maps_pass_result(self, mock_worker_cls):
+        worker = mock_worker_cls.return_value
+        worker.run_job.return_value = ("PASS", [], [], "ok")
+        worker.jobs_run = 1
+        worker.alive.return_value = True
+
+        result = self.pool.run_tests(self.files, inject_tests={"src/test/java/AppTest.java": "x"})
+
+        assert result.status == "PASS"
+        assert result.returncode == 0
+        assert result.raw_log == "ok"
+
+    @patch("codellamas_backend.runtime.jvm_pool.JvmWorker")
+    def test_worker_reused_between_jobs(self, mock_worker_cls):
+        worker = mock_worker_cls.return_value
+        worker.run_job.return_value = ("PASS", [], [], "")
+        worker.jobs_run = 1
+        worker.alive.return_value = True
+
+        self.pool.run_tests(self.files)
+        self.pool.run_tests(self.files)
+
+        assert mock_worker_cls.call_count == 1
+
+    @patch("codellamas_backend.runtime.jvm_pool.JvmWorker")
+    def test_worker_retired_after_max_jobs(self, mock_worker_cls):
+        self.pool.max_jobs_per_worker = 1
+        worker = mock_worker_cls.return_value
+        worker.run_job.return_value = ("PASS", [], [], "")
+        worker.jobs_run = 1
+        worker.alive.return_value = True
+
+        self.pool.run_tests(self.files)
+
+        worker.shutdown.assert_called_once()
+
+    @patch("codellamas_backend.runtime.jvm_pool.JvmWorker")
+    def test_timeout_kills_worker(self, mock_worker_cls):
+        worker = mock_worker_cls.return_value
+        worker.run_job.side_effect = TimeoutError
+
+        result = self.pool.run_tests(self.files, timeout_sec=3)
+
+        assert result.status == "FAIL"
+        assert result.returncode == 124
+        assert "timed out after 3s" in result.errors[0]
+        worker.kill.assert_called_once()
+
+    @patch("subprocess.Popen")
+    def test_worker_dying_mid_job_returns_none(self, mock_popen):
+        mock_popen.return_value = make_fake_proc(["READY\n", "STATUS\tPASS\n"])
+
+        assert self.pool.run_tests(self.files, timeout_sec=5) is None
+        mock_popen.return_value.kill.assert_called_once()
+        assert self.pool._idle.empty()
+
+    @patch("codellamas_backend.runtime.jvm_pool.JvmWorker")
+    def test_worker_start_failure_returns_none(self, mock_worker_cls):
+        mock_worker_cls.side_effect = RuntimeError("JVM worker failed to start")
+
+        assert self.pool.run_tests(self.files) is None
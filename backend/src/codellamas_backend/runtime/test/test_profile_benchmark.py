@@ -0,0 +1,123 @@
+import json
+import os
+import tempfile
+
+from unittest.mock import MagicMock, patch
+
+from codellamas_backend.runtime import profile_benchmark
+from codellamas_backend.runtime.profile_benchmark import (
+    benchmark_profile,
+    load_project,
+    main,
+    sample_project,
+)
+from codellamas_backend.tools.maven_tool import MavenTestResult
+from codellamas_backend.tools.surefire_report import TestCaseResult
+from codellamas_backend.tools.verification_profile import VerificationProfile
+
+
+def passing_result(total=3):
+    cases = [TestCaseResult(class_name="com.example.AppTest", method=f"t{i}", status="passed", duration_sec=0.01) for i in range(total)]
+    return MavenTestResult(status="PASS", returncode=0, failed_tests=[], errors=[], raw_log="", test_cases=cases)
+
+
+class FakeClock:
+    """time.monotonic() advancing by the duration of the tool that just ran."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# ─────────────────────────────────────────────
+# Benchmark
+# ─────────────────────────────────────────────
+
+class TestBenchmarkProfile:
+    def make_tools(self, clock, durations, results=None):
+        tools = []
+
+        def factory(mvn_cmd="", timeout_sec=600, fast_path=None, profile=None):
+            tool = MagicMock()
+            name = "profile" if profile is not None else "untouched"
+
+            def run_tests(files, inject_tests=None):
+                clock.now += durations[name]
+                return (results or {}).get(name) or passing_result()
+
+            tool.run_tests.side_effect = run_tests
+            tool.name = name
+            tool.fast_path = fast_path
+            tools.append(tool)
+            return tool
+
+        return factory, tools
+
+    def test_compares_medians(self):
+        clock = FakeClock()
+        factory, tools = self.make_tools(clock, {"untouched": 4.0, "profile": 2.0})
+        with patch.object(profile_benchmark, "MavenTool", side_effect=factory), \
+                patch.object(profile_benchmark.time, "monotonic", clock):
+            result = benchmark_profile(sample_project(), profile=VerificationProfile(), runs=3)
+
+        assert result["untouched"]["seconds"] == [4.0, 4.0, 4.0]
+        assert result["with_profile"]["median"] == 2.0
+        assert result["speedup"] == 2.0
+        assert result["same_outcome"] is True
+        # warm-up plus three timed runs each, always through Maven
+        assert all(t.run_tests.call_count == 4 for t in tools)
+        assert all(t.fast_path is False for t in tools)
+
+    def test_detects_changed_outcome(self):
+        clock = FakeClock()
+        failing = MavenTestResult(status="FAIL", returncode=1, failed_tests=["t0"], errors=["Test failures"],
+                                  raw_log="", test_cases=[TestCaseResult(class_name="A", method="t0", status="failed", duration_sec=0.01)])
+        factory, _ = self.make_tools(clock, {"untouched": 1.0, "profile": 1.0}, {"profile": failing})
+        with patch.object(profile_benchmark, "MavenTool", side_effect=factory), \
+                patch.object(profile_benchmark.time, "monotonic", clock):
+            result = benchmark_profile(sample_project(), profile=VerificationProfile(), runs=2)
+
+        assert result["same_outcome"] is False
+        assert result["with_profile"]["outcome"] == ("FAIL", 1, 1)
+
+    def test_uses_env_profile(self):
+        clock = FakeClock()
+        factory, tools = self.make_tools(clock, {"untouched": 1.0, "profile": 1.0})
+        with patch.object(profile_benchmark, "MavenTool", side_effect=factory), \
+                patch.object(profile_benchmark.time, "monotonic", clock), \
+                patch.dict(os.environ, {"VERIFY_PROFILE_HEAP_MB": "64"}):
+            result = benchmark_profile(sample_project(), runs=1)
+        assert result["profile"]["heap_mb"] == 64
+
+
+# ─────────────────────────────────────────────
+# Projects and CLI
+# ─────────────────────────────────────────────
+
+class TestProjects:
+    def test_sample_project(self):
+        files = sample_project(test_classes=2)
+        paths = [f.path for f in files]
+        assert "pom.xml" in paths
+        assert "src/test/java/com/example/Pricing2Test.java" in paths
+
+    def test_load_project_skips_build_output(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "src", "main", "java"))
+            os.makedirs(os.path.join(root, "target", "classes"))
+            with open(os.path.join(root, "pom.xml"), "w") as f:
+                f.write("<project/>")
+            with open(os.path.join(root, "src", "main", "java", "App.java"), "w") as f:
+                f.write("class App {}")
+            with open(os.path.join(root, "target", "classes", "App.class"), "wb") as f:
+                f.write(b"\xca\xfe\xba\xbe\xff")
+            paths = [f.path for f in load_project(root)]
+        assert paths == ["pom.xml", "src/main/java/App.java"]
+
+    def test_main_prints_json(self, capsys):
+        with patch.object(profile_benchmark, "benchmark_profile", return_value={"speedup": 1.5}) as bench:
+            main(["--runs", "2"])
+        assert json.loads(capsys.readouterr().out) == {"speedup": 1.5}
+        assert bench.call_args[1]["runs"] == 2
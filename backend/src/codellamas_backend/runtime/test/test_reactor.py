@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+
+from unittest.mock import MagicMock, patch
+
+import codellamas_backend.runtime.reactor as reactor_module
+from codellamas_backend.runtime.reactor import ReactorBatcher, get_reactor_batcher
+from codellamas_backend.schemas.files import ProjectFile
+from codellamas_backend.tools.maven_reactor import ReactorJob
+from codellamas_backend.tools.maven_tool import MavenTestResult
+
+
+def job(name: str) -> ReactorJob:
+    return ReactorJob(project_files=[ProjectFile(path="src/main/java/App.java", content=name)])
+
+
+def make_tool(run_reactor=None) -> MagicMock:
+    tool = MagicMock()
+    tool.mvn_cmd = "mvn"
+    tool.profile = None
+    tool.offline = None
+
+    def default(modules, timeout_sec=None, threads=None):
+        return {
+            module: MavenTestResult(status="PASS", returncode=0, failed_tests=[], errors=[],
+                                    raw_log=j.project_files[0].content)
+            for module, j in modules.items()
+        }
+
+    tool.run_reactor.side_effect = run_reactor or default
+    return tool
+
+
+def submit_all(batcher, tool, names, timeouts=None):
+    results = {}
+
+    def run(name, timeout):
+        results[name] = batcher.submit(tool, job(name), timeout, wait=True)
+
+    threads = [
+        threading.Thread(target=run, args=(name, (timeouts or {}).get(name, 60)))
+        for name in names
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    return results
+
+
+# ─────────────────────────────────────────────
+# Batching
+# ─────────────────────────────────────────────
+
+class TestReactorBatcher:
+    def test_concurrent_submissions_share_one_build(self):
+        batcher = ReactorBatcher(window_sec=0.5, max_modules=3)
+        tool = make_tool()
+        results = submit_all(batcher, tool, ["a", "b", "c"], {"b": 90})
+
+        tool.run_reactor.assert_called_once()
+        assert tool.run_reactor.call_args[1]["timeout_sec"] == 90
+        # each module's test fork keeps its own caller's limit
+        modules = tool.run_reactor.call_args[0][0]
+        assert sorted(j.timeout_sec for j in modules.values()) == [60, 60, 90]
+        # every caller gets its own module's result back
+        assert {name: outcome[0].raw_log for name, outcome in results.items()} == {"a": "a", "b": "b", "c": "c"}
+        assert batcher.stats()["batches"] == 1
+        assert batcher.stats()["avg_modules"] == 3
+
+    def test_lone_submission_runs_on_its_own(self):
+        batcher = ReactorBatcher(window_sec=0.01)
+        tool = make_tool()
+        assert batcher.submit(tool, job("a"), 60) is None
+        tool.run_reactor.assert_not_called()
+        assert batcher.stats()["solo"] == 1
+
+    def test_lone_submission_skips_the_window_when_idle(self):
+        batcher = ReactorBatcher(window_sec=5)
+        started = time.monotonic()
+        assert batcher.submit(make_tool(), job("a"), 60) is None
+        assert time.monotonic() - started < 1
+
+    def test_lone_submission_waits_while_others_are_in_flight(self):
+        batcher = ReactorBatcher(window_sec=0.2)
+        scheduler = MagicMock()
+        scheduler.in_flight.return_value = 1
+        with patch("codellamas_backend.runtime.reactor.get_verification_scheduler", return_value=scheduler):
+            started = time.monotonic()
+            assert batcher.submit(make_tool(), job("a"), 60) is None
+        assert time.monotonic() - started >= 0.2
+
+    def test_undetermined_module_falls_back_alone(self):
+        def run_reactor(modules, timeout_sec=None, threads=None):
+            first, second = modules
+            return {
+                first: MavenTestResult(status="FAIL", returncode=1, failed_tests=["T.t"], errors=["Test failures"],
+                                       raw_log="x"),
+                second: None,
+            }
+
+        batcher = ReactorBatcher(window_sec=0.5, max_modules=2)
+        results = submit_all(batcher, make_tool(run_reactor), ["a", "b"])
+
+        outcomes = sorted(results.values(), key=lambda outcome: outcome is None)
+        assert outcomes[0][0].status == "FAIL"
+        assert outcomes[1] is None
+        assert batcher.stats()["fallbacks"] == 1
+
+    def test_reactor_crash_releases_every_caller(self):
+        batcher = ReactorBatcher(window_sec=0.5, max_modules=2)
+        results = submit_all(batcher, make_tool(MagicMock(side_effect=OSError("mvn not found"))), ["a", "b"])
+        assert results == {"a": None, "b": None}
+
+    def test_different_build_settings_do_not_mix(self):
+        batcher = ReactorBatcher(window_sec=0.05, max_modules=2)
+        maven, other = make_tool(), make_tool()
+        other.mvn_cmd = "/opt/mvn"
+        results = {}
+        threads = [
+            threading.Thread(target=lambda: results.setdefault("a", batcher.submit(maven, job("a"), 60))),
+            threading.Thread(target=lambda: results.setdefault("b", batcher.submit(other, job("b"), 60))),
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        assert results == {"a": None, "b": None}
+        maven.run_reactor.assert_not_called()
+
+
+# ─────────────────────────────────────────────
+# Process-wide instance
+# ─────────────────────────────────────────────
+
+class TestGetReactorBatcher:
+    def test_disabled(self):
+        with patch.dict(os.environ, {"VERIFY_REACTOR": "0"}):
+            assert get_reactor_batcher() is None
+
+    def test_singleton_reads_env(self):
+        env = {"VERIFY_REACTOR": "1", "VERIFY_REACTOR_WINDOW_MS": "50", "VERIFY_REACTOR_MAX_MODULES": "8"}
+        with patch.dict(os.environ, env), patch.object(reactor_module, "_batcher", None):
+            first = get_reactor_batcher()
+            assert first is get_reactor_batcher()
+            assert first.window_sec == 0.05
+            assert first.max_modules == 8
@@ -0,0 +1,262 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+
+import codellamas_backend.runtime.scheduler as scheduler_module
+from codellamas_backend.runtime.scheduler import (
+    VerificationQueueFull,
+    VerificationScheduler,
+    async_verification_slot,
+    default_concurrency,
+    get_verification_scheduler,
+    verification_slot,
+)
+
+
+def hold_slot(scheduler, started: threading.Event, release: threading.Event, weight: int = 1):
+    def body():
+        with scheduler.slot(weight):
+            started.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=body)
+    thread.start()
+    assert started.wait(5)
+    return thread
+
+
+# ─────────────────────────────────────────────
+# default_concurrency
+# ─────────────────────────────────────────────
+
+class TestDefaultConcurrency:
+    def test_half_the_cores(self):
+        with patch("os.cpu_count", return_value=16), \
+             patch.object(scheduler_module, "total_memory_bytes", return_value=None):
+            assert default_concurrency() == 8
+
+    def test_capped_by_memory(self):
+        with patch("os.cpu_count", return_value=16), \
+             patch.object(scheduler_module, "total_memory_bytes", return_value=3 * 1024 ** 3):
+            assert default_concurrency(memory_per_verification_mb=1024) == 3
+
+    def test_never_below_one(self):
+        with patch("os.cpu_count", return_value=1), \
+             patch.object(scheduler_module, "total_memory_bytes", return_value=1024):
+            assert default_concurrency() == 1
+
+
+# ─────────────────────────────────────────────
+# VerificationScheduler
+# ─────────────────────────────────────────────
+
+class TestVerificationScheduler:
+    def test_slot_reports_timing(self):
+        scheduler = VerificationScheduler(max_concurrent=1)
+        with scheduler.slot() as timing:
+            time.sleep(0.01)
+        assert timing.queue_wait_sec < 1
+        assert timing.exec_sec >= 0.01
+        stats = scheduler.stats()
+        assert stats["admitted"] == 1
+        assert stats["running"] == 0
+        assert stats["exec_sec"]["count"] == 1
+
+    def test_waits_for_free_slot(self):
+        scheduler = VerificationScheduler(max_concurrent=1)
+        started, release = threading.Event(), threading.Event()
+        holder = hold_slot(scheduler, started, release)
+
+        timings = []
+
+        def waiter():
+            with scheduler.slot() as timing:
+                timings.append(timing)
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        time.sleep(0.1)
+        assert scheduler.stats()["queued"] == 1
+        assert not timings
+
+        release.set()
+        holder.join(5)
+        thread.join(5)
+        assert timings[0].queue_wait_sec >= 0.05
+        assert scheduler.stats()["queue_wait_sec"]["max"] >= 0.05
+
+    def test_rejects_when_queue_full(self):
+        scheduler = VerificationScheduler(max_concurrent=1, max_queue=0)
+        started, release = threading.Event(), threading.Event()
+        holder = hold_slot(scheduler, started, release)
+        try:
+            with pytest.raises(VerificationQueueFull, match="queue is full"):
+                with scheduler.slot():
+                    pass
+        finally:
+            release.set()
+            holder.join(5)
+        assert scheduler.stats()["rejected"] == 1
+
+    def test_weight_takes_several_slots(self):
+        scheduler = VerificationScheduler(max_concurrent=2)
+        started, release = threading.Event(), threading.Event()
+        holder = hold_slot(scheduler, started, release, weight=2)
+        assert scheduler.stats()["running"] == 2
+        release.set()
+        holder.join(5)
+
+    def test_weight_capped_at_limit(self):
+        scheduler = VerificationScheduler(max_concurrent=1)
+        with scheduler.slot(weight=5):
+            assert scheduler.stats()["running"] == 1
+
+    def test_slot_released_on_exception(self):
+        scheduler = VerificationScheduler(max_concurrent=1)
+        with pytest.raises(RuntimeError):
+            with scheduler.slot():
+                raise RuntimeError("boom")
+        assert scheduler.stats()["running"] == 0
+
+    def test_fifo_order(self):
+        scheduler = VerificationScheduler(max_concurrent=1)
+        started, release = threading.Event(), threading.Event()
+        holder = hold_slot(scheduler, started, release)
+        order = []
+
+        def waiter(name):
+            with scheduler.slot():
+                order.append(name)
+
+        threads = []
+        for name in ("a", "b", "c"):
+            t = threading.Thread(target=waiter, args=(name,))
+            t.start()
+            threads.append(t)
+            while scheduler.stats()["queued"] < len(threads):
+                time.sleep(0.005)
+
+        release.set()
+        holder.join(5)
+        for t in threads:
+            t.join(5)
+        assert order == ["a", "b", "c"]
+
+
+class TestAsyncSlot:
+    def test_admits_and_times(self):
+        scheduler = VerificationScheduler(max_concurrent=1)
+
+        async def main():
+            async with scheduler.async_slot() as timing:
+                assert scheduler.stats()["running"] == 1
+            return timing
+
+        timing = asyncio.run(main())
+        assert timing.exec_sec >= 0.0
+        assert scheduler.stats()["running"] == 0
+
+    def test_waits_behind_thread_holder(self):
+        scheduler = VerificationScheduler(max_concurrent=1)
+        started, release = threading.Event(), threading.Event()
+        holder = hold_slot(scheduler, started, release)
+        threading.Timer(0.1, release.set).start()
+
+        async def main():
+            async with scheduler.async_slot(poll_sec=0.01) as timing:
+                pass
+            return timing
+
+        timing = asyncio.run(main())
+        holder.join(5)
+        assert timing.queue_wait_sec >= 0.05
+
+    def test_cancelled_waiter_leaves_queue(self):
+        scheduler = VerificationScheduler(max_concurrent=1)
+        started, release = threading.Event(), threading.Event()
+        holder = hold_slot(scheduler, started, release)
+
+        async def main():
+            async def wait():
+                async with scheduler.async_slot(poll_sec=0.01):
+                    pass
+
+            task = asyncio.create_task(wait())
+            await asyncio.sleep(0.05)
+            assert scheduler.stats()["queued"] == 1
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        try:
+            asyncio.run(main())
+            assert scheduler.stats()["queued"] == 0
+        finally:
+            release.set()
+            holder.join(5)
+        assert scheduler.stats()["running"] == 0
+
+    def test_rejects_when_queue_full(self):
+        scheduler = VerificationScheduler(max_concurrent=1, max_queue=0)
+        started, release = threading.Event(), threading.Event()
+        holder = hold_slot(scheduler, started, release)
+
+        async def main():
+            async with scheduler.async_slot():
+                pass
+
+        try:
+            with pytest.raises(VerificationQueueFull):
+                asyncio.run(main())
+        finally:
+            release.set()
+            holder.join(5)
+
+
+# ─────────────────────────────────────────────
+# Process-wide scheduler
+# ─────────────────────────────────────────────
+
+class TestGetVerificationScheduler:
+    def setup_method(self):
+        scheduler_module._scheduler = None
+
+    def teardown_method(self):
+        scheduler_module._scheduler = None
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setenv("VERIFY_SCHEDULER", "0")
+        assert get_verification_scheduler() is None
+
+    def test_env_configuration(self, monkeypatch):
+        monkeypatch.delenv("VERIFY_SCHEDULER", raising=False)
+        monkeypatch.setenv("VERIFY_CONCURRENCY", "3")
+        monkeypatch.setenv("VERIFY_QUEUE_MAX", "7")
+        scheduler = get_verification_scheduler()
+        assert scheduler.max_concurrent == 3
+        assert scheduler.max_queue == 7
+        assert get_verification_scheduler() is scheduler
+
+    def test_slot_without_scheduler_still_times(self, monkeypatch):
+        monkeypatch.setenv("VERIFY_SCHEDULER", "0")
+        with verification_slot() as timing:
+            time.sleep(0.01)
+        assert timing.queue_wait_sec == 0.0
+        assert timing.exec_sec >= 0.01
+
+    def test_async_slot_without_scheduler_still_times(self, monkeypatch):
+        monkeypatch.setenv("VERIFY_SCHEDULER", "0")
+
+        async def main():
+            async with async_verification_slot() as timing:
+                await asyncio.sleep(0.01)
+            return timing
+
+        timing = asyncio.run(main())
+        assert timing.queue_wait_sec == 0.0
+        assert timing.exec_sec >= 0.01
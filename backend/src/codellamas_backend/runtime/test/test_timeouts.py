@@ -0,0 +1,162 @@
+import os
+
+from unittest.mock import patch
+
+import codellamas_backend.runtime.timeouts as timeouts_module
+from codellamas_backend.runtime.timeouts import (
+    AdaptiveTimeouts,
+    DurationHistogram,
+    get_adaptive_timeouts,
+    project_fingerprint,
+)
+from codellamas_backend.schemas.files import ProjectFile
+
+
+def pf(path="src/main/java/App.java", content="class App {}") -> ProjectFile:
+    return ProjectFile(path=path, content=content)
+
+
+POM = pf("pom.xml", "<project/>")
+
+
+def trained(timeouts: AdaptiveTimeouts, fingerprint: str, durations):
+    for seconds in durations:
+        timeouts.record(timeouts.timeout_for(fingerprint, 180), seconds)
+
+
+# ─────────────────────────────────────────────
+# project_fingerprint
+# ─────────────────────────────────────────────
+
+class TestProjectFingerprint:
+    def test_student_edits_keep_fingerprint(self):
+        assert project_fingerprint([POM, pf(content="a")]) == project_fingerprint([POM, pf(content="b")])
+
+    def test_pom_changes_fingerprint(self):
+        assert project_fingerprint([POM]) != project_fingerprint([pf("pom.xml", "<project><x/></project>")])
+
+    def test_injected_tests_and_phase_change_fingerprint(self):
+        base = project_fingerprint([POM])
+        assert project_fingerprint([POM], {"src/test/java/AppTest.java": "t"}) != base
+        assert project_fingerprint([POM], phase="compile") != base
+
+    def test_file_order_does_not_matter(self):
+        assert project_fingerprint([POM, pf()]) == project_fingerprint([pf(), POM])
+
+
+# ─────────────────────────────────────────────
+# Histogram
+# ─────────────────────────────────────────────
+
+class TestDurationHistogram:
+    def test_percentiles_and_buckets(self):
+        histogram = DurationHistogram()
+        for seconds in [0.5, 3, 4, 12, 700]:
+            histogram.add(seconds)
+        described = histogram.describe()
+        assert described["samples"] == 5
+        assert described["p50_sec"] == 4
+        assert described["p99_sec"] == 700
+        assert described["buckets"]["le_1"] == 1
+        assert described["buckets"]["le_5"] == 2
+        assert described["buckets"]["le_20"] == 1
+        assert described["buckets"]["le_1200"] == 1
+
+    def test_window_rolls(self):
+        histogram = DurationHistogram(window=3)
+        for seconds in [100, 1, 1, 1]:
+            histogram.add(seconds)
+        assert histogram.percentile(0.99) == 1
+
+    def test_empty(self):
+        assert DurationHistogram().describe()["p99_sec"] is None
+
+
+# ─────────────────────────────────────────────
+# Deriving the limit
+# ─────────────────────────────────────────────
+
+class TestAdaptiveTimeouts:
+    def test_default_until_enough_samples(self):
+        timeouts = AdaptiveTimeouts(min_samples=3)
+        trained(timeouts, "fp", [10, 10])
+        decision = timeouts.timeout_for("fp", 180)
+        assert decision.basis == "default"
+        assert decision.limit_sec == 180
+        assert decision.samples == 2
+
+    def test_p99_times_safety_factor(self):
+        timeouts = AdaptiveTimeouts(safety_factor=3, floor_sec=5, ceiling_sec=600, min_samples=3)
+        trained(timeouts, "fp", [10, 12, 20])
+        decision = timeouts.timeout_for("fp", 180)
+        assert decision.basis == "observed"
+        assert decision.p99_sec == 20
+        assert decision.limit_sec == 60
+
+    def test_clamped_to_floor_and_ceiling(self):
+        timeouts = AdaptiveTimeouts(safety_factor=3, floor_sec=30, ceiling_sec=100, min_samples=1)
+        trained(timeouts, "fast", [1])
+        trained(timeouts, "slow", [90])
+        assert timeouts.timeout_for("fast", 180).limit_sec == 30
+        assert timeouts.timeout_for("slow", 180).limit_sec == 100
+
+    def test_never_above_the_callers_timeout(self):
+        timeouts = AdaptiveTimeouts(safety_factor=3, floor_sec=30, ceiling_sec=600, min_samples=1)
+        trained(timeouts, "slow", [150])
+        assert timeouts.timeout_for("slow", 180).limit_sec == 180
+        assert timeouts.timeout_for("slow", 60).limit_sec == 60
+
+    def test_one_retry_after_cut_off_gets_the_callers_timeout(self):
+        timeouts = AdaptiveTimeouts(floor_sec=1, ceiling_sec=600, min_samples=1)
+        trained(timeouts, "fp", [5])
+        decision = timeouts.timeout_for("fp", 180)
+        timeouts.record(decision, decision.limit_sec, timed_out=True)
+
+        retry = timeouts.timeout_for("fp", 180)
+        assert retry.basis == "retry"
+        assert retry.limit_sec == 180
+
+        # the retry is handed out once, whether or not it completes
+        assert timeouts.timeout_for("fp", 180).basis == "observed"
+
+    def test_cut_offs_are_not_samples(self):
+        timeouts = AdaptiveTimeouts(min_samples=1)
+        decision = timeouts.timeout_for("fp", 180)
+        timeouts.record(decision, 180, timed_out=True)
+        histogram = timeouts.histogram("fp")
+        assert histogram["samples"] == 0
+        assert histogram["timeouts"] == 1
+        assert histogram["recent_cutoffs"][0]["limit_sec"] == 180
+        assert histogram["recent_cutoffs"][0]["basis"] == "default"
+
+    def test_least_recent_project_evicted(self):
+        timeouts = AdaptiveTimeouts(max_projects=2)
+        for fingerprint in ["a", "b", "c"]:
+            trained(timeouts, fingerprint, [1])
+        assert timeouts.histogram("a") is None
+        assert timeouts.stats()["projects"] == 2
+
+    def test_stats(self):
+        timeouts = AdaptiveTimeouts()
+        trained(timeouts, "fp", [3])
+        stats = timeouts.stats()
+        assert stats["enabled"] is True
+        assert stats["recent"]["fp"]["samples"] == 1
+
+
+# ─────────────────────────────────────────────
+# Process-wide instance
+# ─────────────────────────────────────────────
+
+class TestGetAdaptiveTimeouts:
+    def test_disabled(self):
+        with patch.dict(os.environ, {"VERIFY_ADAPTIVE_TIMEOUTS": "0"}):
+            assert get_adaptive_timeouts() is None
+
+    def test_singleton_reads_env(self):
+        env = {"VERIFY_ADAPTIVE_TIMEOUTS": "1", "VERIFY_TIMEOUT_FACTOR": "2", "VERIFY_TIMEOUT_CEILING_SEC": "900"}
+        with patch.dict(os.environ, env), patch.object(timeouts_module, "_timeouts", None):
+            first = get_adaptive_timeouts()
+            assert first is get_adaptive_timeouts()
+            assert first.safety_factor == 2
+            assert first.ceiling_sec == 900
@@ -1,7 +1,12 @@
+import asyncio
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from codellamas_backend.runtime.verifier import MavenVerifier, VerificationResult
+from codellamas_backend.runtime.cache import VerificationCache
 from codellamas_backend.schemas.files import ProjectFile
+from codellamas_backend.tools.maven_tool import MavenTestResult
+from codellamas_backend.tools.surefire_report import TestCaseResult
+from codellamas_backend.tools.verification_profile import VerificationProfile
 
 
 class TestVerificationResult(unittest.TestCase):
@@ -29,17 +34,35 @@ class TestVerificationResult(unittest.TestCase):
 
 
 class TestMavenVerifier(unittest.TestCase):
+    def setUp(self):
+        # cache behaviour is covered in test_cache / TestMavenVerifierCache
+        cache_patcher = patch('codellamas_backend.runtime.verifier.get_verification_cache', return_value=None)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+        timeouts_patcher = patch('codellamas_backend.runtime.verifier.get_adaptive_timeouts', return_value=None)
+        timeouts_patcher.start()
+        self.addCleanup(timeouts_patcher.stop)
+
+        reactor_patcher = patch('codellamas_backend.runtime.verifier.get_reactor_batcher', return_value=None)
+        reactor_patcher.start()
+        self.addCleanup(reactor_patcher.stop)
+
     @patch.dict('os.environ', {'MAVEN_CMD': '/usr/bin/mvn'})
     @patch('codellamas_backend.runtime.verifier.MavenTool')
     def test_init_with_env_var(self, mock_maven_tool):
         MavenVerifier(timeout_sec=300, quiet=False)
-        mock_maven_tool.assert_called_once_with(mvn_cmd='/usr/bin/mvn', timeout_sec=300, quiet=False)
+        mock_maven_tool.assert_called_once_with(
+            mvn_cmd='/usr/bin/mvn', timeout_sec=300, quiet=False, profile=VerificationProfile()
+        )
 
     @patch.dict('os.environ', {}, clear=True)
     @patch('codellamas_backend.runtime.verifier.MavenTool')
     def test_init_default_maven_cmd(self, mock_maven_tool):
         MavenVerifier()
-        mock_maven_tool.assert_called_once_with(mvn_cmd='', timeout_sec=600, quiet=True)
+        mock_maven_tool.assert_called_once_with(
+            mvn_cmd='', timeout_sec=600, quiet=True, profile=VerificationProfile()
+        )
 
     @patch('codellamas_backend.runtime.verifier.MavenTool')
     def test_verify_with_all_parameters(self, mock_maven_tool):
@@ -51,6 +74,10 @@ class TestMavenVerifier(unittest.TestCase):
         mock_result.failed_tests = []
         mock_result.errors = []
         mock_result.raw_log_head = Mock(return_value="test log")
+        mock_result.test_cases = []
+        mock_result.test_summary = Mock(return_value={})
+        mock_result.estimated_startup_saving_sec = 0.0
+        mock_result.diagnostics = []
         mock_maven_instance.run_tests.return_value = mock_result
 
         verifier = MavenVerifier()
@@ -67,7 +94,8 @@ class TestMavenVerifier(unittest.TestCase):
         mock_maven_instance.run_tests.assert_called_once_with(
             project_files=base_files,
             override_files=override_files,
-            inject_tests=injected_tests
+            inject_tests=injected_tests,
+            timeout_sec=600,
         )
 
     @patch('codellamas_backend.runtime.verifier.MavenTool')
@@ -80,6 +108,10 @@ class TestMavenVerifier(unittest.TestCase):
         mock_result.failed_tests = ["TestCase::testMethod"]
         mock_result.errors = ["Compilation error"]
         mock_result.raw_log_head = Mock(return_value="error log")
+        mock_result.test_cases = []
+        mock_result.test_summary = Mock(return_value={})
+        mock_result.estimated_startup_saving_sec = 0.0
+        mock_result.diagnostics = []
         mock_maven_instance.run_tests.return_value = mock_result
 
         verifier = MavenVerifier()
@@ -94,7 +126,8 @@ class TestMavenVerifier(unittest.TestCase):
         mock_maven_instance.run_tests.assert_called_once_with(
             project_files=base_files,
             override_files=[],
-            inject_tests={}
+            inject_tests={},
+            timeout_sec=600,
         )
 
     @patch('codellamas_backend.runtime.verifier.MavenTool')
@@ -107,6 +140,10 @@ class TestMavenVerifier(unittest.TestCase):
         mock_result.failed_tests = []
         mock_result.errors = ["Maven timeout"]
         mock_result.raw_log_head = Mock(return_value="x" * 8000)
+        mock_result.test_cases = []
+        mock_result.test_summary = Mock(return_value={})
+        mock_result.estimated_startup_saving_sec = 0.0
+        mock_result.diagnostics = []
         mock_maven_instance.run_tests.return_value = mock_result
 
         verifier = MavenVerifier()
@@ -117,3 +154,625 @@ class TestMavenVerifier(unittest.TestCase):
         self.assertEqual(result.errors, ["Maven timeout"])
         self.assertEqual(result.raw_log, "x" * 8000)
         mock_result.raw_log_head.assert_called_once_with(8000)
+
+    @patch('codellamas_backend.runtime.verifier.get_jvm_pool')
+    @patch('codellamas_backend.runtime.verifier.MavenTool')
+    def test_jvm_pool_backend_used_when_supported(self, mock_maven_tool, mock_get_pool):
+        pool = mock_get_pool.return_value
+        pool.supports.return_value = True
+        pool_result = Mock()
+        pool_result.status = "PASS"
+        pool_result.failed_tests = []
+        pool_result.errors = []
+        pool_result.raw_log_head = Mock(return_value="pool log")
+        pool_result.test_cases = []
+        pool_result.test_summary = Mock(return_value={})
+        pool_result.estimated_startup_saving_sec = 0.0
+        pool_result.diagnostics = []
+        pool.run_tests.return_value = pool_result
+
+        verifier = MavenVerifier(timeout_sec=120, backend="jvm_pool")
+        result = verifier.verify([Mock(spec=ProjectFile)])
+
+        self.assertEqual(result.backend, "jvm_pool")
+        self.assertEqual(result.raw_log, "pool log")
+        self.assertEqual(pool.run_tests.call_args[1]["timeout_sec"], 120)
+        mock_maven_tool.return_value.run_tests.assert_not_called()
+
+    @patch('codellamas_backend.runtime.verifier.get_jvm_pool')
+    @patch('codellamas_backend.runtime.verifier.MavenTool')
+    def test_jvm_pool_backend_falls_back_to_maven(self, mock_maven_tool, mock_get_pool):
+        mock_get_pool.return_value.supports.return_value = False
+        mock_result = Mock()
+        mock_result.status = "PASS"
+        mock_result.failed_tests = []
+        mock_result.errors = []
+        mock_result.raw_log_head = Mock(return_value="mvn log")
+        mock_result.test_cases = []
+        mock_result.test_summary = Mock(return_value={})
+        mock_result.estimated_startup_saving_sec = 0.0
+        mock_result.diagnostics = []
+        mock_maven_tool.return_value.run_tests.return_value = mock_result
+
+        verifier = MavenVerifier(backend="jvm_pool")
+        result = verifier.verify([Mock(spec=ProjectFile)])
+
+        self.assertEqual(result.backend, "maven")
+        mock_get_pool.return_value.run_tests.assert_not_called()
+
+    @patch('codellamas_backend.runtime.verifier.get_jvm_pool')
+    @patch('codellamas_backend.runtime.verifier.MavenTool')
+    def test_jvm_pool_worker_failure_falls_back_to_maven(self, mock_maven_tool, mock_get_pool):
+        pool = mock_get_pool.return_value
+        pool.supports.return_value = True
+        pool.run_tests.return_value = None
+        mock_result = Mock()
+        mock_result.status = "PASS"
+        mock_result.failed_tests = []
+        mock_result.errors = []
+        mock_result.raw_log_head = Mock(return_value="mvn log")
+        mock_result.test_cases = []
+        mock_result.test_summary = Mock(return_value={})
+        mock_result.estimated_startup_saving_sec = 0.0
+        mock_result.diagnostics = []
+        mock_maven_tool.return_value.run_tests.return_value = mock_result
+
+        verifier = MavenVerifier(backend="jvm_pool")
+        result = verifier.verify([Mock(spec=ProjectFile)])
+
+        self.assertEqual(result.backend, "maven")
+        self.assertEqual(result.status, "PASS")
+        mock_maven_tool.return_value.run_tests.assert_called_once()
+
+    @patch.dict('os.environ', {'VERIFY_BACKEND': 'JVM_POOL'})
+    @patch('codellamas_backend.runtime.verifier.MavenTool')
+    def test_backend_read_from_env(self, mock_maven_tool):
+        verifier = MavenVerifier()
+        self.assertEqual(verifier.backend, "jvm_pool")
+
+    @patch('codellamas_backend.runtime.verifier.get_jvm_pool')
+    @patch('codellamas_backend.runtime.verifier.MavenTool')
+    def test_default_backend_never_touches_pool(self, mock_maven_tool, mock_get_pool):
+        mock_result = Mock()
+        mock_result.status = "PASS"
+        mock_result.failed_tests = []
+        mock_result.errors = []
+        mock_result.raw_log_head = Mock(return_value="")
+        mock_result.test_cases = []
+        mock_result.test_summary = Mock(return_value={})
+        mock_result.estimated_startup_saving_sec = 0.0
+        mock_result.diagnostics = []
+        mock_maven_tool.return_value.run_tests.return_value = mock_result
+
+        with patch.dict('os.environ', {}, clear=True):
+            MavenVerifier().verify([Mock(spec=ProjectFile)])
+
+        mock_get_pool.assert_not_called()
+
+    @patch('codellamas_backend.runtime.verifier.MavenTool')
+    def test_structured_test_cases_exposed(self, mock_maven_tool):
+        mock_maven_tool.return_value.run_tests.return_value = MavenTestResult(
+            status="FAIL",
+            returncode=1,
+            failed_tests=["com.example.AppTest.testBad"],
+            errors=["Test failures"],
+            raw_log="log",
+            test_cases=[
+                TestCaseResult("com.example.AppTest", "testOk", "passed", 0.1),
+                TestCaseResult("com.example.AppTest", "testBad", "failed", 0.2, message="nope"),
+            ],
+        )
+
+        result = MavenVerifier().verify([Mock(spec=ProjectFile)])
+
+        self.assertEqual(result.test_cases[1]["method"], "testBad")
+        self.assertEqual(result.test_cases[1]["message"], "nope")
+        self.assertEqual(result.test_summary["failed"], 1)
+        self.assertEqual(result.test_summary["total"], 2)
+
+    @patch('codellamas_backend.runtime.verifier.get_bundle_store')
+    @patch('codellamas_backend.runtime.verifier.MavenTool')
+    def test_bundle_used_for_review(self, mock_maven_tool, mock_get_store):
+        bundle_result = Mock()
+        bundle_result.status = "PASS"
+        bundle_result.returncode = 0
+        bundle_result.failed_tests = []
+        bundle_result.errors = []
+        bundle_result.raw_log_head = Mock(return_value="bundle log")
+        bundle_result.test_cases = []
+        bundle_result.test_summary = Mock(return_value={})
+        bundle_result.estimated_startup_saving_sec = 0.0
+        bundle_result.diagnostics = []
+        mock_get_store.return_value.run.return_value = bundle_result
+
+        result = MavenVerifier().verify([Mock(spec=ProjectFile)], use_bundle=True)
+
+        self.assertEqual(result.backend, "bundle")
+        mock_maven_tool.return_value.run_tests.assert_not_called()
+
+    @patch('codellamas_backend.runtime.verifier.get_bundle_store')
+    @patch('codellamas_backend.runtime.verifier.MavenTool')
+    def test_bundle_miss_falls_back_to_maven(self, mock_maven_tool, mock_get_store):
+        mock_get_store.return_value.run.return_value = None
+        mock_result = Mock()
+        mock_result.status = "PASS"
+        mock_result.failed_tests = []
+        mock_result.errors = []
+        mock_result.raw_log_head = Mock(return_value="")
+        mock_result.test_cases = []
+        mock_result.test_summary = Mock(return_value={})
+        mock_result.estimated_startup_saving_sec = 0.0
+        mock_result.diagnostics = []
+        mock_maven_tool.return_value.run_tests.return_value = mock_result
+
+        result = MavenVerifier().verify([Mock(spec=ProjectFile)], use_bundle=True)
+
+        self.assertEqual(result.backend, "maven")
+        mock_maven_tool.return_value.run_tests.assert_called_once()
+
+    @patch('codellamas_backend.runtime.verifier.get_bundle_store')
+    @patch('codellamas_backend.runtime.verifier.MavenTool')
+    def test_bundle_not_used_by_default(self, mock_maven_tool, mock_get_store):
+        mock_maven_tool.return_value.run_tests.return_value = Mock(
+            status="PASS", failed_tests=[], errors=[], raw_log_head=Mock(return_value=""),
+            test_cases=[], test_summary=Mock(return_value={}), estimated_startup_saving_sec=0.0, diagnostics=[],
+        )
+        MavenVerifier().verify([Mock(spec=ProjectFile)])
+        mock_get_store.assert_not_called()
+
+
+class TestMavenVerifierCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = VerificationCache(max_memory_entries=8)
+        cache_patcher = patch('codellamas_backend.runtime.verifier.get_verification_cache', return_value=self.cache)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+        timeouts_patcher = patch('codellamas_backend.runtime.verifier.get_adaptive_timeouts', return_value=None)
+        timeouts_patcher.start()
+        self.addCleanup(timeouts_patcher.stop)
+
+        reactor_patcher = patch('codellamas_backend.runtime.verifier.get_reactor_batcher', return_value=None)
+        reactor_patcher.start()
+        self.addCleanup(reactor_patcher.stop)
+
+        maven_patcher = patch('codellamas_backend.runtime.verifier.MavenTool')
+        mock_maven_tool = maven_patcher.start()
+        self.addCleanup(maven_patcher.stop)
+        self.maven = mock_maven_tool.return_value
+        self.maven.mvn_cmd = "mvn"
+        self.maven.quiet = True
+
+        self.files = [ProjectFile(path="pom.xml", content="<project/>")]
+
+    def _maven_result(self, status="PASS", returncode=0):
+        result = Mock()
+        result.status = status
+        result.returncode = returncode
+        result.failed_tests = []
+        result.errors = []
+        result.raw_log_head = Mock(return_value="log")
+        result.test_cases = []
+        result.test_summary = Mock(return_value={})
+        result.estimated_startup_saving_sec = 0.0
+        result.diagnostics = []
+        return result
+
+    def test_second_identical_verify_served_from_cache(self):
+        self.maven.run_tests.return_value = self._maven_result()
+        verifier = MavenVerifier()
+
+        first = verifier.verify(self.files, injected_tests={"src/test/java/AppTest.java": "t"})
+        second = verifier.verify(self.files, injected_tests={"src/test/java/AppTest.java": "t"})
+
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.status, "PASS")
+        self.assertEqual(second.raw_log, "log")
+        self.maven.run_tests.assert_called_once()
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_different_injected_tests_miss(self):
+        self.maven.run_tests.return_value = self._maven_result()
+        verifier = MavenVerifier()
+
+        verifier.verify(self.files, injected_tests={"src/test/java/AppTest.java": "a"})
+        verifier.verify(self.files, injected_tests={"src/test/java/AppTest.java": "b"})
+
+        self.assertEqual(self.maven.run_tests.call_count, 2)
+
+    def test_profile_change_misses(self):
+        self.maven.run_tests.return_value = self._maven_result()
+        MavenVerifier().verify(self.files)
+        with patch.dict('os.environ', {'VERIFY_PROFILE_PARALLEL': 'classes'}):
+            MavenVerifier().verify(self.files)
+
+        self.assertEqual(self.maven.run_tests.call_count, 2)
+
+    def test_compile_check_cached_separately(self):
+        self.maven.compile_only.return_value = self._maven_result()
+        self.maven.run_tests.return_value = self._maven_result()
+        verifier = MavenVerifier()
+
+        compiled = verifier.verify_compile(self.files)
+        again = verifier.verify_compile(self.files)
+        tested = verifier.verify(self.files)
+
+        self.assertEqual(compiled.phase, "compile")
+        self.assertTrue(again.from_cache)
+        self.assertEqual(tested.phase, "test")
+        self.assertFalse(tested.from_cache)
+        self.assertEqual(self.maven.compile_only.call_count, 1)
+
+    def test_compile_failure_carries_diagnostics(self):
+        from codellamas_backend.tools.compiler_diagnostics import CompilerDiagnostic
+
+        result = self._maven_result(status="FAIL", returncode=1)
+        result.errors = ["Compilation error"]
+        result.diagnostics = [CompilerDiagnostic(path="src/main/java/App.java", line=3, column=9,
+                                                 severity="error", message="cannot find symbol")]
+        self.maven.compile_only.return_value = result
+
+        verification = MavenVerifier().verify_compile(self.files, injected_tests={"src/test/java/AppTest.java": "t"})
+
+        self.assertEqual(verification.status, "FAIL")
+        self.assertEqual(verification.diagnostics[0]["line"], 3)
+        self.maven.compile_only.assert_called_once_with(
+            project_files=self.files, override_files=[], inject_tests={"src/test/java/AppTest.java": "t"},
+            timeout_sec=600,
+        )
+
+    def test_compile_variants(self):
+        self.maven.compile_only.return_value = self._maven_result()
+        results = MavenVerifier().verify_compile_variants(
+            self.files, {"smelly": [ProjectFile(path="a.java", content="a")], "solution": []}
+        )
+        self.assertEqual(set(results), {"smelly", "solution"})
+        self.assertEqual(self.maven.compile_only.call_count, 2)
+
+    def test_timeouts_not_cached(self):
+        self.maven.run_tests.return_value = self._maven_result(status="FAIL", returncode=124)
+        verifier = MavenVerifier()
+
+        verifier.verify(self.files)
+        verifier.verify(self.files)
+
+        self.assertEqual(self.maven.run_tests.call_count, 2)
+
+    def test_dependency_failures_not_cached(self):
+        result = self._maven_result(status="FAIL", returncode=1)
+        result.errors = ["Dependency resolution error"]
+        self.maven.run_tests.return_value = result
+        verifier = MavenVerifier()
+
+        verifier.verify(self.files)
+        verifier.verify(self.files)
+
+        self.assertEqual(self.maven.run_tests.call_count, 2)
+
+    def test_verify_variants_runs_uncached_variants_together(self):
+        self.maven.run_test_variants.return_value = {
+            "smelly": self._maven_result(status="PASS"),
+            "solution": self._maven_result(status="FAIL", returncode=1),
+        }
+        verifier = MavenVerifier()
+
+        results = verifier.verify_variants(
+            self.files,
+            {
+                "smelly": [ProjectFile(path="src/main/java/App.java", content="smelly")],
+                "solution": [ProjectFile(path="src/main/java/App.java", content="clean")],
+            },
+            injected_tests={"src/test/java/AppTest.java": "t"},
+        )
+
+        self.assertEqual(list(results), ["smelly", "solution"])
+        self.assertEqual(results["smelly"].status, "PASS")
+        self.assertEqual(results["solution"].status, "FAIL")
+        self.maven.run_test_variants.assert_called_once()
+        self.maven.run_tests.assert_not_called()
+
+    def test_verify_variants_serves_cached_variant_and_runs_the_rest(self):
+        smelly = [ProjectFile(path="src/main/java/App.java", content="smelly")]
+        clean = [ProjectFile(path="src/main/java/App.java", content="clean")]
+        self.maven.run_tests.return_value = self._maven_result()
+        verifier = MavenVerifier()
+        verifier.verify(self.files, smelly)
+
+        results = verifier.verify_variants(self.files, {"smelly": smelly, "solution": clean})
+
+        self.assertTrue(results["smelly"].from_cache)
+        self.assertFalse(results["solution"].from_cache)
+        self.assertEqual(self.maven.run_tests.call_count, 2)
+        self.maven.run_test_variants.assert_not_called()
+
+
+class TestMavenVerifierScheduling(unittest.TestCase):
+    def setUp(self):
+        cache_patcher = patch('codellamas_backend.runtime.verifier.get_verification_cache', return_value=None)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+        timeouts_patcher = patch('codellamas_backend.runtime.verifier.get_adaptive_timeouts', return_value=None)
+        timeouts_patcher.start()
+        self.addCleanup(timeouts_patcher.stop)
+
+        reactor_patcher = patch('codellamas_backend.runtime.verifier.get_reactor_batcher', return_value=None)
+        reactor_patcher.start()
+        self.addCleanup(reactor_patcher.stop)
+
+        maven_patcher = patch('codellamas_backend.runtime.verifier.MavenTool')
+        self.maven = maven_patcher.start().return_value
+        self.addCleanup(maven_patcher.stop)
+
+        self.files = [ProjectFile(path="pom.xml", content="<project/>")]
+
+    def _maven_result(self, status="PASS"):
+        return MavenTestResult(status=status, returncode=0, failed_tests=[], errors=[], raw_log="log")
+
+    def test_verify_reports_queue_wait_and_exec_time(self):
+        from codellamas_backend.runtime.scheduler import VerificationScheduler
+
+        scheduler = VerificationScheduler(max_concurrent=1)
+        self.maven.run_tests.return_value = self._maven_result()
+        with patch('codellamas_backend.runtime.scheduler.get_verification_scheduler', return_value=scheduler):
+            result = MavenVerifier().verify(self.files)
+
+        self.assertEqual(result.status, "PASS")
+        self.assertGreaterEqual(result.exec_sec, 0.0)
+        self.assertGreaterEqual(result.queue_wait_sec, 0.0)
+        self.assertEqual(scheduler.stats()["admitted"], 1)
+
+    def test_verify_returns_error_when_queue_full(self):
+        from codellamas_backend.runtime.scheduler import VerificationQueueFull
+
+        slot = Mock(side_effect=VerificationQueueFull("Verification queue is full"))
+        with patch('codellamas_backend.runtime.verifier.verification_slot', slot):
+            result = MavenVerifier().verify(self.files)
+
+        self.assertEqual(result.status, "ERROR")
+        self.assertEqual(result.errors, ["Verification queue is full"])
+        self.maven.run_tests.assert_not_called()
+
+    def test_variants_take_one_slot_per_build(self):
+        from codellamas_backend.runtime.scheduler import VerificationScheduler
+
+        scheduler = VerificationScheduler(max_concurrent=4)
+        seen = {}
+
+        def run_test_variants(project_files, variants, inject_tests, timeout_sec):
+            seen["running"] = scheduler.stats()["running"]
+            return {name: self._maven_result() for name in variants}
+
+        self.maven.run_test_variants.side_effect = run_test_variants
+        with patch('codellamas_backend.runtime.scheduler.get_verification_scheduler', return_value=scheduler):
+            results = MavenVerifier().verify_variants(
+                self.files,
+                {"smelly": [ProjectFile(path="A.java", content="a")], "solution": [ProjectFile(path="A.java", content="b")]},
+            )
+
+        self.assertEqual(seen["running"], 2)
+        self.assertEqual(results["smelly"].status, "PASS")
+        self.assertGreaterEqual(results["solution"].exec_sec, 0.0)
+
+
+class TestMavenVerifierAsync(unittest.TestCase):
+    def setUp(self):
+        self.cache = VerificationCache(max_memory_entries=8)
+        cache_patcher = patch('codellamas_backend.runtime.verifier.get_verification_cache', return_value=self.cache)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+        timeouts_patcher = patch('codellamas_backend.runtime.verifier.get_adaptive_timeouts', return_value=None)
+        timeouts_patcher.start()
+        self.addCleanup(timeouts_patcher.stop)
+
+        reactor_patcher = patch('codellamas_backend.runtime.verifier.get_reactor_batcher', return_value=None)
+        reactor_patcher.start()
+        self.addCleanup(reactor_patcher.stop)
+
+        maven_patcher = patch('codellamas_backend.runtime.verifier.MavenTool')
+        self.maven = maven_patcher.start().return_value
+        self.addCleanup(maven_patcher.stop)
+        self.maven.mvn_cmd = "mvn"
+        self.maven.quiet = True
+        self.maven.run_tests_async = AsyncMock(
+            return_value=MavenTestResult(status="PASS", returncode=0, failed_tests=[], errors=[], raw_log="log")
+        )
+
+        self.files = [ProjectFile(path="pom.xml", content="<project/>")]
+
+    def test_verify_async_uses_async_maven_and_cache(self):
+        verifier = MavenVerifier()
+        first = asyncio.run(verifier.verify_async(self.files))
+        second = asyncio.run(verifier.verify_async(self.files))
+
+        self.assertEqual(first.status, "PASS")
+        self.assertEqual(first.backend, "maven")
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.maven.run_tests_async.assert_awaited_once()
+        self.maven.run_tests.assert_not_called()
+
+    @patch('codellamas_backend.runtime.verifier.get_bundle_store')
+    def test_verify_async_prefers_bundle(self, mock_store):
+        mock_store.return_value.run.return_value = MavenTestResult(
+            status="FAIL", returncode=1, failed_tests=["T.t"], errors=["Test failures"], raw_log="x"
+        )
+        result = asyncio.run(MavenVerifier().verify_async(self.files, use_bundle=True))
+
+        self.assertEqual(result.backend, "bundle")
+        self.assertEqual(result.failed_tests, ["T.t"])
+        self.maven.run_tests_async.assert_not_called()
+
+    @patch('codellamas_backend.runtime.verifier.get_bundle_store')
+    def test_verify_async_falls_back_when_bundle_missing(self, mock_store):
+        mock_store.return_value.run.return_value = None
+        result = asyncio.run(MavenVerifier().verify_async(self.files, use_bundle=True))
+
+        self.assertEqual(result.backend, "maven")
+        self.maven.run_tests_async.assert_awaited_once()
+
+    def test_verify_async_queue_full(self):
+        from codellamas_backend.runtime.scheduler import VerificationScheduler
+
+        scheduler = VerificationScheduler(max_concurrent=1, max_queue=0)
+        with patch('codellamas_backend.runtime.scheduler.get_verification_scheduler', return_value=scheduler):
+            with scheduler.slot():
+                result = asyncio.run(MavenVerifier().verify_async(self.files))
+
+        self.assertEqual(result.status, "ERROR")
+        self.assertIn("queue is full", result.errors[0])
+
+
+class TestMavenVerifierTimeouts(unittest.TestCase):
+    def setUp(self):
+        from codellamas_backend.runtime.timeouts import AdaptiveTimeouts
+
+        cache_patcher = patch('codellamas_backend.runtime.verifier.get_verification_cache', return_value=None)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+        self.timeouts = AdaptiveTimeouts(safety_factor=3, floor_sec=10, ceiling_sec=600, min_samples=2)
+        timeouts_patcher = patch('codellamas_backend.runtime.verifier.get_adaptive_timeouts', return_value=self.timeouts)
+        timeouts_patcher.start()
+        self.addCleanup(timeouts_patcher.stop)
+
+        reactor_patcher = patch('codellamas_backend.runtime.verifier.get_reactor_batcher', return_value=None)
+        reactor_patcher.start()
+        self.addCleanup(reactor_patcher.stop)
+
+        maven_patcher = patch('codellamas_backend.runtime.verifier.MavenTool')
+        self.maven = maven_patcher.start().return_value
+        self.addCleanup(maven_patcher.stop)
+
+        self.files = [ProjectFile(path="pom.xml", content="<project/>")]
+
+    def _maven_result(self, returncode=0, errors=None):
+        return MavenTestResult(
+            status="PASS" if returncode == 0 else "FAIL",
+            returncode=returncode, failed_tests=[], errors=errors or [], raw_log="log",
+        )
+
+    def _verify_taking(self, seconds, result=None):
+        def timed(verification, timing):
+            verification.exec_sec = seconds
+            return verification
+
+        self.maven.run_tests.return_value = result or self._maven_result()
+        with patch('codellamas_backend.runtime.verifier._timed', side_effect=timed):
+            return MavenVerifier(timeout_sec=180).verify(self.files)
+
+    def test_default_timeout_until_history(self):
+        result = self._verify_taking(4.0)
+        self.assertEqual(self.maven.run_tests.call_args[1]["timeout_sec"], 180)
+        self.assertEqual(result.timeout["basis"], "default")
+
+    def test_limit_follows_observed_durations(self):
+        self._verify_taking(4.0)
+        self._verify_taking(8.0)
+        result = self._verify_taking(5.0)
+
+        self.assertEqual(self.maven.run_tests.call_args[1]["timeout_sec"], 24.0)
+        self.assertEqual(result.timeout["basis"], "observed")
+        self.assertEqual(result.timeout["p99_sec"], 8.0)
+
+    def test_timed_out_run_recorded_as_cut_off(self):
+        self._verify_taking(4.0)
+        self._verify_taking(4.0)
+        result = self._verify_taking(12.0, self._maven_result(returncode=124, errors=["mvn test timed out after 12.0s"]))
+
+        self.assertTrue(result.timed_out)
+        histogram = self.timeouts.histogram(result.timeout["fingerprint"])
+        self.assertEqual(histogram["samples"], 2)
+        self.assertEqual(histogram["recent_cutoffs"][0]["limit_sec"], 12.0)
+
+    def test_compile_failures_are_not_samples(self):
+        result = self._verify_taking(0.5, self._maven_result(returncode=1, errors=["Compilation error"]))
+        self.assertIsNone(self.timeouts.histogram(result.timeout["fingerprint"]))
+
+    def test_compile_phase_has_its_own_history(self):
+        self.maven.compile_only.return_value = self._maven_result()
+        compiled = MavenVerifier().verify_compile(self.files)
+        tested = self._verify_taking(3.0)
+        self.assertNotEqual(compiled.timeout["fingerprint"], tested.timeout["fingerprint"])
+
+
+class TestMavenVerifierReactor(unittest.TestCase):
+    def setUp(self):
+        cache_patcher = patch('codellamas_backend.runtime.verifier.get_verification_cache', return_value=None)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+        timeouts_patcher = patch('codellamas_backend.runtime.verifier.get_adaptive_timeouts', return_value=None)
+        timeouts_patcher.start()
+        self.addCleanup(timeouts_patcher.stop)
+
+        self.batcher = Mock()
+        reactor_patcher = patch('codellamas_backend.runtime.verifier.get_reactor_batcher', return_value=self.batcher)
+        reactor_patcher.start()
+        self.addCleanup(reactor_patcher.stop)
+
+        maven_patcher = patch('codellamas_backend.runtime.verifier.MavenTool')
+        self.maven = maven_patcher.start().return_value
+        self.maven.reactor_eligible.return_value = True
+        self.addCleanup(maven_patcher.stop)
+
+        self.files = [ProjectFile(path="pom.xml", content="<project/>")]
+
+    def _reactor_outcome(self, status="PASS"):
+        from codellamas_backend.runtime.scheduler import SlotTiming
+
+        result = MavenTestResult(status=status, returncode=0 if status == "PASS" else 1,
+                                 failed_tests=[], errors=[], raw_log=status)
+        return result, SlotTiming(queue_wait_sec=0.2, exec_sec=4.0)
+
+    def test_verify_uses_reactor_result(self):
+        self.batcher.submit.return_value = self._reactor_outcome()
+        result = MavenVerifier(timeout_sec=200).verify(self.files)
+
+        self.assertEqual(result.backend, "reactor")
+        self.assertEqual(result.exec_sec, 4.0)
+        self.assertEqual(self.batcher.submit.call_args[0][2], 200)
+        self.maven.run_tests.assert_not_called()
+
+    def test_verify_falls_back_when_batch_declines(self):
+        self.batcher.submit.return_value = None
+        self.maven.run_tests.return_value = MavenTestResult(
+            status="PASS", returncode=0, failed_tests=[], errors=[], raw_log="alone"
+        )
+        result = MavenVerifier().verify(self.files)
+
+        self.assertEqual(result.backend, "maven")
+        self.maven.run_tests.assert_called_once()
+
+    def test_variants_submitted_separately(self):
+        outcomes = {"smelly": self._reactor_outcome("FAIL"), "solution": self._reactor_outcome("PASS")}
+        self.batcher.submit.side_effect = lambda tool, job, timeout, wait: outcomes[job.override_files[0].content]
+
+        results = MavenVerifier().verify_variants(self.files, {
+            "smelly": [ProjectFile(path="A.java", content="smelly")],
+            "solution": [ProjectFile(path="A.java", content="solution")],
+        })
+
+        self.assertEqual(results["smelly"].status, "FAIL")
+        self.assertEqual(results["solution"].status, "PASS")
+        self.assertEqual(self.batcher.submit.call_count, 2)
+        self.assertTrue(self.batcher.submit.call_args[1]["wait"])
+        self.maven.run_test_variants.assert_not_called()
+
+    def test_fast_path_projects_not_batched(self):
+        self.maven.reactor_eligible.return_value = False
+        self.maven.run_tests.return_value = MavenTestResult(
+            status="PASS", returncode=0, failed_tests=[], errors=[], raw_log="fast"
+        )
+        MavenVerifier().verify(self.files)
+        self.batcher.submit.assert_not_called()
+
+    def test_bundle_requests_not_batched(self):
+        with patch('codellamas_backend.runtime.verifier.get_bundle_store', return_value=None):
+            self.maven.run_tests.return_value = MavenTestResult(
+                status="PASS", returncode=0, failed_tests=[], errors=[], raw_log="x"
+            )
+            MavenVerifier().verify(self.files, use_bundle=True)
+        self.batcher.submit.assert_not_called()
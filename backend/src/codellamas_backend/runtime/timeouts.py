@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from codellamas_backend.schemas.files import ProjectFile
+
+
+# upper bounds (seconds) of the buckets reported by DurationHistogram.describe()
+BUCKETS_SEC = (1, 2, 5, 10, 20, 30, 60, 120, 300, 600, 1200)
+
+
+def project_fingerprint(
+    base_project: List[ProjectFile],
+    injected_tests: Optional[Dict[str, str]] = None,
+    phase: str = "test",
+) -> str:
+    """
+    Identity of an exercise for timing purposes: the pom, the file layout of
+    the base project and the injected test paths. Student edits change file
+    contents, not the fingerprint, so every attempt at one exercise shares a
+    histogram.
+    """
+    h = hashlib.sha256()
+    h.update(phase.encode("utf-8") + b"\0")
+    for f in sorted(base_project, key=lambda f: f.path):
+        h.update(f.path.encode("utf-8") + b"\0")
+        if f.path == "pom.xml":
+            h.update(f.content.encode("utf-8") + b"\0")
+    for path in sorted(injected_tests or {}):
+        h.update(b"test:" + path.encode("utf-8") + b"\0")
+    return h.hexdigest()[:16]
+
+
+@dataclass
+class TimeoutDecision:
+    fingerprint: str
+    limit_sec: float
+    basis: str                # observed | default | retry
+    p99_sec: Optional[float]  # observed p99 the limit was derived from
+    samples: int
+
+    def describe(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class DurationHistogram:
+    """Rolling window of completed run durations for one project, plus its recent cut-offs."""
+
+    def __init__(self, window: int = 200, history: int = 20):
+        self.durations: Deque[float] = deque(maxlen=window)
+        self.cutoffs: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.timed_out_last = False
+        self.timeouts = 0
+
+    def add(self, seconds: float) -> None:
+        self.durations.append(seconds)
+        self.timed_out_last = False
+
+    def cut_off(self, decision: TimeoutDecision, seconds: float) -> None:
+        self.cutoffs.append({**decision.describe(), "at": round(time.time(), 3), "elapsed_sec": seconds})
+        self.timed_out_last = True
+        self.timeouts += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.durations:
+            return None
+        ordered = sorted(self.durations)
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+    def describe(self) -> Dict[str, Any]:
+        buckets: Dict[str, int] = {f"le_{bound}": 0 for bound in BUCKETS_SEC}
+        buckets["inf"] = 0
+        for seconds in self.durations:
+            bound = next((b for b in BUCKETS_SEC if seconds <= b), None)
+            buckets[f"le_{bound}" if bound is not None else "inf"] += 1
+        return {
+            "samples": len(self.durations),
+            "p50_sec": self.percentile(0.5),
+            "p95_sec": self.percentile(0.95),
+            "p99_sec": self.percentile(0.99),
+            "max_sec": max(self.durations) if self.durations else None,
+            "buckets": buckets,
+            "timeouts": self.timeouts,
+            "recent_cutoffs": list(self.cutoffs),
+        }
+
+
+class AdaptiveTimeouts:
+    """
+    Verification timeouts derived from how long each project actually takes:
+    p99 of its recent completed runs times safety_factor, clamped to
+    [floor_sec, ceiling_sec] and never above the caller's timeout. Until a
+    project has min_samples runs, and for the one run after a cut-off, the
+    caller's timeout applies instead.
+
+    Runs that time out or fail to compile are not samples: the first says
+    nothing about the true duration, the second stops before any test runs.
+    """
+
+    def __init__(
+        self,
+        safety_factor: float = 3.0,
+        floor_sec: float = 30.0,
+        ceiling_sec: float = 600.0,
+        min_samples: int = 5,
+        window: int = 200,
+        max_projects: int = 1024,
+    ):
+        self.safety_factor = safety_factor
+        self.floor_sec = floor_sec
+        self.ceiling_sec = ceiling_sec
+        self.min_samples = max(1, min_samples)
+        self.window = window
+        self.max_projects = max_projects
+        self._lock = threading.Lock()
+        self._projects: "OrderedDict[str, DurationHistogram]" = OrderedDict()
+
+    def timeout_for(self, fingerprint: str, default_sec: float) -> TimeoutDecision:
+        with self._lock:
+            histogram = self._projects.get(fingerprint)
+            if histogram is None:
+                return TimeoutDecision(fingerprint, float(default_sec), "default", None, 0)
+            self._projects.move_to_end(fingerprint)
+            samples = len(histogram.durations)
+            p99 = histogram.percentile(0.99)
+            if histogram.timed_out_last:
+                # one retry: the fingerprint ignores student code, so a hung
+                # submission must not loosen the limit for later ones
+                histogram.timed_out_last = False
+                return TimeoutDecision(fingerprint, float(default_sec), "retry", p99, samples)
+            if samples < self.min_samples:
+                return TimeoutDecision(fingerprint, float(default_sec), "default", p99, samples)
+            ceiling = min(self.ceiling_sec, default_sec)
+            limit = min(ceiling, max(self.floor_sec, p99 * self.safety_factor))
+            return TimeoutDecision(fingerprint, round(limit, 3), "observed", p99, samples)
+
+    def record(self, decision: TimeoutDecision, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            histogram = self._projects.get(decision.fingerprint)
+            if histogram is None:
+                histogram = self._projects[decision.fingerprint] = DurationHistogram(self.window)
+                while len(self._projects) > self.max_projects:
+                    self._projects.popitem(last=False)
+            self._projects.move_to_end(decision.fingerprint)
+            if timed_out:
+                histogram.cut_off(decision, seconds)
+            else:
+                histogram.add(seconds)
+
+    def histogram(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            histogram = self._projects.get(fingerprint)
+            return histogram.describe() if histogram is not None else None
+
+    def stats(self, recent: int = 20) -> Dict[str, Any]:
+        with self._lock:
+            fingerprints = list(reversed(self._projects))[:recent]
+            return {
+                "enabled": True,
+                "safety_factor": self.safety_factor,
+                "floor_sec": self.floor_sec,
+                "ceiling_sec": self.ceiling_sec,
+                "min_samples": self.min_samples,
+                "projects": len(self._projects),
+                "timeouts": sum(h.timeouts for h in self._projects.values()),
+                "recent": {fp: self._projects[fp].describe() for fp in fingerprints},
+            }
+
+
+_timeouts: Optional[AdaptiveTimeouts] = None
+_timeouts_lock = threading.Lock()
+
+
+def get_adaptive_timeouts() -> Optional[AdaptiveTimeouts]:
+    """
+    Process-wide timing history shared by every MavenVerifier instance.
+    Disabled with VERIFY_ADAPTIVE_TIMEOUTS=0, which leaves every caller's
+    fixed timeout in place. VERIFY_TIMEOUT_FACTOR, VERIFY_TIMEOUT_FLOOR_SEC,
+    VERIFY_TIMEOUT_CEILING_SEC and VERIFY_TIMEOUT_MIN_SAMPLES tune it.
+    """
+    global _timeouts
+    if os.getenv("VERIFY_ADAPTIVE_TIMEOUTS", "1") == "0":
+        return None
+    with _timeouts_lock:
+        if _timeouts is None:
+            _timeouts = AdaptiveTimeouts(
+                safety_factor=float(os.getenv("VERIFY_TIMEOUT_FACTOR", "3")),
+                floor_sec=float(os.getenv("VERIFY_TIMEOUT_FLOOR_SEC", "30")),
+                ceiling_sec=float(os.getenv("VERIFY_TIMEOUT_CEILING_SEC", "600")),
+                min_samples=int(os.getenv("VERIFY_TIMEOUT_MIN_SAMPLES", "5")),
+            )
+        return _timeouts
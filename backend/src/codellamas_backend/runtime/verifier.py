@@ -1,9 +1,24 @@
+import asyncio
 import os
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Dict, Optional, Tuple
+from dataclasses import dataclass, asdict, field
 
-from codellamas_backend.tools.maven_tool import MavenTool
+from codellamas_backend.tools.maven_tool import MavenTool, MavenTestResult
+from codellamas_backend.runtime.jvm_pool import get_jvm_pool
+from codellamas_backend.runtime.bundles import get_bundle_store
+from codellamas_backend.runtime.cache import get_verification_cache, verification_cache_key
+from codellamas_backend.runtime.reactor import get_reactor_batcher
+from codellamas_backend.runtime.timeouts import TimeoutDecision, get_adaptive_timeouts, project_fingerprint
+from codellamas_backend.runtime.scheduler import (
+    SlotTiming,
+    VerificationQueueFull,
+    async_verification_slot,
+    verification_slot,
+)
 from codellamas_backend.schemas.files import ProjectFile
+from codellamas_backend.tools.maven_reactor import ReactorJob
+from codellamas_backend.tools.verification_profile import verification_profile_from_env
 
 
 @dataclass
@@ -12,6 +27,17 @@ class VerificationResult:
     failed_tests: List[str]
     errors: List[str]
     raw_log: str
+    backend: str = "maven"      # maven | jvm_pool | bundle | reactor
+    from_cache: bool = False
+    test_cases: List[Dict[str, Any]] = field(default_factory=list)   # per-test class/method/status/duration/message/trace
+    test_summary: Dict[str, Any] = field(default_factory=dict)       # totals derived from test_cases
+    queue_wait_sec: float = 0.0  # time spent waiting for a verification slot
+    exec_sec: float = 0.0        # time spent verifying once admitted
+    estimated_startup_saving_sec: float = 0.0  # JVM startup time saved by CDS archives
+    phase: str = "test"         # test | compile (verify_compile)
+    diagnostics: List[Dict[str, Any]] = field(default_factory=list)  # path/line/column/severity/message/details
+    timed_out: bool = False
+    timeout: Dict[str, Any] = field(default_factory=dict)  # the TimeoutDecision the run was given
 
     def summary(self) -> str:
         return self.raw_log[:4000]
@@ -26,30 +52,458 @@ class MavenVerifier:
     - Inject / override code and tests
     - Run mvn test (includes compilation)
     - Return structured, comparable results
+
+    Set VERIFY_BACKEND=jvm_pool to run JUnit-only projects on the warm JVM
+    worker pool instead; anything the pool cannot handle still uses Maven.
+
+    Results are cached by content hash (see runtime.cache), so re-verifying
+    an identical file set returns the earlier result without running Maven.
+
+    verify(use_bundle=True) first tries the exercise's prebuilt verification
+    bundle (see runtime.bundles), which only compiles the overridden files.
+
+    Everything that is not answered from the cache waits for a slot of the
+    process-wide verification scheduler (see runtime.scheduler) first.
+
+    verify_async is the awaitable equivalent of verify; Maven then runs as an
+    asyncio subprocess (MavenTool.run_tests_async) instead of on a thread.
+
+    Maven and the javac fast path run with the deployment's verification
+    profile (see tools.verification_profile) unless VERIFY_PROFILE=0.
+
+    verify_compile only compiles (MavenTool.compile_only); fix loops use it to
+    reject code that does not compile before paying for a full test run.
+
+    timeout_sec is the limit until the project has a timing history; after
+    that the limit follows its observed durations (see runtime.timeouts).
+    Every result records the limit it ran under and how it was chosen.
+
+    Maven verifications that arrive together (e.g. the variants of many
+    exercises generated at once) are built as modules of one reactor (see
+    runtime.reactor) unless VERIFY_REACTOR=0.
     """
 
-    def __init__(self, timeout_sec: int = 600, quiet: bool = True):
+    def __init__(self, timeout_sec: int = 600, quiet: bool = True, backend: Optional[str] = None):
         mvn_cmd = os.getenv("MAVEN_CMD", "")  # empty triggers auto-detect
-        self.maven = MavenTool(mvn_cmd=mvn_cmd, timeout_sec=timeout_sec, quiet=quiet)
+        self.profile = verification_profile_from_env()
+        self.maven = MavenTool(mvn_cmd=mvn_cmd, timeout_sec=timeout_sec, quiet=quiet, profile=self.profile)
+        self.timeout_sec = timeout_sec
+        self.backend = (backend or os.getenv("VERIFY_BACKEND", "maven")).lower()
 
     def verify(
         self,
         base_project: List[ProjectFile],
         override_files: Optional[List[ProjectFile]] = None,
         injected_tests: Optional[Dict[str, str]] = None,
+        use_bundle: bool = False,
     ) -> VerificationResult:
         override_files = override_files or []
         injected_tests = injected_tests or {}
 
-        result = self.maven.run_tests(
-            project_files=base_project,
-            override_files=override_files,
-            inject_tests=injected_tests,
-        )
+        cache_key = self._cache_key(base_project, override_files, injected_tests)
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
+
+        decision = self._timeout(base_project, injected_tests)
+        if not use_bundle:
+            batched = self._batched(base_project, {"": override_files}, injected_tests, decision).get("")
+            if batched is not None:
+                return self._observe(self._finish_batched(cache_key, batched), decision)
+
+        try:
+            with verification_slot() as timing:
+                verification = None
+                if use_bundle:
+                    store = get_bundle_store()
+                    result = (
+                        store.run(base_project, override_files, injected_tests, timeout_sec=decision.limit_sec)
+                        if store is not None
+                        else None
+                    )
+                    if result is not None:
+                        verification = self._finish(cache_key, result, "bundle")
+                if verification is None:
+                    verification = self._run_one(
+                        cache_key, base_project, override_files, injected_tests, decision.limit_sec
+                    )
+        except VerificationQueueFull as e:
+            return _rejected(e)
+        return self._observe(_timed(verification, timing), decision)
+
+    async def verify_async(
+        self,
+        base_project: List[ProjectFile],
+        override_files: Optional[List[ProjectFile]] = None,
+        injected_tests: Optional[Dict[str, str]] = None,
+        use_bundle: bool = False,
+    ) -> VerificationResult:
+        override_files = override_files or []
+        injected_tests = injected_tests or {}
+
+        # the cache's disk tier is read and written on worker threads
+        cache_key = self._cache_key(base_project, override_files, injected_tests)
+        cached = await asyncio.to_thread(self._cached, cache_key)
+        if cached is not None:
+            return cached
+
+        decision = self._timeout(base_project, injected_tests)
+        if not use_bundle:
+            outcomes = await asyncio.to_thread(
+                self._batched, base_project, {"": override_files}, injected_tests, decision
+            )
+            if "" in outcomes:
+                verification = await asyncio.to_thread(self._finish_batched, cache_key, outcomes[""])
+                return self._observe(verification, decision)
+
+        try:
+            async with async_verification_slot() as timing:
+                result, backend = None, "maven"
+                if use_bundle:
+                    store = get_bundle_store()
+                    if store is not None:
+                        result = await asyncio.to_thread(
+                            store.run, base_project, override_files, injected_tests, timeout_sec=decision.limit_sec
+                        )
+                        backend = "bundle"
+                if result is None and self._use_pool(base_project, override_files):
+                    result = await asyncio.to_thread(
+                        get_jvm_pool().run_tests,
+                        project_files=base_project,
+                        override_files=override_files,
+                        inject_tests=injected_tests,
+                        timeout_sec=decision.limit_sec,
+                    )
+                    backend = "jvm_pool"
+                if result is None:
+                    result = await self.maven.run_tests_async(
+                        project_files=base_project,
+                        override_files=override_files,
+                        inject_tests=injected_tests,
+                        timeout_sec=decision.limit_sec,
+                    )
+                    backend = "maven"
+                verification = await asyncio.to_thread(self._finish, cache_key, result, backend)
+        except VerificationQueueFull as e:
+            return _rejected(e)
+        return self._observe(_timed(verification, timing), decision)
+
+    def verify_compile(
+        self,
+        base_project: List[ProjectFile],
+        override_files: Optional[List[ProjectFile]] = None,
+        injected_tests: Optional[Dict[str, str]] = None,
+    ) -> VerificationResult:
+        """Compile-only check; a FAIL carries the compiler errors in `diagnostics`."""
+        override_files = override_files or []
+        injected_tests = injected_tests or {}
+
+        cache_key = self._cache_key(base_project, override_files, injected_tests, phase="compile")
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
+
+        decision = self._timeout(base_project, injected_tests, phase="compile")
+        try:
+            with verification_slot() as timing:
+                result = self.maven.compile_only(
+                    project_files=base_project,
+                    override_files=override_files,
+                    inject_tests=injected_tests,
+                    timeout_sec=decision.limit_sec,
+                )
+                verification = self._finish(cache_key, result, "maven", phase="compile")
+        except VerificationQueueFull as e:
+            return _rejected(e)
+        return self._observe(_timed(verification, timing), decision)
+
+    def verify_compile_variants(
+        self,
+        base_project: List[ProjectFile],
+        variants: Dict[str, List[ProjectFile]],
+        injected_tests: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, VerificationResult]:
+        """verify_compile for several override variants, compiled concurrently."""
+        if len(variants) <= 1:
+            return {
+                name: self.verify_compile(base_project, files, injected_tests)
+                for name, files in variants.items()
+            }
+        with ThreadPoolExecutor(max_workers=len(variants)) as executor:
+            futures = {
+                name: executor.submit(self.verify_compile, base_project, files, injected_tests)
+                for name, files in variants.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
+
+    def _run_one(
+        self,
+        cache_key: Optional[str],
+        base_project: List[ProjectFile],
+        override_files: List[ProjectFile],
+        injected_tests: Dict[str, str],
+        timeout_sec: float,
+    ) -> VerificationResult:
+        result = None
+        backend = "maven"
+
+        if self._use_pool(base_project, override_files):
+            result = get_jvm_pool().run_tests(
+                project_files=base_project,
+                override_files=override_files,
+                inject_tests=injected_tests,
+                timeout_sec=timeout_sec,
+            )
+            backend = "jvm_pool"
+
+        if result is None:
+            result = self.maven.run_tests(
+                project_files=base_project,
+                override_files=override_files,
+                inject_tests=injected_tests,
+                timeout_sec=timeout_sec,
+            )
+            backend = "maven"
+
+        return self._finish(cache_key, result, backend)
+
+    def verify_variants(
+        self,
+        base_project: List[ProjectFile],
+        variants: Dict[str, List[ProjectFile]],
+        injected_tests: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, VerificationResult]:
+        """
+        Verifies several override variants (e.g. smelly and solution) against
+        one base project and one set of injected tests. Cached variants are
+        answered immediately; the rest share one prepared workspace and run
+        concurrently. Returns one result per variant name.
+        """
+        injected_tests = injected_tests or {}
+        results: Dict[str, VerificationResult] = {}
+        pending: Dict[str, List[ProjectFile]] = {}
+        keys: Dict[str, Optional[str]] = {}
+
+        for name, override_files in variants.items():
+            override_files = override_files or []
+            keys[name] = self._cache_key(base_project, override_files, injected_tests)
+            cached = self._cached(keys[name])
+            if cached is not None:
+                results[name] = cached
+            else:
+                pending[name] = override_files
+
+        if not pending:
+            return {name: results[name] for name in variants}
+
+        decision = self._timeout(base_project, injected_tests)
+        for name, batched in self._batched(base_project, pending, injected_tests, decision).items():
+            results[name] = self._finish_batched(keys[name], batched)
+            results[name].timeout = decision.describe()
+            del pending[name]
+        if not pending:
+            return {name: results[name] for name in variants}
+
+        try:
+            with verification_slot(weight=len(pending)) as timing:
+                results.update(self._run_variants(keys, base_project, pending, injected_tests, decision.limit_sec))
+        except VerificationQueueFull as e:
+            results.update({name: _rejected(e) for name in pending})
+        else:
+            for name in pending:
+                _timed(results[name], timing)
+                results[name].timeout = decision.describe()
+            # the variants ran side by side: one sample for the batch, a cut-off if any was cut off
+            batch = [results[name] for name in pending]
+            self._observe(next((v for v in batch if v.timed_out), batch[0]), decision)
+
+        return {name: results[name] for name in variants}
+
+    def _run_variants(
+        self,
+        keys: Dict[str, Optional[str]],
+        base_project: List[ProjectFile],
+        pending: Dict[str, List[ProjectFile]],
+        injected_tests: Dict[str, str],
+        timeout_sec: float,
+    ) -> Dict[str, VerificationResult]:
+        results: Dict[str, VerificationResult] = {}
+        if len(pending) == 1:
+            (name, override_files), = pending.items()
+            results[name] = self._run_one(keys[name], base_project, override_files, injected_tests, timeout_sec)
+        else:
+            pooled = {
+                name: files for name, files in pending.items()
+                if self._use_pool(base_project, files)
+            }
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                pool_futures = {
+                    name: executor.submit(
+                        get_jvm_pool().run_tests,
+                        project_files=base_project,
+                        override_files=files,
+                        inject_tests=injected_tests,
+                        timeout_sec=timeout_sec,
+                    )
+                    for name, files in pooled.items()
+                }
+                maven_variants = {n: f for n, f in pending.items() if n not in pooled}
+                maven_results = (
+                    self.maven.run_test_variants(
+                        project_files=base_project,
+                        variants=maven_variants,
+                        inject_tests=injected_tests,
+                        timeout_sec=timeout_sec,
+                    )
+                    if maven_variants
+                    else {}
+                )
+                for name, future in pool_futures.items():
+                    result, backend = future.result(), "jvm_pool"
+                    if result is None:
+                        result = self.maven.run_tests(
+                            project_files=base_project,
+                            override_files=pooled[name],
+                            inject_tests=injected_tests,
+                            timeout_sec=timeout_sec,
+                        )
+                        backend = "maven"
+                    results[name] = self._finish(keys[name], result, backend)
+            for name, result in maven_results.items():
+                results[name] = self._finish(keys[name], result, "maven")
+        return results
+
+    def _batched(
+        self,
+        base_project: List[ProjectFile],
+        variants: Dict[str, List[ProjectFile]],
+        injected_tests: Dict[str, str],
+        decision: TimeoutDecision,
+    ) -> Dict[str, Tuple[MavenTestResult, SlotTiming]]:
+        """Submits the Maven-bound variants to the reactor batcher; returns those it verified."""
+        batcher = get_reactor_batcher()
+        if batcher is None:
+            return {}
+        eligible = {
+            name: files for name, files in variants.items()
+            if not self._use_pool(base_project, files) and self.maven.reactor_eligible(base_project, files)
+        }
 
-        return VerificationResult(
+        def submit(files: List[ProjectFile]):
+            job = ReactorJob(base_project, files, injected_tests)
+            return batcher.submit(self.maven, job, decision.limit_sec, wait=len(eligible) > 1 or None)
+
+        if len(eligible) <= 1:
+            outcomes = {name: submit(files) for name, files in eligible.items()}
+        else:
+            with ThreadPoolExecutor(max_workers=len(eligible)) as executor:
+                futures = {name: executor.submit(submit, files) for name, files in eligible.items()}
+                outcomes = {name: future.result() for name, future in futures.items()}
+        return {name: outcome for name, outcome in outcomes.items() if outcome is not None}
+
+    def _finish_batched(
+        self, cache_key: Optional[str], batched: Tuple[MavenTestResult, SlotTiming]
+    ) -> VerificationResult:
+        result, timing = batched
+        return _timed(self._finish(cache_key, result, "reactor"), timing)
+
+    def _use_pool(self, base_project: List[ProjectFile], override_files: List[ProjectFile]) -> bool:
+        return self.backend == "jvm_pool" and get_jvm_pool().supports(base_project, override_files)
+
+    def _cache_key(
+        self,
+        base_project: List[ProjectFile],
+        override_files: List[ProjectFile],
+        injected_tests: Dict[str, str],
+        phase: str = "test",
+    ) -> Optional[str]:
+        if get_verification_cache() is None:
+            return None
+        options = {
+            "mvn_cmd": self.maven.mvn_cmd,
+            "quiet": self.maven.quiet,
+            "backend": self.backend,
+            "profile": self.profile.describe() if self.profile else None,
+        }
+        if phase != "test":
+            options["phase"] = phase
+        return verification_cache_key(base_project, override_files, injected_tests, options=options)
+
+    def _cached(self, cache_key: Optional[str]) -> Optional[VerificationResult]:
+        cache = get_verification_cache()
+        if cache is None or cache_key is None:
+            return None
+        cached = cache.get(cache_key)
+        if cached is None:
+            return None
+        return VerificationResult(**{**cached, "from_cache": True, "estimated_startup_saving_sec": 0.0, "timeout": {}})
+
+    def _timeout(
+        self, base_project: List[ProjectFile], injected_tests: Dict[str, str], phase: str = "test"
+    ) -> TimeoutDecision:
+        timeouts = get_adaptive_timeouts()
+        if timeouts is None:
+            return TimeoutDecision(fingerprint="", limit_sec=self.timeout_sec, basis="fixed", p99_sec=None, samples=0)
+        return timeouts.timeout_for(project_fingerprint(base_project, injected_tests, phase), self.timeout_sec)
+
+    def _observe(self, verification: VerificationResult, decision: TimeoutDecision) -> VerificationResult:
+        """Attaches the timeout decision and feeds the run's duration back into the history."""
+        verification.timeout = decision.describe()
+        timeouts = get_adaptive_timeouts()
+        if (
+            timeouts is not None
+            and decision.fingerprint
+            and verification.status != "ERROR"
+            # bundle runs skip most of the build and reactor runs share it:
+            # neither says how long the project takes on its own
+            and verification.backend not in ("bundle", "reactor")
+            and (verification.timed_out or "Compilation error" not in verification.errors)
+        ):
+            timeouts.record(decision, verification.exec_sec, timed_out=verification.timed_out)
+        return verification
+
+    def _finish(
+        self, cache_key: Optional[str], result: MavenTestResult, backend: str, phase: str = "test"
+    ) -> VerificationResult:
+        verification = VerificationResult(
             status=result.status,
             failed_tests=result.failed_tests,
             errors=result.errors,
             raw_log=result.raw_log_head(8000),
+            backend=backend,
+            test_cases=[asdict(case) for case in result.test_cases],
+            test_summary=result.test_summary(),
+            estimated_startup_saving_sec=result.estimated_startup_saving_sec,
+            phase=phase,
+            diagnostics=[asdict(d) for d in result.diagnostics],
+            timed_out=result.returncode == 124,
         )
+
+        # timeouts, infrastructure errors and unresolved dependencies say
+        # nothing about the code itself
+        cache = get_verification_cache()
+        if (
+            cache is not None
+            and cache_key is not None
+            and result.returncode != 124
+            and result.status != "ERROR"
+            and "Dependency resolution error" not in result.errors
+        ):
+            cache.put(cache_key, {**asdict(verification), "from_cache": False})
+
+        return verification
+
+
+def compile_preflight_enabled() -> bool:
+    """Whether fix loops check compilation before the full test run (VERIFY_COMPILE_PREFLIGHT=0 disables)."""
+    return os.getenv("VERIFY_COMPILE_PREFLIGHT", "1") != "0"
+
+
+def _timed(verification: VerificationResult, timing: SlotTiming) -> VerificationResult:
+    verification.queue_wait_sec = timing.queue_wait_sec
+    verification.exec_sec = timing.exec_sec
+    return verification
+
+
+def _rejected(error: VerificationQueueFull) -> VerificationResult:
+    return VerificationResult(status="ERROR", failed_tests=[], errors=[str(error)], raw_log="")
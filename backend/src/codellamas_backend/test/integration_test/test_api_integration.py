@@ -1,6 +1,6 @@
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 from codellamas_backend.api import app
 from codellamas_backend.crews.crew_single import SpringBootExercise
@@ -60,9 +60,10 @@ class TestGenerateEndpointIntegration:
     """Mocks LLM but uses real FastAPI routing, validation, file saving"""
 
     @patch("codellamas_backend.api.save_exercise_to_repo", return_value="/tmp/saved")
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
-    @patch("codellamas_backend.api.generate_single_implementation_with_retries")
-    @patch("codellamas_backend.api.generate_single_contract")
+    @patch("codellamas_backend.api.run_maven_verification_variants",
+           return_value={"smelly": {"enabled": False}, "solution": {"enabled": False}})
+    @patch("codellamas_backend.api.generate_single_implementation_with_retries_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock)
     @patch("codellamas_backend.api.get_backend")
     def test_generate_returns_200(
         self, mock_backend, mock_contract, mock_impl, mock_maven, mock_save
@@ -82,9 +83,10 @@ class TestGenerateEndpointIntegration:
         assert response.status_code == 200
 
     @patch("codellamas_backend.api.save_exercise_to_repo", return_value="/tmp/saved")
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
-    @patch("codellamas_backend.api.generate_single_implementation_with_retries")
-    @patch("codellamas_backend.api.generate_single_contract")
+    @patch("codellamas_backend.api.run_maven_verification_variants",
+           return_value={"smelly": {"enabled": False}, "solution": {"enabled": False}})
+    @patch("codellamas_backend.api.generate_single_implementation_with_retries_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock)
     @patch("codellamas_backend.api.get_backend")
     def test_generate_response_has_data(
         self, mock_backend, mock_contract, mock_impl, mock_maven, mock_save
@@ -126,9 +128,10 @@ class TestGenerateEndpointIntegration:
         assert response.status_code == 422
 
     @patch("codellamas_backend.api.save_exercise_to_repo", return_value="/tmp/saved")
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
-    @patch("codellamas_backend.api.generate_single_implementation_with_retries")
-    @patch("codellamas_backend.api.generate_single_contract")
+    @patch("codellamas_backend.api.run_maven_verification_variants",
+           return_value={"smelly": {"enabled": False}, "solution": {"enabled": False}})
+    @patch("codellamas_backend.api.generate_single_implementation_with_retries_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock)
     @patch("codellamas_backend.api.get_backend")
     def test_generate_count_2_returns_results_list(
         self, mock_backend, mock_contract, mock_impl, mock_maven, mock_save
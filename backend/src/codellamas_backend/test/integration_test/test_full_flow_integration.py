@@ -1,6 +1,6 @@
 import pytest
 import tempfile
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from fastapi.testclient import TestClient
 
 from codellamas_backend.api import app
@@ -51,9 +51,10 @@ class TestFullFlowIntegration:
 
     @patch("codellamas_backend.api.append_to_csv")
     @patch("codellamas_backend.api.save_exercise_to_repo")
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
-    @patch("codellamas_backend.api.generate_single_implementation_with_retries")
-    @patch("codellamas_backend.api.generate_single_contract")
+    @patch("codellamas_backend.api.run_maven_verification_variants",
+           return_value={"smelly": {"enabled": False}, "solution": {"enabled": False}})
+    @patch("codellamas_backend.api.generate_single_implementation_with_retries_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock)
     @patch("codellamas_backend.api.CodellamasBackend")
     @patch("codellamas_backend.api.get_backend")
     def test_generate_then_review(
@@ -100,9 +101,9 @@ class TestFullFlowIntegration:
 
     @patch("codellamas_backend.api.append_to_csv")
     @patch("codellamas_backend.api.save_exercise_to_repo")
-    @patch("codellamas_backend.api.run_maven_verification")
-    @patch("codellamas_backend.api.generate_single_implementation_with_retries")
-    @patch("codellamas_backend.api.generate_single_contract")
+    @patch("codellamas_backend.api.run_maven_verification_variants")
+    @patch("codellamas_backend.api.generate_single_implementation_with_retries_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock)
     @patch("codellamas_backend.api.get_backend")
     def test_generate_with_maven_verification(
         self, mock_backend, mock_contract, mock_impl,
@@ -110,13 +111,14 @@ class TestFullFlowIntegration:
     ):
         exercise = make_exercise()
         mock_save.return_value = "/tmp/saved"
-        mock_maven.return_value = {
+        passed = {
             "enabled": True,
             "status": "PASS",
             "failed_tests": [],
             "errors": [],
             "raw_log_head": "BUILD SUCCESS",
         }
+        mock_maven.return_value = {"smelly": passed, "solution": passed}
         mock_contract.return_value = ContractSpec(
             problem_description="Fix god class",
             test_files=exercise.test_files,
@@ -135,10 +137,10 @@ class TestFullFlowIntegration:
 
     @patch("codellamas_backend.api.append_to_csv")
     @patch("codellamas_backend.api.save_exercise_to_repo")
-    @patch("codellamas_backend.api.run_maven_verification",
-           return_value={"enabled": False})
-    @patch("codellamas_backend.api.generate_single_implementation_with_retries")
-    @patch("codellamas_backend.api.generate_single_contract")
+    @patch("codellamas_backend.api.run_maven_verification_variants",
+           return_value={"smelly": {"enabled": False}, "solution": {"enabled": False}})
+    @patch("codellamas_backend.api.generate_single_implementation_with_retries_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock)
     @patch("codellamas_backend.api.get_backend")
     def test_generated_exercise_saved_to_disk(
         self, mock_backend, mock_contract, mock_impl,
@@ -164,10 +166,10 @@ class TestFullFlowIntegration:
 
     @patch("codellamas_backend.api.append_to_csv")
     @patch("codellamas_backend.api.save_exercise_to_repo")
-    @patch("codellamas_backend.api.run_maven_verification",
-           return_value={"enabled": False})
-    @patch("codellamas_backend.api.generate_single_implementation_with_retries")
-    @patch("codellamas_backend.api.generate_single_contract")
+    @patch("codellamas_backend.api.run_maven_verification_variants",
+           return_value={"smelly": {"enabled": False}, "solution": {"enabled": False}})
+    @patch("codellamas_backend.api.generate_single_implementation_with_retries_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock)
     @patch("codellamas_backend.api.get_backend")
     def test_exercise_data_structure_is_complete(
         self, mock_backend, mock_contract, mock_impl,
@@ -160,7 +160,7 @@ class TestCodellamasBackendMultiVerifyIntegration:
 
     def setup_method(self):
         from unittest.mock import patch
-        with patch("codellamas_backend.crews.crew_multi.LLM"):
+        with patch("codellamas_backend.crews.crew_multi.CachedLLM"):
             with patch.object(
                 CodellamasBackendMulti,
                 "test_runner",
@@ -241,7 +241,7 @@ class TestBuildReferenceOverrideFilesIntegration:
     def setup_method(self):
         from unittest.mock import patch, MagicMock
         from crewai import Agent
-        with patch("codellamas_backend.crews.crew_multi.LLM"):
+        with patch("codellamas_backend.crews.crew_multi.CachedLLM"):
             with patch.object(
                 CodellamasBackendMulti,
                 "test_runner",
@@ -10,7 +10,7 @@ from codellamas_backend.crews.crew_single import (
 
 
 def make_backend():
-    with patch("codellamas_backend.crews.crew_single.LLM"):
+    with patch("codellamas_backend.crews.crew_single.CachedLLM"):
         return CodellamasBackend()
 
 
@@ -1,14 +1,17 @@
+import asyncio
 import os
 import csv
 import json
 import pytest
 import tempfile
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from codellamas_backend.schemas.files import ProjectFile
 
+from codellamas_backend.crews.backend_pool import BackendPool
+from codellamas_backend.crews.llm_cache import current_llm_cache_scope
 from codellamas_backend.crews.crew_single import (
     ContractSpec,
     ImplementationSpec,
@@ -19,6 +22,9 @@ from codellamas_backend.api import (
     ingest_code_smells,
     normalize_project_files,
     run_maven_verification,
+    run_maven_verification_async,
+    run_maven_verification_variants,
+    run_compile_preflight_variants,
     build_solution_override_files,
     should_retry_single_generation,
     build_maven_failure_context,
@@ -28,15 +34,20 @@ from codellamas_backend.api import (
     validate_exercise_payload,
     compose_exercise,
     get_backend,
+    release_backend,
     append_to_csv,
     save_exercise_to_repo,
     default_base_project_files,
     build_preflight_failure_context,
-    generate_single_contract,
+    generate_single_contract_async,
+    start_maven_warmup,
+    prepare_review_bundle,
     app,
-    _execute_single_generation,
+    _execute_single_generation_async,
+    _execute_fan_out_generation_async,
+    _generate_shared_contract_async,
     GenerateRequest,
-    generate_single_implementation_with_retries,
+    generate_single_implementation_with_retries_async,
 
 )
 client = TestClient(app)
@@ -65,6 +76,10 @@ def make_exercise(**kwargs) -> SpringBootExercise:
     return SpringBootExercise(**{**defaults, **kwargs})
 
 
+def variants_of(verification: dict) -> dict:
+    return {"smelly": dict(verification), "solution": dict(verification)}
+
+
 def make_contract(**kwargs) -> ContractSpec:
     defaults = dict(
         problem_description="Fix the bug",
@@ -271,6 +286,178 @@ class TestRunMavenVerification:
         assert kwargs["injected_tests"] == {"src/Test.java": "test"}
 
 
+class TestRunMavenVerificationAsync:
+    def test_disabled(self):
+        result = asyncio.run(run_maven_verification_async(
+            verify_maven=False, project_files=[pf()], override_files=[], injected_tests=[],
+        ))
+        assert result == {"enabled": False}
+
+    def test_skipped_without_project_files(self):
+        result = asyncio.run(run_maven_verification_async(
+            verify_maven=True, project_files=[], override_files=[], injected_tests=[],
+        ))
+        assert result == {
+            "enabled": True,
+            "status": "SKIPPED",
+            "reason": "verify_maven=true but no project_files provided",
+        }
+
+    @patch("codellamas_backend.api.MavenVerifier")
+    def test_awaits_verify_async(self, mock_verifier):
+        v = MagicMock()
+        v.status = "PASS"
+        v.failed_tests = []
+        v.errors = []
+        v.summary.return_value = "log"
+        v.from_cache = False
+        v.test_summary = {}
+        v.test_cases = []
+        v.queue_wait_sec = 0.0
+        v.exec_sec = 1.0
+        v.estimated_startup_saving_sec = 0.4
+        mock_verifier.return_value.verify_async = AsyncMock(return_value=v)
+
+        result = asyncio.run(run_maven_verification_async(
+            verify_maven=True,
+            project_files=[pf()],
+            override_files=[pf(content="student")],
+            injected_tests=[pf("src/Test.java", "test")],
+            use_bundle=True,
+        ))
+
+        assert result["enabled"] is True
+        assert result["status"] == "PASS"
+        assert result["exec_sec"] == 1.0
+        assert result["estimated_startup_saving_sec"] == 0.4
+        kwargs = mock_verifier.return_value.verify_async.call_args[1]
+        assert kwargs["injected_tests"] == {"src/Test.java": "test"}
+        assert kwargs["override_files"][0].content == "student"
+        assert kwargs["use_bundle"] is True
+        mock_verifier.return_value.verify.assert_not_called()
+
+
+class TestRunMavenVerificationVariants:
+    def test_disabled_for_every_variant(self):
+        result = run_maven_verification_variants(
+            verify_maven=False,
+            project_files=[pf()],
+            variants={"smelly": [], "solution": []},
+            injected_tests=[],
+        )
+        assert result == {"smelly": {"enabled": False}, "solution": {"enabled": False}}
+
+    def test_skipped_for_every_variant_without_project_files(self):
+        result = run_maven_verification_variants(
+            verify_maven=True,
+            project_files=[],
+            variants={"smelly": [], "solution": []},
+            injected_tests=[],
+        )
+        assert result["smelly"]["status"] == "SKIPPED"
+        assert result["solution"]["status"] == "SKIPPED"
+
+    @patch("codellamas_backend.api.MavenVerifier")
+    def test_single_verifier_call_for_all_variants(self, mock_verifier):
+        def make_v(status):
+            v = MagicMock()
+            v.status = status
+            v.failed_tests = []
+            v.errors = []
+            v.summary.return_value = status
+            v.from_cache = False
+            v.test_summary = {"total": 1}
+            v.test_cases = []
+            v.queue_wait_sec = 0.5
+            v.exec_sec = 2.0
+            v.estimated_startup_saving_sec = 0.0
+            v.phase = "test"
+            v.diagnostics = []
+            v.timed_out = False
+            v.timeout = {"fingerprint": "abc", "limit_sec": 180, "basis": "default", "p99_sec": None, "samples": 0}
+            return v
+
+        mock_verifier.return_value.verify_variants.return_value = {
+            "smelly": make_v("PASS"),
+            "solution": make_v("FAIL"),
+        }
+
+        result = run_maven_verification_variants(
+            verify_maven=True,
+            project_files=[pf()],
+            variants={"smelly": [pf(content="smelly")], "solution": [pf(content="clean")]},
+            injected_tests=[pf("src/test/java/AppTest.java", "test")],
+        )
+
+        assert result["smelly"] == {
+            "enabled": True,
+            "status": "PASS",
+            "failed_tests": [],
+            "errors": [],
+            "raw_log_head": "PASS",
+            "from_cache": False,
+            "test_summary": {"total": 1},
+            "test_cases": [],
+            "queue_wait_sec": 0.5,
+            "exec_sec": 2.0,
+            "estimated_startup_saving_sec": 0.0,
+            "phase": "test",
+            "diagnostics": [],
+            "timed_out": False,
+            "timeout": {"fingerprint": "abc", "limit_sec": 180, "basis": "default", "p99_sec": None, "samples": 0},
+        }
+        assert result["solution"]["status"] == "FAIL"
+        mock_verifier.return_value.verify_variants.assert_called_once()
+        kwargs = mock_verifier.return_value.verify_variants.call_args[1]
+        assert kwargs["variants"]["solution"][0].content == "clean"
+        assert kwargs["injected_tests"] == {"src/test/java/AppTest.java": "test"}
+
+
+class TestRunCompilePreflightVariants:
+    def test_disabled_without_maven(self):
+        result = run_compile_preflight_variants(
+            verify_maven=False, project_files=[pf()], variants={"smelly": []}, injected_tests=[]
+        )
+        assert result == {"smelly": {"enabled": False}}
+
+    @patch.dict("os.environ", {"VERIFY_COMPILE_PREFLIGHT": "0"})
+    def test_disabled_by_env(self):
+        result = run_compile_preflight_variants(
+            verify_maven=True, project_files=[pf()], variants={"smelly": []}, injected_tests=[]
+        )
+        assert result == {"smelly": {"enabled": False}}
+
+    @patch("codellamas_backend.api.MavenVerifier")
+    def test_payload_carries_diagnostics(self, mock_verifier):
+        v = MagicMock()
+        v.status = "FAIL"
+        v.failed_tests = []
+        v.errors = ["Compilation error"]
+        v.summary.return_value = "[ERROR] COMPILATION ERROR"
+        v.from_cache = False
+        v.test_summary = {}
+        v.test_cases = []
+        v.queue_wait_sec = 0.0
+        v.exec_sec = 0.4
+        v.estimated_startup_saving_sec = 0.0
+        v.phase = "compile"
+        v.diagnostics = [{"path": "src/main/java/App.java", "line": 3, "message": "cannot find symbol"}]
+        mock_verifier.return_value.verify_compile_variants.return_value = {"smelly": v}
+
+        result = run_compile_preflight_variants(
+            verify_maven=True,
+            project_files=[pf()],
+            variants={"smelly": [pf(content="smelly")]},
+            injected_tests=[pf("src/test/java/AppTest.java", "test")],
+        )
+
+        assert result["smelly"]["enabled"] is True
+        assert result["smelly"]["phase"] == "compile"
+        assert result["smelly"]["diagnostics"][0]["line"] == 3
+        kwargs = mock_verifier.return_value.verify_compile_variants.call_args[1]
+        assert kwargs["injected_tests"] == {"src/test/java/AppTest.java": "test"}
+
+
 # ─────────────────────────────────────────────
 # build_solution_override_files
 # ─────────────────────────────────────────────
@@ -438,6 +625,18 @@ class TestBuildMavenFailureContext:
         error_lines = [line for line in result.splitlines() if "[ERROR]" in line]
         assert len(error_lines) <= 10
 
+    def test_compiler_diagnostics_listed(self):
+        result = build_maven_failure_context("SOLUTION", {
+            "failed_tests": [],
+            "errors": ["Compilation error"],
+            "raw_log_head": "[ERROR] noise",
+            "diagnostics": [{"path": "src/main/java/App.java", "line": 4,
+                             "message": "cannot find symbol", "details": "symbol: method total()"}],
+        })
+        assert "Compiler errors:" in result
+        assert "- src/main/java/App.java:4: cannot find symbol (symbol: method total())" in result
+        assert "[ERROR] noise" not in result
+
     def test_none_fields_handled(self):
         result = build_maven_failure_context("SMELLY", {
             "failed_tests": None,
@@ -752,6 +951,25 @@ class TestGetBackend:
         get_backend("single", api_key="my-key")
         mock_single.assert_called_once_with(None, None, "my-key")
 
+    @patch("codellamas_backend.api.CodellamasBackend")
+    def test_released_backend_is_reused(self, mock_single):
+        mock_single.side_effect = lambda *args: MagicMock()
+        with patch("codellamas_backend.api.get_backend_pool", return_value=BackendPool()):
+            first = get_backend("single", model_name="m", api_key="k")
+            release_backend(first)
+            assert get_backend("single", model_name="m", api_key="k") is first
+            assert get_backend("single", model_name="m", api_key="other") is not first
+        mock_single.assert_called_with("m", None, "other")
+        assert mock_single.call_count == 2
+
+    @patch("codellamas_backend.api.CodellamasBackend")
+    def test_without_pool_constructs_every_time(self, mock_single):
+        mock_single.side_effect = lambda *args: MagicMock()
+        with patch("codellamas_backend.api.get_backend_pool", return_value=None):
+            first = get_backend("single")
+            release_backend(first)
+            assert get_backend("single") is not first
+
 
 # ─────────────────────────────────────────────
 # append_to_csv
@@ -921,7 +1139,7 @@ class TestBuildPreflightFailureContext:
 
 
 # ─────────────────────────────────────────────
-# generate_single_contract
+# generate_single_contract_async
 # ─────────────────────────────────────────────
 
 class TestGenerateSingleContract:
@@ -935,24 +1153,24 @@ class TestGenerateSingleContract:
     def test_returns_contract_on_valid_result(self):
         contract = make_contract()
         backend = self._make_backend(contract)
-        result = generate_single_contract(
+        result = asyncio.run(generate_single_contract_async(
             backend=backend,
             topic="refactoring",
             code_smells="god class",
             existing_codebase="NONE",
-        )
+        ))
         assert isinstance(result, ContractSpec)
         assert result.problem_description == contract.problem_description
 
     def test_kickoff_called_with_correct_inputs(self):
         contract = make_contract()
         backend = self._make_backend(contract)
-        generate_single_contract(
+        asyncio.run(generate_single_contract_async(
             backend=backend,
             topic="refactoring",
             code_smells="god class",
             existing_codebase="my code",
-        )
+        ))
         kickoff_kwargs = backend.contract_crew.return_value.kickoff.call_args[1]
         assert kickoff_kwargs["inputs"]["topic"] == "refactoring"
         assert kickoff_kwargs["inputs"]["code_smells"] == "god class"
@@ -963,12 +1181,12 @@ class TestGenerateSingleContract:
         bad_contract = make_contract(problem_description="   ")
         backend = self._make_backend(bad_contract)
         with pytest.raises(HTTPException) as exc_info:
-            generate_single_contract(
+            asyncio.run(generate_single_contract_async(
                 backend=backend,
                 topic="refactoring",
                 code_smells="god class",
                 existing_codebase="NONE",
-            )
+            ))
         assert exc_info.value.status_code == 500
         assert "validation" in exc_info.value.detail.lower()
 
@@ -976,12 +1194,12 @@ class TestGenerateSingleContract:
         bad_contract = make_contract(problem_description="   ", test_files=[], paths_to_ex=[])
         backend = self._make_backend(bad_contract)
         with pytest.raises(HTTPException) as exc_info:
-            generate_single_contract(
+            asyncio.run(generate_single_contract_async(
                 backend=backend,
                 topic="refactoring",
                 code_smells="god class",
                 existing_codebase="NONE",
-            )
+            ))
         assert "problem_description" in exc_info.value.detail
 
 
@@ -990,7 +1208,7 @@ class TestGenerateSingleContract:
 # ─────────────────────────────────────────────
 
 class TestGenerateEndpoint:
-    @patch("codellamas_backend.api._execute_single_generation")
+    @patch("codellamas_backend.api._execute_single_generation_async", new_callable=AsyncMock)
     def test_generate_success(self, mock_exec):
         mock_exec.return_value = (
             {"status": "success", "data": make_exercise().model_dump()},
@@ -1005,7 +1223,7 @@ class TestGenerateEndpoint:
         assert response.status_code == 200
         assert response.json()["status"] == "success"
 
-    @patch("codellamas_backend.api._execute_single_generation")
+    @patch("codellamas_backend.api._execute_single_generation_async", new_callable=AsyncMock)
     def test_generate_returns_error_raises_500(self, mock_exec):
         mock_exec.return_value = (
             {"status": "error", "message": "something failed"},
@@ -1018,7 +1236,7 @@ class TestGenerateEndpoint:
             })
         assert response.status_code == 500
 
-    @patch("codellamas_backend.api._execute_single_generation",
+    @patch("codellamas_backend.api._execute_single_generation_async", new_callable=AsyncMock,
            side_effect=Exception("unexpected crash"))
     def test_generate_exception_raises_500(self, mock_exec):
         response = client.post("/generate", json={
@@ -1028,7 +1246,7 @@ class TestGenerateEndpoint:
         assert response.status_code == 500
 
     @patch("codellamas_backend.api.append_to_csv")
-    @patch("codellamas_backend.api._execute_single_generation")
+    @patch("codellamas_backend.api._execute_single_generation_async", new_callable=AsyncMock)
     def test_generate_multiple_count_returns_results_list(self, mock_exec, mock_csv):
         mock_exec.return_value = (
             {"status": "success", "data": make_exercise().model_dump()},
@@ -1043,11 +1261,140 @@ class TestGenerateEndpoint:
         assert response.status_code == 200
         assert "results" in response.json()
         assert len(response.json()["results"]) == 2
+        assert sorted(c.args[2] for c in mock_exec.call_args_list) == [0, 1]
+
+    @patch("codellamas_backend.api.append_to_csv")
+    @patch("codellamas_backend.api.save_exercise_to_repo", return_value="/tmp/saved")
+    @patch("codellamas_backend.api.run_maven_verification_variants", return_value=variants_of({"enabled": False}))
+    @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
+    @patch("codellamas_backend.api.generate_single_implementation_with_retries_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.get_backend")
+    def test_llm_cache_is_opt_in(
+        self, mock_backend, mock_contract, mock_impl,
+        mock_solution, mock_maven, mock_save, mock_csv
+    ):
+        scopes = []
+
+        async def contract(**kwargs):
+            scopes.append(current_llm_cache_scope())
+            return make_contract()
+
+        mock_contract.side_effect = contract
+        mock_impl.return_value = (make_exercise(), None)
+
+        for body in ({}, {"llm_cache": True}):
+            response = client.post("/generate", json={"topic": "refactoring", "code_smells": [], **body})
+            assert response.status_code == 200
+
+        assert [scope.enabled for scope in scopes] == [False, True]
+
+
+class TestFanOutGeneration:
+    @patch("codellamas_backend.api.append_to_csv")
+    @patch("codellamas_backend.api._execute_single_generation_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api._generate_shared_contract_async", new_callable=AsyncMock)
+    def test_one_contract_for_all_candidates(self, mock_contract, mock_exec, mock_csv):
+        contract = make_contract()
+        mock_contract.return_value = contract
+        mock_exec.return_value = ({"status": "success", "meta": {}}, None)
+
+        response = client.post("/generate", json={
+            "topic": "refactoring",
+            "code_smells": ["god class"],
+            "count": 3,
+            "fan_out": True,
+        })
+
+        assert response.status_code == 200
+        mock_contract.assert_awaited_once()
+        assert mock_exec.await_count == 3
+        assert all(c.args[3] is contract for c in mock_exec.call_args_list)
+        assert sorted(c.args[2] for c in mock_exec.call_args_list) == [0, 1, 2]
+        assert response.json()["results"][0]["meta"]["fan_out"]["candidates"] == 3
+
+    @patch("codellamas_backend.api._execute_single_generation_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api._generate_shared_contract_async", new_callable=AsyncMock,
+           side_effect=RuntimeError("Contract generation failed after 3 attempts: bad JSON"))
+    def test_contract_failure_fails_every_candidate(self, mock_contract, mock_exec):
+        response = client.post("/generate", json={
+            "topic": "refactoring",
+            "code_smells": [],
+            "count": 2,
+            "fan_out": True,
+        })
+
+        results = response.json()["results"]
+        assert [r["status"] for r in results] == ["error", "error"]
+        assert "bad JSON" in results[0]["message"]
+        mock_exec.assert_not_awaited()
+
+    @patch("codellamas_backend.api._generate_shared_contract_async", new_callable=AsyncMock,
+           side_effect=RuntimeError("bad JSON"))
+    def test_contract_failure_results_are_separate_objects(self, mock_contract):
+        request = GenerateRequest(topic="refactoring", code_smells=[], count=2, fan_out=True)
+        results = asyncio.run(_execute_fan_out_generation_async(request))
+
+        first, second = (response for response, _ in results)
+        assert first == second
+        first["message"] = "changed"
+        assert second["message"] == "bad JSON"
+
+    @patch("codellamas_backend.api.append_to_csv")
+    @patch("codellamas_backend.api._execute_single_generation_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api._generate_shared_contract_async", new_callable=AsyncMock)
+    def test_multi_mode_runs_independent_generations(self, mock_contract, mock_exec, mock_csv):
+        mock_exec.return_value = ({"status": "success"}, None)
+
+        client.post("/generate", json={
+            "topic": "refactoring",
+            "code_smells": [],
+            "mode": "multi",
+            "count": 2,
+            "fan_out": True,
+        })
+
+        mock_contract.assert_not_awaited()
+        assert mock_exec.await_count == 2
+
+    @patch("codellamas_backend.api.release_backend")
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.get_backend")
+    def test_shared_contract_retries_then_raises(self, mock_backend, mock_contract, mock_release):
+        mock_contract.side_effect = [Exception("bad JSON"), make_contract()]
+        request = GenerateRequest(topic="refactoring", code_smells=[])
+
+        assert asyncio.run(_generate_shared_contract_async(request, max_retries=2)) == make_contract()
+        assert mock_release.call_count == 2
+
+        mock_contract.side_effect = Exception("still bad")
+        with pytest.raises(RuntimeError, match="after 2 attempts"):
+            asyncio.run(_generate_shared_contract_async(request, max_retries=2))
+
+    @patch("codellamas_backend.api.save_exercise_to_repo", return_value="/tmp/saved")
+    @patch("codellamas_backend.api.run_maven_verification_variants", return_value=variants_of({"enabled": False}))
+    @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
+    @patch("codellamas_backend.api.generate_single_implementation_with_retries_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.get_backend")
+    def test_candidate_uses_the_given_contract(
+        self, mock_backend, mock_contract, mock_impl,
+        mock_solution, mock_maven, mock_save
+    ):
+        contract = make_contract(problem_description="Shared")
+        mock_impl.return_value = (make_exercise(), {"mode": "single"})
+        request = GenerateRequest(topic="refactoring", code_smells=[])
+
+        result, _ = asyncio.run(_execute_single_generation_async(request, sample=1, contract=contract))
+
+        assert result["status"] == "success"
+        mock_contract.assert_not_awaited()
+        assert mock_impl.call_args[1]["contract"] is contract
 
 
 class TestReviewEndpoint:
     @patch("codellamas_backend.api.CodellamasBackend")
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
+    @patch("codellamas_backend.api.run_maven_verification_async", new_callable=AsyncMock, return_value={"enabled": False})
     def test_review_success(self, mock_maven, mock_backend_cls):
         mock_raw = MagicMock()
         mock_raw.__str__ = lambda self: "Great work!"
@@ -1062,7 +1409,21 @@ class TestReviewEndpoint:
         assert "feedback" in response.json()
 
     @patch("codellamas_backend.api.get_backend")
-    @patch("codellamas_backend.api.run_maven_verification",
+    @patch("codellamas_backend.api.run_maven_verification_async", new_callable=AsyncMock,
+           return_value={"enabled": False})
+    def test_review_reports_llm_cache_in_meta(self, mock_maven, mock_backend):
+        mock_backend.return_value.review_crew.return_value.kickoff.return_value = "feedback"
+
+        response = client.post("/review", json={
+            "code_smells": [],
+            "question_json": {},
+            "llm_cache": False,
+        })
+        assert response.status_code == 200
+        assert response.json()["meta"]["llm_cache"] == {"enabled": False, "hits": 0, "misses": 0, "hit_rate": 0.0}
+
+    @patch("codellamas_backend.api.get_backend")
+    @patch("codellamas_backend.api.run_maven_verification_async", new_callable=AsyncMock,
            return_value={"enabled": False})
     def test_review_crew_failure_raises_500(self, mock_maven, mock_backend):
         mock_backend.return_value.review_crew.return_value.kickoff.side_effect = \
@@ -1076,7 +1437,7 @@ class TestReviewEndpoint:
         assert response.status_code == 500
 
     @patch("codellamas_backend.api.CodellamasBackend")
-    @patch("codellamas_backend.api.run_maven_verification")
+    @patch("codellamas_backend.api.run_maven_verification_async", new_callable=AsyncMock)
     def test_review_uses_maven_log_as_test_results(self, mock_maven, mock_backend_cls):
         mock_maven.return_value = {
             "enabled": True,
@@ -1097,10 +1458,30 @@ class TestReviewEndpoint:
 
         kickoff_inputs = mock_backend_cls.return_value.review_crew.return_value.kickoff.call_args[1]["inputs"]
         assert kickoff_inputs["test_results"] == "BUILD FAILURE log here"
+        assert mock_maven.call_args[1]["use_bundle"] is True
 
 
 # ─────────────────────────────────────────────
-# _execute_single_generation
+# prepare_review_bundle
+# ─────────────────────────────────────────────
+
+class TestPrepareReviewBundle:
+    @patch("codellamas_backend.api.get_bundle_store")
+    def test_keys_bundle_like_review(self, mock_store):
+        exercise = make_exercise()
+        prepare_review_bundle(exercise)
+
+        project_files, injected = mock_store.return_value.prepare_async.call_args[0]
+        assert [f.path for f in project_files] == [f.path for f in exercise.project_files]
+        assert injected == {f.path: f.content for f in exercise.test_files}
+
+    @patch("codellamas_backend.api.get_bundle_store", return_value=None)
+    def test_disabled_store_is_noop(self, mock_store):
+        prepare_review_bundle(make_exercise())
+
+
+# ─────────────────────────────────────────────
+# _execute_single_generation_async
 # ─────────────────────────────────────────────
 
 class TestExecuteSingleGeneration:
@@ -1111,10 +1492,10 @@ class TestExecuteSingleGeneration:
         )
 
     @patch("codellamas_backend.api.save_exercise_to_repo", return_value="/tmp/saved")
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
+    @patch("codellamas_backend.api.run_maven_verification_variants", return_value=variants_of({"enabled": False}))
     @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
-    @patch("codellamas_backend.api.generate_single_implementation_with_retries")
-    @patch("codellamas_backend.api.generate_single_contract")
+    @patch("codellamas_backend.api.generate_single_implementation_with_retries_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock)
     @patch("codellamas_backend.api.get_backend")
     def test_success_returns_response_and_csv_args(
         self, mock_backend, mock_contract, mock_impl,
@@ -1123,15 +1504,15 @@ class TestExecuteSingleGeneration:
         mock_contract.return_value = make_contract()
         mock_impl.return_value = (make_exercise(), {"mode": "single"})
 
-        result, csv_args = _execute_single_generation(self.request)
+        result, csv_args = asyncio.run(_execute_single_generation_async(self.request))
         assert result["status"] == "success"
         assert csv_args is not None
 
     @patch("codellamas_backend.api.save_exercise_to_repo", return_value="/tmp/saved")
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
+    @patch("codellamas_backend.api.run_maven_verification_variants", return_value=variants_of({"enabled": False}))
     @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
-    @patch("codellamas_backend.api.generate_single_implementation_with_retries")
-    @patch("codellamas_backend.api.generate_single_contract")
+    @patch("codellamas_backend.api.generate_single_implementation_with_retries_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock)
     @patch("codellamas_backend.api.get_backend")
     def test_response_contains_exercise_data(
         self, mock_backend, mock_contract, mock_impl,
@@ -1141,15 +1522,15 @@ class TestExecuteSingleGeneration:
         mock_contract.return_value = make_contract()
         mock_impl.return_value = (exercise, {"mode": "single"})
 
-        result, _ = _execute_single_generation(self.request)
+        result, _ = asyncio.run(_execute_single_generation_async(self.request))
         assert "data" in result
         assert result["data"]["problem_description"] == exercise.problem_description
 
     @patch("codellamas_backend.api.save_exercise_to_repo", return_value="/tmp/saved")
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
+    @patch("codellamas_backend.api.run_maven_verification_variants", return_value=variants_of({"enabled": False}))
     @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
-    @patch("codellamas_backend.api.generate_single_implementation_with_retries")
-    @patch("codellamas_backend.api.generate_single_contract")
+    @patch("codellamas_backend.api.generate_single_implementation_with_retries_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock)
     @patch("codellamas_backend.api.get_backend")
     def test_meta_included_in_response(
         self, mock_backend, mock_contract, mock_impl,
@@ -1158,26 +1539,34 @@ class TestExecuteSingleGeneration:
         mock_contract.return_value = make_contract()
         mock_impl.return_value = (make_exercise(), {"mode": "single", "fix_loop": True})
 
-        result, _ = _execute_single_generation(self.request)
+        result, _ = asyncio.run(_execute_single_generation_async(self.request))
         assert "meta" in result
         assert result["meta"]["mode"] == "single"
 
+    @patch("codellamas_backend.api.release_backend")
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock, side_effect=Exception("LLM down"))
+    @patch("codellamas_backend.api.get_backend")
+    def test_backend_released_after_each_attempt(self, mock_backend, mock_contract, mock_release):
+        asyncio.run(_execute_single_generation_async(self.request, max_retries=2))
+        assert mock_release.call_count == 2
+        mock_release.assert_called_with(mock_backend.return_value)
+
     @patch("codellamas_backend.api.get_backend", side_effect=Exception("backend failed"))
     def test_all_attempts_fail_returns_error(self, mock_backend):
-        result, csv_args = _execute_single_generation(self.request, max_retries=1)
+        result, csv_args = asyncio.run(_execute_single_generation_async(self.request, max_retries=1))
         assert result["status"] == "error"
         assert csv_args is None
 
     @patch("codellamas_backend.api.get_backend", side_effect=Exception("backend failed"))
     def test_error_message_contains_attempt_count(self, mock_backend):
-        result, _ = _execute_single_generation(self.request, max_retries=2)
+        result, _ = asyncio.run(_execute_single_generation_async(self.request, max_retries=2))
         assert "2" in result["message"]
 
     @patch("codellamas_backend.api.save_exercise_to_repo", return_value="/tmp/saved")
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
+    @patch("codellamas_backend.api.run_maven_verification_variants", return_value=variants_of({"enabled": False}))
     @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
-    @patch("codellamas_backend.api.generate_single_implementation_with_retries")
-    @patch("codellamas_backend.api.generate_single_contract")
+    @patch("codellamas_backend.api.generate_single_implementation_with_retries_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock)
     @patch("codellamas_backend.api.get_backend")
     def test_single_mode_has_smelly_and_solution_verification(
         self, mock_backend, mock_contract, mock_impl,
@@ -1186,16 +1575,16 @@ class TestExecuteSingleGeneration:
         mock_contract.return_value = make_contract()
         mock_impl.return_value = (make_exercise(), {"mode": "single"})
 
-        result, _ = _execute_single_generation(self.request)
+        result, _ = asyncio.run(_execute_single_generation_async(self.request))
         maven = result["maven_verification"]
         assert "smelly" in maven
         assert "solution" in maven
 
     @patch("codellamas_backend.api.save_exercise_to_repo", return_value="/tmp/saved")
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
+    @patch("codellamas_backend.api.run_maven_verification_variants", return_value=variants_of({"enabled": False}))
     @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
-    @patch("codellamas_backend.api.generate_single_implementation_with_retries")
-    @patch("codellamas_backend.api.generate_single_contract")
+    @patch("codellamas_backend.api.generate_single_implementation_with_retries_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock)
     @patch("codellamas_backend.api.get_backend")
     def test_csv_args_has_correct_keys(
         self, mock_backend, mock_contract, mock_impl,
@@ -1204,7 +1593,7 @@ class TestExecuteSingleGeneration:
         mock_contract.return_value = make_contract()
         mock_impl.return_value = (make_exercise(), {"mode": "single"})
 
-        _, csv_args = _execute_single_generation(self.request)
+        _, csv_args = asyncio.run(_execute_single_generation_async(self.request))
         assert all(k in csv_args for k in ("exercise", "topic", "model", "response_data"))
 
     @patch("codellamas_backend.api.save_exercise_to_repo", return_value="/tmp/saved")
@@ -1219,16 +1608,50 @@ class TestExecuteSingleGeneration:
             mode="multi",
             verify_maven=True,
         )
-        mock_backend.return_value.generate_with_fix_loop.return_value = (
+        mock_backend.return_value.generate_with_fix_loop_async = AsyncMock(return_value=(
             make_exercise(), {"mode": "multi"}
-        )
+        ))
+
+        result, _ = asyncio.run(_execute_single_generation_async(request))
+        mock_backend.return_value.generate_with_fix_loop_async.assert_called_once()
 
-        result, _ = _execute_single_generation(request)
-        mock_backend.return_value.generate_with_fix_loop.assert_called_once()
+    @patch("codellamas_backend.api.save_exercise_to_repo", return_value="/tmp/saved")
+    @patch("codellamas_backend.api.run_maven_verification_variants", return_value=variants_of({"enabled": False}))
+    @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
+    @patch("codellamas_backend.api.generate_single_implementation_with_retries_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock)
+    @patch("codellamas_backend.api.get_backend")
+    def test_meta_reports_llm_cache_for_the_request(
+        self, mock_backend, mock_contract, mock_impl,
+        mock_solution, mock_maven, mock_save
+    ):
+        scopes = []
+
+        async def contract(**kwargs):
+            scopes.append(current_llm_cache_scope())
+            scopes[-1].record(hit=True)
+            return make_contract()
+
+        mock_contract.side_effect = contract
+        mock_impl.return_value = (make_exercise(), None)
+        request = GenerateRequest(topic="refactoring", code_smells=[], llm_cache=False)
+
+        result, _ = asyncio.run(_execute_single_generation_async(request, sample=2))
+        assert scopes[0].enabled is False
+        assert scopes[0].variant == "sample-2"
+        assert result["meta"]["llm_cache"]["hits"] == 1
+        assert result["meta"]["llm_cache"]["enabled"] is False
+
+    @patch("codellamas_backend.crews.llm_cache.LLMCacheScope.forget", autospec=True)
+    @patch("codellamas_backend.api.generate_single_contract_async", new_callable=AsyncMock, side_effect=Exception("bad JSON"))
+    @patch("codellamas_backend.api.get_backend")
+    def test_failed_attempt_forgets_its_cached_answers(self, mock_backend, mock_contract, mock_forget):
+        asyncio.run(_execute_single_generation_async(self.request, max_retries=2))
+        assert mock_forget.call_count == 2
 
 
 # ─────────────────────────────────────────────
-# generate_single_implementation_with_retries
+# generate_single_implementation_with_retries_async
 # ─────────────────────────────────────────────
 
 class TestGenerateSingleImplementationWithRetries:
@@ -1242,6 +1665,16 @@ class TestGenerateSingleImplementationWithRetries:
         mock_raw.json_dict = make_implementation().model_dump()
         self.mock_backend.implementation_crew.return_value.kickoff.return_value = mock_raw
 
+        # every variant compiles unless a test says otherwise
+        self.preflight = patch(
+            "codellamas_backend.api.run_compile_preflight_variants",
+            side_effect=lambda **kw: {name: {"enabled": False} for name in kw["variants"]},
+        )
+        self.mock_preflight = self.preflight.start()
+
+    def teardown_method(self):
+        self.preflight.stop()
+
     def _call(self, **kwargs):
         defaults = dict(
             backend=self.mock_backend,
@@ -1251,51 +1684,51 @@ class TestGenerateSingleImplementationWithRetries:
             base_project_files=self.base_files,
             verify_maven=False,
         )
-        return generate_single_implementation_with_retries(**{**defaults, **kwargs})
+        return asyncio.run(generate_single_implementation_with_retries_async(**{**defaults, **kwargs}))
 
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
+    @patch("codellamas_backend.api.run_maven_verification_variants", return_value=variants_of({"enabled": False}))
     @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
     def test_returns_exercise_and_meta(self, mock_solution, mock_maven):
         result, meta = self._call()
         assert isinstance(result, SpringBootExercise)
         assert isinstance(meta, dict)
 
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
+    @patch("codellamas_backend.api.run_maven_verification_variants", return_value=variants_of({"enabled": False}))
     @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
     def test_meta_mode_is_single(self, mock_solution, mock_maven):
         _, meta = self._call()
         assert meta["mode"] == "single"
 
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
+    @patch("codellamas_backend.api.run_maven_verification_variants", return_value=variants_of({"enabled": False}))
     @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
     def test_meta_has_implementation_attempts(self, mock_solution, mock_maven):
         _, meta = self._call()
         assert "implementation_attempts" in meta
         assert len(meta["implementation_attempts"]) >= 1
 
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
+    @patch("codellamas_backend.api.run_maven_verification_variants", return_value=variants_of({"enabled": False}))
     @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
     def test_first_attempt_preflight_pass(self, mock_solution, mock_maven):
         _, meta = self._call()
         assert meta["implementation_attempts"][0]["preflight"]["status"] == "PASS"
 
-    @patch("codellamas_backend.api.run_maven_verification",
-           return_value={"enabled": True, "status": "PASS"})
+    @patch("codellamas_backend.api.run_maven_verification_variants",
+           return_value=variants_of({"enabled": True, "status": "PASS"}))
     @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
     def test_maven_pass_no_retry(self, mock_solution, mock_maven):
         _, meta = self._call(verify_maven=True)
         assert meta["single_retries_used"] == 0
 
-    @patch("codellamas_backend.api.run_maven_verification",
-           return_value={"enabled": True, "status": "FAIL",
-                         "failed_tests": ["AppTest"], "errors": ["err"],
-                         "raw_log_head": "BUILD FAILURE"})
+    @patch("codellamas_backend.api.run_maven_verification_variants",
+           return_value=variants_of({"enabled": True, "status": "FAIL",
+                                     "failed_tests": ["AppTest"], "errors": ["err"],
+                                     "raw_log_head": "BUILD FAILURE"}))
     @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
     def test_maven_fail_triggers_retry(self, mock_solution, mock_maven):
         _, meta = self._call(verify_maven=True)
         assert meta["single_retries_used"] >= 1
 
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
+    @patch("codellamas_backend.api.run_maven_verification_variants", return_value=variants_of({"enabled": False}))
     @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
     def test_preflight_fail_recorded_in_attempts(self, mock_solution, mock_maven):
         # return exercise with empty project_files to fail preflight
@@ -1306,7 +1739,7 @@ class TestGenerateSingleImplementationWithRetries:
         _, meta = self._call()
         assert meta["implementation_attempts"][0]["preflight"]["status"] == "FAIL"
 
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
+    @patch("codellamas_backend.api.run_maven_verification_variants", return_value=variants_of({"enabled": False}))
     @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
     def test_raises_http_exception_when_no_data_returned(self, mock_solution, mock_maven):
         # make kickoff return None json_dict to break ImplementationSpec construction
@@ -1317,24 +1750,24 @@ class TestGenerateSingleImplementationWithRetries:
         with pytest.raises((HTTPException, Exception)):
             self._call()
 
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
+    @patch("codellamas_backend.api.run_maven_verification_variants", return_value=variants_of({"enabled": False}))
     @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
     def test_kickoff_called_with_correct_topic(self, mock_solution, mock_maven):
         self._call(topic="my topic")
         kickoff_kwargs = self.mock_backend.implementation_crew.return_value.kickoff.call_args[1]
         assert kickoff_kwargs["inputs"]["topic"] == "my topic"
 
-    @patch("codellamas_backend.api.run_maven_verification", return_value={"enabled": False})
+    @patch("codellamas_backend.api.run_maven_verification_variants", return_value=variants_of({"enabled": False}))
     @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
     def test_contract_json_passed_to_kickoff(self, mock_solution, mock_maven):
         self._call()
         kickoff_kwargs = self.mock_backend.implementation_crew.return_value.kickoff.call_args[1]
         assert "contract_json" in kickoff_kwargs["inputs"]
 
-    @patch("codellamas_backend.api.run_maven_verification",
-           return_value={"enabled": True, "status": "FAIL",
-                         "failed_tests": ["AppTest"], "errors": ["err"],
-                         "raw_log_head": "BUILD FAILURE"})
+    @patch("codellamas_backend.api.run_maven_verification_variants",
+           return_value=variants_of({"enabled": True, "status": "FAIL",
+                                     "failed_tests": ["AppTest"], "errors": ["err"],
+                                     "raw_log_head": "BUILD FAILURE"}))
     @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
     def test_failure_context_passed_on_retry(self, mock_solution, mock_maven):
         self._call(verify_maven=True)
@@ -1344,6 +1777,40 @@ class TestGenerateSingleImplementationWithRetries:
             retry_inputs = calls[1][1]["inputs"]
             assert retry_inputs["maven_failure_context"] != ""
 
+    @patch("codellamas_backend.api.run_maven_verification_variants",
+           return_value={"smelly": {"enabled": True, "status": "PASS"}})
+    @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
+    def test_compile_failure_skips_test_run_for_that_variant(self, mock_solution, mock_maven):
+        compile_fail = {
+            "enabled": True, "status": "FAIL", "phase": "compile", "errors": ["Compilation error"],
+            "failed_tests": [], "raw_log_head": "",
+            "diagnostics": [{"path": "src/main/java/App.java", "line": 7, "message": "';' expected"}],
+        }
+        self.mock_preflight.side_effect = lambda **kw: {
+            "smelly": {"enabled": True, "status": "PASS", "phase": "compile"},
+            "solution": compile_fail,
+        }
+
+        _, meta = self._call(verify_maven=True)
+
+        first = meta["implementation_attempts"][0]
+        assert mock_maven.call_args_list[0][1]["variants"].keys() == {"smelly"}
+        assert first["solution"] == compile_fail
+        assert first["compile"]["solution"] == compile_fail
+        retry_inputs = self.mock_backend.implementation_crew.return_value.kickoff.call_args_list[1][1]["inputs"]
+        assert "src/main/java/App.java:7: ';' expected" in retry_inputs["maven_failure_context"]
+
+    @patch("codellamas_backend.api.run_maven_verification_variants")
+    @patch("codellamas_backend.api.build_solution_override_files", return_value=[])
+    def test_nothing_compiles_no_test_run(self, mock_solution, mock_maven):
+        self.mock_preflight.side_effect = lambda **kw: {
+            name: {"enabled": True, "status": "FAIL", "phase": "compile", "errors": ["Compilation error"]}
+            for name in kw["variants"]
+        }
+        _, meta = self._call(verify_maven=True)
+        mock_maven.assert_not_called()
+        assert meta["implementation_attempts"][-1]["smelly"]["status"] == "FAIL"
+
 
 # ─────────────────────────────────────────────
 # /, /health, /capabilities
@@ -1365,3 +1832,59 @@ class TestSimpleEndpoints:
         response = client.get("/capabilities")
         assert response.status_code == 200
         assert "backends" in response.json()
+
+    def test_verification_stats_reports_cache(self):
+        response = client.get("/verification/stats")
+        assert response.status_code == 200
+        assert "cache" in response.json()
+        assert "warm" in response.json()["maven_repository"]
+        assert "max_concurrent" in response.json()["scheduler"]
+        assert "bytes_written" in response.json()["workspaces"]
+        assert "cds" in response.json()
+        assert "profile" in response.json()
+        assert "timeouts" in response.json()
+        assert "batches" in response.json()["reactor"]
+        assert set(response.json()["cleanup"]) == {"deleter", "janitor"}
+        assert "daemon_warm" in response.json()["gradle"]
+
+    def test_verification_timeouts_unknown_project(self):
+        response = client.get("/verification/timeouts/0123456789abcdef")
+        assert response.status_code == 404
+
+    def test_backend_stats_reports_pool(self):
+        with patch("codellamas_backend.api.get_backend_pool", return_value=BackendPool()):
+            response = client.get("/backends/stats")
+        assert response.status_code == 200
+        assert response.json()["pool"]["hits"] == 0
+        assert "llm_cache" in response.json()
+
+    def test_verification_timeouts_reports_histogram(self):
+        from codellamas_backend.runtime.timeouts import AdaptiveTimeouts
+
+        timeouts = AdaptiveTimeouts()
+        timeouts.record(timeouts.timeout_for("abc", 180), 12.5)
+        with patch("codellamas_backend.api.get_adaptive_timeouts", return_value=timeouts):
+            response = client.get("/verification/timeouts/abc")
+        assert response.status_code == 200
+        assert response.json()["samples"] == 1
+        assert response.json()["buckets"]["le_20"] == 1
+
+
+# ─────────────────────────────────────────────
+# start_maven_warmup
+# ─────────────────────────────────────────────
+
+class TestStartMavenWarmup:
+    def test_disabled_by_env(self):
+        with patch.dict(os.environ, {"MAVEN_WARMUP": "0"}):
+            assert start_maven_warmup() is None
+
+    @patch("codellamas_backend.api.warm_up_maven_repository")
+    def test_warms_default_pom_in_background(self, mock_warm):
+        with patch.dict(os.environ, {"MAVEN_WARMUP": "1", "MAVEN_WARMUP_POMS": ""}):
+            thread = start_maven_warmup()
+        thread.join(timeout=5)
+
+        kwargs = mock_warm.call_args[1]
+        assert kwargs["default_pom"] == default_base_project_files()[0].content
+        assert kwargs["pom_files"] == []
@@ -0,0 +1,36 @@
+import os
+
+from unittest.mock import AsyncMock, patch
+
+from codellamas_backend.pipeline_benchmark import benchmark_pipeline, main
+
+
+# ─────────────────────────────────────────────
+# benchmark_pipeline
+# ─────────────────────────────────────────────
+
+class TestBenchmarkPipeline:
+    @patch("codellamas_backend.api._execute_single_generation_async", new_callable=AsyncMock)
+    def test_counts_successes_and_failures(self, mock_exec):
+        mock_exec.side_effect = [
+            ({"status": "success"}, {}),
+            ({"status": "error", "message": "No recording"}, None),
+            ({"status": "success"}, {}),
+        ]
+        with patch.dict(os.environ, {"LLM_CASSETTE": ""}):
+            result = benchmark_pipeline(requests=3, concurrency=2)
+
+        assert result["succeeded"] == 2
+        assert result["failed"] == 1
+        assert result["errors"] == ["No recording"]
+        assert result["cassette"] is None
+        assert sorted(c.args[2] for c in mock_exec.call_args_list) == [0, 1, 2]
+        assert all(c.args[1] == 1 for c in mock_exec.call_args_list)
+
+    @patch("codellamas_backend.pipeline_benchmark.benchmark_pipeline", return_value={})
+    def test_main_replays_strictly_without_cache(self, mock_benchmark, tmp_path):
+        with patch.dict(os.environ, {}):
+            main(["--cassette", str(tmp_path / "run.json"), "--requests", "2"])
+            assert os.environ["LLM_CASSETTE_MODE"] == "strict"
+            assert os.environ["LLM_CACHE"] == "0"
+        assert mock_benchmark.call_args[1]["requests"] == 2
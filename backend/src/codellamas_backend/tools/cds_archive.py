@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+
+# JVMs the verification engine starts over and over with a stable classpath:
+#   maven    - the Maven launcher (options via MAVEN_OPTS)
+#   junit    - the JUnit console launcher of the javac fast path
+# The surefire fork has none: it boots from a jar inside each workspace,
+# which no shared archive would match.
+ROLES = ("maven", "junit")
+
+# -XX:ArchiveClassesAtExit (dynamic AppCDS) exists since JDK 13
+MIN_JAVA_MAJOR = 13
+
+# CDS warnings (skipped classes, class path mismatches) would end up in the
+# build log and confuse its parsers
+QUIET_LOGGING = ["-Xlog:cds=off", "-Xlog:cds+dynamic=off"]
+
+_MVN_JAVA_RE = re.compile(r"Java version:\s*(\d+)(?:\.(\d+))?")
+_JAVA_VERSION_RE = re.compile(r'version "(\d+)(?:\.(\d+))?')
+
+
+@dataclass
+class CdsArchive:
+    role: str
+    path: str
+    fingerprint: str
+    created_at: float
+    startup_sec: Optional[float] = None           # launch time without the archive
+    archived_startup_sec: Optional[float] = None  # ... and with it
+
+    @property
+    def saving_sec(self) -> float:
+        if self.startup_sec is None or self.archived_startup_sec is None:
+            return 0.0
+        return round(max(0.0, self.startup_sec - self.archived_startup_sec), 3)
+
+
+@dataclass
+class CdsLaunch:
+    """JVM options for one launch, and the archive being created by it, if any."""
+    role: str
+    options: List[str] = field(default_factory=list)
+    archive: Optional[CdsArchive] = None
+    creating: Optional[str] = None  # temp file the JVM dumps its classes to at exit
+    fingerprint: str = ""
+
+    @property
+    def saving_sec(self) -> float:
+        return self.archive.saving_sec if self.archive is not None else 0.0
+
+
+def java_major(version_output: str) -> Optional[int]:
+    """Feature release from `mvn -v` or `java -version` output (1.8 -> 8)."""
+    m = _MVN_JAVA_RE.search(version_output or "") or _JAVA_VERSION_RE.search(version_output or "")
+    if not m:
+        return None
+    major = int(m.group(1))
+    if major == 1 and m.group(2):
+        major = int(m.group(2))
+    return major
+
+
+class CdsManager:
+    """
+    Dynamic AppCDS archives for the JVMs of a verification run.
+
+    The first launch of a role without a usable archive dumps one at exit
+    (-XX:ArchiveClassesAtExit); later launches map it (-XX:SharedArchiveFile,
+    -Xshare:auto, so a mismatching archive is ignored rather than fatal).
+    Archives are tied to a fingerprint of the JDK and Maven installation
+    (`mvn -v` / `java -version` output plus launcher jars) and recreated when
+    it changes. After creation the startup saving is estimated once by
+    timing a trivial launch with and without the archive; runs report that
+    estimate, not a measurement of their own.
+    """
+
+    def __init__(self, root_dir: Optional[str] = None, calibrate: bool = True):
+        self.root_dir = root_dir or os.path.join(tempfile.gettempdir(), "codellamas_cds")
+        self.calibrate_archives = calibrate
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._remove_abandoned_dumps()
+
+        self._lock = threading.Lock()
+        self._archives: Dict[str, CdsArchive] = {}
+        self._creating: Dict[str, str] = {}
+        self._probes: Dict[tuple, tuple] = {}
+        self.created = 0
+        self.stale = 0
+        self.failed = 0
+        self.uses: Dict[str, int] = {role: 0 for role in ROLES}
+
+    def launch(self, role: str, command: str, inputs: Sequence[str] = ()) -> CdsLaunch:
+        """
+        Options for starting `role` through `command` (mvn for maven, java
+        for junit). `inputs` are extra files whose change invalidates the
+        archive, such as the console launcher jar.
+        """
+        fingerprint = self.fingerprint(role, command, inputs)
+        if not fingerprint:
+            return CdsLaunch(role=role)
+
+        path = self._archive_path(role)
+        with self._lock:
+            archive = self._archives.get(role) or self._load(role)
+            if archive is not None and archive.fingerprint == fingerprint and os.path.isfile(path):
+                self.uses[role] += 1
+                return CdsLaunch(
+                    role=role,
+                    options=[f"-XX:SharedArchiveFile={path}", "-Xshare:auto", *QUIET_LOGGING],
+                    archive=archive,
+                    fingerprint=fingerprint,
+                )
+            if archive is not None:
+                # JDK or Maven changed underneath the archive
+                self.stale += 1
+                self._drop(role)
+            if role in self._creating:
+                return CdsLaunch(role=role, fingerprint=fingerprint)
+            tmp = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+            self._creating[role] = tmp
+        return CdsLaunch(
+            role=role,
+            options=[f"-XX:ArchiveClassesAtExit={tmp}", *QUIET_LOGGING],
+            creating=tmp,
+            fingerprint=fingerprint,
+        )
+
+    def complete(self, launch: CdsLaunch, command: str = "", inputs: Sequence[str] = ()) -> None:
+        """Publishes the archive a launch dumped (if it did) and schedules its calibration."""
+        if not launch.creating:
+            return
+        path = self._archive_path(launch.role)
+        archive = None
+        try:
+            if os.path.isfile(launch.creating) and os.path.getsize(launch.creating) > 0:
+                os.replace(launch.creating, path)
+                archive = CdsArchive(
+                    role=launch.role, path=path, fingerprint=launch.fingerprint, created_at=time.time()
+                )
+                self._save(archive)
+        except OSError:
+            archive = None
+        finally:
+            if os.path.exists(launch.creating):
+                try:
+                    os.remove(launch.creating)
+                except OSError:
+                    pass
+            with self._lock:
+                self._creating.pop(launch.role, None)
+                if archive is not None:
+                    self._archives[launch.role] = archive
+                    self.created += 1
+                else:
+                    self.failed += 1
+
+        if archive is not None and self.calibrate_archives and command:
+            threading.Thread(
+                target=self.calibrate,
+                args=(launch.role, command, list(inputs)),
+                name="cds-calibrate",
+                daemon=True,
+            ).start()
+
+    def calibrate(self, role: str, command: str, inputs: Sequence[str] = (), runs: int = 3) -> Optional[CdsArchive]:
+        """Measures the startup time of a trivial launch of `role` with and without its archive."""
+        with self._lock:
+            archive = self._archives.get(role)
+        if archive is None:
+            return None
+        with tempfile.TemporaryDirectory(prefix="codellamas_cds_") as empty:
+            probe = _calibration_command(role, command, inputs, empty)
+            if probe is None:
+                return archive
+            cmd, env_var = probe
+            without = _best_of(cmd, [], env_var, runs)
+            with_archive = _best_of(cmd, [f"-XX:SharedArchiveFile={archive.path}", "-Xshare:auto"], env_var, runs)
+        if without is None or with_archive is None:
+            return archive
+        archive.startup_sec = round(without, 3)
+        archive.archived_startup_sec = round(with_archive, 3)
+        self._save(archive)
+        return archive
+
+    def fingerprint(self, role: str, command: str, inputs: Sequence[str] = ()) -> Optional[str]:
+        """Identity of the JDK (and Maven) the role runs on; None when CDS cannot be used."""
+        probe_cmd = [command, "-v"] if role == "maven" else [command, "-version"]
+        output = self._probe(tuple(probe_cmd))
+        major = java_major(output or "")
+        if major is None or major < MIN_JAVA_MAJOR:
+            return None
+        h = hashlib.sha256(role.encode("utf-8"))
+        h.update(b"\0")
+        h.update(output.encode("utf-8"))
+        for path in inputs:
+            try:
+                st = os.stat(path)
+                h.update(f"\0{path}\0{st.st_size}\0{int(st.st_mtime)}".encode("utf-8"))
+            except OSError:
+                return None
+        return h.hexdigest()
+
+    def saving_sec(self, role: str) -> float:
+        """Estimated saving of the role's current archive (0.0 without one)."""
+        with self._lock:
+            archive = self._archives.get(role)
+            return archive.saving_sec if archive is not None else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            archives = {}
+            for role in ROLES:
+                archive = self._archives.get(role)
+                if archive is not None:
+                    archives[role] = {**asdict(archive), "estimated_saving_sec": archive.saving_sec}
+            return {
+                "dir": self.root_dir,
+                "archives": archives,
+                "creating": sorted(self._creating),
+                "created": self.created,
+                "stale": self.stale,
+                "failed": self.failed,
+                "uses": dict(self.uses),
+            }
+
+    def _probe(self, cmd: tuple) -> Optional[str]:
+        # successful probes hold for the process lifetime, failures are retried after a minute
+        cached = self._probes.get(cmd)
+        if cached is not None and (cached[0] is not None or time.monotonic() - cached[1] < 60):
+            return cached[0]
+        output = None
+        try:
+            proc = subprocess.Popen(
+                list(cmd),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+                shell=os.name == "nt",  # mvn.cmd
+            )
+            out, _ = proc.communicate(timeout=60)
+            if proc.returncode == 0:
+                output = out
+        except (OSError, subprocess.SubprocessError):
+            output = None
+        self._probes[cmd] = (output, time.monotonic())
+        return output
+
+    def _archive_path(self, role: str) -> str:
+        return os.path.join(self.root_dir, f"{role}.jsa")
+
+    def _meta_path(self, role: str) -> str:
+        return os.path.join(self.root_dir, f"{role}.json")
+
+    def _load(self, role: str) -> Optional[CdsArchive]:
+        # caller holds self._lock
+        try:
+            with open(self._meta_path(role), "r", encoding="utf-8") as f:
+                archive = CdsArchive(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+        self._archives[role] = archive
+        return archive
+
+    def _save(self, archive: CdsArchive) -> None:
+        tmp = f"{self._meta_path(archive.role)}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(asdict(archive), f)
+            os.replace(tmp, self._meta_path(archive.role))
+        except OSError:
+            pass
+
+    def _remove_abandoned_dumps(self, max_age_sec: float = 3600) -> None:
+        # dumps of JVMs killed mid-run (other processes may still be writing
+        # recent ones), and archives of roles no longer used
+        now = time.time()
+        for name in os.listdir(self.root_dir):
+            path = os.path.join(self.root_dir, name)
+            stem, ext = os.path.splitext(name)
+            try:
+                if name.endswith(".tmp") and now - os.path.getmtime(path) > max_age_sec:
+                    os.remove(path)
+                elif ext in (".jsa", ".json") and stem not in ROLES:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _drop(self, role: str) -> None:
+        # caller holds self._lock
+        self._archives.pop(role, None)
+        for path in (self._archive_path(role), self._meta_path(role)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _calibration_command(role: str, command: str, inputs: Sequence[str], empty_dir: str) -> Optional[tuple]:
+    """(argv, env var carrying the JVM options or None for inline options) of a trivial launch."""
+    if role == "maven":
+        return [command, "-v"], "MAVEN_OPTS"
+    if role == "junit" and inputs:
+        return [command, "-jar", inputs[0], "execute", "--disable-banner", "--class-path", empty_dir,
+                "--scan-class-path"], None
+    return None
+
+
+def _best_of(cmd: List[str], options: List[str], env_var: Optional[str], runs: int) -> Optional[float]:
+    env = dict(os.environ)
+    if env_var:
+        env[env_var] = " ".join([env.get(env_var, ""), *options]).strip()
+        argv = cmd
+    else:
+        argv = [cmd[0], *options, *cmd[1:]]
+    best = None
+    for _ in range(runs):
+        started = time.monotonic()
+        try:
+            subprocess.Popen(
+                argv, env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL, shell=os.name == "nt" and env_var is not None,
+            ).wait(timeout=120)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        elapsed = time.monotonic() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+_manager: Optional[CdsManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_cds_manager() -> Optional[CdsManager]:
+    """
+    Process-wide AppCDS archive manager used by MavenTool, the javac fast
+    path and the Maven warm-up. Disabled with CDS_ARCHIVES=0; CDS_DIR sets
+    where archives are kept.
+    """
+    global _manager
+    if os.getenv("CDS_ARCHIVES", "1") == "0":
+        return None
+    with _manager_lock:
+        if _manager is None:
+            _manager = CdsManager(root_dir=os.getenv("CDS_DIR") or None)
+        return _manager
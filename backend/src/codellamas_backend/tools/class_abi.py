@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import os
+import re
+import struct
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+
+ACC_PRIVATE = 0x0002
+ACC_SUPER = 0x0020
+ACC_SYNTHETIC = 0x1000
+
+# anonymous and local classes (Outer$1, Outer$1Local) are never referenced by name
+_LOCAL_CLASS_RE = re.compile(r"\$\d")
+
+ClassAbi = Tuple[int, str, Optional[str], Tuple[str, ...], FrozenSet[tuple], FrozenSet[tuple]]
+
+
+def class_abi(data: bytes) -> ClassAbi:
+    """
+    The part of a class file other classes are compiled against: access
+    flags, super class and interfaces, and every non-private field and method
+    (name, descriptor, flags) together with the values of compile-time
+    constants, which javac inlines into the classes using them.
+    Raises ValueError for anything that is not a class file.
+    """
+    try:
+        return _ClassReader(data).abi()
+    except (struct.error, IndexError, TypeError, UnicodeDecodeError) as e:
+        raise ValueError(f"malformed class file: {e}") from e
+
+
+def tree_abi(classes_dir: str) -> Dict[str, ClassAbi]:
+    """class_abi of every named class under classes_dir, by relative path."""
+    out: Dict[str, ClassAbi] = {}
+    for dirpath, _, filenames in os.walk(classes_dir):
+        for name in filenames:
+            if not name.endswith(".class") or _LOCAL_CLASS_RE.search(name):
+                continue
+            path = os.path.join(dirpath, name)
+            with open(path, "rb") as f:
+                out[os.path.relpath(path, classes_dir).replace(os.sep, "/")] = class_abi(f.read())
+    return out
+
+
+class _ClassReader:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def abi(self) -> ClassAbi:
+        magic, _, _ = struct.unpack(">IHH", self._take(8))
+        if magic != 0xCAFEBABE:
+            raise ValueError("not a class file")
+        pool = self._constant_pool()
+        access, this_class, super_class = struct.unpack(">HHH", self._take(6))
+        interfaces = tuple(self._class_name(pool, self._u2()) for _ in range(self._u2()))
+        fields = self._members(pool, constants=True)
+        methods = self._members(pool, constants=False)
+        return (
+            access & ~ACC_SUPER,
+            self._class_name(pool, this_class),
+            self._class_name(pool, super_class) if super_class else None,
+            interfaces,
+            fields,
+            methods,
+        )
+
+    def _constant_pool(self) -> List[Any]:
+        count = self._u2()
+        pool: List[Any] = [None] * count
+        i = 1
+        while i < count:
+            tag = self._take(1)[0]
+            if tag == 1:  # Utf8 (modified UTF-8; lone surrogates are kept as escapes)
+                pool[i] = self._take(self._u2()).decode("utf-8", "surrogateescape")
+            elif tag in (3, 4):  # Integer, Float: raw bytes, so NaN payloads compare too
+                pool[i] = (tag, self._take(4))
+            elif tag in (5, 6):  # Long, Double take two slots
+                pool[i] = (tag, self._take(8))
+                i += 1
+            elif tag in (7, 8, 16, 19, 20):  # Class, String, MethodType, Module, Package
+                pool[i] = (tag, self._u2())
+            elif tag in (9, 10, 11, 12, 17, 18):  # refs, NameAndType, (Invoke)Dynamic
+                self._take(4)
+            elif tag == 15:  # MethodHandle
+                self._take(3)
+            else:
+                raise ValueError(f"unknown constant pool tag {tag}")
+            i += 1
+        return pool
+
+    def _members(self, pool: List[Any], constants: bool) -> FrozenSet[tuple]:
+        out = set()
+        for _ in range(self._u2()):
+            access, name_index, descriptor_index = struct.unpack(">HHH", self._take(6))
+            value = None
+            for _ in range(self._u2()):
+                attr_name, length = struct.unpack(">HI", self._take(6))
+                info = self._take(length)
+                if constants and pool[attr_name] == "ConstantValue":
+                    value = self._constant(pool, struct.unpack(">H", info)[0])
+            if access & (ACC_PRIVATE | ACC_SYNTHETIC):
+                continue
+            out.add((pool[name_index], pool[descriptor_index], access, value))
+        return frozenset(out)
+
+    @staticmethod
+    def _constant(pool: List[Any], index: int) -> Any:
+        tag, value = pool[index]
+        return pool[value] if tag == 8 else value
+
+    @staticmethod
+    def _class_name(pool: List[Any], index: int) -> str:
+        return pool[pool[index][1]]
+
+    def _u2(self) -> int:
+        return struct.unpack(">H", self._take(2))[0]
+
+    def _take(self, n: int) -> bytes:
+        chunk = self.data[self.pos:self.pos + n]
+        if len(chunk) != n:
+            raise ValueError("truncated class file")
+        self.pos += n
+        return chunk
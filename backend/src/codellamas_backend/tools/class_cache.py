@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+
+_COMMENTS_AND_STRINGS_RE = re.compile(
+    r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'',
+    flags=re.DOTALL,
+)
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_$][\w$]*")
+_DECLARED_TYPE_RE = re.compile(r"\b(?:class|interface|enum|record)\s+([A-Za-z_$][\w$]*)")
+_PACKAGE_RE = re.compile(r"^\s*package\s+([\w.]+)\s*;", flags=re.MULTILINE)
+
+
+def _strip(source: str) -> str:
+    return _COMMENTS_AND_STRINGS_RE.sub(" ", source)
+
+
+def package_dir(source: str) -> str:
+    m = _PACKAGE_RE.search(_strip(source))
+    return m.group(1).replace(".", "/") if m else ""
+
+
+def declared_types(source: str) -> Set[str]:
+    return set(_DECLARED_TYPE_RE.findall(_strip(source)))
+
+
+def outputs_of(source: str, source_path: str, class_files: List[str]) -> List[str]:
+    """
+    Which of class_files (relative to the output root) javac produced for one
+    source file: its top-level types and their nested/anonymous classes.
+    """
+    pkg = package_dir(source)
+    names = declared_types(source) | {os.path.splitext(os.path.basename(source_path))[0]}
+    out = []
+    for rel in class_files:
+        rel_posix = rel.replace(os.sep, "/")
+        if os.path.dirname(rel_posix) != pkg:
+            continue
+        stem = os.path.basename(rel_posix)[: -len(".class")]
+        if stem.split("$", 1)[0] in names:
+            out.append(rel)
+    return out
+
+
+def dependency_graph(sources: Dict[str, str]) -> Dict[str, Set[str]]:
+    """
+    Which source files each file refers to, by simple type name.
+    Deliberately over-approximate: a false edge only costs a recompile.
+    """
+    stripped = {path: _strip(content) for path, content in sources.items()}
+    declared = {path: declared_types(content) for path, content in sources.items()}
+    graph: Dict[str, Set[str]] = {}
+    for path, text in stripped.items():
+        identifiers = set(_IDENTIFIER_RE.findall(text))
+        graph[path] = {other for other, names in declared.items() if other != path and names & identifiers}
+    return graph
+
+
+def unit_keys(sources: Dict[str, str], classpath_hash: str) -> Dict[str, str]:
+    """
+    Cache key per source file: its own content, the content of everything it
+    transitively depends on, and the compile classpath. Editing one file
+    therefore invalidates exactly that file and its (transitive) dependents.
+    """
+    graph = dependency_graph(sources)
+    keys: Dict[str, str] = {}
+    for path in sources:
+        closure = _closure(graph, path)
+        h = hashlib.sha256(classpath_hash.encode("utf-8"))
+        for member in [path] + sorted(closure - {path}):
+            h.update(b"\0")
+            h.update(member.encode("utf-8"))
+            h.update(b"\0")
+            h.update(sources[member].encode("utf-8"))
+        keys[path] = h.hexdigest()
+    return keys
+
+
+def classpath_hash(javac_cmd: str, release: Optional[str], classpath: Iterable[str] = ()) -> str:
+    """Everything besides the sources that changes javac's output."""
+    h = hashlib.sha256()
+    h.update(f"{javac_cmd}\0{release or ''}\0".encode("utf-8"))
+    for entry in classpath:
+        try:
+            st = os.stat(entry)
+            h.update(f"{entry}\0{st.st_size}\0{int(st.st_mtime)}\0".encode("utf-8"))
+        except OSError:
+            h.update(f"{entry}\0missing\0".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _closure(graph: Dict[str, Set[str]], start: str) -> Set[str]:
+    seen = {start}
+    stack = [start]
+    while stack:
+        for dep in graph.get(stack.pop(), ()):
+            if dep not in seen:
+                seen.add(dep)
+                stack.append(dep)
+    return seen
+
+
+class CompiledClassCache:
+    """
+    On-disk store of javac output per compilation unit (see unit_keys).
+    Entries are directories of .class files relative to the output root,
+    trimmed least recently used first once max_bytes is exceeded.
+    """
+
+    def __init__(self, root_dir: Optional[str] = None, max_bytes: int = 256 * 1024 * 1024):
+        self.root_dir = root_dir or os.path.join(tempfile.gettempdir(), "codellamas_classes")
+        self.max_bytes = max_bytes
+        os.makedirs(self.root_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def seed(self, key: str, out_dir: str) -> bool:
+        """Copies the cached classes for `key` into out_dir; False on a miss."""
+        entry = self._entry_dir(key)
+        try:
+            os.utime(entry)  # bump recency for LRU trimming
+            _copy_tree(entry, out_dir)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def store(self, key: str, out_dir: str, class_files: List[str]) -> None:
+        """Saves class_files (paths relative to out_dir) as the entry for `key`."""
+        if not class_files:
+            return
+        entry = self._entry_dir(key)
+        if os.path.isdir(entry):
+            return
+        staging = None
+        try:
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            staging = tempfile.mkdtemp(prefix=".staging_", dir=os.path.dirname(entry))
+            for rel in class_files:
+                dst = os.path.join(staging, rel)
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                shutil.copy2(os.path.join(out_dir, rel), dst)
+            os.rename(staging, entry)
+        except OSError:
+            # lost a race with an identical store, or the disk is unhappy
+            if staging:
+                shutil.rmtree(staging, ignore_errors=True)
+            return
+        with self._lock:
+            self.stores += 1
+        self._trim()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.stores = self.evictions = 0
+        for path, _, _ in self._entries():
+            shutil.rmtree(path, ignore_errors=True)
+
+    def stats(self) -> Dict[str, int]:
+        entries = self._entries()
+        with self._lock:
+            return {
+                "entries": len(entries),
+                "bytes": sum(size for _, _, size in entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions,
+            }
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.root_dir, key[:2], key)
+
+    def _entries(self) -> List[tuple]:
+        out = []
+        if not os.path.isdir(self.root_dir):
+            return out
+        for shard in os.listdir(self.root_dir):
+            shard_dir = os.path.join(self.root_dir, shard)
+            if not os.path.isdir(shard_dir):
+                continue
+            for name in os.listdir(shard_dir):
+                if name.startswith("."):
+                    continue
+                path = os.path.join(shard_dir, name)
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    continue
+                out.append((path, mtime, _tree_size(path)))
+        return out
+
+    def _trim(self) -> None:
+        entries = self._entries()
+        total = sum(size for _, _, size in entries)
+        if total <= self.max_bytes:
+            return
+        for path, _, size in sorted(entries, key=lambda e: e[1]):
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            with self._lock:
+                self.evictions += 1
+            if total <= self.max_bytes:
+                break
+
+
+def _copy_tree(src_root: str, dest_root: str) -> None:
+    # real copies: javac may later rewrite files in dest_root
+    if not os.path.isdir(src_root):
+        raise FileNotFoundError(src_root)
+    shutil.copytree(src_root, dest_root, dirs_exist_ok=True)
+
+
+def _tree_size(root: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass
+    return total
+
+
+_cache: Optional[CompiledClassCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_class_cache() -> Optional[CompiledClassCache]:
+    """
+    Process-wide compiled class cache used by the javac fast path.
+    Disabled with CLASS_CACHE=0; CLASS_CACHE_DIR and CLASS_CACHE_MB control
+    its location and size.
+    """
+    global _cache
+    if os.getenv("CLASS_CACHE", "1") == "0":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = CompiledClassCache(
+                root_dir=os.getenv("CLASS_CACHE_DIR") or None,
+                max_bytes=int(os.getenv("CLASS_CACHE_MB", "256")) * 1024 * 1024,
+            )
+        return _cache
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+# javac:                 /ws/src/main/java/App.java:12: error: cannot find symbol
+# javac via _prefix_errors: [ERROR] /ws/src/main/java/App.java:12: error: ...
+_JAVAC_RE = re.compile(
+    r"^(?:\[ERROR\]\s*)?(?P<path>\S.*?\.java):(?P<line>\d+):\s*(?P<severity>error|warning):\s*(?P<message>.*)$"
+)
+# maven-compiler-plugin: [ERROR] /ws/src/main/java/App.java:[12,17] cannot find symbol
+_MAVEN_RE = re.compile(
+    r"^\[(?P<severity>ERROR|WARNING)\]\s+(?P<path>\S.*?\.java):\[(?P<line>\d+),(?P<column>\d+)\]\s*(?P<message>.*)$"
+)
+# detail lines javac prints below an error
+_DETAIL_RE = re.compile(r"^(?:\[(?:ERROR|WARNING)\])?\s+(symbol|location|required|found|reason):\s*(.*)$")
+
+MAX_DIAGNOSTICS = 50
+
+
+@dataclass
+class CompilerDiagnostic:
+    path: str               # relative to the project root when it lies inside it
+    line: int
+    column: Optional[int]   # only maven-compiler-plugin reports one
+    severity: str           # error | warning
+    message: str
+    details: str = ""       # symbol/location/required/found lines, "; "-joined
+
+    def render(self) -> str:
+        where = f"{self.path}:{self.line}" + (f":{self.column}" if self.column else "")
+        text = f"{where}: {self.severity}: {self.message}"
+        return f"{text} ({self.details})" if self.details else text
+
+
+def parse_diagnostics(raw: str, root: Optional[str] = None) -> List[CompilerDiagnostic]:
+    """
+    Compiler errors and warnings from javac or maven-compiler-plugin output,
+    in order of appearance and without the duplicates Maven prints in its
+    failure summary. Paths under `root` are made relative to it.
+    """
+    out: List[CompilerDiagnostic] = []
+    seen = set()
+    current: Optional[CompilerDiagnostic] = None
+
+    for line in (raw or "").splitlines():
+        m = _MAVEN_RE.match(line) or _JAVAC_RE.match(line)
+        if m:
+            groups = m.groupdict()
+            diagnostic = CompilerDiagnostic(
+                path=_relative(groups["path"], root),
+                line=int(groups["line"]),
+                column=int(groups["column"]) if groups.get("column") else None,
+                severity=groups["severity"].lower(),
+                message=groups["message"].strip(),
+            )
+            key = (diagnostic.path, diagnostic.line, diagnostic.severity, diagnostic.message)
+            if key in seen:
+                current = None
+                continue
+            seen.add(key)
+            out.append(diagnostic)
+            current = diagnostic
+            continue
+
+        detail = _DETAIL_RE.match(line)
+        if detail and current is not None:
+            part = f"{detail.group(1)}: {detail.group(2).strip()}"
+            current.details = f"{current.details}; {part}" if current.details else part
+
+    return out[:MAX_DIAGNOSTICS]
+
+
+def errors_only(diagnostics: List[CompilerDiagnostic]) -> List[CompilerDiagnostic]:
+    return [d for d in diagnostics if d.severity == "error"]
+
+
+def _relative(path: str, root: Optional[str]) -> str:
+    path = path.strip()
+    if root:
+        root_abs = os.path.abspath(root)
+        try:
+            if os.path.commonpath([os.path.abspath(path), root_abs]) == root_abs:
+                path = os.path.relpath(path, root_abs)
+        except ValueError:
+            pass  # different drives on Windows
+    return path.replace("\\", "/")
@@ -7,6 +7,8 @@ from crewai.tools import BaseTool
 from typing import Type
 import json
 
+from codellamas_backend.tools.gradle_tool import GradleTool, get_gradle_tool
+
 
 class TestRunnerInput(BaseModel):
     """Input schema for running a Java JUnit 5 test suite."""
@@ -26,6 +28,12 @@ class TestRunnerInput(BaseModel):
 
 
 class JavaTestRunnerTool(BaseTool):
+    """
+    build_tool="gradle" runs `gradle test` through the process-wide GradleTool
+    (warm daemon, shared build cache) and adds the parsed outcome to the
+    result; anything else runs `mvn test`.
+    """
+
     name: str = "java_junit_test_runner"
     description: str = (
         "Compiles Java source code and executes JUnit 5 tests. "
@@ -41,17 +49,21 @@ class JavaTestRunnerTool(BaseTool):
     ) -> str:
 
         with tempfile.TemporaryDirectory() as project_dir:
-            self._write_project_files(project_dir, source_files, test_files)
+            self._write_project_files(project_dir, source_files, test_files, build_tool)
             result = self._run_tests(project_dir, build_tool)
             return json.dumps(result, indent=2)
 
-    def _write_project_files(self, project_dir, source_files, test_files):
+    def _write_project_files(self, project_dir, source_files, test_files, build_tool="maven"):
         for path, content in {**source_files, **test_files}.items():
             full_path = os.path.join(project_dir, path)
             os.makedirs(os.path.dirname(full_path), exist_ok=True)
             with open(full_path, "w") as f:
                 f.write(content)
 
+        if _is_gradle(build_tool):
+            GradleTool.write_default_build(project_dir)
+            return
+
         # Minimal Maven setup
         pom_path = os.path.join(project_dir, "pom.xml")
         if not os.path.exists(pom_path):
@@ -59,6 +71,8 @@ class JavaTestRunnerTool(BaseTool):
                 f.write(self._default_pom())
 
     def _run_tests(self, project_dir, build_tool):
+        if _is_gradle(build_tool):
+            return self._run_gradle_tests(project_dir)
         try:
             process = subprocess.run(
                 "mvn test",
@@ -82,6 +96,25 @@ class JavaTestRunnerTool(BaseTool):
                 "error": "Test execution timed out"
             }
 
+    def _run_gradle_tests(self, project_dir):
+        result = get_gradle_tool().run_tests(project_dir)
+        if result.returncode == 124:
+            return {
+                "success": False,
+                "error": "Test execution timed out"
+            }
+
+        return {
+            "success": result.status == "PASS",
+            "return_code": result.returncode,
+            "stdout": result.raw_log,
+            "stderr": "",
+            "failed_tests": result.failed_tests,
+            "errors": result.errors,
+            "test_summary": result.test_summary(),
+            "diagnostics": [d.render() for d in result.diagnostics],
+        }
+
     def _default_pom(self):
         return """\
             <project xmlns="http://maven.apache.org/POM/4.0.0">
@@ -108,3 +141,7 @@ class JavaTestRunnerTool(BaseTool):
             </build>
             </project>
         """
+
+
+def _is_gradle(build_tool) -> bool:
+    return (build_tool or "").strip().lower() == "gradle"
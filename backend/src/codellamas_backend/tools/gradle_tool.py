@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from codellamas_backend.tools.compiler_diagnostics import errors_only, parse_diagnostics
+from codellamas_backend.tools.maven_tool import MavenTestResult
+from codellamas_backend.tools.process_stream import run_streaming
+from codellamas_backend.tools.surefire_report import failed_test_names, parse_reports
+
+
+BUILD_FILES = ("build.gradle", "build.gradle.kts")
+
+# Output after which the build cannot produce a useful test result.
+GRADLE_STOP_ON = ("Compilation failed; see the compiler error output",)
+
+# com.example.AppTest > bad() FAILED
+_FAILED_TEST_RE = re.compile(r"^(?P<cls>[\w.$]+) > (?P<method>.+?)(?:\(\))? FAILED\s*$")
+
+DEFAULT_BUILD_GRADLE = """\
+plugins {
+    id 'java'
+}
+
+group = 'edu.exercise'
+version = '1.0-SNAPSHOT'
+
+repositories {
+    mavenCentral()
+}
+
+dependencies {
+    testImplementation 'org.junit.jupiter:junit-jupiter:5.10.0'
+    testRuntimeOnly 'org.junit.platform:junit-platform-launcher'
+}
+
+test {
+    useJUnitPlatform()
+}
+"""
+
+DEFAULT_SETTINGS_GRADLE = "rootProject.name = 'refactoring-exercise'\n"
+
+
+class GradleTool:
+    """
+    Runs `gradle test` in a project directory and parses the outcome into the
+    same MavenTestResult the Maven path returns: PASS/FAIL, failed tests from
+    the JUnit XML reports in build/test-results/test (console lines as a
+    fallback), error categories, and javac diagnostics.
+
+    Builds go through a Gradle daemon that outlives the run, so only the first
+    build of a worker pays for JVM startup and build script compilation, and
+    through Gradle's build cache, so unchanged compile tasks are reused across
+    workspaces. Both live in `user_home`, which every run shares. The daemon
+    exits after `daemon_idle_sec` without builds.
+
+    A project's own wrapper (gradlew with its wrapper jar) is preferred over
+    the configured `gradle_cmd`.
+    """
+
+    def __init__(
+        self,
+        gradle_cmd: str = "gradle",
+        timeout_sec: int = 300,
+        daemon: bool = True,
+        build_cache: bool = True,
+        user_home: Optional[str] = None,
+        daemon_idle_sec: int = 3 * 3600,
+    ):
+        self.gradle_cmd = gradle_cmd
+        self.timeout_sec = timeout_sec
+        self.daemon = daemon
+        self.build_cache = build_cache
+        self.user_home = user_home or os.path.join(tempfile.gettempdir(), "codellamas_gradle")
+        self.daemon_idle_sec = daemon_idle_sec
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.daemon_warm = False
+
+    @staticmethod
+    def is_gradle_project(project_dir: str) -> bool:
+        return any(os.path.isfile(os.path.join(project_dir, name)) for name in BUILD_FILES)
+
+    @staticmethod
+    def write_default_build(project_dir: str) -> None:
+        """Adds a plain JUnit 5 build (and settings) unless the project has its own."""
+        if not GradleTool.is_gradle_project(project_dir):
+            with open(os.path.join(project_dir, "build.gradle"), "w", encoding="utf-8") as f:
+                f.write(DEFAULT_BUILD_GRADLE)
+        if not any(os.path.isfile(os.path.join(project_dir, name)) for name in ("settings.gradle", "settings.gradle.kts")):
+            # without settings Gradle searches parent directories for a build
+            with open(os.path.join(project_dir, "settings.gradle"), "w", encoding="utf-8") as f:
+                f.write(DEFAULT_SETTINGS_GRADLE)
+
+    def run_tests(self, project_dir: str, timeout_sec: Optional[float] = None) -> MavenTestResult:
+        timeout_sec = timeout_sec or self.timeout_sec
+        try:
+            proc = run_streaming(
+                self._command(project_dir, "test"),
+                cwd=project_dir,
+                env=self._env(),
+                timeout=timeout_sec,
+                stop_on=GRADLE_STOP_ON,
+            )
+        except subprocess.TimeoutExpired as e:
+            return MavenTestResult(
+                status="FAIL",
+                returncode=124,
+                failed_tests=[],
+                errors=[f"gradle test timed out after {timeout_sec}s"],
+                raw_log=e.output or "",
+            )
+        except OSError as e:
+            return MavenTestResult(
+                status="FAIL",
+                returncode=127,
+                failed_tests=[],
+                errors=["Gradle executable not found"],
+                raw_log=str(e),
+            )
+        with self._lock:
+            self.builds += 1
+            self.daemon_warm = self.daemon
+        return self._result(project_dir, proc.returncode, proc.stdout or "", getattr(proc, "stopped_on", None))
+
+    def warm_up(self) -> bool:
+        """Starts the daemon with a no-op build, so the first real build finds it running."""
+        if not self.daemon:
+            return False
+        with tempfile.TemporaryDirectory(prefix="codellamas_gradle_warmup_") as project_dir:
+            with open(os.path.join(project_dir, "settings.gradle"), "w", encoding="utf-8") as f:
+                f.write(DEFAULT_SETTINGS_GRADLE)
+            try:
+                proc = subprocess.run(
+                    self._command(project_dir, "help"),
+                    cwd=project_dir,
+                    env=self._env(),
+                    capture_output=True,
+                    text=True,
+                    timeout=self.timeout_sec,
+                )
+            except (OSError, subprocess.TimeoutExpired) as e:
+                logging.warning(f"Gradle warm-up failed: {e}")
+                return False
+        with self._lock:
+            self.daemon_warm = proc.returncode == 0
+        return proc.returncode == 0
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "gradle_cmd": self.gradle_cmd,
+                "daemon": self.daemon,
+                "daemon_warm": self.daemon_warm,
+                "build_cache": self.build_cache,
+                "user_home": self.user_home,
+                "builds": self.builds,
+            }
+
+    def _command(self, project_dir: str, task: str) -> List[str]:
+        cmd = [self._executable(project_dir), task, "--console=plain", "--gradle-user-home", self.user_home]
+        cmd += ["--daemon", f"-Dorg.gradle.daemon.idletimeout={self.daemon_idle_sec * 1000}"] if self.daemon else ["--no-daemon"]
+        cmd += ["--build-cache"] if self.build_cache else ["--no-build-cache"]
+        return cmd
+
+    def _executable(self, project_dir: str) -> str:
+        wrapper = os.path.join(project_dir, "gradlew.bat" if os.name == "nt" else "gradlew")
+        wrapper_jar = os.path.join(project_dir, "gradle", "wrapper", "gradle-wrapper.jar")
+        if os.path.isfile(wrapper) and os.path.isfile(wrapper_jar) and os.access(wrapper, os.X_OK):
+            return wrapper
+        return self.gradle_cmd
+
+    def _env(self) -> Dict[str, str]:
+        env = dict(os.environ)
+        env["GRADLE_USER_HOME"] = self.user_home
+        return env
+
+    def _result(self, project_dir: str, returncode: int, raw: str, stopped_on: Optional[str] = None) -> MavenTestResult:
+        if isinstance(stopped_on, str):
+            raw += f"\n[codellamas] build stopped early after '{stopped_on}'"
+            returncode = returncode if returncode > 0 else 1
+        status, failed_tests, errors = parse_gradle_output(returncode, raw)
+
+        test_cases = parse_reports(os.path.join(project_dir, "build", "test-results", "test"))
+        if status == "FAIL" and test_cases:
+            failed_tests = failed_test_names(test_cases)[:30] or failed_tests
+
+        return MavenTestResult(
+            status=status,
+            returncode=returncode,
+            failed_tests=failed_tests,
+            errors=errors,
+            raw_log=raw,
+            test_cases=test_cases,
+            diagnostics=errors_only(parse_diagnostics(raw, project_dir)) if status == "FAIL" else [],
+        )
+
+
+def parse_gradle_output(returncode: int, raw: str) -> Tuple[str, List[str], List[str]]:
+    """Status, failed tests and error categories, like MavenTool._parse_maven_output."""
+    if returncode == 0:
+        return "PASS", [], []
+
+    errors: List[str] = []
+    if "Compilation failed" in raw or re.search(r":compile\w*Java FAILED", raw):
+        errors.append("Compilation error")
+    if "There were failing tests" in raw or re.search(r":test FAILED", raw):
+        errors.append("Test failures")
+    if "Could not resolve" in raw or "No cached version of" in raw:
+        errors.append("Dependency resolution error")
+    if "BUILD FAILED" in raw:
+        errors.append("Build failure")
+    if not errors:
+        errors.append("gradle test failed (see raw_log)")
+
+    failed_tests = []
+    for line in raw.splitlines():
+        m = _FAILED_TEST_RE.match(line.strip())
+        if m:
+            failed_tests.append(f"{m.group('cls')}.{m.group('method')}")
+
+    return "FAIL", list(dict.fromkeys(failed_tests))[:30], list(dict.fromkeys(errors))[:20]
+
+
+_gradle: Optional[GradleTool] = None
+_gradle_lock = threading.Lock()
+
+
+def get_gradle_tool() -> GradleTool:
+    """
+    Process-wide Gradle runner, so every build of a worker shares one daemon
+    and one build cache. GRADLE_DAEMON=0 and GRADLE_BUILD_CACHE=0 turn those
+    off; GRADLE_CMD, GRADLE_USER_HOME, GRADLE_TIMEOUT_SEC and
+    GRADLE_DAEMON_IDLE_SEC configure it.
+    """
+    global _gradle
+    with _gradle_lock:
+        if _gradle is None:
+            _gradle = GradleTool(
+                gradle_cmd=os.getenv("GRADLE_CMD", "gradle"),
+                timeout_sec=int(os.getenv("GRADLE_TIMEOUT_SEC", "300")),
+                daemon=os.getenv("GRADLE_DAEMON", "1") != "0",
+                build_cache=os.getenv("GRADLE_BUILD_CACHE", "1") != "0",
+                user_home=os.getenv("GRADLE_USER_HOME") or None,
+                daemon_idle_sec=int(os.getenv("GRADLE_DAEMON_IDLE_SEC", str(3 * 3600))),
+            )
+        return _gradle
+
+
+def start_gradle_warmup() -> Optional[threading.Thread]:
+    """
+    Starts this worker's Gradle daemon in the background when GRADLE_WARMUP=1.
+    Off by default: only the java_junit_test_runner tool builds with Gradle,
+    so the daemon is otherwise started by the first Gradle build. Also
+    skipped when the daemon is disabled or Gradle is not installed.
+    """
+    if os.getenv("GRADLE_WARMUP", "0") != "1":
+        return None
+    tool = get_gradle_tool()
+    if not tool.daemon or shutil.which(tool.gradle_cmd) is None:
+        return None
+    thread = threading.Thread(target=tool.warm_up, name="gradle-warmup", daemon=True)
+    thread.start()
+    return thread
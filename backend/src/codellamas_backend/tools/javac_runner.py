@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import glob
+import os
+import shutil
+import subprocess
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from codellamas_backend.tools.cds_archive import get_cds_manager
+from codellamas_backend.tools.surefire_report import failed_test_names, parse_reports
+from codellamas_backend.tools.class_cache import (
+    CompiledClassCache,
+    classpath_hash,
+    get_class_cache,
+    outputs_of,
+    unit_keys,
+)
+
+JUNIT_STANDALONE_VERSION = "1.10.2"
+
+RunOutcome = Tuple[str, int, List[str], List[str], str]  # status, returncode, failed_tests, errors, raw_log
+
+
+def default_junit_standalone_jar() -> str:
+    """
+    junit-platform-console-standalone bundles the JUnit Platform launcher, the
+    Jupiter API and the Jupiter engine, i.e. the whole pre-resolved test
+    classpath for simple exercise poms.
+    """
+    configured = os.getenv("JUNIT_STANDALONE_JAR", "")
+    if configured:
+        return configured
+    repo = os.getenv("MAVEN_LOCAL_REPO") or os.path.join(os.path.expanduser("~"), ".m2", "repository")
+    return os.path.join(
+        repo,
+        "org",
+        "junit",
+        "platform",
+        "junit-platform-console-standalone",
+        JUNIT_STANDALONE_VERSION,
+        f"junit-platform-console-standalone-{JUNIT_STANDALONE_VERSION}.jar",
+    )
+
+
+class JavacJUnitRunner:
+    """
+    Compiles a Maven-layout workspace with javac and runs it with the JUnit
+    Platform console launcher, skipping Maven entirely.
+    Only valid for projects that pass pom_profile.is_simple_junit_pom.
+
+    Main classes are seeded from the compiled class cache when possible, so
+    only changed files and the files depending on them are recompiled.
+    """
+
+    def __init__(
+        self,
+        timeout_sec: int = 300,
+        console_jar: Optional[str] = None,
+        java_cmd: Optional[str] = None,
+        javac_cmd: Optional[str] = None,
+        class_cache: Optional[CompiledClassCache] = None,
+    ):
+        self.timeout_sec = timeout_sec
+        self.class_cache = class_cache
+        self.console_jar = console_jar or default_junit_standalone_jar()
+        self.java_cmd = java_cmd or shutil.which("java") or ""
+        self.javac_cmd = javac_cmd or shutil.which("javac") or ""
+
+    def available(self) -> bool:
+        return bool(self.java_cmd and self.javac_cmd) and os.path.isfile(self.console_jar)
+
+    def compile(
+        self,
+        root: str,
+        release: Optional[str] = None,
+        compile_tests: bool = True,
+        deadline: Optional[float] = None,
+    ) -> Tuple[bool, str]:
+        """
+        Compiles main (and unless compile_tests=False, test) sources into
+        target/classes and target/test-classes. Raises TimeoutExpired.
+        """
+        deadline = deadline or time.monotonic() + self.timeout_sec
+        classes = os.path.join(root, "target", "classes")
+        ok, log = self._compile_main(root, classes, release, deadline)
+        if ok and compile_tests:
+            ok, log = self._javac(
+                root,
+                _sources(root, "src/test/java"),
+                os.path.join(root, "target", "test-classes"),
+                os.pathsep.join([classes, self.console_jar]),
+                release,
+                deadline,
+            )
+        return ok, log
+
+    def run(
+        self,
+        root: str,
+        release: Optional[str] = None,
+        compile_tests: bool = True,
+        jvm_args: Sequence[str] = (),
+        config: Optional[Dict[str, str]] = None,
+        timeout_sec: Optional[float] = None,
+        precompiled: bool = False,
+    ) -> RunOutcome:
+        """
+        compile_tests=False runs against test classes already in target/test-classes,
+        precompiled=True against main and test classes compiled beforehand.
+        jvm_args and config (JUnit Platform configuration parameters) are
+        passed to the console launcher. timeout_sec overrides the runner's
+        timeout for this run.
+        """
+        timeout_sec = timeout_sec or self.timeout_sec
+        deadline = time.monotonic() + timeout_sec
+        classes = os.path.join(root, "target", "classes")
+        test_classes = os.path.join(root, "target", "test-classes")
+        reports = os.path.join(root, "target", "junit-reports")
+
+        try:
+            ok, log = (True, "") if precompiled else self.compile(root, release, compile_tests, deadline)
+            if not ok:
+                return compilation_failed(log)
+
+            cds = get_cds_manager()
+            launch = cds.launch("junit", self.java_cmd, [self.console_jar]) if cds is not None else None
+            try:
+                proc = subprocess.run(
+                    [
+                        self.java_cmd,
+                        *(launch.options if launch is not None else []),
+                        *jvm_args,
+                        "-jar",
+                        self.console_jar,
+                        "execute",
+                        "--disable-banner",
+                        "--disable-ansi-colors",
+                        "--details=tree",
+                        "--class-path",
+                        os.pathsep.join([classes, test_classes]),
+                        "--scan-class-path",
+                        "--reports-dir",
+                        reports,
+                        *(f"--config={key}={value}" for key, value in (config or {}).items()),
+                    ],
+                    cwd=root,
+                    capture_output=True,
+                    text=True,
+                    timeout=_remaining(deadline),
+                )
+            finally:
+                if launch is not None:
+                    cds.complete(launch, self.java_cmd, [self.console_jar])
+        except subprocess.TimeoutExpired:
+            return timed_out(timeout_sec)
+
+        raw = (proc.stdout or "") + "\n" + (proc.stderr or "")
+        failed_tests = parse_junit_xml_failures(reports)
+
+        if proc.returncode == 0:
+            return "PASS", 0, [], [], raw
+
+        errors = ["Test failures"] if failed_tests else ["JUnit console launcher failed (see raw_log)"]
+        return "FAIL", proc.returncode, failed_tests[:30], errors, raw
+
+    def _compile_main(
+        self, root: str, out_dir: str, release: Optional[str], deadline: float
+    ) -> Tuple[bool, str]:
+        sources = _sources(root, "src/main/java")
+        cache = self.class_cache or get_class_cache()
+        if cache is None or not sources:
+            return self._javac(root, sources, out_dir, "", release, deadline)
+
+        contents: Dict[str, str] = {}
+        for path in sources:
+            with open(path, "r", encoding="utf-8") as f:
+                contents[path] = f.read()
+        # keys must not depend on the (random) workspace location
+        rel = {path: os.path.relpath(path, root) for path in sources}
+        keys_by_rel = unit_keys(
+            {rel[p]: c for p, c in contents.items()},
+            classpath_hash(self.javac_cmd, release),
+        )
+
+        os.makedirs(out_dir, exist_ok=True)
+        stale = [p for p in sources if not cache.seed(keys_by_rel[rel[p]], out_dir)]
+        if not stale:
+            return True, ""
+
+        seeded = set(_class_files(out_dir))
+        ok, log = self._javac(root, stale, out_dir, out_dir, release, deadline)
+        if ok:
+            fresh = [f for f in _class_files(out_dir) if f not in seeded]
+            for path in stale:
+                cache.store(keys_by_rel[rel[path]], out_dir, outputs_of(contents[path], path, fresh))
+        return ok, log
+
+    def _javac(
+        self,
+        root: str,
+        sources: List[str],
+        out_dir: str,
+        classpath: str,
+        release: Optional[str],
+        deadline: float,
+    ) -> Tuple[bool, str]:
+        if not sources:
+            return True, ""
+
+        os.makedirs(out_dir, exist_ok=True)
+        argfile = os.path.join(os.path.dirname(out_dir), f"{os.path.basename(out_dir)}.sources")
+        with open(argfile, "w", encoding="utf-8") as f:
+            f.write("\n".join(f'"{_escape_argfile(s)}"' for s in sources))
+
+        cmd = [self.javac_cmd, "-d", out_dir, "-encoding", "UTF-8", "-proc:none", "-implicit:none"]
+        if release:
+            cmd += ["--release", release]
+        if classpath:
+            cmd += ["-cp", classpath]
+        cmd.append(f"@{argfile}")
+
+        proc = subprocess.run(
+            cmd, cwd=root, capture_output=True, text=True, timeout=_remaining(deadline)
+        )
+        return proc.returncode == 0, (proc.stdout or "") + (proc.stderr or "")
+
+
+def compilation_failed(log: str) -> RunOutcome:
+    return "FAIL", 1, [], ["Compilation error"], "[ERROR] COMPILATION ERROR :\n" + _prefix_errors(log)
+
+
+def timed_out(timeout_sec: float) -> RunOutcome:
+    return "FAIL", 124, [], [f"javac/JUnit test run timed out after {timeout_sec}s"], ""
+
+
+def _sources(root: str, src_rel: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(root, src_rel, "**", "*.java"), recursive=True))
+
+
+def _class_files(out_dir: str) -> List[str]:
+    return [
+        os.path.relpath(path, out_dir)
+        for path in glob.glob(os.path.join(out_dir, "**", "*.class"), recursive=True)
+    ]
+
+
+def parse_junit_xml_failures(reports_dir: str) -> List[str]:
+    """Failed/errored test cases from legacy (surefire-style) XML reports."""
+    return failed_test_names(parse_reports(reports_dir))
+
+
+def _remaining(deadline: float) -> float:
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise subprocess.TimeoutExpired(cmd="javac", timeout=0)
+    return remaining
+
+
+def _escape_argfile(path: str) -> str:
+    return path.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _prefix_errors(log: str) -> str:
+    return "\n".join(
+        f"[ERROR] {line}" if ": error:" in line else line for line in log.splitlines()
+    )
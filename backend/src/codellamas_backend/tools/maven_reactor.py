@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import glob
+import math
+import os
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from codellamas_backend.schemas.files import ProjectFile
+from codellamas_backend.tools.workspace import Workspace
+
+
+POM_NS = "http://maven.apache.org/POM/4.0.0"
+ET.register_namespace("", POM_NS)
+
+AGGREGATOR_ARTIFACT = "codellamas-reactor"
+
+# [INFO] m003 ........................................... FAILURE [  2.114 s]
+# [INFO] m003 1.0-SNAPSHOT .............................. SUCCESS [  1.020 s]
+_SUMMARY_RE = re.compile(r"^\[INFO\]\s+(?P<name>\S+)(?:\s+\S+)?\s+\.+\s*(?P<status>SUCCESS|FAILURE|SKIPPED)\b")
+
+# surefire's default <includes>
+_TEST_CLASS_RE = re.compile(r"^(Test\w*|\w*Test|\w*Tests|\w*TestCase)\.java$")
+
+
+@dataclass
+class ReactorJob:
+    """One verification to run as a module of a reactor build."""
+
+    project_files: List[ProjectFile]
+    override_files: List[ProjectFile] = field(default_factory=list)
+    inject_tests: Dict[str, str] = field(default_factory=dict)
+    timeout_sec: Optional[float] = None  # for the module's test fork
+
+    def pom(self) -> Optional[str]:
+        for f in reversed(self.override_files):
+            if Workspace.normalize(f.path) == "pom.xml":
+                return f.content
+        for f in self.project_files:
+            if Workspace.normalize(f.path) == "pom.xml":
+                return f.content
+        return None
+
+    def files(self) -> List[ProjectFile]:
+        """Base project, then the overrides, then the injected tests, as write order."""
+        tests = [ProjectFile(path=path, content=content) for path, content in self.inject_tests.items()]
+        return list(self.project_files) + list(self.override_files) + tests
+
+    def test_classes(self) -> List[str]:
+        """Simple names of the classes surefire runs by default."""
+        names = set()
+        for f in self.files():
+            path = Workspace.normalize(f.path)
+            name = os.path.basename(path)
+            if path.startswith("src/test/java/") and _TEST_CLASS_RE.match(name):
+                names.add(name[: -len(".java")])
+        return sorted(names)
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child(el: ET.Element, name: str) -> Optional[ET.Element]:
+    for child in el:
+        if _local_name(child.tag) == name:
+            return child
+    return None
+
+
+def reactor_eligible(pom_xml: Optional[str]) -> bool:
+    """
+    Whether the project can be a reactor module: a parseable single-module
+    jar project. Aggregators and projects with a local parent pom cannot.
+    """
+    if not pom_xml:
+        return False
+    try:
+        root = ET.fromstring(pom_xml)
+    except ET.ParseError:
+        return False
+    if _child(root, "modules") is not None:
+        return False
+    packaging = _child(root, "packaging")
+    if packaging is not None and (packaging.text or "").strip() not in ("", "jar"):
+        return False
+    parent = _child(root, "parent")
+    if parent is not None:
+        relative = _child(parent, "relativePath")
+        # an explicit relativePath points at a parent inside the project
+        if relative is not None and (relative.text or "").strip():
+            return False
+    return True
+
+
+def module_pom(pom_xml: str, module: str, fork_timeout_sec: Optional[float] = None) -> str:
+    """
+    The project's pom as reactor module `module`: its artifactId and name
+    become the module name (every exercise is usually called the same), and
+    a parent is resolved from the repository, never from the aggregator.
+    fork_timeout_sec caps the module's test fork (surefire.timeout) unless
+    the project sets a shorter one.
+    """
+    root = ET.fromstring(pom_xml)
+    ns = root.tag[: -len("project")] if root.tag.endswith("}project") else ""
+    for name in ("artifactId", "name"):
+        el = _child(root, name)
+        if el is None:
+            el = ET.SubElement(root, f"{ns}{name}")
+        el.text = module
+    parent = _child(root, "parent")
+    if parent is not None and _child(parent, "relativePath") is None:
+        ET.SubElement(parent, f"{ns}relativePath")
+    if fork_timeout_sec:
+        properties = _child(root, "properties")
+        if properties is None:
+            properties = ET.SubElement(root, f"{ns}properties")
+        timeout = _child(properties, "surefire.timeout")
+        if timeout is None:
+            timeout = ET.SubElement(properties, f"{ns}surefire.timeout")
+        limit = max(1, math.ceil(fork_timeout_sec))
+        current = (timeout.text or "").strip()
+        if not current.isdigit() or int(current) <= 0 or int(current) > limit:
+            timeout.text = str(limit)
+    return ET.tostring(root, encoding="unicode")
+
+
+def aggregator_pom(modules: List[str]) -> str:
+    module_lines = "\n".join(f"    <module>{m}</module>" for m in modules)
+    return f"""<project xmlns="{POM_NS}">
+  <modelVersion>4.0.0</modelVersion>
+  <groupId>codellamas</groupId>
+  <artifactId>{AGGREGATOR_ARTIFACT}</artifactId>
+  <version>1</version>
+  <packaging>pom</packaging>
+  <modules>
+{module_lines}
+  </modules>
+</project>
+"""
+
+
+def parse_reactor_summary(raw: str, modules: List[str]) -> Dict[str, str]:
+    """Module name -> SUCCESS | FAILURE | SKIPPED from Maven's reactor summary."""
+    wanted = set(modules)
+    out: Dict[str, str] = {}
+    for line in (raw or "").splitlines():
+        m = _SUMMARY_RE.match(line.strip())
+        if m and m.group("name") in wanted:
+            out[m.group("name")] = m.group("status")
+    return out
+
+
+def module_log(raw: str, module: str, module_root: str, max_report_chars: int = 4000) -> str:
+    """
+    The part of an interleaved reactor log that belongs to one module: lines
+    naming its directory or its summary entry, followed by its surefire
+    text reports.
+    """
+    marker = os.sep + module + os.sep
+    lines = [
+        line for line in (raw or "").splitlines()
+        if marker in line or f"/{module}/" in line or re.match(rf"^\[INFO\]\s+{re.escape(module)}\b", line)
+    ]
+    reports = []
+    for path in sorted(glob.glob(os.path.join(module_root, "target", "surefire-reports", "*.txt"))):
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                reports.append(f.read())
+        except OSError:
+            continue
+    text = "\n".join(lines)
+    report_text = "\n".join(reports)[:max_report_chars]
+    return f"{text}\n{report_text}".strip() if report_text else text
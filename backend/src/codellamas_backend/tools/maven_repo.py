@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+from codellamas_backend.tools.cds_archive import get_cds_manager
+from codellamas_backend.tools.javac_runner import JUNIT_STANDALONE_VERSION
+from codellamas_backend.tools.workspace import Workspace
+
+
+JUNIT_CONSOLE_ARTIFACT = "org.junit.platform:junit-platform-console-standalone"
+
+# Minimal test so the warm-up run also resolves the surefire JUnit Platform
+# provider, which Maven only downloads once there is a test to execute.
+SMOKE_TEST_PATH = "src/test/java/codellamas/warmup/WarmupTest.java"
+SMOKE_TEST = """package codellamas.warmup;
+
+import org.junit.jupiter.api.Test;
+
+class WarmupTest {
+    @Test
+    void warmup() {
+    }
+}
+"""
+
+_OFFLINE_MISSING_RE = re.compile(
+    r"artifact (\S+) has not been downloaded from it before", flags=re.IGNORECASE
+)
+_NOT_FOUND_RE = re.compile(
+    r"(?:Could not find artifact|Failure to find) (\S+)", flags=re.IGNORECASE
+)
+_PLUGIN_RE = re.compile(
+    r"Plugin (\S+) or one of its dependencies could not be resolved", flags=re.IGNORECASE
+)
+
+
+@dataclass
+class WarmupResult:
+    pom: str  # "default" or the pom file path
+    ok: bool
+    seconds: float
+    missing_artifacts: List[str]
+    error: str = ""
+
+
+def local_repository() -> Optional[str]:
+    """Local repository override (MAVEN_LOCAL_REPO); None means Maven's ~/.m2 default."""
+    return os.getenv("MAVEN_LOCAL_REPO") or None
+
+
+def local_repository_args() -> List[str]:
+    repo = local_repository()
+    return [f"-Dmaven.repo.local={repo}"] if repo else []
+
+
+def offline_enabled() -> bool:
+    """
+    MAVEN_OFFLINE=1 forces offline builds, 0 disables them; the default
+    ("auto") goes offline as soon as a warm-up completed without failures.
+    """
+    mode = os.getenv("MAVEN_OFFLINE", "auto").lower()
+    if mode in ("1", "true"):
+        return True
+    if mode in ("0", "false"):
+        return False
+    with _state_lock:
+        return _warm
+
+
+def missing_artifacts(raw: str) -> List[str]:
+    """Artifact coordinates Maven could not resolve, as reported in its log."""
+    out: Dict[str, None] = {}
+    for pattern in (_OFFLINE_MISSING_RE, _NOT_FOUND_RE, _PLUGIN_RE):
+        for coords in pattern.findall(raw or ""):
+            out[coords.rstrip(".,:")] = None
+    return list(out)[:30]
+
+
+def warm_up_maven_repository(
+    pom_files: Optional[List[str]] = None,
+    *,
+    default_pom: Optional[str] = None,
+    mvn_cmd: str = "",
+    timeout_sec: int = 900,
+) -> List[WarmupResult]:
+    """
+    Resolves every dependency and plugin the default pom and each extra pom
+    need into the local repository by running a real `mvn test` once per pom,
+    plus the junit-platform-console-standalone jar used by the javac fast path.
+    Results are recorded for repository_status(); when all succeed, MavenTool
+    switches to offline mode (see offline_enabled).
+    """
+    mvn = mvn_cmd or _which_mvn()
+    results: List[WarmupResult] = []
+
+    if not mvn:
+        results.append(WarmupResult(pom="default", ok=False, seconds=0.0, missing_artifacts=[],
+                                    error="Maven executable not found"))
+        _record(results)
+        return results
+
+    poms: List[tuple] = []
+    if default_pom:
+        poms.append(("default", default_pom))
+    for path in pom_files or []:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                poms.append((path, f.read()))
+        except OSError as e:
+            results.append(WarmupResult(pom=path, ok=False, seconds=0.0, missing_artifacts=[], error=str(e)))
+
+    for name, pom_xml in poms:
+        results.append(_warm_one(mvn, name, pom_xml, timeout_sec))
+
+    results.append(_fetch_console_jar(mvn, timeout_sec))
+    _record(results)
+    return results
+
+
+def warm_up_pom_files() -> List[str]:
+    """Extra poms to warm up, from MAVEN_WARMUP_POMS (os.pathsep separated)."""
+    raw = os.getenv("MAVEN_WARMUP_POMS", "")
+    return [p for p in raw.split(os.pathsep) if p.strip()]
+
+
+def repository_status() -> Dict[str, Any]:
+    with _state_lock:
+        results = [asdict(r) for r in _results]
+        warm = _warm
+    return {
+        "local_repository": local_repository() or "~/.m2/repository",
+        "warm": warm,
+        "offline": offline_enabled(),
+        "warmup": results,
+    }
+
+
+def _warm_one(mvn: str, name: str, pom_xml: str, timeout_sec: int) -> WarmupResult:
+    started = time.monotonic()
+    with Workspace(prefix="codellamas_warmup_") as ws:
+        ws.write_file_map({"pom.xml": pom_xml})
+        if "junit-jupiter" in pom_xml:
+            ws.write_file_map({SMOKE_TEST_PATH: SMOKE_TEST})
+        # the first build also creates the AppCDS archives for later verifications
+        cds = get_cds_manager()
+        launches = [cds.launch("maven", mvn), cds.launch("surefire", mvn)] if cds is not None else []
+        env = dict(os.environ)
+        arg_line: List[str] = []
+        for launch in launches:
+            if launch.role == "maven" and launch.options:
+                env["MAVEN_OPTS"] = " ".join([env.get("MAVEN_OPTS", ""), *launch.options]).strip()
+            elif launch.role == "surefire" and launch.options:
+                arg_line = ["-DargLine=" + " ".join(launch.options)]
+        cmd = [mvn, "-B", "-q", *local_repository_args(), *arg_line, "dependency:go-offline", "test"]
+        try:
+            ok, raw, error = _run(cmd, ws.root, timeout_sec, env=env)
+        finally:
+            for launch in launches:
+                cds.complete(launch, mvn)
+    return WarmupResult(
+        pom=name,
+        ok=ok,
+        seconds=round(time.monotonic() - started, 2),
+        missing_artifacts=[] if ok else missing_artifacts(raw),
+        error=error,
+    )
+
+
+def _fetch_console_jar(mvn: str, timeout_sec: int) -> WarmupResult:
+    started = time.monotonic()
+    coords = f"{JUNIT_CONSOLE_ARTIFACT}:{JUNIT_STANDALONE_VERSION}"
+    cmd = [mvn, "-B", "-q", *local_repository_args(), "dependency:get", f"-Dartifact={coords}"]
+    ok, raw, error = _run(cmd, None, timeout_sec)
+    return WarmupResult(
+        pom=coords,
+        ok=ok,
+        seconds=round(time.monotonic() - started, 2),
+        missing_artifacts=[] if ok else (missing_artifacts(raw) or [coords]),
+        error=error,
+    )
+
+
+def _run(cmd: List[str], cwd: Optional[str], timeout_sec: int, env: Optional[Dict[str, str]] = None) -> tuple:
+    try:
+        proc = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, timeout=timeout_sec, env=env)
+    except subprocess.TimeoutExpired:
+        return False, "", f"timed out after {timeout_sec}s"
+    except OSError as e:
+        return False, "", str(e)
+    raw = (proc.stdout or "") + "\n" + (proc.stderr or "")
+    if proc.returncode != 0:
+        return False, raw, f"mvn exited with {proc.returncode}"
+    return True, raw, ""
+
+
+def _which_mvn() -> str:
+    configured = os.getenv("MAVEN_CMD", "")
+    if configured:
+        return configured
+    for candidate in ("mvn.cmd", "mvn.bat", "mvn"):
+        if shutil.which(candidate):
+            return candidate
+    return ""
+
+
+def _record(results: List[WarmupResult]) -> None:
+    global _warm, _results
+    with _state_lock:
+        _results = list(results)
+        _warm = bool(results) and all(r.ok for r in results)
+
+
+_state_lock = threading.Lock()
+_warm = False
+_results: List[WarmupResult] = []
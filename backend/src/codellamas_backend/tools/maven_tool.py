@@ -1,17 +1,47 @@
 from __future__ import annotations
 
+import asyncio
 import shutil
 
 import os
 import re
+import shlex
 import subprocess
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Sequence, Tuple
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from codellamas_backend.tools.cds_archive import CdsLaunch, get_cds_manager
+from codellamas_backend.tools.compiler_diagnostics import CompilerDiagnostic, errors_only, parse_diagnostics
+from codellamas_backend.tools.javac_runner import JavacJUnitRunner
+from codellamas_backend.tools.maven_reactor import (
+    ReactorJob,
+    aggregator_pom,
+    module_log,
+    module_pom,
+    parse_reactor_summary,
+    reactor_eligible,
+)
+from codellamas_backend.tools.maven_repo import local_repository_args, missing_artifacts, offline_enabled
+from codellamas_backend.tools.pom_profile import is_simple_junit_pom, java_release
+from codellamas_backend.tools.process_stream import BoundedOutput, StreamedProcess, run_streaming, run_streaming_async
+from codellamas_backend.tools.verification_profile import VerificationProfile
+from codellamas_backend.tools.surefire_report import (
+    TestCaseResult,
+    failed_test_names,
+    parse_reports,
+    summarize,
+)
 from codellamas_backend.tools.workspace import Workspace
 from codellamas_backend.schemas.files import ProjectFile
 
 
+# Output after which the build cannot produce a useful test result; Maven is
+# stopped shortly after (see run_streaming's grace period).
+DEFAULT_STOP_ON = ("COMPILATION ERROR",)
+
+
 @dataclass
 class MavenTestResult:
     status: str  # "PASS" or "FAIL"
@@ -19,14 +49,48 @@ class MavenTestResult:
     failed_tests: List[str]
     errors: List[str]
     raw_log: str
+    test_cases: List[TestCaseResult] = field(default_factory=list)
+    estimated_startup_saving_sec: float = 0.0  # JVM startup saving of the CDS archives used, as calibrated once
+    diagnostics: List[CompilerDiagnostic] = field(default_factory=list)  # compiler errors, if any
 
     def raw_log_head(self, n: int = 4000) -> str:
         return self.raw_log[:n]
 
+    def test_summary(self) -> Dict[str, Any]:
+        return summarize(self.test_cases)
+
 
 class MavenTool:
     """
     Runs `mvn test` in an isolated temp workspace built from in-memory files.
+
+    Projects whose pom matches the plain JUnit 5 profile (see pom_profile) are
+    compiled with javac and run on the JUnit console launcher instead, unless
+    MAVEN_FAST_PATH=0 or no java/javac/console jar is available.
+
+    Maven runs offline with update checks disabled once the local repository
+    has been warmed up (see maven_repo), unless `offline` says otherwise.
+
+    Maven's output is streamed into a bounded buffer (head, tail and error
+    lines) and the build is stopped as soon as a `stop_on` marker shows up.
+    MAVEN_EARLY_EXIT=0 turns the default markers off.
+
+    The Maven JVM starts from an AppCDS archive (see cds_archive); the
+    first run without one creates it.
+
+    A `profile` (see verification_profile) adds verification-only JVM, fork
+    and JUnit settings without changing the project's pom.
+
+    run_reactor verifies several independent projects in one Maven
+    invocation, as modules of a temporary multi-module reactor.
+
+    compile_only stops after compiling main and test sources (javac, or
+    `mvn test-compile`), for callers that only need to know whether the code
+    compiles. Compiler errors are returned as structured diagnostics.
+
+    run_tests_async does the same on the event loop: Maven is started with
+    asyncio.create_subprocess_exec (no shell) in its own process group, and a
+    timeout or cancellation kills Maven together with its surefire fork.
     """
 
     def __init__(
@@ -34,10 +98,23 @@ class MavenTool:
         mvn_cmd: str = "mvn",
         timeout_sec: int = 300,
         quiet: bool = True,
+        fast_path: Optional[bool] = None,
+        offline: Optional[bool] = None,
+        stop_on: Optional[Sequence[str]] = None,
+        profile: Optional[VerificationProfile] = None,
     ):
         self.mvn_cmd = mvn_cmd or self._detect_mvn()
         self.timeout_sec = timeout_sec
         self.quiet = quiet
+        if fast_path is None:
+            fast_path = os.getenv("MAVEN_FAST_PATH", "1") != "0"
+        self.fast_runner = JavacJUnitRunner(timeout_sec=timeout_sec) if fast_path else None
+        # None: decided per run by maven_repo.offline_enabled()
+        self.offline = offline
+        if stop_on is None:
+            stop_on = DEFAULT_STOP_ON if os.getenv("MAVEN_EARLY_EXIT", "1") != "0" else ()
+        self.stop_on = tuple(stop_on)
+        self.profile = profile
 
     def run_tests(
         self,
@@ -45,61 +122,443 @@ class MavenTool:
         override_files: Optional[List[ProjectFile]] = None,
         inject_tests: Optional[Dict[str, str]] = None,
         extra_mvn_args: Optional[Sequence[str]] = None,
+        timeout_sec: Optional[float] = None,
     ) -> MavenTestResult:
+        """timeout_sec overrides the tool's timeout for this run only."""
         override_files = override_files or []
         inject_tests = inject_tests or {}
         extra_mvn_args = list(extra_mvn_args or [])
 
         with Workspace(prefix="codellamas_") as ws:
-            # 1) materialize base project (from VS Code)
-            ws.write_files(project_files)
+            self._prepare(ws, project_files, override_files, inject_tests)
+            return self._run_in_workspace(ws, extra_mvn_args, timeout_sec)
+
+    async def run_tests_async(
+        self,
+        project_files: List[ProjectFile],
+        override_files: Optional[List[ProjectFile]] = None,
+        inject_tests: Optional[Dict[str, str]] = None,
+        extra_mvn_args: Optional[Sequence[str]] = None,
+        timeout_sec: Optional[float] = None,
+    ) -> MavenTestResult:
+        extra_mvn_args = list(extra_mvn_args or [])
+        timeout_sec = timeout_sec or self.timeout_sec
 
-            # 2) apply student edits (override)
-            if override_files:
-                ws.write_files(override_files)
+        # only the Maven process is awaited on the loop; writing, reading and
+        # deleting the workspace run on worker threads. A workspace orphaned by
+        # a cancellation during setup is removed by the janitor.
+        ws = await asyncio.to_thread(
+            self._prepared_workspace, project_files, override_files or [], inject_tests or {}
+        )
+        try:
+            if await asyncio.to_thread(self._can_use_fast_path, ws, extra_mvn_args):
+                # javac and the console launcher are short-lived; keep them off the loop
+                return await asyncio.to_thread(self._run_fast_path, ws, timeout_sec)
 
-            # 3) inject generated tests (path -> content)
-            if inject_tests:
-                ws.write_file_map(inject_tests)
+            offline = self._offline()
+            fork_options = await asyncio.to_thread(self._fork_options, ws, extra_mvn_args)
+            launches = await asyncio.to_thread(self._cds_launches)
+            try:
+                cmd = self._mvn_command(extra_mvn_args, offline, fork_options)
+                # MAVEN_CMD may carry its own arguments; without a shell they are split here
+                proc = await run_streaming_async(
+                    shlex.split(cmd[0], posix=os.name == "posix") + cmd[1:],
+                    cwd=ws.root,
+                    timeout=timeout_sec,
+                    env=self._safe_env(launches),
+                    stop_on=self.stop_on,
+                )
+            except subprocess.TimeoutExpired as e:
+                return self._timeout_result(e, timeout_sec)
+            finally:
+                await asyncio.to_thread(self._complete_cds, launches)
+            return await asyncio.to_thread(self._maven_result, ws, proc, offline, launches)
+        finally:
+            await asyncio.to_thread(ws.cleanup)
 
-            # 4) run mvn test
-            cmd = [self.mvn_cmd]
-            if self.quiet:
-                cmd += ["-q"]
-            cmd += ["test"]
-            cmd += extra_mvn_args
+    def compile_only(
+        self,
+        project_files: List[ProjectFile],
+        override_files: Optional[List[ProjectFile]] = None,
+        inject_tests: Optional[Dict[str, str]] = None,
+        timeout_sec: Optional[float] = None,
+    ) -> MavenTestResult:
+        """
+        Compiles main and test sources without running any test: with javac
+        when the project qualifies for the fast path, `mvn test-compile`
+        otherwise. PASS means the code compiles.
+        """
+        with Workspace(prefix="codellamas_") as ws:
+            self._prepare(ws, project_files, override_files or [], inject_tests or {})
+            if self._can_use_fast_path(ws, []):
+                return self._compile_fast_path(ws, timeout_sec)
+            return self._run_maven(ws, [], goal="test-compile", timeout_sec=timeout_sec)
+
+    def run_test_variants(
+        self,
+        project_files: List[ProjectFile],
+        variants: Dict[str, List[ProjectFile]],
+        inject_tests: Optional[Dict[str, str]] = None,
+        extra_mvn_args: Optional[Sequence[str]] = None,
+        timeout_sec: Optional[float] = None,
+    ) -> Dict[str, MavenTestResult]:
+        """
+        Runs several override variants (e.g. smelly vs. solution) against the
+        same base project and injected tests. The base project is cloned from
+        one shared template per variant; the Maven runs execute in parallel.
+        """
+        inject_tests = inject_tests or {}
+        extra_mvn_args = list(extra_mvn_args or [])
+        if not variants:
+            return {}
+
+        def run_variant(override_files: List[ProjectFile]) -> MavenTestResult:
+            with Workspace(prefix="codellamas_") as ws:
+                self._prepare(ws, project_files, override_files, inject_tests)
+                return self._run_in_workspace(ws, extra_mvn_args, timeout_sec)
 
-            cmd_str = " ".join(cmd)
+        with ThreadPoolExecutor(max_workers=len(variants)) as pool:
+            futures = {name: pool.submit(run_variant, files) for name, files in variants.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def reactor_eligible(
+        self, project_files: List[ProjectFile], override_files: Optional[List[ProjectFile]] = None
+    ) -> bool:
+        """Whether the project would run on Maven (not the fast path) and can be a reactor module."""
+        job = ReactorJob(project_files, override_files or [])
+        pom = job.pom()
+        if not reactor_eligible(pom):
+            return False
+        if self.fast_runner is None or not self.fast_runner.available():
+            return True
+        resources = any(
+            Workspace.normalize(f.path).startswith(("src/main/resources/", "src/test/resources/"))
+            for f in job.files()
+        )
+        return resources or not is_simple_junit_pom(pom)
+
+    def run_reactor(
+        self,
+        jobs: Dict[str, ReactorJob],
+        timeout_sec: Optional[float] = None,
+        threads: Optional[int] = None,
+    ) -> Dict[str, Optional[MavenTestResult]]:
+        """
+        Runs every job as a module of one temporary reactor with
+        `mvn -T <threads> --fail-at-end test`, so the modules share one Maven
+        JVM and its resolved plugins, and one module's failure does not stop
+        the others. Keys are the module names.
+
+        Each module's test fork is capped by its job's timeout_sec; timeout_sec
+        bounds the whole build. A module's result is None when the build
+        cannot tell what happened to it (skipped, unfinished when the build
+        timed out, or failed without compiler errors or test failures, e.g.
+        unresolved dependencies); verify it on its own then.
+        """
+        timeout_sec = timeout_sec or self.timeout_sec
+        modules = list(jobs)
+        with Workspace(prefix="codellamas_reactor_") as ws:
+            for module, job in jobs.items():
+                ws.write_files(
+                    ProjectFile(path=f"{module}/{Workspace.normalize(f.path)}", content=f.content)
+                    for f in job.files()
+                )
+                ws.write_file_map({f"{module}/pom.xml": module_pom(job.pom(), module, job.timeout_sec)})
+            ws.write_file_map({"pom.xml": aggregator_pom(modules)})
+
+            offline = self._offline()
+            launches = self._cds_launches()
+            cmd = [self.mvn_cmd, "-B", "-ntp", "--fail-at-end", "-T", str(threads or len(modules))]
+            if offline:
+                cmd += ["-o", "-nsu"]
+            cmd += local_repository_args()
+            cmd += self._reactor_fork_options(jobs)
+            cmd += ["test"]
 
             try:
-                proc = subprocess.run(
-                    cmd_str,
+                # no -q and no early exit: the reactor summary says which module failed,
+                # and a compile error in one module must not stop the others
+                proc = run_streaming(
+                    _shell_join(cmd),
                     cwd=ws.root,
-                    capture_output=True,
-                    text=True,
-                    timeout=self.timeout_sec,
-                    env=self._safe_env(),
+                    timeout=timeout_sec,
+                    env=self._safe_env(launches),
                     shell=True,
+                    output=BoundedOutput(tail_lines=200 + 2 * len(modules), max_important=300 * len(modules)),
                 )
-            except subprocess.TimeoutExpired:
-                return MavenTestResult(
-                    status="FAIL",
-                    returncode=124,
-                    failed_tests=[],
-                    errors=[f"mvn test timed out after {self.timeout_sec}s"],
-                    raw_log="",
-                )
+            except subprocess.TimeoutExpired as e:
+                # modules whose tests all reported before the deadline keep their result
+                raw = e.output if isinstance(e.output, str) else ""
+                return {module: self._finished_module_result(ws, module, jobs[module], raw) for module in modules}
+            finally:
+                self._complete_cds(launches)
+
+            raw = proc.stdout or ""
+            summary = parse_reactor_summary(raw, modules)
+            return {module: self._module_result(ws, module, summary.get(module), raw) for module in modules}
+
+    def _reactor_fork_options(self, jobs: Dict[str, ReactorJob]) -> List[str]:
+        if not self.profile:
+            return []
+        options = self.profile.surefire_properties()
+        if all("argLine" not in (job.pom() or "") for job in jobs.values()):
+            options.append("-DargLine=" + " ".join(self.profile.fork_arg_line()))
+        return options
+
+    def _finished_module_result(
+        self, ws: Workspace, module: str, job: ReactorJob, raw: str
+    ) -> Optional[MavenTestResult]:
+        """A timed-out reactor's module result, or None unless every test class wrote its report."""
+        expected = job.test_classes()
+        module_root = os.path.join(ws.root, module)
+        test_cases = parse_reports(os.path.join(module_root, "target", "surefire-reports"))
+        reported = {case.class_name.rsplit(".", 1)[-1] for case in test_cases}
+        if not expected or not set(expected) <= reported:
+            return None
+        failed_tests = failed_test_names(test_cases)
+        return MavenTestResult(
+            status="FAIL" if failed_tests else "PASS",
+            returncode=1 if failed_tests else 0,
+            failed_tests=failed_tests[:30],
+            errors=["Test failures"] if failed_tests else [],
+            raw_log=module_log(raw, module, module_root),
+            test_cases=test_cases,
+        )
+
+    def _module_result(
+        self, ws: Workspace, module: str, status: Optional[str], raw: str
+    ) -> Optional[MavenTestResult]:
+        if status not in ("SUCCESS", "FAILURE"):
+            return None
+        module_root = os.path.join(ws.root, module)
+        test_cases = parse_reports(os.path.join(module_root, "target", "surefire-reports"))
+        log = module_log(raw, module, module_root)
+        if status == "SUCCESS":
+            return MavenTestResult(status="PASS", returncode=0, failed_tests=[], errors=[], raw_log=log,
+                                   test_cases=test_cases)
+
+        # paths outside the module stay absolute: those errors belong to another module
+        diagnostics = [
+            d for d in errors_only(parse_diagnostics(raw, module_root))
+            if not os.path.isabs(d.path) and not d.path.startswith("..")
+        ]
+        failed_tests = failed_test_names(test_cases)
+        if not diagnostics and not failed_tests:
+            return None
+        errors = (["Compilation error"] if diagnostics else []) + (["Test failures"] if failed_tests else [])
+        return MavenTestResult(
+            status="FAIL",
+            returncode=1,
+            failed_tests=failed_tests[:30],
+            errors=errors,
+            raw_log=("[ERROR] COMPILATION ERROR :\n" if diagnostics else "") + log,
+            test_cases=test_cases,
+            diagnostics=diagnostics,
+        )
 
-            raw = (proc.stdout or "") + "\n" + (proc.stderr or "")
-            status, failed_tests, errors = self._parse_maven_output(proc.returncode, raw)
+    def _prepared_workspace(
+        self,
+        project_files: List[ProjectFile],
+        override_files: List[ProjectFile],
+        inject_tests: Dict[str, str],
+    ) -> Workspace:
+        ws = Workspace(prefix="codellamas_")
+        try:
+            self._prepare(ws, project_files, override_files, inject_tests)
+        except BaseException:
+            ws.cleanup()
+            raise
+        return ws
+
+    def _prepare(
+        self,
+        ws: Workspace,
+        project_files: List[ProjectFile],
+        override_files: List[ProjectFile],
+        inject_tests: Dict[str, str],
+    ) -> None:
+        # 1) materialize base project (from VS Code)
+        ws.write_base(project_files)
+
+        # 2) apply student edits (override)
+        if override_files:
+            ws.write_files(override_files)
+
+        # 3) inject generated tests (path -> content)
+        if inject_tests:
+            ws.write_file_map(inject_tests)
+
+    def _run_in_workspace(
+        self, ws: Workspace, extra_mvn_args: Sequence[str], timeout_sec: Optional[float] = None
+    ) -> MavenTestResult:
+        if self._can_use_fast_path(ws, extra_mvn_args):
+            return self._run_fast_path(ws, timeout_sec)
+        return self._run_maven(ws, extra_mvn_args, timeout_sec=timeout_sec)
+
+    def _run_maven(
+        self,
+        ws: Workspace,
+        extra_mvn_args: Sequence[str],
+        goal: str = "test",
+        timeout_sec: Optional[float] = None,
+    ) -> MavenTestResult:
+        timeout_sec = timeout_sec or self.timeout_sec
+        offline = self._offline()
+        launches = self._cds_launches()
+        fork_options = self._fork_options(ws, extra_mvn_args) if goal == "test" else []
+        cmd_str = _shell_join(self._mvn_command(extra_mvn_args, offline, fork_options, goal))
 
-            return MavenTestResult(
-                status=status,
-                returncode=proc.returncode,
-                failed_tests=failed_tests,
-                errors=errors,
-                raw_log=raw,
+        try:
+            proc = run_streaming(
+                cmd_str,
+                cwd=ws.root,
+                timeout=timeout_sec,
+                env=self._safe_env(launches),
+                shell=True,
+                stop_on=self.stop_on,
             )
+        except subprocess.TimeoutExpired as e:
+            return self._timeout_result(e, timeout_sec)
+        finally:
+            self._complete_cds(launches)
+        return self._maven_result(ws, proc, offline, launches)
+
+    def _run_fast_path(self, ws: Workspace, timeout_sec: Optional[float] = None) -> MavenTestResult:
+        status, returncode, failed_tests, errors, raw = self.fast_runner.run(
+            ws.root,
+            release=java_release(ws.read("pom.xml")),
+            jvm_args=self.profile.test_jvm_args() if self.profile else (),
+            config=self.profile.junit_config() if self.profile else None,
+            timeout_sec=timeout_sec,
+        )
+        cds = get_cds_manager()
+        return MavenTestResult(
+            status=status,
+            returncode=returncode,
+            failed_tests=failed_tests,
+            errors=errors,
+            raw_log=raw,
+            test_cases=parse_reports(os.path.join(ws.root, "target", "junit-reports")),
+            estimated_startup_saving_sec=cds.saving_sec("junit") if cds is not None else 0.0,
+            diagnostics=errors_only(parse_diagnostics(raw, ws.root)) if status != "PASS" else [],
+        )
+
+    def _compile_fast_path(self, ws: Workspace, timeout_sec: Optional[float] = None) -> MavenTestResult:
+        timeout_sec = timeout_sec or self.timeout_sec
+        try:
+            ok, log = self.fast_runner.compile(
+                ws.root,
+                release=java_release(ws.read("pom.xml")),
+                deadline=time.monotonic() + timeout_sec,
+            )
+        except subprocess.TimeoutExpired as e:
+            return self._timeout_result(e, timeout_sec)
+        if ok:
+            return MavenTestResult(status="PASS", returncode=0, failed_tests=[], errors=[], raw_log=log)
+        return MavenTestResult(
+            status="FAIL",
+            returncode=1,
+            failed_tests=[],
+            errors=["Compilation error"],
+            raw_log="[ERROR] COMPILATION ERROR :\n" + log,
+            diagnostics=errors_only(parse_diagnostics(log, ws.root)),
+        )
+
+    def _mvn_command(
+        self,
+        extra_mvn_args: Sequence[str],
+        offline: bool,
+        fork_options: Sequence[str] = (),
+        goal: str = "test",
+    ) -> List[str]:
+        cmd = [self.mvn_cmd]
+        if self.quiet:
+            cmd += ["-q"]
+        if offline:
+            cmd += ["-o", "-nsu"]
+        cmd += local_repository_args()
+        cmd += list(fork_options)
+        cmd += [goal]
+        cmd += list(extra_mvn_args)
+        return cmd
+
+    def _fork_options(self, ws: Workspace, extra_mvn_args: Sequence[str]) -> List[str]:
+        """Surefire user properties from the profile, and the argLine carrying its JVM options."""
+        options = self.profile.surefire_properties() if self.profile else []
+        jvm_args = self.profile.fork_arg_line() if self.profile and self._arg_line_free(ws, extra_mvn_args) else []
+        if jvm_args:
+            options.append("-DargLine=" + " ".join(jvm_args))
+        return options
+
+    def _arg_line_free(self, ws: Workspace, extra_mvn_args: Sequence[str]) -> bool:
+        # -DargLine would replace an argLine the project sets itself (e.g. for jacoco)
+        pom = ws.read("pom.xml") or ""
+        return "argLine" not in pom and not any("argLine" in arg for arg in extra_mvn_args)
+
+    def _cds_launches(self) -> List[CdsLaunch]:
+        # only the Maven JVM: the surefire fork's classpath is a booter jar inside
+        # each workspace, so no shared archive would ever match it
+        cds = get_cds_manager()
+        return [cds.launch("maven", self.mvn_cmd)] if cds is not None else []
+
+    def _complete_cds(self, launches: Sequence[CdsLaunch]) -> None:
+        cds = get_cds_manager()
+        if cds is None:
+            return
+        for launch in launches:
+            cds.complete(launch, self.mvn_cmd)
+
+    def _timeout_result(self, e: subprocess.TimeoutExpired, timeout_sec: Optional[float] = None) -> MavenTestResult:
+        return MavenTestResult(
+            status="FAIL",
+            returncode=124,
+            failed_tests=[],
+            errors=[f"mvn test timed out after {timeout_sec or self.timeout_sec}s"],
+            raw_log=e.output or "",
+        )
+
+    def _maven_result(
+        self, ws: Workspace, proc: StreamedProcess, offline: bool, launches: Sequence[CdsLaunch] = ()
+    ) -> MavenTestResult:
+        raw = (proc.stdout or "") + "\n" + (proc.stderr or "")
+        returncode = proc.returncode
+        stopped_on = getattr(proc, "stopped_on", None)
+        if isinstance(stopped_on, str):
+            raw += f"\n[codellamas] build stopped early after '{stopped_on}'"
+            returncode = returncode if returncode > 0 else 1
+        status, failed_tests, errors = self._parse_maven_output(returncode, raw)
+
+        # reports must be read before the workspace is cleaned up
+        test_cases = parse_reports(os.path.join(ws.root, "target", "surefire-reports"))
+        if status == "FAIL" and test_cases:
+            failed_tests = failed_test_names(test_cases)[:30] or failed_tests
+        if offline and "Dependency resolution error" in errors:
+            missing = missing_artifacts(raw)
+            if missing:
+                errors.append("Missing from offline repository: " + ", ".join(missing))
+
+        return MavenTestResult(
+            status=status,
+            returncode=returncode,
+            failed_tests=failed_tests,
+            errors=errors,
+            raw_log=raw,
+            test_cases=test_cases,
+            estimated_startup_saving_sec=round(sum(launch.saving_sec for launch in launches), 3),
+            diagnostics=errors_only(parse_diagnostics(raw, ws.root)) if status == "FAIL" else [],
+        )
+
+    def _offline(self) -> bool:
+        return offline_enabled() if self.offline is None else self.offline
+
+    def _can_use_fast_path(self, ws: Workspace, extra_mvn_args: Sequence[str]) -> bool:
+        if self.fast_runner is None or extra_mvn_args or not self.fast_runner.available():
+            return False
+        # resources would need Maven's resource copying (and filtering)
+        for res_dir in ("src/main/resources", "src/test/resources"):
+            if os.path.isdir(os.path.join(ws.root, res_dir)):
+                return False
+        return is_simple_junit_pom(ws.read("pom.xml"))
 
     def _detect_mvn(self) -> str:
         for candidate in ("mvn.cmd", "mvn.bat", "mvn"):
@@ -111,13 +570,19 @@ class MavenTool:
             "(try running `mvn -version` in the same terminal)."
         )
 
-    def _safe_env(self) -> Dict[str, str]:
+    def _safe_env(self, launches: Sequence[CdsLaunch] = ()) -> Dict[str, str]:
         """
         You can add env hardening here later.
         For now, inherit and ensure consistent encoding.
         """
         env = dict(os.environ)
         env.setdefault("MAVEN_OPTS", "")
+        options = self.profile.launcher_jvm_args() if self.profile else []
+        for launch in launches:
+            if launch.role == "maven":
+                options += launch.options
+        if options:
+            env["MAVEN_OPTS"] = " ".join([env["MAVEN_OPTS"], *options]).strip()
         return env
 
     def _parse_maven_output(self, returncode: int, raw: str) -> Tuple[str, List[str], List[str]]:
@@ -131,7 +596,12 @@ class MavenTool:
             errors.append("Compilation error")
         if "There are test failures" in raw:
             errors.append("Test failures")
-        if "Could not resolve dependencies" in raw or "Could not find artifact" in raw:
+        if (
+            "Could not resolve dependencies" in raw
+            or "Could not find artifact" in raw
+            or "offline mode" in raw
+            or "could not be resolved" in raw
+        ):
             errors.append("Dependency resolution error")
         if "BUILD FAILURE" in raw:
             errors.append("Build failure")
@@ -164,3 +634,11 @@ class MavenTool:
                 out.append(cls)
 
         return out
+
+
+def _shell_join(cmd: List[str]) -> str:
+    # cmd[0] is MAVEN_CMD as configured (it may carry its own arguments)
+    rest = cmd[1:]
+    if os.name == "posix":
+        return " ".join([cmd[0], *(shlex.quote(arg) for arg in rest)])
+    return " ".join([cmd[0], subprocess.list2cmdline(rest)]) if rest else cmd[0]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import re
+import xml.etree.ElementTree as ET
+from typing import Optional
+
+
+# Plugins whose default behaviour the javac + JUnit console path reproduces.
+SIMPLE_PLUGINS = {"maven-surefire-plugin"}
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(el: ET.Element, name: str) -> str:
+    for child in el:
+        if _local_name(child.tag) == name:
+            return (child.text or "").strip()
+    return ""
+
+
+def is_simple_junit_pom(pom_xml: Optional[str]) -> bool:
+    """
+    True for poms shaped like default_base_project_files(): a standalone
+    project (no parent, modules or profiles) whose only dependencies are
+    JUnit Jupiter artifacts and whose only build plugin is surefire.
+    """
+    if not pom_xml:
+        return False
+    try:
+        root = ET.fromstring(pom_xml)
+    except ET.ParseError:
+        return False
+
+    for el in root.iter():
+        name = _local_name(el.tag)
+        if name in ("parent", "modules", "profiles", "dependencyManagement", "resources", "testResources"):
+            return False
+        if name == "dependency":
+            if _child_text(el, "groupId") != "org.junit.jupiter":
+                return False
+        elif name == "plugin":
+            group = _child_text(el, "groupId") or "org.apache.maven.plugins"
+            if group != "org.apache.maven.plugins" or _child_text(el, "artifactId") not in SIMPLE_PLUGINS:
+                return False
+    return True
+
+
+def java_release(pom_xml: Optional[str]) -> Optional[str]:
+    """
+    Java language level requested by the pom (maven.compiler.release, then
+    .target, then .source), or None when unspecified or not a plain number.
+    """
+    if not pom_xml:
+        return None
+    try:
+        root = ET.fromstring(pom_xml)
+    except ET.ParseError:
+        return None
+
+    props = {}
+    for el in root:
+        if _local_name(el.tag) == "properties":
+            props = {_local_name(p.tag): (p.text or "").strip() for p in el}
+            break
+
+    for key in ("maven.compiler.release", "maven.compiler.target", "maven.compiler.source"):
+        value = props.get(key, "")
+        if re.fullmatch(r"(1\.)?\d+", value):
+            return value[2:] if value.startswith("1.") else value
+    return None
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Deque, List, Optional, Sequence
+
+
+# Lines worth keeping from the middle of a long build log: everything the
+# result parsers (MavenTool._parse_maven_output, maven_repo.missing_artifacts)
+# and a human reading the failure look for.
+IMPORTANT_MARKERS = (
+    "[ERROR]",
+    "ERROR",
+    "FAIL",
+    "Tests run:",
+    "Tests in error",
+    "Failed tests",
+    "Exception",
+    "expected",
+    "BUILD",
+    "Could not",
+    "could not be resolved",
+    "offline mode",
+    "has not been downloaded",
+    "Failure to find",
+)
+
+MAX_LINE_CHARS = 2000
+
+
+class BoundedOutput:
+    """
+    Bounded capture of a process's output: the first head_chars characters,
+    the last tail_lines lines, and up to max_important lines from the middle
+    that match IMPORTANT_MARKERS. Memory stays constant however much the
+    process prints.
+    """
+
+    def __init__(
+        self,
+        head_chars: int = 8000,
+        tail_lines: int = 200,
+        max_important: int = 300,
+        markers: Sequence[str] = IMPORTANT_MARKERS,
+    ):
+        self.head_chars = head_chars
+        self.markers = tuple(markers)
+        self.max_important = max_important
+        self._head: List[str] = []
+        self._head_size = 0
+        self._important: List[str] = []
+        self._tail: Deque[str] = deque(maxlen=tail_lines)
+        self._lock = threading.Lock()
+        self.lines = 0
+        self.omitted = 0
+
+    def append(self, line: str) -> None:
+        line = line.rstrip("\r\n")
+        if len(line) > MAX_LINE_CHARS:
+            line = line[:MAX_LINE_CHARS] + " ..."
+        with self._lock:
+            self.lines += 1
+            if self._head_size < self.head_chars:
+                self._head.append(line)
+                self._head_size += len(line) + 1
+                return
+            if self._tail.maxlen == 0:
+                self._keep_or_omit(line)
+                return
+            if len(self._tail) == self._tail.maxlen:
+                self._keep_or_omit(self._tail[0])
+            self._tail.append(line)
+
+    def text(self) -> str:
+        with self._lock:
+            parts = list(self._head)
+            if self.omitted:
+                parts.append(f"... [{self.omitted} lines omitted] ...")
+            parts += self._important
+            parts += self._tail
+        return "\n".join(parts)
+
+    def _keep_or_omit(self, line: str) -> None:
+        # caller holds self._lock
+        if len(self._important) < self.max_important and any(m in line for m in self.markers):
+            self._important.append(line)
+        else:
+            self.omitted += 1
+
+
+class StreamedProcess(subprocess.CompletedProcess):
+    """CompletedProcess whose stdout is the bounded, merged stdout/stderr capture."""
+
+    def __init__(self, args, returncode: int, stdout: str, stopped_on: Optional[str] = None):
+        super().__init__(args, returncode, stdout=stdout, stderr="")
+        self.stopped_on = stopped_on
+
+
+def run_streaming(
+    cmd,
+    *,
+    cwd: Optional[str] = None,
+    env: Optional[dict] = None,
+    timeout: Optional[float] = None,
+    shell: bool = False,
+    stop_on: Sequence[str] = (),
+    grace_sec: float = 2.0,
+    grace_lines: int = 200,
+    output: Optional[BoundedOutput] = None,
+) -> StreamedProcess:
+    """
+    Runs cmd like subprocess.run(..., capture_output=True, text=True), but
+    reads its output line by line into `output` instead of buffering all of
+    it, and runs it in its own process group so that every child is killed
+    with it.
+
+    Once a line contains one of the stop_on markers the process gets
+    grace_sec seconds (or grace_lines more lines) to print the diagnostics
+    that follow, then it is killed; the result's stopped_on names the marker.
+    Raises subprocess.TimeoutExpired (with the captured output) on timeout.
+    """
+    output = output or BoundedOutput()
+    proc = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        env=env,
+        shell=shell,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+        start_new_session=os.name == "posix",
+    )
+    done = threading.Event()
+    state = {"stopped_on": None, "stop_at": None, "after": 0}
+
+    def pump() -> None:
+        try:
+            for line in proc.stdout:
+                output.append(line)
+                if state["stopped_on"] is not None:
+                    state["after"] += 1
+                    if state["after"] >= grace_lines:
+                        state["stop_at"] = time.monotonic()
+                    continue
+                for marker in stop_on:
+                    if marker in line:
+                        state["stopped_on"] = marker
+                        state["stop_at"] = time.monotonic() + grace_sec
+                        break
+        except (OSError, ValueError):
+            pass  # pipe closed under us by kill_process_tree
+        finally:
+            done.set()
+
+    reader = threading.Thread(target=pump, name="process-output", daemon=True)
+    reader.start()
+
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    timed_out = stopped = False
+    while not done.wait(0.05):
+        now = time.monotonic()
+        if state["stop_at"] is not None and now >= state["stop_at"]:
+            stopped = True
+            break
+        if deadline is not None and now >= deadline:
+            timed_out = True
+            break
+
+    if timed_out or stopped:
+        kill_process_tree(proc)
+    reader.join(timeout=5)
+    returncode = proc.wait()
+    if proc.stdout is not None:
+        proc.stdout.close()
+
+    if timed_out:
+        raise subprocess.TimeoutExpired(cmd, timeout, output=output.text())
+    return StreamedProcess(cmd, returncode, output.text(), stopped_on=state["stopped_on"] if stopped else None)
+
+
+async def run_streaming_async(
+    cmd: Sequence[str],
+    *,
+    cwd: Optional[str] = None,
+    env: Optional[dict] = None,
+    timeout: Optional[float] = None,
+    stop_on: Sequence[str] = (),
+    grace_sec: float = 2.0,
+    grace_lines: int = 200,
+    output: Optional[BoundedOutput] = None,
+) -> StreamedProcess:
+    """
+    run_streaming for asyncio: executes cmd (an argument list, no shell) in
+    its own process group without tying up a thread. A timeout, an early stop
+    or cancellation of the awaiting task kills the whole process tree.
+    """
+    output = output or BoundedOutput()
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=cwd,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        start_new_session=os.name == "posix",
+        limit=1024 * 1024,
+    )
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout if timeout is not None else None
+    stopped_on: Optional[str] = None
+    stop_at: Optional[float] = None
+    after = 0
+    stopped = False
+
+    try:
+        while True:
+            limits = [t for t in (deadline, stop_at) if t is not None]
+            wait = max(0.0, min(limits) - loop.time()) if limits else None
+            try:
+                raw = await _readline(proc.stdout, wait)
+            except asyncio.TimeoutError:
+                if stop_at is not None and loop.time() >= stop_at:
+                    stopped = True
+                    break
+                raise subprocess.TimeoutExpired(list(cmd), timeout, output=output.text())
+            except ValueError:
+                continue  # line longer than the stream limit; it is dropped
+            if not raw:
+                break
+            line = raw.decode("utf-8", errors="replace")
+            output.append(line)
+            if stopped_on is not None:
+                after += 1
+                if after >= grace_lines:
+                    stopped = True
+                    break
+                continue
+            for marker in stop_on:
+                if marker in line:
+                    stopped_on = marker
+                    stop_at = loop.time() + grace_sec
+                    break
+
+        if stopped:
+            _signal_group(proc)
+        remaining = max(0.0, deadline - loop.time()) if deadline is not None else None
+        try:
+            returncode = await asyncio.wait_for(_reap(proc), remaining)
+        except asyncio.TimeoutError:
+            raise subprocess.TimeoutExpired(list(cmd), timeout, output=output.text())
+    except BaseException:
+        # timeout or cancellation: nothing of the tree may outlive the caller
+        _signal_group(proc)
+        try:
+            await asyncio.wait_for(asyncio.shield(_reap(proc)), 5)
+        except BaseException:
+            pass
+        raise
+
+    return StreamedProcess(list(cmd), returncode, output.text(), stopped_on=stopped_on if stopped else None)
+
+
+def kill_process_tree(proc: subprocess.Popen) -> None:
+    """Kills proc and, on POSIX, everything in its process group."""
+    _signal_group(proc)
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        pass
+
+
+async def _readline(stream: asyncio.StreamReader, timeout: Optional[float]) -> bytes:
+    # not asyncio.wait_for: before 3.12 it drops a cancellation that arrives
+    # as the line does, and the caller would read on until the timeout
+    read = asyncio.ensure_future(stream.readline())
+    try:
+        done, _ = await asyncio.wait({read}, timeout=timeout)
+    except BaseException:
+        read.cancel()
+        raise
+    if not done:
+        read.cancel()
+        raise asyncio.TimeoutError
+    return read.result()
+
+
+async def _reap(proc) -> int:
+    # read the pipe to EOF first: asyncio only reports the exit once it is closed
+    try:
+        while await proc.stdout.read(65536):
+            pass
+    except (OSError, ValueError):
+        pass
+    return await proc.wait()
+
+
+def _signal_group(proc) -> None:
+    # works for subprocess.Popen and asyncio.subprocess.Process alike
+    if os.name == "posix":
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    try:
+        proc.kill()
+    except (OSError, ProcessLookupError):
+        pass
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import glob
+import os
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+
+# Frames that only show how the test was invoked, never why it failed.
+NOISE_FRAME_PREFIXES = (
+    "at org.junit.",
+    "at org.apache.maven.surefire.",
+    "at org.opentest4j.",
+    "at java.base/jdk.internal.",
+    "at java.base/java.lang.reflect.",
+    "at java.base/java.util.",
+    "at jdk.internal.",
+    "at sun.reflect.",
+    "at java.lang.reflect.",
+)
+
+
+@dataclass
+class TestCaseResult:
+    class_name: str
+    method: str
+    status: str  # passed | failed | error | skipped
+    duration_sec: float
+    message: str = ""
+    stack_trace: str = ""
+
+    __test__ = False  # not a pytest test class
+
+    @property
+    def name(self) -> str:
+        return f"{self.class_name}.{self.method}"
+
+
+def parse_reports(reports_dir: str) -> List[TestCaseResult]:
+    """
+    Test cases from surefire-style XML reports (TEST-*.xml, also written by
+    the JUnit console launcher's legacy reporter). Unreadable files are skipped.
+    """
+    cases: List[TestCaseResult] = []
+    for path in sorted(glob.glob(os.path.join(reports_dir, "*.xml"))):
+        try:
+            tree = ET.parse(path)
+        except (ET.ParseError, OSError):
+            continue
+        for case in tree.iter("testcase"):
+            cases.append(_case(case))
+    return cases
+
+
+def summarize(cases: List[TestCaseResult]) -> Dict[str, Any]:
+    counts = {"passed": 0, "failed": 0, "error": 0, "skipped": 0}
+    for case in cases:
+        counts[case.status] = counts.get(case.status, 0) + 1
+    return {
+        "total": len(cases),
+        "passed": counts["passed"],
+        "failed": counts["failed"],
+        "errors": counts["error"],
+        "skipped": counts["skipped"],
+        "duration_sec": round(sum(c.duration_sec for c in cases), 3),
+    }
+
+
+def failed_test_names(cases: List[TestCaseResult]) -> List[str]:
+    return list(dict.fromkeys(c.name for c in cases if c.status in ("failed", "error")))
+
+
+def trim_stack_trace(trace: str, max_lines: int = 12) -> str:
+    """Keeps the exception line(s) and application frames, drops runner internals."""
+    kept: List[str] = []
+    dropped = 0
+    for line in (trace or "").strip().splitlines():
+        stripped = line.strip()
+        if stripped.startswith(NOISE_FRAME_PREFIXES):
+            dropped += 1
+            continue
+        kept.append(line.rstrip())
+    if len(kept) > max_lines:
+        dropped += len(kept) - max_lines
+        kept = kept[:max_lines]
+    if dropped:
+        kept.append(f"\t... {dropped} more")
+    return "\n".join(kept)
+
+
+def _case(el: ET.Element) -> TestCaseResult:
+    status, message, trace = "passed", "", ""
+    for child in el:
+        if child.tag in ("failure", "error"):
+            status = "failed" if child.tag == "failure" else "error"
+            message = child.get("message") or ""
+            trace = trim_stack_trace(child.text or "")
+            break
+        if child.tag == "skipped":
+            status = "skipped"
+            message = child.get("message") or ""
+    try:
+        duration = float(el.get("time") or 0)
+    except ValueError:
+        duration = 0.0
+    return TestCaseResult(
+        class_name=el.get("classname", ""),
+        method=el.get("name", "").split("(", 1)[0],
+        status=status,
+        duration_sec=duration,
+        message=message[:500],
+        stack_trace=trace,
+    )
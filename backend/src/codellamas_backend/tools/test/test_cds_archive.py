@@ -0,0 +1,233 @@
+import os
+import tempfile
+import time
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+import codellamas_backend.tools.cds_archive as cds_module
+from codellamas_backend.tools.cds_archive import (
+    CdsArchive,
+    CdsManager,
+    _calibration_command,
+    get_cds_manager,
+    java_major,
+)
+
+
+MVN_V_17 = "Apache Maven 3.9.6\nJava version: 17.0.9, vendor: Eclipse Adoptium\n"
+MVN_V_21 = "Apache Maven 3.9.6\nJava version: 21.0.2, vendor: Eclipse Adoptium\n"
+MVN_V_11 = "Apache Maven 3.9.6\nJava version: 11.0.21, vendor: Eclipse Adoptium\n"
+
+
+@pytest.fixture
+def manager():
+    with tempfile.TemporaryDirectory() as root:
+        m = CdsManager(root_dir=root, calibrate=False)
+        with patch.object(m, "_probe", return_value=MVN_V_17):
+            yield m
+
+
+def dump(launch):
+    """What the JVM does at exit with -XX:ArchiveClassesAtExit."""
+    with open(launch.creating, "wb") as f:
+        f.write(b"archive")
+
+
+# ─────────────────────────────────────────────
+# Version parsing
+# ─────────────────────────────────────────────
+
+class TestJavaMajor:
+    def test_mvn_output(self):
+        assert java_major(MVN_V_17) == 17
+
+    def test_java_version_output(self):
+        assert java_major('openjdk version "21.0.2" 2024-01-16') == 21
+
+    def test_legacy_version_scheme(self):
+        assert java_major('java version "1.8.0_392"') == 8
+
+    def test_unknown(self):
+        assert java_major("command not found") is None
+        assert java_major("") is None
+
+
+# ─────────────────────────────────────────────
+# Create, reuse, invalidate
+# ─────────────────────────────────────────────
+
+class TestCdsManager:
+    def test_first_launch_creates_archive(self, manager):
+        launch = manager.launch("maven", "mvn")
+        assert launch.creating is not None
+        assert launch.options[0] == f"-XX:ArchiveClassesAtExit={launch.creating}"
+        assert launch.saving_sec == 0.0
+
+        dump(launch)
+        manager.complete(launch, "mvn")
+        assert os.path.isfile(os.path.join(manager.root_dir, "maven.jsa"))
+        assert not os.path.exists(launch.creating)
+        assert manager.stats()["created"] == 1
+
+    def test_later_launch_uses_archive(self, manager):
+        first = manager.launch("maven", "mvn")
+        dump(first)
+        manager.complete(first)
+
+        second = manager.launch("maven", "mvn")
+        path = os.path.join(manager.root_dir, "maven.jsa")
+        assert second.creating is None
+        assert f"-XX:SharedArchiveFile={path}" in second.options
+        assert "-Xshare:auto" in second.options
+        assert manager.stats()["uses"]["maven"] == 1
+
+    def test_only_one_creator_per_role(self, manager):
+        first = manager.launch("maven", "mvn")
+        concurrent = manager.launch("maven", "mvn")
+        assert first.creating is not None
+        assert concurrent.options == []
+        assert manager.stats()["creating"] == ["maven"]
+
+    def test_failed_dump_allows_retry(self, manager):
+        launch = manager.launch("maven", "mvn")
+        manager.complete(launch)  # JVM killed before it could dump
+        assert manager.stats()["failed"] == 1
+        assert manager.launch("maven", "mvn").creating is not None
+
+    def test_jdk_upgrade_invalidates_archive(self, manager):
+        first = manager.launch("maven", "mvn")
+        dump(first)
+        manager.complete(first)
+
+        with patch.object(manager, "_probe", return_value=MVN_V_21):
+            again = manager.launch("maven", "mvn")
+        assert again.creating is not None
+        assert not os.path.exists(os.path.join(manager.root_dir, "maven.jsa"))
+        assert manager.stats()["stale"] == 1
+
+    def test_changed_input_invalidates_archive(self, manager):
+        with tempfile.NamedTemporaryFile(delete=False) as jar:
+            jar.write(b"v1")
+        try:
+            first = manager.launch("junit", "java", [jar.name])
+            dump(first)
+            manager.complete(first)
+            assert manager.launch("junit", "java", [jar.name]).creating is None
+
+            with open(jar.name, "wb") as f:
+                f.write(b"version 2")
+            assert manager.launch("junit", "java", [jar.name]).creating is not None
+        finally:
+            os.remove(jar.name)
+
+    def test_old_jdk_gets_no_options(self, manager):
+        with patch.object(manager, "_probe", return_value=MVN_V_11):
+            assert manager.launch("maven", "mvn").options == []
+
+    def test_missing_tool_gets_no_options(self, manager):
+        with patch.object(manager, "_probe", return_value=None):
+            assert manager.launch("maven", "mvn").options == []
+
+    def test_archive_survives_restart(self, manager):
+        first = manager.launch("maven", "mvn")
+        dump(first)
+        manager.complete(first)
+
+        restarted = CdsManager(root_dir=manager.root_dir, calibrate=False)
+        with patch.object(restarted, "_probe", return_value=MVN_V_17):
+            assert restarted.launch("maven", "mvn").creating is None
+
+    def test_removes_abandoned_dumps(self):
+        with tempfile.TemporaryDirectory() as root:
+            old = os.path.join(root, "maven.jsa.deadbeef.tmp")
+            open(old, "wb").close()
+            os.utime(old, (time.time() - 7200, time.time() - 7200))
+            CdsManager(root_dir=root)
+            assert not os.path.exists(old)
+
+    def test_removes_archives_of_unused_roles(self):
+        with tempfile.TemporaryDirectory() as root:
+            for name in ["surefire.jsa", "surefire.json", "maven.jsa"]:
+                open(os.path.join(root, name), "wb").close()
+            CdsManager(root_dir=root)
+            assert os.listdir(root) == ["maven.jsa"]
+
+
+# ─────────────────────────────────────────────
+# Startup saving
+# ─────────────────────────────────────────────
+
+class TestCalibration:
+    def test_measures_saving(self, manager):
+        launch = manager.launch("maven", "mvn")
+        dump(launch)
+        manager.complete(launch)
+
+        with patch.object(cds_module, "_best_of", side_effect=[0.9, 0.6]):
+            archive = manager.calibrate("maven", "mvn")
+        assert archive.saving_sec == 0.3
+        assert manager.saving_sec("maven") == 0.3
+        assert manager.launch("maven", "mvn").saving_sec == 0.3
+        assert manager.stats()["archives"]["maven"]["estimated_saving_sec"] == 0.3
+
+    def test_complete_starts_calibration(self, manager):
+        manager.calibrate_archives = True
+        launch = manager.launch("maven", "mvn")
+        dump(launch)
+        with patch("threading.Thread") as thread:
+            manager.complete(launch, "mvn")
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+
+    def test_junit_without_launcher_is_not_calibrated(self):
+        assert _calibration_command("junit", "java", [], "/tmp") is None
+        assert _calibration_command("maven", "mvn", [], "/tmp") == (["mvn", "-v"], "MAVEN_OPTS")
+
+    def test_saving_never_negative(self):
+        archive = CdsArchive(role="maven", path="x", fingerprint="f", created_at=0.0,
+                             startup_sec=0.5, archived_startup_sec=0.7)
+        assert archive.saving_sec == 0.0
+
+    def test_no_saving_without_archive(self, manager):
+        assert manager.saving_sec("junit") == 0.0
+
+
+# ─────────────────────────────────────────────
+# Process-wide instance
+# ─────────────────────────────────────────────
+
+class TestGetCdsManager:
+    def test_disabled(self):
+        with patch.dict(os.environ, {"CDS_ARCHIVES": "0"}):
+            assert get_cds_manager() is None
+
+    def test_singleton_uses_cds_dir(self):
+        with tempfile.TemporaryDirectory() as root, \
+                patch.dict(os.environ, {"CDS_ARCHIVES": "1", "CDS_DIR": root}), \
+                patch.object(cds_module, "_manager", None):
+            first = get_cds_manager()
+            assert first is get_cds_manager()
+            assert first.root_dir == root
+
+
+# ─────────────────────────────────────────────
+# Probing
+# ─────────────────────────────────────────────
+
+class TestProbe:
+    def test_caches_successful_probe(self):
+        with tempfile.TemporaryDirectory() as root:
+            m = CdsManager(root_dir=root)
+            proc = MagicMock(returncode=0)
+            proc.communicate.return_value = (MVN_V_17, None)
+            with patch("subprocess.Popen", return_value=proc) as popen:
+                assert m._probe(("mvn", "-v")) == MVN_V_17
+                assert m._probe(("mvn", "-v")) == MVN_V_17
+            popen.assert_called_once()
+
+    def test_missing_command(self):
+        with tempfile.TemporaryDirectory() as root:
+            m = CdsManager(root_dir=root)
+            with patch("subprocess.Popen", side_effect=FileNotFoundError()):
+                assert m._probe(("mvn", "-v")) is None
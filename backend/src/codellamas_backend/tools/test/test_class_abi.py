@@ -0,0 +1,110 @@
+import os
+import struct
+import tempfile
+
+import pytest
+
+from codellamas_backend.tools.class_abi import class_abi, tree_abi
+
+
+PUBLIC, PRIVATE, STATIC, FINAL, SYNTHETIC = 0x0001, 0x0002, 0x0008, 0x0010, 0x1000
+
+
+def make_class(name="com/example/App", fields=(), methods=(), super_name="java/lang/Object", code=b""):
+    """
+    A minimal class file: fields are (access, name, descriptor, int constant
+    or None), methods (access, name, descriptor). `code` stands in for method
+    bodies, which are not part of the ABI.
+    """
+    pool = []
+
+    def utf8(text):
+        pool.append(b"\x01" + struct.pack(">H", len(text)) + text.encode())
+        return len(pool)
+
+    def class_ref(text):
+        index = utf8(text)
+        pool.append(b"\x07" + struct.pack(">H", index))
+        return len(pool)
+
+    def integer(value):
+        pool.append(b"\x03" + struct.pack(">i", value))
+        return len(pool)
+
+    this_index, super_index = class_ref(name), class_ref(super_name)
+    constant_value, code_attr = utf8("ConstantValue"), utf8("Code")
+
+    body = b""
+    body += struct.pack(">H", len(fields))
+    for access, field_name, descriptor, value in fields:
+        body += struct.pack(">HHH", access, utf8(field_name), utf8(descriptor))
+        if value is None:
+            body += struct.pack(">H", 0)
+        else:
+            body += struct.pack(">HHIH", 1, constant_value, 2, integer(value))
+    body += struct.pack(">H", len(methods))
+    for access, method_name, descriptor in methods:
+        body += struct.pack(">HHHHHI", access, utf8(method_name), utf8(descriptor), 1, code_attr, len(code)) + code
+
+    header = struct.pack(">IHHH", 0xCAFEBABE, 0, 61, len(pool) + 1) + b"".join(pool)
+    return header + struct.pack(">HHHH", PUBLIC | 0x0020, this_index, super_index, 0) + body + struct.pack(">H", 0)
+
+
+BASE = dict(
+    fields=[(PUBLIC | STATIC | FINAL, "MAX", "I", 5), (PRIVATE, "count", "I", None)],
+    methods=[(PUBLIC, "add", "(I)I"), (PRIVATE, "helper", "()V")],
+)
+
+
+# ─────────────────────────────────────────────
+# class_abi
+# ─────────────────────────────────────────────
+
+class TestClassAbi:
+    def test_reads_names_and_members(self):
+        access, name, super_name, interfaces, fields, methods = class_abi(make_class(**BASE))
+        assert name == "com/example/App"
+        assert super_name == "java/lang/Object"
+        assert interfaces == ()
+        assert {f[0] for f in fields} == {"MAX"}
+        assert {m[:2] for m in methods} == {("add", "(I)I")}
+
+    def test_method_bodies_and_private_members_do_not_count(self):
+        changed = dict(
+            fields=BASE["fields"] + [(PRIVATE | STATIC | FINAL, "SECRET", "I", 7)],
+            methods=BASE["methods"] + [(PRIVATE | SYNTHETIC, "lambda$add$0", "()V")],
+            code=b"\x00\x01",
+        )
+        assert class_abi(make_class(**changed)) == class_abi(make_class(**BASE))
+
+    def test_constant_value_counts(self):
+        changed = dict(BASE, fields=[(PUBLIC | STATIC | FINAL, "MAX", "I", 10)])
+        assert class_abi(make_class(**changed)) != class_abi(make_class(**BASE))
+
+    def test_new_overload_counts(self):
+        changed = dict(BASE, methods=BASE["methods"] + [(PUBLIC, "add", "(J)J")])
+        assert class_abi(make_class(**changed)) != class_abi(make_class(**BASE))
+
+    def test_visibility_counts(self):
+        changed = dict(BASE, methods=[(0, "add", "(I)I"), (PRIVATE, "helper", "()V")])
+        assert class_abi(make_class(**changed)) != class_abi(make_class(**BASE))
+
+    def test_not_a_class_file(self):
+        with pytest.raises(ValueError):
+            class_abi(b"class App {}")
+        with pytest.raises(ValueError):
+            class_abi(make_class(**BASE)[:40])
+
+
+# ─────────────────────────────────────────────
+# tree_abi
+# ─────────────────────────────────────────────
+
+class TestTreeAbi:
+    def test_named_classes_by_relative_path(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "com", "example"))
+            for name in ("App", "App$Inner", "App$1"):
+                with open(os.path.join(root, "com", "example", f"{name}.class"), "wb") as f:
+                    f.write(make_class(f"com/example/{name}"))
+            assert sorted(tree_abi(root)) == ["com/example/App$Inner.class", "com/example/App.class"]
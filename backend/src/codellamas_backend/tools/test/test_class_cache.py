@@ -0,0 +1,135 @@
+import os
+import tempfile
+
+from unittest.mock import patch
+
+import codellamas_backend.tools.class_cache as class_cache_module
+from codellamas_backend.tools.class_cache import (
+    CompiledClassCache,
+    classpath_hash,
+    declared_types,
+    dependency_graph,
+    get_class_cache,
+    outputs_of,
+    package_dir,
+    unit_keys,
+)
+
+
+SOURCES = {
+    "Order.java": "package shop;\npublic class Order { Money total; }",
+    "Money.java": "package shop;\npublic record Money(long cents) {}",
+    "Report.java": "package shop;\n// mentions Order only in a comment\npublic class Report {}",
+}
+
+
+# ─────────────────────────────────────────────
+# Source analysis
+# ─────────────────────────────────────────────
+
+class TestSourceAnalysis:
+    def test_package_dir(self):
+        assert package_dir("package com.example.shop;\nclass A {}") == "com/example/shop"
+        assert package_dir("class A {}") == ""
+
+    def test_declared_types_ignore_strings(self):
+        source = 'class A { String s = "class Fake"; enum Kind {} }'
+        assert declared_types(source) == {"A", "Kind"}
+
+    def test_dependency_graph_by_type_name(self):
+        graph = dependency_graph(SOURCES)
+        assert graph["Order.java"] == {"Money.java"}
+        assert graph["Money.java"] == set()
+        assert graph["Report.java"] == set()
+
+    def test_outputs_of_includes_nested_classes(self):
+        class_files = ["shop/Order.class", "shop/Order$Line.class", "shop/Money.class", "other/Order.class"]
+        assert outputs_of(SOURCES["Order.java"], "src/main/java/shop/Order.java", class_files) == [
+            "shop/Order.class",
+            "shop/Order$Line.class",
+        ]
+
+
+# ─────────────────────────────────────────────
+# unit_keys / classpath_hash
+# ─────────────────────────────────────────────
+
+class TestUnitKeys:
+    def test_change_invalidates_file_and_dependents_only(self):
+        before = unit_keys(SOURCES, "cp")
+        after = unit_keys({**SOURCES, "Money.java": "package shop;\npublic record Money(int cents) {}"}, "cp")
+
+        assert before["Money.java"] != after["Money.java"]
+        assert before["Order.java"] != after["Order.java"]
+        assert before["Report.java"] == after["Report.java"]
+
+    def test_classpath_changes_every_key(self):
+        a = unit_keys(SOURCES, "cp1")
+        b = unit_keys(SOURCES, "cp2")
+        assert all(a[p] != b[p] for p in SOURCES)
+
+    def test_classpath_hash_depends_on_release(self):
+        assert classpath_hash("javac", "17") != classpath_hash("javac", "21")
+        assert classpath_hash("javac", "17", ["/missing.jar"]) == classpath_hash("javac", "17", ["/missing.jar"])
+
+
+# ─────────────────────────────────────────────
+# CompiledClassCache
+# ─────────────────────────────────────────────
+
+class TestCompiledClassCache:
+    def setup_method(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = CompiledClassCache(root_dir=os.path.join(self.tmp.name, "cache"))
+        self.out = os.path.join(self.tmp.name, "classes")
+        os.makedirs(os.path.join(self.out, "shop"))
+        with open(os.path.join(self.out, "shop", "Order.class"), "wb") as f:
+            f.write(b"\xca\xfe\xba\xbe" + b"x" * 20)
+
+    def teardown_method(self):
+        self.tmp.cleanup()
+
+    def test_miss_then_seed(self):
+        assert self.cache.seed("k1", os.path.join(self.tmp.name, "fresh")) is False
+        self.cache.store("k1", self.out, ["shop/Order.class"])
+
+        target = os.path.join(self.tmp.name, "fresh")
+        assert self.cache.seed("k1", target) is True
+        assert os.path.exists(os.path.join(target, "shop", "Order.class"))
+        stats = self.cache.stats()
+        assert (stats["hits"], stats["misses"], stats["stores"], stats["entries"]) == (1, 1, 1, 1)
+
+    def test_empty_store_ignored(self):
+        self.cache.store("k1", self.out, [])
+        assert self.cache.stats()["entries"] == 0
+
+    def test_trim_drops_oldest(self):
+        self.cache.max_bytes = 30
+        self.cache.store("aa", self.out, ["shop/Order.class"])
+        os.utime(self.cache._entry_dir("aa"), (1, 1))
+        self.cache.store("bb", self.out, ["shop/Order.class"])
+
+        assert not os.path.exists(self.cache._entry_dir("aa"))
+        assert os.path.exists(self.cache._entry_dir("bb"))
+        assert self.cache.stats()["evictions"] == 1
+
+    def test_clear(self):
+        self.cache.store("k1", self.out, ["shop/Order.class"])
+        self.cache.clear()
+        assert self.cache.stats()["entries"] == 0
+
+
+# ─────────────────────────────────────────────
+# get_class_cache
+# ─────────────────────────────────────────────
+
+class TestGetClassCache:
+    def test_disabled_by_env(self):
+        with patch.dict("os.environ", {"CLASS_CACHE": "0"}):
+            assert get_class_cache() is None
+
+    def test_singleton(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(class_cache_module, "_cache", None):
+                with patch.dict("os.environ", {"CLASS_CACHE_DIR": tmpdir}):
+                    assert get_class_cache() is get_class_cache()
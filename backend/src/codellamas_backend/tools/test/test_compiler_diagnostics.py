@@ -0,0 +1,95 @@
+from codellamas_backend.tools.compiler_diagnostics import (
+    CompilerDiagnostic,
+    errors_only,
+    parse_diagnostics,
+)
+
+
+JAVAC_LOG = """/ws/src/main/java/com/example/App.java:12: error: cannot find symbol
+        return totl;
+               ^
+  symbol:   variable totl
+  location: class App
+/ws/src/main/java/com/example/App.java:20: warning: [deprecation] Date(int,int,int) in Date has been deprecated
+1 error
+1 warning
+"""
+
+MAVEN_LOG = """[INFO] Compiling 2 source files
+[ERROR] COMPILATION ERROR :
+[ERROR] /ws/src/main/java/com/example/App.java:[12,16] cannot find symbol
+  symbol:   variable totl
+  location: class com.example.App
+[ERROR] /ws/src/test/java/com/example/AppTest.java:[5,8] class AppTests is public, should be declared in a file named AppTests.java
+[INFO] 2 errors
+[ERROR] Failed to execute goal org.apache.maven.plugins:maven-compiler-plugin:3.11.0:compile
+[ERROR] /ws/src/main/java/com/example/App.java:[12,16] cannot find symbol
+[ERROR]   symbol:   variable totl
+"""
+
+
+# ─────────────────────────────────────────────
+# javac output
+# ─────────────────────────────────────────────
+
+class TestJavacOutput:
+    def test_errors_and_warnings(self):
+        diagnostics = parse_diagnostics(JAVAC_LOG, root="/ws")
+        assert len(diagnostics) == 2
+        error = diagnostics[0]
+        assert error.path == "src/main/java/com/example/App.java"
+        assert error.line == 12
+        assert error.column is None
+        assert error.severity == "error"
+        assert error.message == "cannot find symbol"
+        assert error.details == "symbol: variable totl; location: class App"
+        assert diagnostics[1].severity == "warning"
+
+    def test_prefixed_by_fast_path(self):
+        raw = "[ERROR] COMPILATION ERROR :\n[ERROR] /ws/src/main/java/App.java:3: error: ';' expected"
+        (diagnostic,) = parse_diagnostics(raw, root="/ws")
+        assert diagnostic.path == "src/main/java/App.java"
+        assert diagnostic.message == "';' expected"
+
+    def test_errors_only(self):
+        assert [d.line for d in errors_only(parse_diagnostics(JAVAC_LOG))] == [12]
+
+
+# ─────────────────────────────────────────────
+# maven-compiler-plugin output
+# ─────────────────────────────────────────────
+
+class TestMavenOutput:
+    def test_positions_and_details(self):
+        diagnostics = parse_diagnostics(MAVEN_LOG, root="/ws")
+        first = diagnostics[0]
+        assert (first.path, first.line, first.column) == ("src/main/java/com/example/App.java", 12, 16)
+        assert first.details == "symbol: variable totl; location: class com.example.App"
+
+    def test_failure_summary_duplicates_dropped(self):
+        diagnostics = parse_diagnostics(MAVEN_LOG, root="/ws")
+        assert [d.line for d in diagnostics] == [12, 5]
+
+    def test_paths_outside_root_kept(self):
+        (diagnostic,) = parse_diagnostics("[ERROR] /other/App.java:[1,1] oops", root="/ws")
+        assert diagnostic.path == "/other/App.java"
+
+
+# ─────────────────────────────────────────────
+# Rendering and edge cases
+# ─────────────────────────────────────────────
+
+class TestRender:
+    def test_render(self):
+        d = CompilerDiagnostic(path="App.java", line=3, column=5, severity="error",
+                               message="cannot find symbol", details="symbol: x")
+        assert d.render() == "App.java:3:5: error: cannot find symbol (symbol: x)"
+
+    def test_render_without_column(self):
+        d = CompilerDiagnostic(path="App.java", line=3, column=None, severity="error", message="boom")
+        assert d.render() == "App.java:3: error: boom"
+
+    def test_no_diagnostics(self):
+        assert parse_diagnostics("") == []
+        assert parse_diagnostics(None) == []
+        assert parse_diagnostics("[ERROR] There are test failures.") == []
@@ -6,6 +6,7 @@ import pytest
 from unittest.mock import patch, MagicMock
 
 from codellamas_backend.tools.custom_tool import JavaTestRunnerTool, TestRunnerInput
+from codellamas_backend.tools.maven_tool import MavenTestResult
 
 
 # ─────────────────────────────────────────────
@@ -135,6 +136,12 @@ class TestWriteProjectFiles:
             with open(os.path.join(tmpdir, "src/Foo.java")) as f:
                 assert f.read() == "test content"
 
+    def test_gradle_project_gets_build_gradle_not_pom(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.tool._write_project_files(tmpdir, SAMPLE_SOURCE, SAMPLE_TESTS, "gradle")
+            assert os.path.exists(os.path.join(tmpdir, "build.gradle"))
+            assert not os.path.exists(os.path.join(tmpdir, "pom.xml"))
+
     def test_pom_content_is_default_pom(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             self.tool._write_project_files(tmpdir, {}, {})
@@ -296,3 +303,38 @@ class TestRun:
         mock_run.return_value = make_proc()
         result = self.tool._run(SAMPLE_SOURCE, SAMPLE_TESTS)
         assert "\n" in result  # indent=2 produces newlines
+
+
+# ─────────────────────────────────────────────
+# JavaTestRunnerTool with build_tool="gradle"
+# ─────────────────────────────────────────────
+
+class TestRunGradle:
+    def setup_method(self):
+        self.tool = JavaTestRunnerTool()
+
+    @patch("codellamas_backend.tools.custom_tool.get_gradle_tool")
+    def test_gradle_runs_through_gradle_tool(self, mock_get):
+        mock_get.return_value.run_tests.return_value = MavenTestResult(
+            status="FAIL", returncode=1, failed_tests=["AppTest.bad"], errors=["Test failures"], raw_log="LOG",
+        )
+        with patch("subprocess.run") as mock_run:
+            result = json.loads(self.tool._run(SAMPLE_SOURCE, SAMPLE_TESTS, build_tool="gradle"))
+            mock_run.assert_not_called()
+
+        project_dir = mock_get.return_value.run_tests.call_args[0][0]
+        assert not os.path.exists(project_dir)
+        assert result["success"] is False
+        assert result["return_code"] == 1
+        assert result["stdout"] == "LOG"
+        assert result["failed_tests"] == ["AppTest.bad"]
+        assert result["errors"] == ["Test failures"]
+        assert result["test_summary"]["total"] == 0
+
+    @patch("codellamas_backend.tools.custom_tool.get_gradle_tool")
+    def test_gradle_timeout(self, mock_get):
+        mock_get.return_value.run_tests.return_value = MavenTestResult(
+            status="FAIL", returncode=124, failed_tests=[], errors=["gradle test timed out after 300s"], raw_log="",
+        )
+        result = self.tool._run_tests("/tmp/project", "Gradle")
+        assert result == {"success": False, "error": "Test execution timed out"}
@@ -0,0 +1,211 @@
+import os
+import stat
+import subprocess
+import tempfile
+
+from unittest.mock import MagicMock, patch
+
+import codellamas_backend.tools.gradle_tool as gradle_module
+from codellamas_backend.tools.gradle_tool import (
+    DEFAULT_BUILD_GRADLE,
+    GradleTool,
+    get_gradle_tool,
+    parse_gradle_output,
+    start_gradle_warmup,
+)
+
+
+TEST_RESULT_FAIL = """<testsuite name="com.example.AppTest">
+  <testcase name="ok()" classname="com.example.AppTest" time="0.01"/>
+  <testcase name="bad()" classname="com.example.AppTest" time="0.02">
+    <failure message="expected: &lt;1&gt; but was: &lt;2&gt;">org.opentest4j.AssertionFailedError</failure>
+  </testcase>
+</testsuite>"""
+
+
+def make_proc(returncode=0, stdout="BUILD SUCCESSFUL", stopped_on=None) -> MagicMock:
+    proc = MagicMock()
+    proc.returncode = returncode
+    proc.stdout = stdout
+    proc.stopped_on = stopped_on
+    return proc
+
+
+def write_results(project_dir: str, xml: str) -> None:
+    results = os.path.join(project_dir, "build", "test-results", "test")
+    os.makedirs(results)
+    with open(os.path.join(results, "TEST-com.example.AppTest.xml"), "w") as f:
+        f.write(xml)
+
+
+# ─────────────────────────────────────────────
+# Output parsing
+# ─────────────────────────────────────────────
+
+class TestParseGradleOutput:
+    def test_success(self):
+        assert parse_gradle_output(0, "BUILD SUCCESSFUL in 2s") == ("PASS", [], [])
+
+    def test_test_failures(self):
+        raw = "\n".join([
+            "> Task :test FAILED",
+            "",
+            "AppTest > bad() FAILED",
+            "    org.opentest4j.AssertionFailedError at AppTest.java:12",
+            "",
+            "There were failing tests. See the report at: file:///ws/build/reports/tests/test/index.html",
+            "BUILD FAILED in 3s",
+        ])
+        status, failed, errors = parse_gradle_output(1, raw)
+        assert status == "FAIL"
+        assert failed == ["AppTest.bad"]
+        assert errors == ["Test failures", "Build failure"]
+
+    def test_compilation_error(self):
+        raw = "> Task :compileJava FAILED\nCompilation failed; see the compiler error output for details.\nBUILD FAILED"
+        assert parse_gradle_output(1, raw)[2] == ["Compilation error", "Build failure"]
+
+    def test_dependency_error(self):
+        raw = "Could not resolve all files for configuration ':testCompileClasspath'."
+        assert parse_gradle_output(1, raw)[2] == ["Dependency resolution error"]
+
+    def test_unknown_failure(self):
+        assert parse_gradle_output(2, "")[2] == ["gradle test failed (see raw_log)"]
+
+
+# ─────────────────────────────────────────────
+# GradleTool
+# ─────────────────────────────────────────────
+
+class TestGradleTool:
+    def test_default_build_only_when_missing(self):
+        with tempfile.TemporaryDirectory() as project_dir:
+            GradleTool.write_default_build(project_dir)
+            with open(os.path.join(project_dir, "build.gradle")) as f:
+                assert f.read() == DEFAULT_BUILD_GRADLE
+            assert os.path.isfile(os.path.join(project_dir, "settings.gradle"))
+
+        with tempfile.TemporaryDirectory() as project_dir:
+            with open(os.path.join(project_dir, "build.gradle.kts"), "w") as f:
+                f.write("plugins { java }")
+            GradleTool.write_default_build(project_dir)
+            assert not os.path.exists(os.path.join(project_dir, "build.gradle"))
+
+    @patch("codellamas_backend.tools.gradle_tool.run_streaming")
+    def test_command_uses_daemon_and_build_cache(self, mock_run):
+        mock_run.return_value = make_proc()
+        tool = GradleTool(user_home="/cache/gradle", daemon_idle_sec=60)
+        result = tool.run_tests("/tmp/project")
+
+        assert result.status == "PASS"
+        cmd = mock_run.call_args[0][0]
+        assert cmd[:2] == ["gradle", "test"]
+        assert "--daemon" in cmd and "--build-cache" in cmd
+        assert "-Dorg.gradle.daemon.idletimeout=60000" in cmd
+        assert cmd[cmd.index("--gradle-user-home") + 1] == "/cache/gradle"
+        assert mock_run.call_args[1]["env"]["GRADLE_USER_HOME"] == "/cache/gradle"
+        assert tool.stats()["daemon_warm"] is True
+
+    @patch("codellamas_backend.tools.gradle_tool.run_streaming")
+    def test_daemon_and_cache_can_be_disabled(self, mock_run):
+        mock_run.return_value = make_proc()
+        GradleTool(daemon=False, build_cache=False).run_tests("/tmp/project")
+        cmd = mock_run.call_args[0][0]
+        assert "--no-daemon" in cmd and "--no-build-cache" in cmd
+
+    @patch("codellamas_backend.tools.gradle_tool.run_streaming")
+    def test_project_wrapper_preferred(self, mock_run):
+        mock_run.return_value = make_proc()
+        with tempfile.TemporaryDirectory() as project_dir:
+            wrapper = os.path.join(project_dir, "gradlew")
+            with open(wrapper, "w") as f:
+                f.write("#!/bin/sh\n")
+            os.chmod(wrapper, os.stat(wrapper).st_mode | stat.S_IEXEC)
+            os.makedirs(os.path.join(project_dir, "gradle", "wrapper"))
+            open(os.path.join(project_dir, "gradle", "wrapper", "gradle-wrapper.jar"), "w").close()
+
+            GradleTool().run_tests(project_dir)
+            assert mock_run.call_args[0][0][0] == wrapper
+
+    @patch("codellamas_backend.tools.gradle_tool.run_streaming")
+    def test_failed_tests_from_reports(self, mock_run):
+        with tempfile.TemporaryDirectory() as project_dir:
+            write_results(project_dir, TEST_RESULT_FAIL)
+            mock_run.return_value = make_proc(1, "> Task :test FAILED\nThere were failing tests.\nBUILD FAILED")
+            result = GradleTool().run_tests(project_dir)
+
+        assert result.status == "FAIL"
+        assert result.failed_tests == ["com.example.AppTest.bad"]
+        assert result.test_summary()["total"] == 2
+        assert result.errors == ["Test failures", "Build failure"]
+
+    @patch("codellamas_backend.tools.gradle_tool.run_streaming")
+    def test_compile_error_diagnostics(self, mock_run):
+        with tempfile.TemporaryDirectory() as project_dir:
+            mock_run.return_value = make_proc(
+                -9,
+                f"> Task :compileJava\n{project_dir}/src/main/java/App.java:3: error: ';' expected\n"
+                "Compilation failed; see the compiler error output for details.",
+                stopped_on="Compilation failed; see the compiler error output",
+            )
+            result = GradleTool().run_tests(project_dir)
+
+        assert result.returncode == 1
+        assert result.errors[0] == "Compilation error"
+        assert result.diagnostics[0].path == "src/main/java/App.java"
+        assert result.diagnostics[0].line == 3
+
+    @patch("codellamas_backend.tools.gradle_tool.run_streaming",
+           side_effect=subprocess.TimeoutExpired(cmd="gradle", timeout=5))
+    def test_timeout(self, mock_run):
+        result = GradleTool().run_tests("/tmp/project", timeout_sec=5)
+        assert result.returncode == 124
+        assert result.errors == ["gradle test timed out after 5s"]
+
+    @patch("codellamas_backend.tools.gradle_tool.run_streaming", side_effect=FileNotFoundError("gradle"))
+    def test_missing_gradle(self, mock_run):
+        result = GradleTool().run_tests("/tmp/project")
+        assert result.status == "FAIL"
+        assert result.errors == ["Gradle executable not found"]
+
+    @patch("subprocess.run")
+    def test_warm_up_starts_daemon(self, mock_run):
+        mock_run.return_value = make_proc()
+        tool = GradleTool()
+        assert tool.warm_up() is True
+        assert mock_run.call_args[0][0][1] == "help"
+        assert tool.stats()["daemon_warm"] is True
+
+    def test_warm_up_skipped_without_daemon(self):
+        assert GradleTool(daemon=False).warm_up() is False
+
+
+# ─────────────────────────────────────────────
+# Process-wide instance
+# ─────────────────────────────────────────────
+
+class TestGetGradleTool:
+    def test_singleton_reads_env(self):
+        env = {"GRADLE_CMD": "/opt/gradle/bin/gradle", "GRADLE_DAEMON": "0", "GRADLE_USER_HOME": "/cache/g"}
+        with patch.dict(os.environ, env), patch.object(gradle_module, "_gradle", None):
+            tool = get_gradle_tool()
+            assert tool is get_gradle_tool()
+            assert tool.gradle_cmd == "/opt/gradle/bin/gradle"
+            assert tool.daemon is False
+            assert tool.build_cache is True
+            assert tool.user_home == "/cache/g"
+
+    def test_warmup_disabled(self):
+        with patch.dict(os.environ, {"GRADLE_WARMUP": "0"}):
+            assert start_gradle_warmup() is None
+
+    def test_warmup_off_by_default(self):
+        env = {k: v for k, v in os.environ.items() if k != "GRADLE_WARMUP"}
+        with patch.dict(os.environ, env, clear=True), patch.object(gradle_module, "get_gradle_tool") as get_tool:
+            assert start_gradle_warmup() is None
+        get_tool.assert_not_called()
+
+    def test_warmup_skipped_without_gradle(self):
+        with patch.dict(os.environ, {"GRADLE_WARMUP": "1"}), patch.object(gradle_module, "_gradle", GradleTool()), \
+             patch("codellamas_backend.tools.gradle_tool.shutil.which", return_value=None):
+            assert start_gradle_warmup() is None
@@ -0,0 +1,261 @@
+import os
+import subprocess
+import tempfile
+
+from unittest.mock import patch, MagicMock
+
+from codellamas_backend.tools.class_cache import CompiledClassCache
+from codellamas_backend.tools.javac_runner import (
+    JavacJUnitRunner,
+    default_junit_standalone_jar,
+    parse_junit_xml_failures,
+)
+
+
+REPORT_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<testsuite name="JUnit Jupiter" tests="3" failures="1" errors="1">
+  <testcase name="testPass()" classname="com.example.AppTest" time="0.01"/>
+  <testcase name="testFail()" classname="com.example.AppTest" time="0.02">
+    <failure message="expected: &lt;3&gt; but was: &lt;2&gt;"/>
+  </testcase>
+  <testcase name="testBoom()" classname="com.example.OtherTest" time="0.01">
+    <error message="boom"/>
+  </testcase>
+</testsuite>"""
+
+
+def make_proc(returncode: int = 0, stdout: str = "", stderr: str = "") -> MagicMock:
+    proc = MagicMock()
+    proc.returncode = returncode
+    proc.stdout = stdout
+    proc.stderr = stderr
+    return proc
+
+
+def make_project(root: str) -> None:
+    for rel in ("src/main/java/com/example/App.java", "src/test/java/com/example/AppTest.java"):
+        path = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write("class X {}")
+
+
+# ─────────────────────────────────────────────
+# default_junit_standalone_jar / available
+# ─────────────────────────────────────────────
+
+class TestDefaults:
+    def test_env_override(self):
+        with patch.dict("os.environ", {"JUNIT_STANDALONE_JAR": "/opt/junit.jar"}):
+            assert default_junit_standalone_jar() == "/opt/junit.jar"
+
+    def test_defaults_to_local_maven_repository(self):
+        with patch.dict("os.environ", {}, clear=True):
+            path = default_junit_standalone_jar()
+        assert "junit-platform-console-standalone" in path
+        assert path.endswith(".jar")
+
+    def test_unavailable_without_jar(self):
+        runner = JavacJUnitRunner(console_jar="/nope.jar", java_cmd="java", javac_cmd="javac")
+        assert runner.available() is False
+
+
+# ─────────────────────────────────────────────
+# parse_junit_xml_failures
+# ─────────────────────────────────────────────
+
+class TestParseJunitXmlFailures:
+    def test_failures_and_errors_extracted(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, "TEST-junit-jupiter.xml"), "w") as f:
+                f.write(REPORT_XML)
+            assert parse_junit_xml_failures(tmpdir) == [
+                "com.example.AppTest.testFail",
+                "com.example.OtherTest.testBoom",
+            ]
+
+    def test_missing_dir_returns_empty(self):
+        assert parse_junit_xml_failures("/does/not/exist") == []
+
+    def test_corrupt_report_skipped(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, "TEST-bad.xml"), "w") as f:
+                f.write("<testsuite")
+            assert parse_junit_xml_failures(tmpdir) == []
+
+
+# ─────────────────────────────────────────────
+# JavacJUnitRunner.run
+# ─────────────────────────────────────────────
+
+class TestRun:
+    def setup_method(self):
+        self.runner = JavacJUnitRunner(console_jar="/opt/junit.jar", java_cmd="java", javac_cmd="javac")
+
+    @patch("subprocess.run")
+    def test_pass(self, mock_run):
+        mock_run.return_value = make_proc(returncode=0, stdout="[ 1 tests successful ]")
+        with tempfile.TemporaryDirectory() as root:
+            make_project(root)
+            status, returncode, failed, errors, raw = self.runner.run(root, release="17")
+
+        assert (status, returncode, failed, errors) == ("PASS", 0, [], [])
+        assert "tests successful" in raw
+        javac_cmd = mock_run.call_args_list[0][0][0]
+        assert javac_cmd[0] == "javac"
+        assert "--release" in javac_cmd and "17" in javac_cmd
+        assert mock_run.call_count == 3  # javac main, javac test, console launcher
+
+    @patch("subprocess.run")
+    def test_compile_error_stops_before_tests(self, mock_run):
+        mock_run.return_value = make_proc(
+            returncode=1, stderr="App.java:3: error: cannot find symbol"
+        )
+        with tempfile.TemporaryDirectory() as root:
+            make_project(root)
+            status, returncode, failed, errors, raw = self.runner.run(root)
+
+        assert status == "FAIL"
+        assert errors == ["Compilation error"]
+        assert "COMPILATION ERROR" in raw
+        assert "[ERROR] App.java:3: error: cannot find symbol" in raw
+        assert mock_run.call_count == 1
+
+    @patch("subprocess.run")
+    def test_test_failures_read_from_reports(self, mock_run):
+        def fake_run(cmd, **kwargs):
+            if cmd[0] == "java":
+                reports = cmd[cmd.index("--reports-dir") + 1]
+                os.makedirs(reports, exist_ok=True)
+                with open(os.path.join(reports, "TEST-junit-jupiter.xml"), "w") as f:
+                    f.write(REPORT_XML)
+                return make_proc(returncode=1, stdout="[ 2 tests failed ]")
+            return make_proc(returncode=0)
+
+        mock_run.side_effect = fake_run
+        with tempfile.TemporaryDirectory() as root:
+            make_project(root)
+            status, returncode, failed, errors, _ = self.runner.run(root)
+
+        assert status == "FAIL"
+        assert returncode == 1
+        assert errors == ["Test failures"]
+        assert "com.example.AppTest.testFail" in failed
+
+    @patch("subprocess.run", side_effect=subprocess.TimeoutExpired(cmd="javac", timeout=1))
+    def test_timeout(self, mock_run):
+        with tempfile.TemporaryDirectory() as root:
+            make_project(root)
+            status, returncode, _, errors, _ = self.runner.run(root)
+
+        assert status == "FAIL"
+        assert returncode == 124
+        assert "timed out" in errors[0]
+
+    @patch("subprocess.run", side_effect=subprocess.TimeoutExpired(cmd="javac", timeout=1))
+    def test_per_run_timeout(self, mock_run):
+        with tempfile.TemporaryDirectory() as root:
+            make_project(root)
+            _, _, _, errors, _ = self.runner.run(root, timeout_sec=20)
+
+        assert errors == ["javac/JUnit test run timed out after 20s"]
+
+    @patch("subprocess.run")
+    def test_no_sources_skips_javac(self, mock_run):
+        mock_run.return_value = make_proc(returncode=0)
+        with tempfile.TemporaryDirectory() as root:
+            self.runner.run(root)
+        assert mock_run.call_count == 1
+        assert mock_run.call_args[0][0][0] == "java"
+
+    @patch("subprocess.run")
+    def test_precompiled_runs_launcher_only(self, mock_run):
+        mock_run.return_value = make_proc(returncode=0)
+        with tempfile.TemporaryDirectory() as root:
+            make_project(root)
+            status, *_ = self.runner.run(root, compile_tests=False, precompiled=True)
+        assert status == "PASS"
+        assert mock_run.call_count == 1
+        assert mock_run.call_args[0][0][0] == "java"
+
+    @patch("subprocess.run")
+    def test_jvm_args_and_config_passed_to_launcher(self, mock_run):
+        mock_run.return_value = make_proc(returncode=0)
+        with tempfile.TemporaryDirectory() as root:
+            self.runner.run(root, jvm_args=["-Xmx256m"], config={"junit.jupiter.execution.parallel.enabled": "true"})
+        cmd = mock_run.call_args[0][0]
+        assert cmd.index("-Xmx256m") < cmd.index("-jar")
+        assert "--config=junit.jupiter.execution.parallel.enabled=true" in cmd
+
+
+# ─────────────────────────────────────────────
+# JavacJUnitRunner with the compiled class cache
+# ─────────────────────────────────────────────
+
+def write_sources(root: str, sources: dict) -> None:
+    for rel, content in sources.items():
+        path = os.path.join(root, "src/main/java/shop", rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+
+def fake_javac(compiled: list):
+    """Writes one .class per source listed in the argfile and records the sources."""
+    def run(cmd, **kwargs):
+        if cmd[0] != "javac":
+            return make_proc()
+        out_dir = cmd[cmd.index("-d") + 1]
+        with open(cmd[-1][1:]) as f:
+            sources = [line.strip().strip('"') for line in f if line.strip()]
+        for src in sources:
+            compiled.append(os.path.basename(src))
+            stem = os.path.basename(src)[:-len(".java")]
+            os.makedirs(os.path.join(out_dir, "shop"), exist_ok=True)
+            with open(os.path.join(out_dir, "shop", f"{stem}.class"), "w") as f:
+                f.write(stem)
+        return make_proc()
+    return run
+
+
+class TestRunWithClassCache:
+    SOURCES = {
+        "Order.java": "package shop;\npublic class Order { Money total; }",
+        "Money.java": "package shop;\npublic class Money {}",
+        "Report.java": "package shop;\npublic class Report {}",
+    }
+
+    def setup_method(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = CompiledClassCache(root_dir=os.path.join(self.tmp.name, "cache"))
+        self.runner = JavacJUnitRunner(
+            console_jar="/opt/junit.jar", java_cmd="java", javac_cmd="javac", class_cache=self.cache
+        )
+
+    def teardown_method(self):
+        self.tmp.cleanup()
+
+    def _run(self, sources: dict) -> list:
+        compiled: list = []
+        with tempfile.TemporaryDirectory() as root:
+            write_sources(root, sources)
+            with patch("subprocess.run", side_effect=fake_javac(compiled)):
+                self.runner.run(root)
+            classes = sorted(os.listdir(os.path.join(root, "target", "classes", "shop")))
+        return compiled, classes
+
+    def test_repeat_run_compiles_nothing(self):
+        first, _ = self._run(self.SOURCES)
+        second, classes = self._run(self.SOURCES)
+
+        assert sorted(first) == ["Money.java", "Order.java", "Report.java"]
+        assert second == []
+        assert classes == ["Money.class", "Order.class", "Report.class"]
+
+    def test_change_recompiles_file_and_dependents(self):
+        self._run(self.SOURCES)
+        changed = {**self.SOURCES, "Money.java": "package shop;\npublic class Money { long cents; }"}
+        compiled, classes = self._run(changed)
+
+        assert sorted(compiled) == ["Money.java", "Order.java"]
+        assert classes == ["Money.class", "Order.class", "Report.class"]
@@ -0,0 +1,219 @@
+import os
+import subprocess
+import xml.etree.ElementTree as ET
+
+from unittest.mock import MagicMock, patch
+
+from codellamas_backend.schemas.files import ProjectFile
+from codellamas_backend.tools.maven_reactor import (
+    ReactorJob,
+    aggregator_pom,
+    module_pom,
+    parse_reactor_summary,
+    reactor_eligible,
+)
+from codellamas_backend.tools.maven_tool import MavenTool
+
+
+SPRING_POM = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <modelVersion>4.0.0</modelVersion>
+  <parent>
+    <groupId>org.springframework.boot</groupId>
+    <artifactId>spring-boot-starter-parent</artifactId>
+    <version>3.2.0</version>
+  </parent>
+  <groupId>com.example</groupId>
+  <artifactId>exercise</artifactId>
+  <version>1.0</version>
+  <dependencies>
+    <dependency>
+      <groupId>org.springframework.boot</groupId>
+      <artifactId>spring-boot-starter-test</artifactId>
+      <scope>test</scope>
+    </dependency>
+  </dependencies>
+</project>"""
+
+SUREFIRE_FAIL = """<testsuite name="com.example.AppTest">
+  <testcase name="ok" classname="com.example.AppTest" time="0.1"/>
+  <testcase name="bad" classname="com.example.AppTest" time="0.2">
+    <failure message="nope">java.lang.AssertionError: nope</failure>
+  </testcase>
+</testsuite>"""
+
+SUREFIRE_PASS = """<testsuite name="com.example.AppTest">
+  <testcase name="ok" classname="com.example.AppTest" time="0.1"/>
+</testsuite>"""
+
+
+def job(app="class App {}") -> ReactorJob:
+    return ReactorJob(
+        project_files=[ProjectFile(path="pom.xml", content=SPRING_POM),
+                       ProjectFile(path="src/main/java/App.java", content=app)],
+        inject_tests={"src/test/java/AppTest.java": "class AppTest {}"},
+    )
+
+
+def make_proc(stdout: str) -> MagicMock:
+    proc = MagicMock()
+    proc.returncode = 1
+    proc.stdout = stdout
+    return proc
+
+
+def write_report(root: str, module: str, xml: str) -> None:
+    reports = os.path.join(root, module, "target", "surefire-reports")
+    os.makedirs(reports)
+    with open(os.path.join(reports, "TEST-com.example.AppTest.xml"), "w") as f:
+        f.write(xml)
+
+
+# ─────────────────────────────────────────────
+# Reactor poms
+# ─────────────────────────────────────────────
+
+class TestReactorPoms:
+    def test_spring_project_is_eligible(self):
+        assert reactor_eligible(SPRING_POM)
+
+    def test_aggregators_and_local_parents_are_not(self):
+        assert not reactor_eligible("<project><packaging>pom</packaging></project>")
+        assert not reactor_eligible("<project><modules><module>a</module></modules></project>")
+        assert not reactor_eligible("<project><parent><relativePath>../p</relativePath></parent></project>")
+        assert not reactor_eligible("<project")
+        assert not reactor_eligible(None)
+
+    def test_module_pom_renames_project_not_dependencies(self):
+        root = ET.fromstring(module_pom(SPRING_POM, "m007"))
+        ns = {"p": "http://maven.apache.org/POM/4.0.0"}
+        assert root.find("p:artifactId", ns).text == "m007"
+        assert root.find("p:name", ns).text == "m007"
+        assert root.find("p:parent/p:artifactId", ns).text == "spring-boot-starter-parent"
+        assert root.find("p:parent/p:relativePath", ns) is not None
+        assert root.find("p:dependencies/p:dependency/p:artifactId", ns).text == "spring-boot-starter-test"
+
+    def test_module_pom_caps_the_test_fork(self):
+        ns = {"p": "http://maven.apache.org/POM/4.0.0"}
+        root = ET.fromstring(module_pom(SPRING_POM, "m000", fork_timeout_sec=89.5))
+        assert root.find("p:properties/p:surefire.timeout", ns).text == "90"
+        assert ET.fromstring(module_pom(SPRING_POM, "m000")).find("p:properties", ns) is None
+
+    def test_module_pom_keeps_a_shorter_project_timeout(self):
+        pom = "<project><properties><surefire.timeout>30</surefire.timeout></properties></project>"
+        root = ET.fromstring(module_pom(pom, "m000", fork_timeout_sec=120))
+        assert root.find("properties/surefire.timeout").text == "30"
+
+    def test_test_classes_follow_surefire_includes(self):
+        reactor_job = ReactorJob(
+            project_files=[ProjectFile(path="src/test/java/com/example/TestHelper.java", content=""),
+                           ProjectFile(path="src/test/java/com/example/Fixtures.java", content=""),
+                           ProjectFile(path="src/main/java/com/example/AppTest.java", content="")],
+            inject_tests={"src/test/java/AppTests.java": ""},
+        )
+        assert reactor_job.test_classes() == ["AppTests", "TestHelper"]
+
+    def test_aggregator_lists_modules(self):
+        root = ET.fromstring(aggregator_pom(["m000", "m001"]))
+        ns = {"p": "http://maven.apache.org/POM/4.0.0"}
+        assert [m.text for m in root.findall("p:modules/p:module", ns)] == ["m000", "m001"]
+
+    def test_summary(self):
+        raw = "\n".join([
+            "[INFO] Reactor Summary for codellamas-reactor 1:",
+            "[INFO] m000 ............................................. SUCCESS [  3.120 s]",
+            "[INFO] m001 1.0 ......................................... FAILURE [  2.004 s]",
+            "[INFO] codellamas-reactor ............................... SUCCESS [  0.002 s]",
+        ])
+        assert parse_reactor_summary(raw, ["m000", "m001", "m002"]) == {"m000": "SUCCESS", "m001": "FAILURE"}
+
+
+# ─────────────────────────────────────────────
+# MavenTool.run_reactor
+# ─────────────────────────────────────────────
+
+class TestRunReactor:
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_results_split_per_module(self, mock_run):
+        def fake_run(cmd, cwd=None, **kwargs):
+            assert os.path.isfile(os.path.join(cwd, "m002", "src", "test", "java", "AppTest.java"))
+            write_report(cwd, "m000", SUREFIRE_PASS)
+            write_report(cwd, "m001", SUREFIRE_FAIL)
+            return make_proc("\n".join([
+                f"[ERROR] {cwd}/m002/src/main/java/App.java:[1,11] ';' expected",
+                "[INFO] m000 ........ SUCCESS [  3.1 s]",
+                "[INFO] m001 ........ FAILURE [  2.0 s]",
+                "[INFO] m002 ........ FAILURE [  0.4 s]",
+                "[INFO] m003 ........ SKIPPED",
+            ]))
+
+        mock_run.side_effect = fake_run
+        tool = MavenTool(mvn_cmd="mvn", fast_path=False, offline=False)
+        results = tool.run_reactor({f"m00{i}": job() for i in range(4)}, threads=2)
+
+        assert results["m000"].status == "PASS"
+        assert results["m001"].status == "FAIL"
+        assert results["m001"].failed_tests == ["com.example.AppTest.bad"]
+        assert results["m001"].errors == ["Test failures"]
+        # a compile error in m002 hides nothing about the others
+        assert results["m002"].errors == ["Compilation error"]
+        assert results["m002"].diagnostics[0].path == "src/main/java/App.java"
+        assert results["m001"].diagnostics == []
+        assert results["m003"] is None
+
+        cmd = mock_run.call_args[0][0]
+        assert "--fail-at-end" in cmd and "-T 2" in cmd and " -q" not in cmd
+        assert "stop_on" not in mock_run.call_args[1]
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_unexplained_failure_falls_back(self, mock_run):
+        mock_run.return_value = make_proc("[INFO] m000 ..... FAILURE [ 1 s]\n[INFO] m001 ..... SUCCESS [ 1 s]")
+        results = MavenTool(mvn_cmd="mvn", fast_path=False, offline=False).run_reactor({"m000": job(), "m001": job()})
+        assert results["m000"] is None
+        assert results["m001"].status == "PASS"
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming",
+           side_effect=subprocess.TimeoutExpired(cmd="mvn", timeout=1))
+    def test_timeout_falls_back_for_every_module(self, mock_run):
+        results = MavenTool(mvn_cmd="mvn", fast_path=False, offline=False).run_reactor({"m000": job(), "m001": job()})
+        assert results == {"m000": None, "m001": None}
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_timeout_keeps_modules_that_finished(self, mock_run):
+        def fake_run(cmd, cwd=None, **kwargs):
+            write_report(cwd, "m000", SUREFIRE_FAIL)
+            raise subprocess.TimeoutExpired(cmd="mvn", timeout=1, output="[INFO] Building m000")
+
+        mock_run.side_effect = fake_run
+        results = MavenTool(mvn_cmd="mvn", fast_path=False, offline=False).run_reactor({"m000": job(), "m001": job()})
+
+        assert results["m000"].status == "FAIL"
+        assert results["m000"].failed_tests == ["com.example.AppTest.bad"]
+        assert results["m001"] is None
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_module_poms_carry_the_fork_timeout(self, mock_run):
+        def fake_run(cmd, cwd=None, **kwargs):
+            with open(os.path.join(cwd, "m000", "pom.xml")) as f:
+                assert "<surefire.timeout>45</surefire.timeout>" in f.read()
+            return make_proc("[INFO] m000 ..... SUCCESS [ 1 s]")
+
+        mock_run.side_effect = fake_run
+        reactor_job = job()
+        reactor_job.timeout_sec = 45
+        results = MavenTool(mvn_cmd="mvn", fast_path=False, offline=False).run_reactor({"m000": reactor_job})
+        assert results["m000"].status == "PASS"
+
+
+class TestReactorEligible:
+    def test_fast_path_projects_stay_on_the_fast_path(self):
+        tool = MavenTool(mvn_cmd="mvn", fast_path=True)
+        tool.fast_runner = MagicMock()
+        tool.fast_runner.available.return_value = True
+        junit_pom = ProjectFile(path="pom.xml", content="<project><artifactId>x</artifactId></project>")
+        assert not tool.reactor_eligible([junit_pom])
+        assert tool.reactor_eligible([ProjectFile(path="pom.xml", content=SPRING_POM)])
+
+    def test_override_pom_decides(self):
+        tool = MavenTool(mvn_cmd="mvn", fast_path=False)
+        aggregator = ProjectFile(path="pom.xml", content="<project><packaging>pom</packaging></project>")
+        assert not tool.reactor_eligible([ProjectFile(path="pom.xml", content=SPRING_POM)], [aggregator])
@@ -0,0 +1,160 @@
+import os
+import subprocess
+import tempfile
+
+from unittest.mock import patch, MagicMock
+
+import codellamas_backend.tools.maven_repo as maven_repo
+from codellamas_backend.tools.maven_repo import (
+    SMOKE_TEST_PATH,
+    local_repository_args,
+    missing_artifacts,
+    offline_enabled,
+    repository_status,
+    warm_up_maven_repository,
+    warm_up_pom_files,
+)
+
+
+def make_proc(returncode: int = 0, stdout: str = "", stderr: str = "") -> MagicMock:
+    proc = MagicMock()
+    proc.returncode = returncode
+    proc.stdout = stdout
+    proc.stderr = stderr
+    return proc
+
+
+# ─────────────────────────────────────────────
+# missing_artifacts
+# ─────────────────────────────────────────────
+
+class TestMissingArtifacts:
+    def test_offline_not_downloaded(self):
+        raw = (
+            "[ERROR] Cannot access central (https://repo.maven.apache.org/maven2) in offline mode "
+            "and the artifact org.junit.jupiter:junit-jupiter:jar:5.10.2 has not been downloaded from it before."
+        )
+        assert missing_artifacts(raw) == ["org.junit.jupiter:junit-jupiter:jar:5.10.2"]
+
+    def test_could_not_find_and_plugins(self):
+        raw = (
+            "Could not find artifact com.example:lib:jar:1.0 in central\n"
+            "Plugin org.apache.maven.plugins:maven-surefire-plugin:3.2.5 or one of its "
+            "dependencies could not be resolved"
+        )
+        assert missing_artifacts(raw) == [
+            "com.example:lib:jar:1.0",
+            "org.apache.maven.plugins:maven-surefire-plugin:3.2.5",
+        ]
+
+    def test_duplicates_removed(self):
+        raw = "Failure to find a:b:jar:1 in x\nFailure to find a:b:jar:1 in x"
+        assert missing_artifacts(raw) == ["a:b:jar:1"]
+
+    def test_empty(self):
+        assert missing_artifacts("") == []
+
+
+# ─────────────────────────────────────────────
+# Configuration
+# ─────────────────────────────────────────────
+
+class TestConfiguration:
+    def test_local_repository_args(self):
+        with patch.dict("os.environ", {"MAVEN_LOCAL_REPO": "/opt/m2"}):
+            assert local_repository_args() == ["-Dmaven.repo.local=/opt/m2"]
+        with patch.dict("os.environ", {}, clear=True):
+            assert local_repository_args() == []
+
+    def test_offline_forced_on_and_off(self):
+        with patch.object(maven_repo, "_warm", False):
+            with patch.dict("os.environ", {"MAVEN_OFFLINE": "1"}):
+                assert offline_enabled() is True
+        with patch.object(maven_repo, "_warm", True):
+            with patch.dict("os.environ", {"MAVEN_OFFLINE": "0"}):
+                assert offline_enabled() is False
+
+    def test_offline_auto_follows_warmup(self):
+        with patch.dict("os.environ", {}, clear=True):
+            with patch.object(maven_repo, "_warm", False):
+                assert offline_enabled() is False
+            with patch.object(maven_repo, "_warm", True):
+                assert offline_enabled() is True
+
+    def test_warm_up_pom_files(self):
+        with patch.dict("os.environ", {"MAVEN_WARMUP_POMS": os.pathsep.join(["a/pom.xml", "", "b/pom.xml"])}):
+            assert warm_up_pom_files() == ["a/pom.xml", "b/pom.xml"]
+
+
+# ─────────────────────────────────────────────
+# warm_up_maven_repository
+# ─────────────────────────────────────────────
+
+class TestWarmUp:
+    def setup_method(self):
+        patcher_warm = patch.object(maven_repo, "_warm", False)
+        patcher_results = patch.object(maven_repo, "_results", [])
+        patcher_warm.start()
+        patcher_results.start()
+        self.patchers = [patcher_warm, patcher_results]
+
+    def teardown_method(self):
+        for p in self.patchers:
+            p.stop()
+
+    @patch("subprocess.run")
+    def test_success_marks_repository_warm(self, mock_run):
+        seen = {}
+
+        def fake_run(cmd, cwd=None, **kwargs):
+            if "test" in cmd:
+                seen["smoke"] = os.path.exists(os.path.join(cwd, SMOKE_TEST_PATH))
+            return make_proc()
+
+        mock_run.side_effect = fake_run
+        with patch.dict("os.environ", {}, clear=True):
+            results = warm_up_maven_repository(default_pom="<project>junit-jupiter</project>", mvn_cmd="mvn")
+
+            assert [r.ok for r in results] == [True, True]
+            assert seen["smoke"] is True
+            assert offline_enabled() is True
+            assert repository_status()["warm"] is True
+
+        go_offline = mock_run.call_args_list[0][0][0]
+        assert go_offline[:2] == ["mvn", "-B"]
+        assert "dependency:go-offline" in go_offline
+        assert "dependency:get" in mock_run.call_args_list[1][0][0]
+
+    @patch("subprocess.run")
+    def test_failure_keeps_online_and_reports_missing(self, mock_run):
+        mock_run.return_value = make_proc(returncode=1, stdout="Could not find artifact com.example:lib:jar:1.0 in central")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pom_path = os.path.join(tmpdir, "pom.xml")
+            with open(pom_path, "w") as f:
+                f.write("<project/>")
+            with patch.dict("os.environ", {}, clear=True):
+                results = warm_up_maven_repository([pom_path], mvn_cmd="mvn")
+                assert offline_enabled() is False
+
+        assert results[0].pom == pom_path
+        assert results[0].missing_artifacts == ["com.example:lib:jar:1.0"]
+        assert "exited with 1" in results[0].error
+
+    @patch("subprocess.run")
+    def test_unreadable_pom_recorded(self, mock_run):
+        mock_run.return_value = make_proc()
+        results = warm_up_maven_repository(["/does/not/exist/pom.xml"], mvn_cmd="mvn")
+        assert results[0].ok is False
+        assert repository_status()["warm"] is False
+
+    @patch("subprocess.run", side_effect=subprocess.TimeoutExpired(cmd="mvn", timeout=1))
+    def test_timeout_recorded(self, mock_run):
+        results = warm_up_maven_repository(default_pom="<project/>", mvn_cmd="mvn", timeout_sec=1)
+        assert "timed out" in results[0].error
+
+    @patch("shutil.which", return_value=None)
+    def test_no_maven(self, mock_which):
+        with patch.dict("os.environ", {}, clear=True):
+            results = warm_up_maven_repository(default_pom="<project/>")
+        assert results[0].error == "Maven executable not found"
+        assert repository_status()["warmup"][0]["ok"] is False
@@ -1,9 +1,13 @@
+import asyncio
+import os
 import subprocess
+import threading
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from typing import List
 
 from codellamas_backend.tools.maven_tool import MavenTool, MavenTestResult
+from codellamas_backend.tools.workspace import Workspace
 from codellamas_backend.schemas.files import ProjectFile
 
 
@@ -235,28 +239,28 @@ class TestRunTests:
         self.tool = MavenTool()
         self.files = make_files("pom.xml", "src/main/java/App.java")
 
-    @patch("subprocess.run")
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
     def test_pass_on_returncode_zero(self, mock_run):
         mock_run.return_value = make_proc(returncode=0, stdout="BUILD SUCCESS")
         result = self.tool.run_tests(self.files)
         assert result.status == "PASS"
         assert result.returncode == 0
 
-    @patch("subprocess.run")
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
     def test_fail_on_nonzero_returncode(self, mock_run):
         mock_run.return_value = make_proc(returncode=1, stdout="BUILD FAILURE")
         result = self.tool.run_tests(self.files)
         assert result.status == "FAIL"
         assert result.returncode == 1
 
-    @patch("subprocess.run")
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
     def test_quiet_flag_included_by_default(self, mock_run):
         mock_run.return_value = make_proc()
         self.tool.run_tests(self.files)
         cmd = mock_run.call_args[0][0]
         assert "-q" in cmd
 
-    @patch("subprocess.run")
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
     def test_quiet_false_omits_flag(self, mock_run):
         mock_run.return_value = make_proc()
         tool = MavenTool(quiet=False)
@@ -264,14 +268,14 @@ class TestRunTests:
         cmd = mock_run.call_args[0][0]
         assert "-q" not in cmd
 
-    @patch("subprocess.run")
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
     def test_extra_mvn_args_passed(self, mock_run):
         mock_run.return_value = make_proc()
         self.tool.run_tests(self.files, extra_mvn_args=["-Dskip=true"])
         cmd = mock_run.call_args[0][0]
         assert "-Dskip=true" in cmd
 
-    @patch("subprocess.run")
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
     def test_override_files_applied(self, mock_run):
         mock_run.return_value = make_proc()
         overrides = make_files("src/main/java/App.java")
@@ -279,14 +283,14 @@ class TestRunTests:
         result = self.tool.run_tests(self.files, override_files=overrides)
         assert result is not None
 
-    @patch("subprocess.run")
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
     def test_inject_tests_applied(self, mock_run):
         mock_run.return_value = make_proc()
         inject = {"src/test/java/GenTest.java": "public class GenTest {}"}
         result = self.tool.run_tests(self.files, inject_tests=inject)
         assert result is not None
 
-    @patch("subprocess.run", side_effect=subprocess.TimeoutExpired(cmd="mvn", timeout=300))
+    @patch("codellamas_backend.tools.maven_tool.run_streaming", side_effect=subprocess.TimeoutExpired(cmd="mvn", timeout=300))
     def test_timeout_returns_fail(self, mock_run):
         result = self.tool.run_tests(self.files)
         assert result.status == "FAIL"
@@ -294,14 +298,20 @@ class TestRunTests:
         assert any("timed out" in e for e in result.errors)
         assert result.raw_log == ""
 
-    @patch("subprocess.run")
+    @patch("codellamas_backend.tools.maven_tool.run_streaming", side_effect=subprocess.TimeoutExpired(cmd="mvn", timeout=45))
+    def test_per_run_timeout_overrides_tool_timeout(self, mock_run):
+        result = self.tool.run_tests(self.files, timeout_sec=45)
+        assert mock_run.call_args[1]["timeout"] == 45
+        assert result.errors == ["mvn test timed out after 45s"]
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
     def test_raw_log_combines_stdout_and_stderr(self, mock_run):
         mock_run.return_value = make_proc(returncode=0, stdout="OUT", stderr="ERR")
         result = self.tool.run_tests(self.files)
         assert "OUT" in result.raw_log
         assert "ERR" in result.raw_log
 
-    @patch("subprocess.run")
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
     def test_none_stdout_stderr_handled(self, mock_run):
         proc = MagicMock()
         proc.returncode = 0
@@ -311,7 +321,7 @@ class TestRunTests:
         result = self.tool.run_tests(self.files)
         assert result.status == "PASS"
 
-    @patch("subprocess.run")
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
     def test_workspace_cleaned_up_after_run(self, mock_run):
         mock_run.return_value = make_proc()
 
@@ -326,14 +336,14 @@ class TestRunTests:
         # workspace.root is internal — just confirm run completed without leaking
         assert result is not None
 
-    @patch("subprocess.run")
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
     def test_workspace_cleaned_up_on_exception(self, mock_run):
         mock_run.side_effect = RuntimeError("unexpected")
         with pytest.raises(RuntimeError):
             self.tool.run_tests(self.files)
         # if we get here without hanging tmp dirs, cleanup worked via __exit__
 
-    @patch("subprocess.run")
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
     def test_cwd_is_workspace_root(self, mock_run):
         mock_run.return_value = make_proc()
         self.tool.run_tests(self.files)
@@ -341,8 +351,572 @@ class TestRunTests:
         assert "cwd" in kwargs
         assert "codellamas_" in kwargs["cwd"]
 
-    @patch("subprocess.run")
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
     def test_empty_project_files(self, mock_run):
         mock_run.return_value = make_proc(returncode=1, stdout="BUILD FAILURE")
         result = self.tool.run_tests([])
         assert result.status == "FAIL"
+
+
+# ─────────────────────────────────────────────
+# MavenTool.run_test_variants
+# ─────────────────────────────────────────────
+
+class TestRunTestVariants:
+    def setup_method(self):
+        self.tool = MavenTool()
+        self.files = make_files("pom.xml", "src/main/java/App.java")
+
+    def test_empty_variants_returns_empty(self):
+        assert self.tool.run_test_variants(self.files, {}) == {}
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_one_result_per_variant(self, mock_run):
+        def fake_run(cmd, cwd, **kwargs):
+            with open(os.path.join(cwd, "src/main/java/App.java")) as f:
+                content = f.read()
+            return make_proc(returncode=0 if content == "clean" else 1, stdout=content)
+
+        mock_run.side_effect = fake_run
+        results = self.tool.run_test_variants(
+            self.files,
+            {
+                "smelly": [ProjectFile(path="src/main/java/App.java", content="smelly")],
+                "solution": [ProjectFile(path="src/main/java/App.java", content="clean")],
+            },
+        )
+
+        assert results["smelly"].status == "FAIL"
+        assert results["solution"].status == "PASS"
+        assert mock_run.call_count == 2
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_variants_run_in_separate_workspaces(self, mock_run):
+        mock_run.return_value = make_proc()
+        self.tool.run_test_variants(self.files, {"a": [], "b": []})
+        cwds = {c[1]["cwd"] for c in mock_run.call_args_list}
+        assert len(cwds) == 2
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_injected_tests_win_over_overrides(self, mock_run):
+        seen = {}
+
+        def fake_run(cmd, cwd, **kwargs):
+            with open(os.path.join(cwd, "src/test/java/AppTest.java")) as f:
+                seen["test"] = f.read()
+            return make_proc()
+
+        mock_run.side_effect = fake_run
+        self.tool.run_test_variants(
+            self.files,
+            {"smelly": [ProjectFile(path="src/test/java/AppTest.java", content="student")]},
+            inject_tests={"src/test/java/AppTest.java": "generated"},
+        )
+
+        assert seen["test"] == "generated"
+
+
+# ─────────────────────────────────────────────
+# MavenTool javac + JUnit console fast path
+# ─────────────────────────────────────────────
+
+SIMPLE_POM = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <dependencies>
+    <dependency>
+      <groupId>org.junit.jupiter</groupId>
+      <artifactId>junit-jupiter</artifactId>
+    </dependency>
+  </dependencies>
+</project>"""
+
+
+class TestFastPath:
+    def setup_method(self):
+        self.tool = MavenTool(fast_path=True)
+        self.tool.fast_runner = MagicMock()
+        self.tool.fast_runner.available.return_value = True
+        self.tool.fast_runner.run.return_value = ("PASS", 0, [], [], "fast")
+        self.files = [ProjectFile(path="pom.xml", content=SIMPLE_POM)]
+
+    def test_disabled_by_env(self):
+        with patch.dict("os.environ", {"MAVEN_FAST_PATH": "0"}):
+            assert MavenTool().fast_runner is None
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_simple_pom_uses_fast_path(self, mock_run):
+        result = self.tool.run_tests(self.files)
+        assert result.status == "PASS"
+        assert result.raw_log == "fast"
+        mock_run.assert_not_called()
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_other_pom_uses_maven(self, mock_run):
+        mock_run.return_value = make_proc()
+        self.tool.run_tests(make_files("pom.xml"))
+        self.tool.fast_runner.run.assert_not_called()
+        mock_run.assert_called_once()
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_resources_use_maven(self, mock_run):
+        mock_run.return_value = make_proc()
+        files = self.files + [ProjectFile(path="src/main/resources/app.properties", content="a=b")]
+        self.tool.run_tests(files)
+        self.tool.fast_runner.run.assert_not_called()
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_extra_mvn_args_use_maven(self, mock_run):
+        mock_run.return_value = make_proc()
+        self.tool.run_tests(self.files, extra_mvn_args=["-Dtest=AppTest"])
+        self.tool.fast_runner.run.assert_not_called()
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_unavailable_runner_uses_maven(self, mock_run):
+        mock_run.return_value = make_proc()
+        self.tool.fast_runner.available.return_value = False
+        self.tool.run_tests(self.files)
+        self.tool.fast_runner.run.assert_not_called()
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_fast_path_failures_keep_result_shape(self, mock_run):
+        self.tool.fast_runner.run.return_value = (
+            "FAIL", 1, ["com.example.AppTest.testFail"], ["Test failures"], "log"
+        )
+        result = self.tool.run_tests(self.files)
+        assert isinstance(result, MavenTestResult)
+        assert result.failed_tests == ["com.example.AppTest.testFail"]
+        assert result.errors == ["Test failures"]
+
+
+# ─────────────────────────────────────────────
+# MavenTool offline mode
+# ─────────────────────────────────────────────
+
+OFFLINE_LOG = (
+    "[ERROR] Failed to execute goal on project exercise: Could not resolve dependencies\n"
+    "[ERROR] Cannot access central (https://repo.maven.apache.org/maven2) in offline mode"
+    " and the artifact org.junit.jupiter:junit-jupiter:jar:5.10.2 has not been downloaded from it before.\n"
+    "[ERROR] BUILD FAILURE"
+)
+
+
+class TestOfflineMode:
+    def setup_method(self):
+        self.files = make_files("pom.xml")
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_offline_adds_flags(self, mock_run):
+        mock_run.return_value = make_proc()
+        MavenTool(fast_path=False, offline=True).run_tests(self.files)
+        cmd = mock_run.call_args[0][0]
+        assert " -o -nsu " in cmd
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_online_omits_flags(self, mock_run):
+        mock_run.return_value = make_proc()
+        MavenTool(fast_path=False, offline=False).run_tests(self.files)
+        assert "-o" not in mock_run.call_args[0][0].split()
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_default_follows_repository_state(self, mock_run):
+        mock_run.return_value = make_proc()
+        with patch("codellamas_backend.tools.maven_tool.offline_enabled", return_value=True):
+            MavenTool(fast_path=False).run_tests(self.files)
+        assert "-o" in mock_run.call_args[0][0].split()
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_local_repository_passed(self, mock_run):
+        mock_run.return_value = make_proc()
+        with patch.dict("os.environ", {"MAVEN_LOCAL_REPO": "/opt/m2"}):
+            MavenTool(fast_path=False, offline=False).run_tests(self.files)
+        assert "-Dmaven.repo.local=/opt/m2" in mock_run.call_args[0][0]
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_missing_artifacts_reported(self, mock_run):
+        mock_run.return_value = make_proc(returncode=1, stdout=OFFLINE_LOG)
+        result = MavenTool(fast_path=False, offline=True).run_tests(self.files)
+        assert "Dependency resolution error" in result.errors
+        assert (
+            "Missing from offline repository: org.junit.jupiter:junit-jupiter:jar:5.10.2"
+            in result.errors
+        )
+
+
+# ─────────────────────────────────────────────
+# MavenTool surefire report parsing
+# ─────────────────────────────────────────────
+
+SUREFIRE_XML = """<testsuite name="com.example.AppTest">
+  <testcase name="testOk" classname="com.example.AppTest" time="0.1"/>
+  <testcase name="testBad" classname="com.example.AppTest" time="0.2">
+    <failure message="nope">java.lang.AssertionError: nope</failure>
+  </testcase>
+</testsuite>"""
+
+
+class TestSurefireReports:
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_reports_read_before_cleanup(self, mock_run):
+        def fake_run(cmd, cwd=None, **kwargs):
+            reports = os.path.join(cwd, "target", "surefire-reports")
+            os.makedirs(reports)
+            with open(os.path.join(reports, "TEST-com.example.AppTest.xml"), "w") as f:
+                f.write(SUREFIRE_XML)
+            return make_proc(returncode=1, stdout="There are test failures\nBUILD FAILURE")
+
+        mock_run.side_effect = fake_run
+        result = MavenTool(fast_path=False, offline=False).run_tests(make_files("pom.xml"))
+
+        assert [c.status for c in result.test_cases] == ["passed", "failed"]
+        assert result.test_cases[1].message == "nope"
+        assert result.failed_tests == ["com.example.AppTest.testBad"]
+        assert result.test_summary()["total"] == 2
+        assert result.test_summary()["failed"] == 1
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_no_reports_keeps_log_heuristics(self, mock_run):
+        mock_run.return_value = make_proc(returncode=1, stdout="Failed tests: testX(com.example.FooTest)")
+        result = MavenTool(fast_path=False, offline=False).run_tests(make_files("pom.xml"))
+
+        assert result.test_cases == []
+        assert "testX(com.example.FooTest)" in result.failed_tests
+
+
+# ─────────────────────────────────────────────
+# Streaming output / early exit
+# ─────────────────────────────────────────────
+
+class TestEarlyExit:
+    def test_default_stops_on_compilation_error(self, monkeypatch):
+        monkeypatch.delenv("MAVEN_EARLY_EXIT", raising=False)
+        assert MavenTool(mvn_cmd="mvn").stop_on == ("COMPILATION ERROR",)
+
+    def test_env_disables_default_markers(self, monkeypatch):
+        monkeypatch.setenv("MAVEN_EARLY_EXIT", "0")
+        assert MavenTool(mvn_cmd="mvn").stop_on == ()
+
+    def test_explicit_markers_win(self, monkeypatch):
+        monkeypatch.setenv("MAVEN_EARLY_EXIT", "0")
+        assert MavenTool(mvn_cmd="mvn", stop_on=["BUILD FAILURE"]).stop_on == ("BUILD FAILURE",)
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_markers_passed_to_runner(self, mock_run):
+        mock_run.return_value = make_proc()
+        MavenTool(mvn_cmd="mvn", fast_path=False, offline=False, stop_on=["X"]).run_tests(make_files("pom.xml"))
+        assert mock_run.call_args[1]["stop_on"] == ("X",)
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_stopped_build_is_compilation_failure(self, mock_run):
+        proc = make_proc(returncode=-9, stdout="[ERROR] COMPILATION ERROR :\n[ERROR] App.java:[3,5] boom")
+        proc.stopped_on = "COMPILATION ERROR"
+        mock_run.return_value = proc
+
+        result = MavenTool(mvn_cmd="mvn", fast_path=False, offline=False).run_tests(make_files("pom.xml"))
+
+        assert result.status == "FAIL"
+        assert result.returncode == 1
+        assert "Compilation error" in result.errors
+        assert "stopped early after 'COMPILATION ERROR'" in result.raw_log
+
+    @patch(
+        "codellamas_backend.tools.maven_tool.run_streaming",
+        side_effect=subprocess.TimeoutExpired(cmd="mvn", timeout=1, output="partial log"),
+    )
+    def test_timeout_keeps_partial_output(self, mock_run):
+        result = MavenTool(mvn_cmd="mvn", fast_path=False, offline=False).run_tests(make_files("pom.xml"))
+        assert result.returncode == 124
+        assert result.raw_log == "partial log"
+
+
+# ─────────────────────────────────────────────
+# MavenTool.run_tests_async
+# ─────────────────────────────────────────────
+
+class TestRunTestsAsync:
+    def setup_method(self):
+        self.tool = MavenTool(mvn_cmd="mvn", fast_path=False, offline=False)
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming_async", new_callable=AsyncMock)
+    def test_runs_without_shell(self, mock_run):
+        mock_run.return_value = make_proc(returncode=0, stdout="BUILD SUCCESS")
+        result = asyncio.run(self.tool.run_tests_async(make_files("pom.xml"), extra_mvn_args=["-Dx=1"]))
+
+        assert result.status == "PASS"
+        cmd = mock_run.call_args[0][0]
+        assert cmd == ["mvn", "-q", "test", "-Dx=1"]
+        assert "codellamas_" in mock_run.call_args[1]["cwd"]
+        assert "shell" not in mock_run.call_args[1]
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming_async", new_callable=AsyncMock)
+    def test_mvn_cmd_with_arguments_is_split(self, mock_run):
+        mock_run.return_value = make_proc()
+        tool = MavenTool(mvn_cmd="mvn -B", fast_path=False, offline=False)
+        asyncio.run(tool.run_tests_async(make_files("pom.xml")))
+        assert mock_run.call_args[0][0][:2] == ["mvn", "-B"]
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming_async", new_callable=AsyncMock)
+    def test_writes_overrides_and_tests(self, mock_run):
+        seen = {}
+
+        async def fake_run(cmd, cwd=None, **kwargs):
+            with open(os.path.join(cwd, "src/test/java/GenTest.java")) as f:
+                seen["test"] = f.read()
+            return make_proc(returncode=1, stdout="There are test failures\nBUILD FAILURE")
+
+        mock_run.side_effect = fake_run
+        result = asyncio.run(self.tool.run_tests_async(
+            make_files("pom.xml"), inject_tests={"src/test/java/GenTest.java": "generated"}
+        ))
+
+        assert seen["test"] == "generated"
+        assert result.status == "FAIL"
+        assert "Test failures" in result.errors
+
+    @patch(
+        "codellamas_backend.tools.maven_tool.run_streaming_async",
+        new_callable=AsyncMock,
+        side_effect=subprocess.TimeoutExpired(cmd="mvn", timeout=300),
+    )
+    def test_timeout(self, mock_run):
+        result = asyncio.run(self.tool.run_tests_async(make_files("pom.xml")))
+        assert result.returncode == 124
+        assert "timed out" in result.errors[0]
+
+    def test_fast_path_runs_in_thread(self, tmp_path):
+        tool = MavenTool(mvn_cmd="mvn", offline=False)
+        tool.fast_runner = MagicMock()
+        tool.fast_runner.available.return_value = True
+        tool.fast_runner.run.return_value = ("PASS", 0, [], [], "ok")
+        with patch("codellamas_backend.tools.maven_tool.run_streaming_async") as mock_run:
+            result = asyncio.run(tool.run_tests_async([ProjectFile(path="pom.xml", content=SIMPLE_POM)]))
+        assert result.status == "PASS"
+        mock_run.assert_not_called()
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming_async", new_callable=AsyncMock)
+    def test_workspace_io_off_the_event_loop(self, mock_run):
+        mock_run.return_value = make_proc()
+        threads = {}
+        real_write_base = Workspace.write_base
+        real_cleanup = Workspace.cleanup
+
+        def write_base(ws, files):
+            threads["write"] = threading.get_ident()
+            real_write_base(ws, files)
+
+        def cleanup(ws):
+            threads["cleanup"] = threading.get_ident()
+            real_cleanup(ws)
+
+        async def run():
+            threads["loop"] = threading.get_ident()
+            return await self.tool.run_tests_async(make_files("pom.xml"))
+
+        with patch.object(Workspace, "write_base", write_base), patch.object(Workspace, "cleanup", cleanup):
+            asyncio.run(run())
+        assert threads["write"] != threads["loop"]
+        assert threads["cleanup"] != threads["loop"]
+
+    @patch("codellamas_backend.tools.maven_tool.run_streaming_async", new_callable=AsyncMock)
+    def test_workspace_removed_when_cancelled(self, mock_run):
+        roots = []
+
+        async def hang(cmd, cwd=None, **kwargs):
+            roots.append(cwd)
+            await asyncio.sleep(60)
+
+        mock_run.side_effect = hang
+
+        async def run():
+            task = asyncio.ensure_future(self.tool.run_tests_async(make_files("pom.xml")))
+            while not roots:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        assert not os.path.exists(roots[0])
+
+
+# ─────────────────────────────────────────────
+# MavenTool AppCDS archives
+# ─────────────────────────────────────────────
+
+class TestCdsArchives:
+    def setup_method(self):
+        from codellamas_backend.tools.cds_archive import CdsArchive, CdsLaunch
+
+        self.tool = MavenTool(mvn_cmd="mvn", offline=False)
+        archive = CdsArchive(role="maven", path="/cds/maven.jsa", fingerprint="f", created_at=0.0,
+                             startup_sec=0.8, archived_startup_sec=0.5)
+        self.cds = MagicMock()
+        self.cds.launch.side_effect = lambda role, command, inputs=(): CdsLaunch(
+            role=role,
+            options=[f"-XX:SharedArchiveFile=/cds/{role}.jsa", "-Xshare:auto"],
+            archive=archive if role == "maven" else None,
+        )
+
+    def run(self, files, **kwargs):
+        with patch("codellamas_backend.tools.maven_tool.get_cds_manager", return_value=self.cds), \
+                patch("codellamas_backend.tools.maven_tool.run_streaming") as mock_run:
+            mock_run.return_value = make_proc()
+            result = self.tool.run_tests(files, **kwargs)
+        return result, mock_run.call_args
+
+    def test_options_for_maven_launcher_only(self):
+        result, call = self.run(make_files("pom.xml"))
+        assert "-XX:SharedArchiveFile=/cds/maven.jsa" in call[1]["env"]["MAVEN_OPTS"]
+        assert not any("argLine" in arg for arg in call[0][0])
+        assert [c[0][0] for c in self.cds.launch.call_args_list] == ["maven"]
+        assert result.estimated_startup_saving_sec == 0.3
+        assert self.cds.complete.call_count == 1
+
+    def test_project_arg_line_is_kept(self):
+        files = [ProjectFile(path="pom.xml", content="<argLine>-javaagent:jacoco.jar</argLine>")]
+        _, call = self.run(files)
+        assert not any("argLine" in arg for arg in call[0][0])
+
+    def test_disabled(self):
+        self.cds = None
+        result, call = self.run(make_files("pom.xml"))
+        assert "argLine" not in call[0][0]
+        assert result.estimated_startup_saving_sec == 0.0
+
+
+# ─────────────────────────────────────────────
+# MavenTool verification profile
+# ─────────────────────────────────────────────
+
+class TestVerificationProfile:
+    def setup_method(self):
+        from codellamas_backend.tools.verification_profile import VerificationProfile
+
+        self.profile = VerificationProfile(heap_mb=128, junit_parallel="classes")
+        self.tool = MavenTool(mvn_cmd="mvn", offline=False, fast_path=False, profile=self.profile)
+
+    def run(self, files, **kwargs):
+        with patch("codellamas_backend.tools.maven_tool.get_cds_manager", return_value=None), \
+                patch("codellamas_backend.tools.maven_tool.run_streaming") as mock_run:
+            mock_run.return_value = make_proc()
+            self.tool.run_tests(files, **kwargs)
+        return mock_run.call_args
+
+    def test_fork_settings_on_command_line(self):
+        call = self.run(make_files("pom.xml"))
+        cmd = call[0][0]
+        assert "-DforkCount=1" in cmd
+        assert "-DreuseForks=true" in cmd
+        assert "-Xmx128m" in cmd
+        assert "-Djunit.jupiter.execution.parallel.enabled=true" in cmd
+        assert "-XX:TieredStopAtLevel=1" in call[1]["env"]["MAVEN_OPTS"]
+
+    def test_pom_is_not_modified(self):
+        files = make_files("pom.xml")
+        seen = {}
+
+        def fake_run(cmd, cwd=None, **kwargs):
+            with open(os.path.join(cwd, "pom.xml")) as f:
+                seen["pom"] = f.read()
+            return make_proc()
+
+        with patch("codellamas_backend.tools.maven_tool.get_cds_manager", return_value=None), \
+                patch("codellamas_backend.tools.maven_tool.run_streaming", side_effect=fake_run):
+            self.tool.run_tests(files)
+        assert seen["pom"] == files[0].content
+
+    def test_project_arg_line_is_kept(self):
+        files = [ProjectFile(path="pom.xml", content="<argLine>-javaagent:jacoco.jar</argLine>")]
+        cmd = self.run(files)[0][0]
+        assert "argLine" not in cmd
+        assert "-DforkCount=1" in cmd
+
+    def test_applied_on_fast_path(self):
+        tool = MavenTool(fast_path=True, profile=self.profile)
+        tool.fast_runner = MagicMock()
+        tool.fast_runner.available.return_value = True
+        tool.fast_runner.run.return_value = ("PASS", 0, [], [], "fast")
+        tool.run_tests([ProjectFile(path="pom.xml", content=SIMPLE_POM)])
+
+        kwargs = tool.fast_runner.run.call_args[1]
+        assert "-Xmx128m" in kwargs["jvm_args"]
+        assert kwargs["config"]["junit.jupiter.execution.parallel.enabled"] == "true"
+
+    def test_no_profile_adds_nothing(self):
+        self.tool.profile = None
+        cmd = self.run(make_files("pom.xml"))[0][0]
+        assert "forkCount" not in cmd
+        assert "argLine" not in cmd
+
+
+# ─────────────────────────────────────────────
+# MavenTool.compile_only
+# ─────────────────────────────────────────────
+
+class TestCompileOnly:
+    @patch("codellamas_backend.tools.maven_tool.get_cds_manager", return_value=None)
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_maven_runs_test_compile(self, mock_run, _):
+        mock_run.return_value = make_proc()
+        tool = MavenTool(mvn_cmd="mvn", offline=False, fast_path=False)
+        result = tool.compile_only(make_files("pom.xml"))
+        cmd = mock_run.call_args[0][0]
+        assert result.status == "PASS"
+        assert cmd.split()[-1] == "test-compile"
+        assert "argLine" not in cmd
+
+    @patch("codellamas_backend.tools.maven_tool.get_cds_manager", return_value=None)
+    @patch("codellamas_backend.tools.maven_tool.run_streaming")
+    def test_maven_compile_errors_become_diagnostics(self, mock_run, _):
+        def fake_run(cmd, cwd=None, **kwargs):
+            return make_proc(returncode=1, stdout=(
+                "[ERROR] COMPILATION ERROR :\n"
+                f"[ERROR] {cwd}/src/main/java/App.java:[3,9] cannot find symbol\n"
+                "[ERROR]   symbol:   variable x\n"
+            ))
+
+        mock_run.side_effect = fake_run
+        tool = MavenTool(mvn_cmd="mvn", offline=False, fast_path=False)
+        result = tool.compile_only(make_files("pom.xml", "src/main/java/App.java"))
+
+        assert result.status == "FAIL"
+        assert "Compilation error" in result.errors
+        (diagnostic,) = result.diagnostics
+        assert diagnostic.path == "src/main/java/App.java"
+        assert (diagnostic.line, diagnostic.column) == (3, 9)
+        assert diagnostic.details == "symbol: variable x"
+
+    def test_fast_path_uses_javac_only(self):
+        tool = MavenTool(fast_path=True)
+        tool.fast_runner = MagicMock()
+        tool.fast_runner.available.return_value = True
+        seen = {}
+
+        def fake_compile(root, release=None, deadline=None):
+            seen["root"] = root
+            return False, f"{root}/src/main/java/App.java:2: error: ';' expected\n1 error\n"
+
+        tool.fast_runner.compile.side_effect = fake_compile
+        with patch("codellamas_backend.tools.maven_tool.run_streaming") as mock_run:
+            result = tool.compile_only([ProjectFile(path="pom.xml", content=SIMPLE_POM)])
+
+        mock_run.assert_not_called()
+        tool.fast_runner.run.assert_not_called()
+        assert result.status == "FAIL"
+        assert result.diagnostics[0].path == "src/main/java/App.java"
+        assert result.diagnostics[0].message == "';' expected"
+
+    def test_fast_path_pass(self):
+        tool = MavenTool(fast_path=True)
+        tool.fast_runner = MagicMock()
+        tool.fast_runner.available.return_value = True
+        tool.fast_runner.compile.return_value = (True, "")
+        result = tool.compile_only([ProjectFile(path="pom.xml", content=SIMPLE_POM)])
+        assert result.status == "PASS"
+        assert result.diagnostics == []
+
+    def test_fast_path_timeout(self):
+        tool = MavenTool(fast_path=True)
+        tool.fast_runner = MagicMock()
+        tool.fast_runner.available.return_value = True
+        tool.fast_runner.compile.side_effect = subprocess.TimeoutExpired(cmd="javac", timeout=0)
+        result = tool.compile_only([ProjectFile(path="pom.xml", content=SIMPLE_POM)])
+        assert result.returncode == 124
@@ -0,0 +1,92 @@
+from codellamas_backend.api import default_base_project_files
+from codellamas_backend.tools.pom_profile import is_simple_junit_pom, java_release
+
+
+def pom(body: str = "", properties: str = "") -> str:
+    return f"""<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <modelVersion>4.0.0</modelVersion>
+  <properties>{properties}</properties>
+  {body}
+</project>"""
+
+
+JUNIT_DEP = """<dependencies>
+    <dependency>
+      <groupId>org.junit.jupiter</groupId>
+      <artifactId>junit-jupiter</artifactId>
+      <version>5.10.2</version>
+      <scope>test</scope>
+    </dependency>
+  </dependencies>"""
+
+
+# ─────────────────────────────────────────────
+# is_simple_junit_pom
+# ─────────────────────────────────────────────
+
+class TestIsSimpleJunitPom:
+    def test_default_base_project_pom_is_simple(self):
+        assert is_simple_junit_pom(default_base_project_files()[0].content) is True
+
+    def test_junit_dependency_only_is_simple(self):
+        assert is_simple_junit_pom(pom(JUNIT_DEP)) is True
+
+    def test_none_or_empty_is_not_simple(self):
+        assert is_simple_junit_pom(None) is False
+        assert is_simple_junit_pom("") is False
+
+    def test_invalid_xml_is_not_simple(self):
+        assert is_simple_junit_pom("<project>") is False
+
+    def test_other_dependency_is_not_simple(self):
+        body = """<dependencies><dependency>
+          <groupId>org.projectlombok</groupId><artifactId>lombok</artifactId>
+        </dependency></dependencies>"""
+        assert is_simple_junit_pom(pom(body)) is False
+
+    def test_parent_is_not_simple(self):
+        body = "<parent><groupId>org.springframework.boot</groupId></parent>"
+        assert is_simple_junit_pom(pom(body)) is False
+
+    def test_profiles_are_not_simple(self):
+        assert is_simple_junit_pom(pom("<profiles><profile/></profiles>")) is False
+
+    def test_surefire_plugin_allowed(self):
+        body = """<build><plugins><plugin>
+          <groupId>org.apache.maven.plugins</groupId>
+          <artifactId>maven-surefire-plugin</artifactId>
+        </plugin></plugins></build>"""
+        assert is_simple_junit_pom(pom(body)) is True
+
+    def test_surefire_plugin_without_group_allowed(self):
+        body = "<build><plugins><plugin><artifactId>maven-surefire-plugin</artifactId></plugin></plugins></build>"
+        assert is_simple_junit_pom(pom(body)) is True
+
+    def test_other_plugin_is_not_simple(self):
+        body = """<build><plugins><plugin>
+          <groupId>org.jacoco</groupId><artifactId>jacoco-maven-plugin</artifactId>
+        </plugin></plugins></build>"""
+        assert is_simple_junit_pom(pom(body)) is False
+
+
+# ─────────────────────────────────────────────
+# java_release
+# ─────────────────────────────────────────────
+
+class TestJavaRelease:
+    def test_default_pom_is_17(self):
+        assert java_release(default_base_project_files()[0].content) == "17"
+
+    def test_release_preferred_over_target(self):
+        props = "<maven.compiler.release>21</maven.compiler.release><maven.compiler.target>17</maven.compiler.target>"
+        assert java_release(pom(properties=props)) == "21"
+
+    def test_legacy_version_format(self):
+        assert java_release(pom(properties="<maven.compiler.source>1.8</maven.compiler.source>")) == "8"
+
+    def test_property_placeholder_ignored(self):
+        assert java_release(pom(properties="<maven.compiler.release>${java.version}</maven.compiler.release>")) is None
+
+    def test_missing_properties(self):
+        assert java_release("<project/>") is None
+        assert java_release(None) is None
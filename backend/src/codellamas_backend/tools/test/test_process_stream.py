@@ -0,0 +1,193 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from codellamas_backend.tools.process_stream import BoundedOutput, run_streaming, run_streaming_async
+
+
+def py(code: str):
+    return [sys.executable, "-c", code]
+
+
+# ─────────────────────────────────────────────
+# BoundedOutput
+# ─────────────────────────────────────────────
+
+class TestBoundedOutput:
+    def test_short_output_kept_verbatim(self):
+        out = BoundedOutput()
+        for line in ("a\n", "b\n", "c"):
+            out.append(line)
+        assert out.text() == "a\nb\nc"
+        assert out.omitted == 0
+
+    def test_keeps_head_tail_and_important_lines(self):
+        out = BoundedOutput(head_chars=10, tail_lines=3)
+        for i in range(100):
+            out.append(f"line {i}\n")
+            if i == 50:
+                out.append("[ERROR] something broke\n")
+
+        text = out.text()
+        assert text.startswith("line 0\nline 1")
+        assert "[ERROR] something broke" in text
+        assert text.endswith("line 97\nline 98\nline 99")
+        assert "line 40" not in text
+        assert out.lines == 101
+        assert f"[{out.omitted} lines omitted]" in text
+
+    def test_important_lines_are_bounded(self):
+        out = BoundedOutput(head_chars=0, tail_lines=1, max_important=2)
+        for i in range(10):
+            out.append(f"ERROR {i}")
+        text = out.text()
+        assert "ERROR 0" in text and "ERROR 1" in text
+        assert "ERROR 5" not in text
+        assert text.endswith("ERROR 9")
+
+    def test_long_lines_truncated(self):
+        out = BoundedOutput()
+        out.append("x" * 10000)
+        assert len(out.text()) < 2100
+
+
+# ─────────────────────────────────────────────
+# run_streaming
+# ─────────────────────────────────────────────
+
+class TestRunStreaming:
+    def test_captures_stdout_and_stderr(self):
+        proc = run_streaming(py("import sys; print('out'); print('err', file=sys.stderr)"), timeout=30)
+        assert proc.returncode == 0
+        assert "out" in proc.stdout and "err" in proc.stdout
+        assert proc.stopped_on is None
+
+    def test_nonzero_exit_code(self):
+        proc = run_streaming(py("import sys; sys.exit(3)"), timeout=30)
+        assert proc.returncode == 3
+
+    def test_shell_command(self):
+        proc = run_streaming("echo hello", shell=True, timeout=30)
+        assert proc.stdout.strip() == "hello"
+
+    def test_stops_after_marker_and_grace(self):
+        code = (
+            "import time\n"
+            "print('COMPILATION ERROR', flush=True)\n"
+            "print('detail', flush=True)\n"
+            "time.sleep(30)\n"
+        )
+        started = time.monotonic()
+        proc = run_streaming(py(code), timeout=60, stop_on=["COMPILATION ERROR"], grace_sec=0.5)
+        assert time.monotonic() - started < 10
+        assert proc.stopped_on == "COMPILATION ERROR"
+        assert "detail" in proc.stdout
+
+    def test_grace_lines_cut_grace_short(self):
+        code = (
+            "import time\n"
+            "print('STOP', flush=True)\n"
+            "for i in range(5): print(i, flush=True)\n"
+            "time.sleep(30)\n"
+        )
+        started = time.monotonic()
+        proc = run_streaming(py(code), timeout=60, stop_on=["STOP"], grace_sec=30, grace_lines=3)
+        assert time.monotonic() - started < 10
+        assert proc.stopped_on == "STOP"
+
+    def test_marker_ignored_when_process_exits_normally(self):
+        proc = run_streaming(py("print('STOP')"), timeout=30, stop_on=["STOP"], grace_sec=30)
+        assert proc.returncode == 0
+        assert proc.stopped_on is None
+
+    def test_timeout_kills_process_group(self):
+        code = (
+            "import subprocess, sys, time\n"
+            "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+            "print('started', flush=True)\n"
+            "time.sleep(60)\n"
+        )
+        started = time.monotonic()
+        with pytest.raises(subprocess.TimeoutExpired) as exc:
+            run_streaming(py(code), timeout=1)
+        # the grandchild holds the pipe open; returning at all means it was killed too
+        assert time.monotonic() - started < 15
+        assert "started" in exc.value.output
+
+
+# ─────────────────────────────────────────────
+# run_streaming_async
+# ─────────────────────────────────────────────
+
+class TestRunStreamingAsync:
+    def test_captures_merged_output(self):
+        proc = asyncio.run(run_streaming_async(
+            py("import sys; print('out'); print('err', file=sys.stderr); sys.exit(2)"), timeout=30
+        ))
+        assert proc.returncode == 2
+        assert "out" in proc.stdout and "err" in proc.stdout
+        assert proc.stopped_on is None
+
+    def test_stops_after_marker(self):
+        code = (
+            "import time\n"
+            "print('COMPILATION ERROR', flush=True)\n"
+            "print('detail', flush=True)\n"
+            "time.sleep(30)\n"
+        )
+        started = time.monotonic()
+        proc = asyncio.run(run_streaming_async(
+            py(code), timeout=60, stop_on=["COMPILATION ERROR"], grace_sec=0.5
+        ))
+        assert time.monotonic() - started < 10
+        assert proc.stopped_on == "COMPILATION ERROR"
+        assert "detail" in proc.stdout
+
+    def test_grace_lines(self):
+        code = (
+            "import time\n"
+            "print('STOP', flush=True)\n"
+            "for i in range(5): print(i, flush=True)\n"
+            "time.sleep(30)\n"
+        )
+        proc = asyncio.run(run_streaming_async(py(code), timeout=60, stop_on=["STOP"], grace_sec=30, grace_lines=3))
+        assert proc.stopped_on == "STOP"
+
+    def test_timeout_kills_process_group(self):
+        code = (
+            "import subprocess, sys, time\n"
+            "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+            "print('started', flush=True)\n"
+            "time.sleep(60)\n"
+        )
+        started = time.monotonic()
+        with pytest.raises(subprocess.TimeoutExpired) as exc:
+            asyncio.run(run_streaming_async(py(code), timeout=1))
+        assert time.monotonic() - started < 15
+        assert "started" in exc.value.output
+
+    def test_cancellation_kills_process(self, tmp_path):
+        pid_file = tmp_path / "pid"
+        code = (
+            "import os, time\n"
+            f"open({str(pid_file)!r}, 'w').write(str(os.getpid()))\n"
+            "print('ready', flush=True)\n"
+            "time.sleep(60)\n"
+        )
+
+        async def main():
+            task = asyncio.create_task(run_streaming_async(py(code), timeout=60))
+            while not pid_file.exists() or not pid_file.read_text():
+                await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        pid = int(pid_file.read_text())
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
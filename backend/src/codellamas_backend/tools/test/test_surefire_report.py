@@ -0,0 +1,118 @@
+import os
+import tempfile
+
+from codellamas_backend.tools.surefire_report import (
+    TestCaseResult,
+    failed_test_names,
+    parse_reports,
+    summarize,
+    trim_stack_trace,
+)
+
+
+REPORT = """<?xml version="1.0" encoding="UTF-8"?>
+<testsuite name="com.example.AppTest" tests="4" failures="1" errors="1" skipped="1">
+  <testcase name="testPass" classname="com.example.AppTest" time="0.012"/>
+  <testcase name="testFail()" classname="com.example.AppTest" time="0.020">
+    <failure message="expected: &lt;3&gt; but was: &lt;2&gt;"
+             type="org.opentest4j.AssertionFailedError">org.opentest4j.AssertionFailedError: expected: &lt;3&gt; but was: &lt;2&gt;
+    at org.junit.jupiter.api.AssertionUtils.fail(AssertionUtils.java:151)
+    at org.junit.jupiter.api.AssertEquals.assertEquals(AssertEquals.java:150)
+    at com.example.AppTest.testFail(AppTest.java:14)
+    at java.base/jdk.internal.reflect.DirectMethodHandleAccessor.invoke(DirectMethodHandleAccessor.java:103)
+</failure>
+  </testcase>
+  <testcase name="testBoom" classname="com.example.AppTest" time="0.001">
+    <error message="boom" type="java.lang.IllegalStateException">java.lang.IllegalStateException: boom
+    at com.example.App.run(App.java:7)
+</error>
+  </testcase>
+  <testcase name="testLater" classname="com.example.AppTest" time="0">
+    <skipped message="disabled"/>
+  </testcase>
+</testsuite>"""
+
+
+def write_report(tmpdir: str, content: str = REPORT, name: str = "TEST-com.example.AppTest.xml") -> None:
+    with open(os.path.join(tmpdir, name), "w") as f:
+        f.write(content)
+
+
+# ─────────────────────────────────────────────
+# parse_reports
+# ─────────────────────────────────────────────
+
+class TestParseReports:
+    def test_every_case_with_status(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_report(tmpdir)
+            cases = parse_reports(tmpdir)
+
+        assert [(c.method, c.status) for c in cases] == [
+            ("testPass", "passed"),
+            ("testFail", "failed"),
+            ("testBoom", "error"),
+            ("testLater", "skipped"),
+        ]
+        assert cases[0].class_name == "com.example.AppTest"
+        assert cases[1].duration_sec == 0.02
+        assert cases[1].message == "expected: <3> but was: <2>"
+        assert cases[3].message == "disabled"
+
+    def test_stack_trace_trimmed_to_application_frames(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_report(tmpdir)
+            failed = parse_reports(tmpdir)[1]
+
+        assert "at com.example.AppTest.testFail(AppTest.java:14)" in failed.stack_trace
+        assert "org.junit.jupiter.api.AssertionUtils" not in failed.stack_trace
+        assert failed.stack_trace.endswith("... 3 more")
+
+    def test_missing_dir_and_corrupt_files(self):
+        assert parse_reports("/does/not/exist") == []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_report(tmpdir, "<testsuite", name="TEST-bad.xml")
+            write_report(tmpdir)
+            assert len(parse_reports(tmpdir)) == 4
+
+    def test_bad_duration_is_zero(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_report(tmpdir, '<testsuite><testcase name="t" classname="C" time="n/a"/></testsuite>')
+            assert parse_reports(tmpdir)[0].duration_sec == 0.0
+
+
+# ─────────────────────────────────────────────
+# summarize / failed_test_names / trim_stack_trace
+# ─────────────────────────────────────────────
+
+class TestDerived:
+    def test_summary_counts(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_report(tmpdir)
+            summary = summarize(parse_reports(tmpdir))
+
+        assert summary == {
+            "total": 4,
+            "passed": 1,
+            "failed": 1,
+            "errors": 1,
+            "skipped": 1,
+            "duration_sec": 0.033,
+        }
+
+    def test_empty_summary(self):
+        assert summarize([])["total"] == 0
+
+    def test_failed_test_names(self):
+        cases = [
+            TestCaseResult("C", "a", "failed", 0.0),
+            TestCaseResult("C", "b", "passed", 0.0),
+            TestCaseResult("C", "c", "error", 0.0),
+        ]
+        assert failed_test_names(cases) == ["C.a", "C.c"]
+
+    def test_trim_caps_line_count(self):
+        trace = "\n".join(f"at com.example.Deep.f{i}(Deep.java:{i})" for i in range(30))
+        trimmed = trim_stack_trace(trace, max_lines=5)
+        assert len(trimmed.splitlines()) == 6
+        assert trimmed.endswith("... 25 more")
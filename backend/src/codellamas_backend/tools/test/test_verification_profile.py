@@ -0,0 +1,84 @@
+import os
+
+import pytest
+from unittest.mock import patch
+
+from codellamas_backend.tools.verification_profile import VerificationProfile, verification_profile_from_env
+
+
+# ─────────────────────────────────────────────
+# Profile options
+# ─────────────────────────────────────────────
+
+class TestVerificationProfile:
+    def test_defaults(self):
+        profile = VerificationProfile()
+        assert profile.surefire_properties() == ["-DforkCount=1", "-DreuseForks=true"]
+        assert profile.launcher_jvm_args() == ["-XX:+TieredCompilation", "-XX:TieredStopAtLevel=1"]
+        # nothing that changes how the tests run unless asked for
+        assert profile.test_jvm_args() == profile.launcher_jvm_args()
+        assert profile.junit_config() == {}
+
+    def test_heap_cap(self):
+        args = VerificationProfile(heap_mb=256).test_jvm_args()
+        assert "-Xmx256m" in args
+        assert "-XX:+UseSerialGC" in args
+
+    def test_parallel_classes_keeps_methods_sequential(self):
+        config = VerificationProfile(junit_parallel="classes").junit_config()
+        assert config["junit.jupiter.execution.parallel.enabled"] == "true"
+        assert config["junit.jupiter.execution.parallel.mode.classes.default"] == "concurrent"
+        assert config["junit.jupiter.execution.parallel.mode.default"] == "same_thread"
+
+    def test_parallel_all(self):
+        config = VerificationProfile(junit_parallel="all").junit_config()
+        assert config["junit.jupiter.execution.parallel.mode.default"] == "concurrent"
+
+    def test_parallel_off(self):
+        assert VerificationProfile(junit_parallel="off").junit_config() == {}
+
+    def test_unset_flags_are_left_out(self):
+        profile = VerificationProfile(tiered_stop_at_level=None, heap_mb=None, junit_parallel="off")
+        assert profile.launcher_jvm_args() == []
+        assert profile.fork_arg_line() == []
+
+    def test_fork_arg_line_carries_junit_config(self):
+        line = VerificationProfile(extra_jvm_args=["-Dfile.encoding=UTF-8"], junit_parallel="classes").fork_arg_line()
+        assert "-Dfile.encoding=UTF-8" in line
+        assert "-Djunit.jupiter.execution.parallel.enabled=true" in line
+
+
+# ─────────────────────────────────────────────
+# Deployment configuration
+# ─────────────────────────────────────────────
+
+class TestProfileFromEnv:
+    def test_disabled(self):
+        with patch.dict(os.environ, {"VERIFY_PROFILE": "0"}):
+            assert verification_profile_from_env() is None
+
+    def test_defaults(self):
+        with patch.dict(os.environ, {}, clear=True):
+            assert verification_profile_from_env() == VerificationProfile()
+
+    def test_overrides(self):
+        env = {
+            "VERIFY_PROFILE_FORK_COUNT": "2",
+            "VERIFY_PROFILE_REUSE_FORKS": "0",
+            "VERIFY_PROFILE_TIERED_LEVEL": "0",
+            "VERIFY_PROFILE_HEAP_MB": "512",
+            "VERIFY_PROFILE_PARALLEL": "ALL",
+            "VERIFY_PROFILE_JVM_ARGS": "-Xss512k -Duser.timezone=UTC",
+        }
+        with patch.dict(os.environ, env, clear=True):
+            profile = verification_profile_from_env()
+        assert profile.surefire_properties() == ["-DforkCount=2", "-DreuseForks=false"]
+        assert profile.tiered_stop_at_level is None
+        assert profile.heap_mb == 512
+        assert profile.junit_parallel == "all"
+        assert profile.extra_jvm_args == ["-Xss512k", "-Duser.timezone=UTC"]
+
+    def test_rejects_unknown_parallel_mode(self):
+        with patch.dict(os.environ, {"VERIFY_PROFILE_PARALLEL": "methods"}):
+            with pytest.raises(ValueError):
+                verification_profile_from_env()
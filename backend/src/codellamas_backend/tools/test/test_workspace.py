@@ -1,8 +1,12 @@
 import os
 import pytest
+import tempfile
 
 from unittest.mock import patch
 from codellamas_backend.tools.workspace import Workspace
+from codellamas_backend.tools.workspace_cleanup import WorkspaceDeleter
+from codellamas_backend.tools.workspace_root import WorkspaceRoots
+from codellamas_backend.tools.workspace_template import TemplateStore
 from codellamas_backend.schemas.files import ProjectFile
 
 
@@ -170,3 +174,95 @@ class TestWorkspace:
 
         assert root is not None
         assert not os.path.exists(root)
+
+    def test_write_base_uses_template_store(self):
+        with tempfile.TemporaryDirectory() as store_dir:
+            store = TemplateStore(root_dir=store_dir)
+            files = [ProjectFile(path="pom.xml", content="<project/>")]
+            with patch("codellamas_backend.tools.workspace.get_template_store", return_value=store) as get_store:
+                with Workspace() as ws:
+                    ws.write_base(files)
+                    assert ws.read("pom.xml") == "<project/>"
+            assert store.stats()["misses"] == 1
+            get_store.assert_called_once_with(os.path.dirname(ws.root))
+
+    def test_write_base_without_store_writes_files(self):
+        files = [ProjectFile(path="pom.xml", content="<project/>")]
+        with patch("codellamas_backend.tools.workspace.get_template_store", return_value=None):
+            with Workspace() as ws:
+                ws.write_base(files)
+                assert ws.read("pom.xml") == "<project/>"
+
+    def test_overwrite_does_not_touch_linked_template(self):
+        with tempfile.TemporaryDirectory() as store_dir:
+            store = TemplateStore(root_dir=store_dir)
+            files = [ProjectFile(path="src/main/java/App.java", content="base")]
+            with patch("codellamas_backend.tools.workspace.get_template_store", return_value=store):
+                with Workspace() as first:
+                    first.write_base(files)
+                    first.write_file_map({"src/main/java/App.java": "student"})
+                    assert first.read("src/main/java/App.java") == "student"
+                with Workspace() as second:
+                    second.write_base(files)
+                    assert second.read("src/main/java/App.java") == "base"
+
+    def test_normalize(self):
+        assert Workspace.normalize("/src\\main/App.java") == "src/main/App.java"
+
+    def test_explicit_root_dir(self):
+        with tempfile.TemporaryDirectory() as base:
+            with Workspace(root_dir=os.path.join(base, "nested")) as ws:
+                assert os.path.dirname(ws.root) == os.path.join(base, "nested")
+                assert ws.kind == "disk"
+
+    def test_placed_by_workspace_roots(self):
+        with tempfile.TemporaryDirectory() as ram, tempfile.TemporaryDirectory() as disk:
+            roots = WorkspaceRoots(ram_dir=ram, disk_dir=disk, max_used_fraction=1.0, min_free_bytes=0)
+            deleter = WorkspaceDeleter()
+            with patch("codellamas_backend.tools.workspace.get_workspace_roots", return_value=roots), \
+                 patch("codellamas_backend.tools.workspace.get_workspace_deleter", return_value=deleter):
+                with Workspace() as ws:
+                    assert os.path.dirname(ws.root) == ram
+                    assert ws.kind == "ram"
+                    ws.write_file_map({"a.txt": "héllo"})
+                    assert ws.bytes_written == len("héllo".encode("utf-8"))
+            assert deleter.drain(5)
+
+            stats = roots.stats()
+            assert stats["ram_workspaces"] == 1
+            assert stats["bytes_written"] == 6
+            assert stats["workspace_bytes"]["max"] == 6
+
+    def test_cleanup_records_once(self):
+        with tempfile.TemporaryDirectory() as disk:
+            roots = WorkspaceRoots(disk_dir=disk)
+            deleter = WorkspaceDeleter()
+            with patch("codellamas_backend.tools.workspace.get_workspace_roots", return_value=roots), \
+                 patch("codellamas_backend.tools.workspace.get_workspace_deleter", return_value=deleter):
+                ws = Workspace()
+                ws.cleanup()
+                ws.cleanup()
+            assert deleter.drain(5)
+            assert roots.stats()["workspace_bytes"]["count"] == 1
+
+    def test_cleanup_deletes_in_the_background(self):
+        with tempfile.TemporaryDirectory() as disk:
+            deleter = WorkspaceDeleter()
+            with patch("codellamas_backend.tools.workspace.get_workspace_deleter", return_value=deleter):
+                ws = Workspace(root_dir=disk)
+                ws.write_file_map({"a.txt": "x" * 100})
+                ws.cleanup()
+                assert not os.path.exists(ws.root)
+            assert deleter.drain(5)
+            assert os.listdir(disk) == []
+            assert deleter.stats()["bytes_freed"] >= 100
+
+    def test_cleanup_without_deleter_is_synchronous(self):
+        with tempfile.TemporaryDirectory() as disk:
+            roots = WorkspaceRoots(disk_dir=disk)
+            with patch("codellamas_backend.tools.workspace.get_workspace_roots", return_value=roots), \
+                 patch("codellamas_backend.tools.workspace.get_workspace_deleter", return_value=None):
+                with Workspace() as ws:
+                    ws.write_file_map({"a.txt": "abc"})
+            assert os.listdir(disk) == []
+            assert roots.stats()["workspace_bytes"]["max"] == 3
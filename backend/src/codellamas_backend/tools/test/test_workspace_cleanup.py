@@ -0,0 +1,158 @@
+import os
+import tempfile
+import time
+
+from unittest.mock import patch
+
+import codellamas_backend.tools.workspace_cleanup as cleanup_module
+from codellamas_backend.tools.workspace_cleanup import (
+    WorkspaceDeleter,
+    WorkspaceJanitor,
+    get_workspace_deleter,
+    get_workspace_janitor,
+)
+from codellamas_backend.tools.workspace_root import WorkspaceRoots
+
+
+def make_tree(parent: str, name: str, size: int = 10, age_sec: float = 0) -> str:
+    path = os.path.join(parent, name)
+    os.makedirs(os.path.join(path, "src"))
+    with open(os.path.join(path, "src", "App.java"), "w") as f:
+        f.write("x" * size)
+    if age_sec:
+        stamp = time.time() - age_sec
+        os.utime(path, (stamp, stamp))
+    return path
+
+
+# ─────────────────────────────────────────────
+# Background deleter
+# ─────────────────────────────────────────────
+
+class TestWorkspaceDeleter:
+    def test_path_disappears_immediately_and_is_freed_later(self):
+        with tempfile.TemporaryDirectory() as base:
+            path = make_tree(base, "codellamas_abcd1234", size=50)
+            sizes = []
+            deleter = WorkspaceDeleter()
+            deleter.delete(path, on_size=sizes.append)
+
+            assert not os.path.exists(path)
+            assert deleter.drain(5)
+            assert os.listdir(base) == []
+            assert sizes == [50]
+            stats = deleter.stats()
+            assert stats["deleted"] == 1
+            assert stats["bytes_freed"] == 50
+            assert stats["lag_sec"]["count"] == 1
+            assert stats["pending"] == 0
+
+    def test_missing_path_reports_zero(self):
+        sizes = []
+        WorkspaceDeleter().delete("/nonexistent/codellamas_x", on_size=sizes.append)
+        assert sizes == [0]
+
+    def test_full_queue_deletes_synchronously(self):
+        with tempfile.TemporaryDirectory() as base:
+            deleter = WorkspaceDeleter(max_pending=1)
+            with patch.object(deleter, "_ensure_thread"):  # nothing drains the queue
+                deleter.delete(make_tree(base, "codellamas_aaaaaaaa"))
+                deleter.delete(make_tree(base, "codellamas_bbbbbbbb", size=3))
+
+            # the first waits as a tombstone, the second was removed on the spot
+            assert [name.endswith(".deleting") for name in os.listdir(base)] == [True]
+            stats = deleter.stats()
+            assert stats["pending"] == 1
+            assert stats["sync_deletes"] == 1
+            assert stats["bytes_freed"] == 3
+            assert not deleter.drain(0.01)
+
+
+# ─────────────────────────────────────────────
+# Janitor
+# ─────────────────────────────────────────────
+
+class TestWorkspaceJanitor:
+    def test_removes_only_old_workspaces(self):
+        with tempfile.TemporaryDirectory() as base:
+            old = make_tree(base, "codellamas_old12345", size=7, age_sec=7200)
+            old_bundle = make_tree(base, "codellamas_bundle_zz9_abcd", age_sec=7200)
+            fresh = make_tree(base, "codellamas_new12345", size=5)
+            store = make_tree(base, "codellamas_templates", age_sec=7200)
+            other = make_tree(base, "unrelated_dir", age_sec=7200)
+
+            janitor = WorkspaceJanitor([base], max_age_sec=3600)
+            assert janitor.sweep() == 2
+
+            assert not os.path.exists(old)
+            assert not os.path.exists(old_bundle)
+            assert os.path.exists(fresh)
+            assert os.path.exists(store)
+            assert os.path.exists(other)
+
+            stats = janitor.stats()
+            assert stats["removed"] == 2
+            assert stats["bytes_removed"] == 17
+            assert stats["orphan_age_sec"]["max"] >= 7000
+            disk = stats["disk"][base]
+            assert disk["workspaces"] == 1
+            assert disk["workspace_bytes"] == 5
+            assert disk["free"] > 0
+
+    def test_removes_leftover_tombstones_but_not_pending_ones(self):
+        with tempfile.TemporaryDirectory() as base:
+            leftover = make_tree(base, ".codellamas_x1.deadbeef.deleting")
+            queued = make_tree(base, ".codellamas_x2.cafebabe.deleting")
+            deleter = WorkspaceDeleter()
+            with patch.object(deleter, "pending", return_value=[queued]):
+                janitor = WorkspaceJanitor([base], deleter=deleter)
+                assert janitor.sweep() == 1
+            assert deleter.drain(5)
+            assert not os.path.exists(leftover)
+            assert os.path.exists(queued)
+
+    def test_missing_directory_is_skipped(self):
+        janitor = WorkspaceJanitor(["/nonexistent/codellamas_root"])
+        assert janitor.sweep() == 0
+        assert janitor.stats()["sweeps"] == 1
+
+    def test_start_sweeps_in_background(self):
+        with tempfile.TemporaryDirectory() as base:
+            make_tree(base, "codellamas_old12345", age_sec=7200)
+            janitor = WorkspaceJanitor([base], max_age_sec=60, interval_sec=60)
+            thread = janitor.start()
+            assert janitor.start() is thread
+            deadline = time.time() + 5
+            while janitor.stats()["sweeps"] == 0 and time.time() < deadline:
+                time.sleep(0.01)
+            janitor.stop()
+            thread.join(5)
+            assert os.listdir(base) == []
+
+
+# ─────────────────────────────────────────────
+# Process-wide instances
+# ─────────────────────────────────────────────
+
+class TestProcessWideCleanup:
+    def test_deleter_disabled(self):
+        with patch.dict(os.environ, {"WORKSPACE_ASYNC_CLEANUP": "0"}):
+            assert get_workspace_deleter() is None
+
+    def test_janitor_disabled(self):
+        with patch.dict(os.environ, {"WORKSPACE_JANITOR": "0"}):
+            assert get_workspace_janitor() is None
+
+    def test_janitor_watches_workspace_roots(self):
+        roots = WorkspaceRoots(ram_dir="/dev/shm/codellamas", disk_dir="/tmp")
+        env = {"WORKSPACE_JANITOR": "1", "WORKSPACE_ASYNC_CLEANUP": "1",
+               "WORKSPACE_JANITOR_MAX_AGE_SEC": "600", "WORKSPACE_JANITOR_INTERVAL_SEC": "30"}
+        with patch.dict(os.environ, env), \
+             patch.object(cleanup_module, "_janitor", None), \
+             patch.object(cleanup_module, "get_workspace_roots", return_value=roots):
+            janitor = get_workspace_janitor()
+            assert janitor is get_workspace_janitor()
+            assert janitor.dirs == ["/dev/shm/codellamas", "/tmp"]
+            assert janitor.max_age_sec == 600
+            assert janitor.interval_sec == 30
+            assert janitor.deleter is get_workspace_deleter()
@@ -0,0 +1,119 @@
+import os
+import tempfile
+from collections import namedtuple
+
+import pytest
+from unittest.mock import patch
+
+import codellamas_backend.tools.workspace_root as roots_module
+from codellamas_backend.tools.workspace_root import (
+    WorkspaceRoots,
+    default_ram_dir,
+    get_workspace_roots,
+    tree_size,
+)
+
+
+Usage = namedtuple("Usage", "total used free")
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def dirs():
+    with tempfile.TemporaryDirectory() as ram, tempfile.TemporaryDirectory() as disk:
+        yield ram, disk
+
+
+# ─────────────────────────────────────────────
+# Placement and capacity guard
+# ─────────────────────────────────────────────
+
+class TestWorkspaceRoots:
+    def test_disk_only_without_ram_dir(self, dirs):
+        _, disk = dirs
+        roots = WorkspaceRoots(ram_dir=None, disk_dir=disk)
+        assert roots.choose() == (disk, "disk")
+        assert roots.stats()["fallbacks"] == 0
+
+    def test_ram_when_room(self, dirs):
+        ram, disk = dirs
+        roots = WorkspaceRoots(ram_dir=ram, disk_dir=disk, min_free_bytes=100 * MB)
+        with patch("shutil.disk_usage", return_value=Usage(1000 * MB, 100 * MB, 900 * MB)):
+            assert roots.choose() == (ram, "ram")
+        assert roots.stats()["ram_workspaces"] == 1
+
+    def test_falls_back_when_too_full(self, dirs):
+        ram, disk = dirs
+        roots = WorkspaceRoots(ram_dir=ram, disk_dir=disk, max_used_fraction=0.75, min_free_bytes=0)
+        with patch("shutil.disk_usage", return_value=Usage(1000 * MB, 800 * MB, 200 * MB)):
+            assert roots.choose() == (disk, "disk")
+        assert roots.stats()["fallbacks"] == 1
+
+    def test_falls_back_when_too_small(self, dirs):
+        # e.g. a container's default 64 MB /dev/shm
+        ram, disk = dirs
+        roots = WorkspaceRoots(ram_dir=ram, disk_dir=disk, min_free_bytes=512 * MB)
+        with patch("shutil.disk_usage", return_value=Usage(64 * MB, 0, 64 * MB)):
+            assert roots.choose() == (disk, "disk")
+
+    def test_falls_back_when_ram_dir_missing(self, dirs):
+        _, disk = dirs
+        roots = WorkspaceRoots(ram_dir="/nonexistent/ram", disk_dir=disk, min_free_bytes=0)
+        assert roots.choose() == (disk, "disk")
+
+    def test_record_and_stats(self, dirs):
+        ram, disk = dirs
+        roots = WorkspaceRoots(ram_dir=ram, disk_dir=disk)
+        roots.record(bytes_written=10, final_bytes=100)
+        roots.record(bytes_written=30, final_bytes=300)
+        stats = roots.stats()
+        assert stats["bytes_written"] == 40
+        assert stats["workspace_bytes"] == {"count": 2, "avg": 200, "max": 300}
+        assert stats["ram_usage"]["total"] > 0
+
+
+# ─────────────────────────────────────────────
+# Helpers
+# ─────────────────────────────────────────────
+
+class TestHelpers:
+    def test_tree_size(self, dirs):
+        root, _ = dirs
+        os.makedirs(os.path.join(root, "a"))
+        with open(os.path.join(root, "a", "f"), "w") as f:
+            f.write("12345")
+        assert tree_size(root) == 5
+
+    def test_default_ram_dir_non_posix(self):
+        with patch.object(roots_module.os, "name", "nt"):
+            assert default_ram_dir() is None
+
+    def test_default_ram_dir_candidate(self, dirs):
+        ram, _ = dirs
+        with patch.object(roots_module, "RAM_DIR_CANDIDATES", ("/nonexistent", ram)):
+            assert default_ram_dir() == ram
+
+
+class TestGetWorkspaceRoots:
+    def setup_method(self):
+        roots_module._roots = None
+
+    def teardown_method(self):
+        roots_module._roots = None
+
+    def test_ram_disabled(self, monkeypatch):
+        monkeypatch.setenv("WORKSPACE_RAM", "0")
+        assert get_workspace_roots().ram_dir is None
+
+    def test_env_configuration(self, monkeypatch, dirs):
+        ram, disk = dirs
+        monkeypatch.delenv("WORKSPACE_RAM", raising=False)
+        monkeypatch.setenv("WORKSPACE_RAM_DIR", ram)
+        monkeypatch.setenv("WORKSPACE_DIR", disk)
+        monkeypatch.setenv("WORKSPACE_RAM_MAX_USED_PCT", "50")
+        monkeypatch.setenv("WORKSPACE_RAM_MIN_FREE_MB", "1")
+        roots = get_workspace_roots()
+        assert (roots.ram_dir, roots.disk_dir) == (ram, disk)
+        assert roots.max_used_fraction == 0.5
+        assert roots.min_free_bytes == MB
+        assert get_workspace_roots() is roots
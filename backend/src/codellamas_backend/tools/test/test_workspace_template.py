@@ -0,0 +1,162 @@
+import os
+import tempfile
+
+from unittest.mock import patch
+
+import codellamas_backend.tools.workspace_template as template_module
+from codellamas_backend.tools.workspace_template import (
+    TemplateStore,
+    get_template_store,
+    template_key,
+)
+from codellamas_backend.schemas.files import ProjectFile
+
+
+def pf(path="pom.xml", content="<project/>") -> ProjectFile:
+    return ProjectFile(path=path, content=content)
+
+
+# ─────────────────────────────────────────────
+# template_key
+# ─────────────────────────────────────────────
+
+class TestTemplateKey:
+    def test_order_and_spelling_do_not_matter(self):
+        a = template_key([pf("a.java", "1"), pf("/b.java", "2")])
+        b = template_key([pf("b.java", "2"), pf("a.java", "1")])
+        assert a == b
+
+    def test_content_changes_key(self):
+        assert template_key([pf(content="x")]) != template_key([pf(content="y")])
+
+
+# ─────────────────────────────────────────────
+# TemplateStore
+# ─────────────────────────────────────────────
+
+class TestTemplateStore:
+    def setup_method(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = TemplateStore(root_dir=os.path.join(self.tmp.name, "store"))
+
+    def teardown_method(self):
+        self.tmp.cleanup()
+
+    def _dest(self, name: str) -> str:
+        path = os.path.join(self.tmp.name, name)
+        os.makedirs(path)
+        return path
+
+    def test_clone_materializes_files(self):
+        files = [pf(), pf("src/main/java/App.java", "class App {}")]
+        dest = self._dest("ws")
+        self.store.clone(files, dest)
+
+        with open(os.path.join(dest, "src/main/java/App.java")) as f:
+            assert f.read() == "class App {}"
+        assert os.path.exists(os.path.join(dest, "pom.xml"))
+
+    def test_second_clone_reuses_template_via_hardlinks(self):
+        files = [pf()]
+        first, second = self._dest("a"), self._dest("b")
+        key = self.store.clone(files, first)
+        self.store.clone(files, second)
+
+        stats = self.store.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert stats["templates"] == 1
+        template_pom = os.path.join(self.store.root_dir, key, "pom.xml")
+        assert os.path.samefile(template_pom, os.path.join(second, "pom.xml"))
+
+    def test_copy_fallback_when_linking_fails(self):
+        dest = self._dest("ws")
+        with patch("os.link", side_effect=OSError("EXDEV")):
+            self.store.clone([pf()], dest)
+        assert self.store.stats()["copied_files"] == 1
+        assert os.path.exists(os.path.join(dest, "pom.xml"))
+
+    def test_lru_eviction_by_size(self):
+        self.store.max_bytes = 15
+        old = self.store.clone([pf(content="a" * 10)], self._dest("a"))
+        self.store.clone([pf(content="b" * 10)], self._dest("b"))
+
+        assert not os.path.exists(os.path.join(self.store.root_dir, old))
+        stats = self.store.stats()
+        assert stats["templates"] == 1
+        assert stats["evictions"] == 1
+
+    def test_eviction_keeps_existing_clones(self):
+        self.store.max_bytes = 15
+        dest = self._dest("a")
+        self.store.clone([pf(content="a" * 10)], dest)
+        self.store.clone([pf(content="b" * 10)], self._dest("b"))
+
+        with open(os.path.join(dest, "pom.xml")) as f:
+            assert f.read() == "a" * 10
+
+    def test_pinned_template_not_evicted(self):
+        self.store.max_bytes = 15
+        key = template_key([pf(content="a" * 10)])
+        self.store._checkout(key, [pf(content="a" * 10)])  # pinned, as during a clone
+        self.store.clone([pf(content="b" * 10)], self._dest("b"))
+
+        assert os.path.isdir(os.path.join(self.store.root_dir, key))
+        self.store._release(key)
+
+    def test_existing_templates_adopted_on_start(self):
+        key = self.store.clone([pf()], self._dest("a"))
+        staging = os.path.join(self.store.root_dir, ".partial_x")
+        os.makedirs(staging)
+
+        fresh = TemplateStore(root_dir=self.store.root_dir)
+        fresh.clone([pf()], self._dest("b"))
+
+        assert fresh.stats()["hits"] == 1
+        assert not os.path.exists(staging)
+        assert os.path.isdir(os.path.join(fresh.root_dir, key))
+
+    def test_clear_removes_templates(self):
+        key = self.store.clone([pf()], self._dest("a"))
+        self.store.clear()
+        assert self.store.stats()["templates"] == 0
+        assert not os.path.exists(os.path.join(self.store.root_dir, key))
+
+
+# ─────────────────────────────────────────────
+# get_template_store
+# ─────────────────────────────────────────────
+
+class TestGetTemplateStore:
+    def test_disabled_by_env(self):
+        with patch.dict("os.environ", {"WORKSPACE_TEMPLATES": "0"}):
+            assert get_template_store() is None
+
+    def test_singleton(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(template_module, "_stores", {}):
+                with patch.dict("os.environ", {"WORKSPACE_TEMPLATE_DIR": tmpdir}):
+                    assert get_template_store() is get_template_store()
+
+    def test_configured_dir_on_the_workspaces_filesystem(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store_dir = os.path.join(tmpdir, "templates")
+            with patch.object(template_module, "_stores", {}):
+                with patch.dict("os.environ", {"WORKSPACE_TEMPLATE_DIR": store_dir}):
+                    assert get_template_store(tmpdir).root_dir == store_dir
+
+    def test_store_next_to_workspaces_on_another_filesystem(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            workspaces = os.path.join(tmpdir, "workspaces")
+            os.makedirs(workspaces)
+            real_device = template_module._device
+
+            def device(path, create=False):
+                return 2 if path.startswith(workspaces) else real_device(path, create)
+
+            with patch.object(template_module, "_stores", {}), \
+                    patch.object(template_module, "_device", side_effect=device), \
+                    patch.dict("os.environ", {"WORKSPACE_TEMPLATE_DIR": os.path.join(tmpdir, "templates")}):
+                store = get_template_store(workspaces)
+                assert store.root_dir == os.path.join(workspaces, "codellamas_templates")
+                assert get_template_store() is not store
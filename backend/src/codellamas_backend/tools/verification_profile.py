@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+import shlex
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+PARALLEL_MODES = ("off", "classes", "all")
+
+
+@dataclass
+class VerificationProfile:
+    """
+    Build settings applied to verification runs only. Nothing is written to
+    the project: the settings travel as Maven user properties, MAVEN_OPTS and
+    the surefire argLine (or the console launcher's options on the javac
+    fast path), so the pom the student sees stays untouched. A pom that
+    configures forkCount/reuseForks itself keeps its values; one that sets
+    its own argLine keeps it and gets no test JVM options.
+
+    The heap cap and parallel JUnit execution are off by default: they change
+    how the tests themselves run (shared static state, memory-heavy tests),
+    and with it which submissions pass.
+    """
+
+    fork_count: str = "1"
+    reuse_forks: bool = True
+    # C1 only: test runs are too short for C2 to pay off
+    tiered_stop_at_level: Optional[int] = 1
+    heap_mb: Optional[int] = None
+    junit_parallel: str = "off"  # off | classes (methods stay sequential) | all
+    extra_jvm_args: List[str] = field(default_factory=list)
+
+    def launcher_jvm_args(self) -> List[str]:
+        """Options for the Maven JVM itself (MAVEN_OPTS)."""
+        args = []
+        if self.tiered_stop_at_level:
+            args += ["-XX:+TieredCompilation", f"-XX:TieredStopAtLevel={self.tiered_stop_at_level}"]
+        return args
+
+    def test_jvm_args(self) -> List[str]:
+        """Options for the JVM running the tests (surefire fork or console launcher)."""
+        args = self.launcher_jvm_args()
+        if self.heap_mb:
+            # a small heap needs no parallel GC threads competing with other verifications
+            args += [f"-Xmx{self.heap_mb}m", "-XX:+UseSerialGC"]
+        return args + list(self.extra_jvm_args)
+
+    def junit_config(self) -> Dict[str, str]:
+        """JUnit Platform configuration parameters."""
+        if self.junit_parallel == "off":
+            return {}
+        config = {
+            "junit.jupiter.execution.parallel.enabled": "true",
+            "junit.jupiter.execution.parallel.mode.classes.default": "concurrent",
+            "junit.jupiter.execution.parallel.mode.default": "same_thread",
+        }
+        if self.junit_parallel == "all":
+            config["junit.jupiter.execution.parallel.mode.default"] = "concurrent"
+        return config
+
+    def surefire_properties(self) -> List[str]:
+        return [f"-DforkCount={self.fork_count}", f"-DreuseForks={str(self.reuse_forks).lower()}"]
+
+    def fork_arg_line(self) -> List[str]:
+        """The surefire argLine: test JVM options plus the JUnit configuration as system properties."""
+        return self.test_jvm_args() + [f"-D{key}={value}" for key, value in self.junit_config().items()]
+
+    def describe(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def verification_profile_from_env() -> Optional[VerificationProfile]:
+    """
+    The deployment's verification profile, used by MavenVerifier.
+    VERIFY_PROFILE=0 runs the project's build as-is. Otherwise
+    VERIFY_PROFILE_FORK_COUNT, VERIFY_PROFILE_REUSE_FORKS,
+    VERIFY_PROFILE_TIERED_LEVEL (0 leaves tiered compilation alone) and
+    VERIFY_PROFILE_JVM_ARGS adjust the defaults; VERIFY_PROFILE_HEAP_MB
+    (default 0, the heap left alone) and VERIFY_PROFILE_PARALLEL (off,
+    classes or all; default off) opt in to a heap cap and parallel tests.
+    """
+    if os.getenv("VERIFY_PROFILE", "1") == "0":
+        return None
+    parallel = os.getenv("VERIFY_PROFILE_PARALLEL", "off").lower()
+    if parallel not in PARALLEL_MODES:
+        raise ValueError(f"VERIFY_PROFILE_PARALLEL must be one of {', '.join(PARALLEL_MODES)}, got {parallel!r}")
+    return VerificationProfile(
+        fork_count=os.getenv("VERIFY_PROFILE_FORK_COUNT", "1"),
+        reuse_forks=os.getenv("VERIFY_PROFILE_REUSE_FORKS", "1") != "0",
+        tiered_stop_at_level=int(os.getenv("VERIFY_PROFILE_TIERED_LEVEL", "1")) or None,
+        heap_mb=int(os.getenv("VERIFY_PROFILE_HEAP_MB", "0")) or None,
+        junit_parallel=parallel,
+        extra_jvm_args=shlex.split(os.getenv("VERIFY_PROFILE_JVM_ARGS", "")),
+    )
@@ -3,8 +3,11 @@ from __future__ import annotations
 import os
 import shutil
 import tempfile
-from typing import Dict, Iterable, Optional
+from typing import Callable, Dict, Iterable, List, Optional
 from codellamas_backend.schemas.files import ProjectFile
+from codellamas_backend.tools.workspace_cleanup import get_workspace_deleter
+from codellamas_backend.tools.workspace_root import get_workspace_roots, tree_size
+from codellamas_backend.tools.workspace_template import get_template_store
 
 
 class Workspace:
@@ -14,30 +17,64 @@ class Workspace:
       - materializing a Maven project sent from VS Code (path+content)
       - applying student edits (override)
       - injecting generated tests
+
+    Base projects written with write_base are cloned from a shared template
+    (see workspace_template) on the same filesystem, so every file is replaced,
+    never edited in place.
+
+    Unless root_dir is given, the workspace is placed by workspace_root: on a
+    RAM-backed filesystem while it has room, on disk otherwise. `kind` says
+    which; bytes_written counts what the workspace itself wrote.
+
+    cleanup() hands the directory to the background deleter (see
+    workspace_cleanup): the root is gone when it returns, the disk it held
+    is freed shortly after.
     """
 
-    def __init__(self, prefix: str = "codellamas_"):
-        self.root = tempfile.mkdtemp(prefix=prefix)
+    def __init__(self, prefix: str = "codellamas_", root_dir: Optional[str] = None):
+        self._roots = None
+        self.kind = "disk"
+        if root_dir is None:
+            self._roots = get_workspace_roots()
+            root_dir, self.kind = self._roots.choose()
+        os.makedirs(root_dir, exist_ok=True)
+        self.root = tempfile.mkdtemp(prefix=prefix, dir=root_dir)
+        self.bytes_written = 0
 
     def write_files(self, files: Iterable[ProjectFile]) -> None:
         for f in files:
             self._write_one(f.path, f.content)
 
+    def write_base(self, files: List[ProjectFile]) -> None:
+        """Materializes the base project, via the template store when enabled."""
+        store = get_template_store(os.path.dirname(self.root))
+        if store is None:
+            self.write_files(files)
+        else:
+            store.clone(files, self.root)
+
     def write_file_map(self, file_map: Dict[str, str]) -> None:
         for path, content in file_map.items():
             self._write_one(path, content)
 
+    @staticmethod
+    def normalize(rel_path: str) -> str:
+        return rel_path.lstrip("/").replace("\\", "/")
+
     def _write_one(self, rel_path: str, content: str) -> None:
-        rel_path = rel_path.lstrip("/").replace("\\", "/")
+        rel_path = self.normalize(rel_path)
         if rel_path.endswith("/"):
             raise ValueError(f"Invalid path: must be a file, not a directory ({rel_path})")
         abs_path = os.path.join(self.root, rel_path)
         os.makedirs(os.path.dirname(abs_path), exist_ok=True)
+        if os.path.exists(abs_path):
+            os.remove(abs_path)  # may be a hardlink into a template
         with open(abs_path, "w", encoding="utf-8") as out:
             out.write(content)
+        self.bytes_written += len(content.encode("utf-8"))
 
     def read(self, rel_path: str) -> Optional[str]:
-        rel_path = rel_path.lstrip("/").replace("\\", "/")
+        rel_path = self.normalize(rel_path)
         abs_path = os.path.join(self.root, rel_path)
         if rel_path.endswith("/"):
             raise ValueError(f"Invalid path: must be a file, not a directory ({rel_path})")
@@ -47,7 +84,27 @@ class Workspace:
             return f.read()
 
     def cleanup(self) -> None:
+        on_size = self._take_size_recorder()
+        deleter = get_workspace_deleter()
+        if deleter is not None:
+            deleter.delete(self.root, on_size=on_size)
+            return
+        size = tree_size(self.root) if os.path.isdir(self.root) else 0
         shutil.rmtree(self.root, ignore_errors=True)
+        if on_size is not None:
+            on_size(size)
+
+    def _take_size_recorder(self) -> Optional[Callable[[int], None]]:
+        """Reports this workspace's final size to its roots, at most once."""
+        if self._roots is None:
+            return None
+        roots, self._roots = self._roots, None
+        bytes_written = self.bytes_written
+
+        def on_size(size: int) -> None:
+            roots.record(bytes_written, size)
+
+        return on_size
 
     def __enter__(self) -> "Workspace":
         return self
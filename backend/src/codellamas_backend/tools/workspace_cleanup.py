@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from codellamas_backend.tools.workspace_root import get_workspace_roots, tree_size
+
+
+# tempfile.mkdtemp names of every Workspace prefix in use; the persistent
+# stores next to them (codellamas_templates, _classes, _bundles, _cds) never match
+WORKSPACE_NAME_RE = re.compile(r"^codellamas_(?:bundle_|warmup_|reactor_|cds_)?[a-z0-9_]{8}$")
+TOMBSTONE_RE = re.compile(r"^\.codellamas_.+\.deleting$")
+
+_Item = Tuple[str, float, Optional[Callable[[int], None]]]
+
+
+def _distribution(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0, "avg": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "avg": round(sum(ordered) / len(ordered), 3),
+        "p95": round(ordered[int(0.95 * (len(ordered) - 1))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class WorkspaceDeleter:
+    """
+    Deletes workspaces off the request path. delete() renames the directory
+    to a hidden tombstone next to it, so the workspace is gone as far as
+    anyone can see, and queues the tombstone for a background thread. When
+    max_pending tombstones are already waiting the caller deletes it itself,
+    which keeps the backlog (and the disk it holds) bounded.
+
+    stats() reports the lag between queueing and deletion and the bytes freed.
+    """
+
+    def __init__(self, max_pending: int = 256, history: int = 512):
+        self.max_pending = max_pending
+        self._queue: "queue.Queue[_Item]" = queue.Queue(maxsize=max_pending)
+        self._cond = threading.Condition()
+        self._pending: Dict[str, float] = {}
+        self._lags: Deque[float] = deque(maxlen=history)
+        self._thread: Optional[threading.Thread] = None
+        self.deleted = 0
+        self.sync_deletes = 0
+        self.failures = 0
+        self.bytes_freed = 0
+
+    def delete(self, path: str, on_size: Optional[Callable[[int], None]] = None) -> None:
+        """Removes path; on_size gets the bytes it held once it is gone (0 if it did not exist)."""
+        if not os.path.isdir(path):
+            if on_size is not None:
+                on_size(0)
+            return
+        item = (_tombstone(path), time.monotonic(), on_size)
+        with self._cond:
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                self.sync_deletes += 1
+            else:
+                self._pending[item[0]] = item[1]
+                self._ensure_thread()
+                return
+        self._remove(item)
+
+    def pending(self) -> List[str]:
+        with self._cond:
+            return list(self._pending)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Waits until the queue is empty; False if it still is not after timeout seconds."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._cond:
+            oldest = min(self._pending.values(), default=None)
+            return {
+                "enabled": True,
+                "pending": len(self._pending),
+                "max_pending": self.max_pending,
+                "oldest_pending_sec": round(now - oldest, 3) if oldest is not None else 0.0,
+                "deleted": self.deleted,
+                "sync_deletes": self.sync_deletes,
+                "failures": self.failures,
+                "bytes_freed": self.bytes_freed,
+                "lag_sec": _distribution(list(self._lags)),
+            }
+
+    def _ensure_thread(self) -> None:
+        # caller holds self._cond
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._work, name="workspace-deleter", daemon=True)
+            self._thread.start()
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                self._remove(item)
+            except Exception as e:  # background thread: keep serving the queue
+                logging.warning(f"Workspace deletion failed: {e}")
+            finally:
+                with self._cond:
+                    self._pending.pop(item[0], None)
+                    self._cond.notify_all()
+                self._queue.task_done()
+
+    def _remove(self, item: _Item) -> None:
+        path, queued_at, on_size = item
+        size = tree_size(path)
+        shutil.rmtree(path, ignore_errors=True)
+        gone = not os.path.exists(path)
+        with self._cond:
+            if gone:
+                self.deleted += 1
+                self.bytes_freed += size
+            else:
+                self.failures += 1
+            self._lags.append(time.monotonic() - queued_at)
+        if on_size is not None:
+            on_size(size)
+
+
+def _tombstone(path: str) -> str:
+    """Renames path to .<name>.<id>.deleting in the same directory; path itself if that fails."""
+    parent, name = os.path.split(path.rstrip(os.sep))
+    target = os.path.join(parent, f".{name}.{uuid.uuid4().hex[:8]}.deleting")
+    try:
+        os.rename(path, target)
+    except OSError:
+        return path  # e.g. a file still open on Windows; rmtree gets what it can
+    return target
+
+
+class WorkspaceJanitor:
+    """
+    Periodically removes what no Workspace will clean up any more: workspace
+    directories older than max_age_sec (left by a killed verification or a
+    crashed process) and tombstones the deleter did not get to. Only the
+    top level of `dirs` is scanned, and only names a Workspace creates.
+
+    stats() reports the disk usage of each directory, what the live
+    workspaces in it hold, and how long removed orphans had been lingering.
+    """
+
+    def __init__(
+        self,
+        dirs: List[str],
+        max_age_sec: float = 3600.0,
+        interval_sec: float = 300.0,
+        deleter: Optional[WorkspaceDeleter] = None,
+        history: int = 512,
+    ):
+        self.dirs = list(dict.fromkeys(d for d in dirs if d))
+        self.max_age_sec = max_age_sec
+        self.interval_sec = interval_sec
+        self.deleter = deleter
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._orphan_ages: Deque[float] = deque(maxlen=history)
+        self._disk: Dict[str, Dict[str, Any]] = {}
+        self.sweeps = 0
+        self.removed = 0
+        self.bytes_removed = 0
+        self.last_sweep: Optional[Dict[str, Any]] = None
+
+    def sweep(self) -> int:
+        """One pass over every directory; returns how many orphans were removed."""
+        started = time.monotonic()
+        now = time.time()
+        pending = set(self.deleter.pending()) if self.deleter is not None else set()
+        removed = 0
+        disk: Dict[str, Dict[str, Any]] = {}
+
+        for directory in self.dirs:
+            live, live_bytes = 0, 0
+            for name, path, age in _entries(directory, now):
+                if path in pending:
+                    continue
+                tombstone = TOMBSTONE_RE.match(name) is not None
+                if not tombstone and age < self.max_age_sec:
+                    live += 1
+                    live_bytes += tree_size(path)
+                    continue
+                self._remove(path, age)
+                removed += 1
+            disk[directory] = {**_disk_usage(directory), "workspaces": live, "workspace_bytes": live_bytes}
+
+        with self._lock:
+            self.sweeps += 1
+            self._disk = disk
+            self.last_sweep = {
+                "at": round(now, 3),
+                "duration_sec": round(time.monotonic() - started, 3),
+                "removed": removed,
+            }
+        return removed
+
+    def start(self) -> threading.Thread:
+        """Sweeps now and then every interval_sec on a daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="workspace-janitor", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": True,
+                "dirs": self.dirs,
+                "max_age_sec": self.max_age_sec,
+                "interval_sec": self.interval_sec,
+                "sweeps": self.sweeps,
+                "removed": self.removed,
+                "bytes_removed": self.bytes_removed,
+                "orphan_age_sec": _distribution(list(self._orphan_ages)),
+                "last_sweep": self.last_sweep,
+                "disk": self._disk,
+            }
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self.sweep()
+            except Exception as e:  # background thread: try again next interval
+                logging.warning(f"Workspace janitor sweep failed: {e}")
+            if self._stop.wait(self.interval_sec):
+                return
+
+    def _remove(self, path: str, age: float) -> None:
+        def counted(size: int) -> None:
+            with self._lock:
+                self.bytes_removed += size
+
+        with self._lock:
+            self.removed += 1
+            self._orphan_ages.append(age)
+        if self.deleter is not None:
+            self.deleter.delete(path, on_size=counted)
+        else:
+            size = tree_size(path)
+            shutil.rmtree(path, ignore_errors=True)
+            counted(size)
+
+
+def _entries(directory: str, now: float) -> List[Tuple[str, str, float]]:
+    """(name, path, age in seconds) of the workspaces and tombstones directly under directory."""
+    out = []
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return out
+    for name in names:
+        if not (WORKSPACE_NAME_RE.match(name) or TOMBSTONE_RE.match(name)):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            st = os.lstat(path)
+        except OSError:
+            continue  # removed meanwhile
+        if os.path.isdir(path) and not os.path.islink(path):
+            out.append((name, path, max(0.0, now - st.st_mtime)))
+    return out
+
+
+def _disk_usage(directory: str) -> Dict[str, int]:
+    try:
+        usage = shutil.disk_usage(directory)
+    except OSError:
+        return {}
+    return {"total": usage.total, "used": usage.used, "free": usage.free}
+
+
+_deleter: Optional[WorkspaceDeleter] = None
+_janitor: Optional[WorkspaceJanitor] = None
+_cleanup_lock = threading.Lock()
+
+
+def get_workspace_deleter() -> Optional[WorkspaceDeleter]:
+    """
+    Process-wide background deleter used by Workspace.cleanup.
+    WORKSPACE_ASYNC_CLEANUP=0 deletes synchronously; WORKSPACE_CLEANUP_QUEUE
+    bounds the number of workspaces waiting for deletion.
+    """
+    global _deleter
+    if os.getenv("WORKSPACE_ASYNC_CLEANUP", "1") == "0":
+        return None
+    with _cleanup_lock:
+        if _deleter is None:
+            _deleter = WorkspaceDeleter(max_pending=int(os.getenv("WORKSPACE_CLEANUP_QUEUE", "256")))
+        return _deleter
+
+
+def get_workspace_janitor() -> Optional[WorkspaceJanitor]:
+    """
+    Process-wide janitor over the directories workspaces are created in
+    (see workspace_root). Disabled with WORKSPACE_JANITOR=0;
+    WORKSPACE_JANITOR_MAX_AGE_SEC and WORKSPACE_JANITOR_INTERVAL_SEC tune it.
+    """
+    global _janitor
+    if os.getenv("WORKSPACE_JANITOR", "1") == "0":
+        return None
+    roots = get_workspace_roots()
+    deleter = get_workspace_deleter()
+    with _cleanup_lock:
+        if _janitor is None:
+            _janitor = WorkspaceJanitor(
+                dirs=[roots.ram_dir, roots.disk_dir],
+                max_age_sec=float(os.getenv("WORKSPACE_JANITOR_MAX_AGE_SEC", "3600")),
+                interval_sec=float(os.getenv("WORKSPACE_JANITOR_INTERVAL_SEC", "300")),
+                deleter=deleter,
+            )
+        return _janitor
+
+
+def start_workspace_janitor() -> Optional[threading.Thread]:
+    """Starts the process-wide janitor's periodic sweeps, unless WORKSPACE_JANITOR=0."""
+    janitor = get_workspace_janitor()
+    return janitor.start() if janitor is not None else None
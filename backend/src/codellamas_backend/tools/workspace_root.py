@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+
+RAM_DIR_CANDIDATES = ("/dev/shm",)
+
+
+def default_ram_dir() -> Optional[str]:
+    """A writable RAM-backed directory (tmpfs), if the platform has one."""
+    if os.name != "posix":
+        return None
+    for candidate in RAM_DIR_CANDIDATES:
+        if os.path.isdir(candidate) and os.access(candidate, os.W_OK):
+            return candidate
+    return None
+
+
+def tree_size(root: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class WorkspaceRoots:
+    """
+    Decides where new workspaces are created: in ram_dir (a tmpfs such as
+    /dev/shm) while it has at least min_free_bytes free and is at most
+    max_used_fraction full, on disk_dir otherwise. Also collects how many
+    bytes each workspace ended up holding (sources plus build output).
+    """
+
+    def __init__(
+        self,
+        ram_dir: Optional[str] = None,
+        disk_dir: Optional[str] = None,
+        max_used_fraction: float = 0.75,
+        min_free_bytes: int = 512 * 1024 * 1024,
+        history: int = 512,
+    ):
+        self.ram_dir = ram_dir
+        self.disk_dir = disk_dir or tempfile.gettempdir()
+        self.max_used_fraction = max_used_fraction
+        self.min_free_bytes = min_free_bytes
+
+        self._lock = threading.Lock()
+        self._sizes: Deque[int] = deque(maxlen=history)
+        self.ram_workspaces = 0
+        self.disk_workspaces = 0
+        self.fallbacks = 0
+        self.bytes_written = 0
+
+    def choose(self) -> Tuple[str, str]:
+        """(directory, "ram" | "disk") for the next workspace."""
+        if self.ram_dir is not None:
+            if self._ram_has_room():
+                with self._lock:
+                    self.ram_workspaces += 1
+                return self.ram_dir, "ram"
+            with self._lock:
+                self.fallbacks += 1
+        with self._lock:
+            self.disk_workspaces += 1
+        return self.disk_dir, "disk"
+
+    def record(self, bytes_written: int, final_bytes: int) -> None:
+        with self._lock:
+            self.bytes_written += bytes_written
+            self._sizes.append(final_bytes)
+
+    def stats(self) -> Dict[str, Any]:
+        ram = None
+        if self.ram_dir is not None:
+            try:
+                usage = shutil.disk_usage(self.ram_dir)
+                ram = {"total": usage.total, "used": usage.used, "free": usage.free}
+            except OSError:
+                pass
+        with self._lock:
+            sizes = list(self._sizes)
+            return {
+                "ram_dir": self.ram_dir,
+                "disk_dir": self.disk_dir,
+                "ram_usage": ram,
+                "ram_workspaces": self.ram_workspaces,
+                "disk_workspaces": self.disk_workspaces,
+                "fallbacks": self.fallbacks,
+                "bytes_written": self.bytes_written,
+                "workspace_bytes": {
+                    "count": len(sizes),
+                    "avg": int(sum(sizes) / len(sizes)) if sizes else 0,
+                    "max": max(sizes) if sizes else 0,
+                },
+            }
+
+    def _ram_has_room(self) -> bool:
+        try:
+            usage = shutil.disk_usage(self.ram_dir)
+        except OSError:
+            return False
+        if usage.total <= 0:
+            return False
+        return usage.free >= self.min_free_bytes and usage.used / usage.total <= self.max_used_fraction
+
+
+_roots: Optional[WorkspaceRoots] = None
+_roots_lock = threading.Lock()
+
+
+def get_workspace_roots() -> WorkspaceRoots:
+    """
+    Process-wide workspace placement used by Workspace.
+    WORKSPACE_RAM=0 keeps every workspace on disk (WORKSPACE_DIR, default the
+    temp dir); otherwise WORKSPACE_RAM_DIR (default /dev/shm) is used while
+    it has WORKSPACE_RAM_MIN_FREE_MB free and is at most
+    WORKSPACE_RAM_MAX_USED_PCT percent full.
+    """
+    global _roots
+    with _roots_lock:
+        if _roots is None:
+            ram_dir = None
+            if os.getenv("WORKSPACE_RAM", "1") != "0":
+                ram_dir = os.getenv("WORKSPACE_RAM_DIR") or default_ram_dir()
+            _roots = WorkspaceRoots(
+                ram_dir=ram_dir,
+                disk_dir=os.getenv("WORKSPACE_DIR") or None,
+                max_used_fraction=int(os.getenv("WORKSPACE_RAM_MAX_USED_PCT", "75")) / 100,
+                min_free_bytes=int(os.getenv("WORKSPACE_RAM_MIN_FREE_MB", "512")) * 1024 * 1024,
+            )
+        return _roots
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from codellamas_backend.schemas.files import ProjectFile
+
+
+def template_key(files: Iterable[ProjectFile]) -> str:
+    """Content hash of a base project; later files win on duplicate paths."""
+    merged: Dict[str, str] = {}
+    for f in files:
+        merged[_normalize(f.path)] = f.content
+    h = hashlib.sha256()
+    for path in sorted(merged):
+        h.update(path.encode("utf-8"))
+        h.update(b"\0")
+        h.update(merged[path].encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _normalize(path: str) -> str:
+    # mirrors Workspace.normalize
+    return str(path).lstrip("/").replace("\\", "/")
+
+
+class TemplateStore:
+    """
+    Read-only base projects materialized once per content hash and cloned into
+    per-run workspaces with hardlinks (plain copies when the workspace lives on
+    another filesystem). Clones must never be modified in place: Workspace
+    replaces a linked file instead of truncating it.
+
+    The store is bounded by max_bytes and evicts least recently used templates
+    that are not currently being cloned.
+    """
+
+    def __init__(self, root_dir: Optional[str] = None, max_bytes: int = 512 * 1024 * 1024):
+        self.root_dir = root_dir or os.path.join(tempfile.gettempdir(), "codellamas_templates")
+        self.max_bytes = max_bytes
+        os.makedirs(self.root_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._pins: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.linked_files = 0
+        self.copied_files = 0
+        self._adopt_existing()
+
+    def clone(self, files: List[ProjectFile], dest_root: str) -> str:
+        """Materializes `files` into dest_root via the template; returns the template key."""
+        key = template_key(files)
+        path = self._checkout(key, files)
+        try:
+            linked, copied = link_tree(path, dest_root)
+        finally:
+            self._release(key)
+        with self._lock:
+            self.linked_files += linked
+            self.copied_files += copied
+        return key
+
+    def clear(self) -> None:
+        with self._lock:
+            keys = [k for k in self._sizes if not self._pins.get(k)]
+            for key in keys:
+                self._drop(key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "templates": len(self._sizes),
+                "bytes": sum(self._sizes.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "linked_files": self.linked_files,
+                "copied_files": self.copied_files,
+            }
+
+    def _template_dir(self, key: str) -> str:
+        return os.path.join(self.root_dir, key)
+
+    def _checkout(self, key: str, files: List[ProjectFile]) -> str:
+        path = self._template_dir(key)
+        with self._lock:
+            if key in self._sizes and os.path.isdir(path):
+                self._sizes.move_to_end(key)
+                self._pins[key] = self._pins.get(key, 0) + 1
+                self.hits += 1
+                return path
+            self.misses += 1
+
+        # build outside the lock; concurrent builders race on the final rename
+        staging = tempfile.mkdtemp(prefix=f".{key[:12]}_", dir=self.root_dir)
+        size = 0
+        for f in files:
+            rel = _normalize(f.path)
+            abs_path = os.path.join(staging, rel)
+            os.makedirs(os.path.dirname(abs_path), exist_ok=True)
+            with open(abs_path, "w", encoding="utf-8") as out:
+                out.write(f.content)
+        for dirpath, _, filenames in os.walk(staging):
+            size += sum(os.path.getsize(os.path.join(dirpath, n)) for n in filenames)
+
+        with self._lock:
+            try:
+                os.rename(staging, path)
+            except OSError:
+                # another thread (or process) published the same template first
+                shutil.rmtree(staging, ignore_errors=True)
+            self._sizes[key] = size
+            self._sizes.move_to_end(key)
+            self._pins[key] = self._pins.get(key, 0) + 1
+            self._evict()
+        return path
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            remaining = self._pins.get(key, 1) - 1
+            if remaining > 0:
+                self._pins[key] = remaining
+            else:
+                self._pins.pop(key, None)
+            self._evict()
+
+    def _evict(self) -> None:
+        # caller holds self._lock
+        total = sum(self._sizes.values())
+        for key in list(self._sizes):
+            if total <= self.max_bytes:
+                break
+            if self._pins.get(key):
+                continue
+            total -= self._sizes[key]
+            self._drop(key)
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        # caller holds self._lock; existing clones keep their own links
+        self._sizes.pop(key, None)
+        shutil.rmtree(self._template_dir(key), ignore_errors=True)
+
+    def _adopt_existing(self) -> None:
+        entries = []
+        for name in os.listdir(self.root_dir):
+            path = os.path.join(self.root_dir, name)
+            if name.startswith("."):
+                shutil.rmtree(path, ignore_errors=True)  # unfinished staging dir
+                continue
+            if not os.path.isdir(path):
+                continue
+            size = 0
+            for dirpath, _, filenames in os.walk(path):
+                size += sum(os.path.getsize(os.path.join(dirpath, n)) for n in filenames)
+            entries.append((os.stat(path).st_mtime, name, size))
+        with self._lock:
+            for _, name, size in sorted(entries):
+                self._sizes[name] = size
+            self._evict()
+
+
+def link_tree(src_root: str, dest_root: str) -> tuple:
+    """Hardlinks (or copies) every file under src_root into dest_root; returns (linked, copied)."""
+    linked = copied = 0
+    for dirpath, _, filenames in os.walk(src_root):
+        rel_dir = os.path.relpath(dirpath, src_root)
+        target_dir = os.path.join(dest_root, rel_dir) if rel_dir != "." else dest_root
+        os.makedirs(target_dir, exist_ok=True)
+        for name in filenames:
+            src = os.path.join(dirpath, name)
+            dst = os.path.join(target_dir, name)
+            try:
+                os.link(src, dst)
+                linked += 1
+            except OSError:
+                shutil.copy2(src, dst)
+                copied += 1
+    return linked, copied
+
+
+_stores: Dict[int, TemplateStore] = {}
+_store_lock = threading.Lock()
+
+
+def get_template_store(workspace_dir: Optional[str] = None) -> Optional[TemplateStore]:
+    """
+    Process-wide template store for workspaces created in workspace_dir
+    (default: the temp dir). Hardlinks cannot cross filesystems, so there is
+    one store per filesystem: WORKSPACE_TEMPLATE_DIR when it is on the same
+    one, codellamas_templates next to the workspaces otherwise.
+    Disabled with WORKSPACE_TEMPLATES=0; WORKSPACE_TEMPLATE_MB caps each store.
+    """
+    if os.getenv("WORKSPACE_TEMPLATES", "1") == "0":
+        return None
+    workspace_dir = workspace_dir or tempfile.gettempdir()
+    device = _device(workspace_dir)
+    if device is None:
+        return None
+    with _store_lock:
+        store = _stores.get(device)
+        if store is None or not os.path.isdir(store.root_dir):
+            root_dir = os.getenv("WORKSPACE_TEMPLATE_DIR")
+            if not root_dir or _device(root_dir, create=True) != device:
+                root_dir = os.path.join(workspace_dir, "codellamas_templates")
+            store = _stores[device] = TemplateStore(
+                root_dir=root_dir,
+                max_bytes=int(os.getenv("WORKSPACE_TEMPLATE_MB", "512")) * 1024 * 1024,
+            )
+        return store
+
+
+def _device(path: str, create: bool = False) -> Optional[int]:
+    try:
+        if create:
+            os.makedirs(path, exist_ok=True)
+        return os.stat(path).st_dev
+    except OSError:
+        return None